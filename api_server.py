@@ -0,0 +1,384 @@
+"""
+Asyncio HTTP service in front of InventoryStrategist.
+
+Read endpoints serve the forecast, buy plan, P&L and KPIs for a period from
+memory: each response body is built once per version of its source files and
+tagged with an ETag, so clients never read a half-written CSV and unchanged
+data costs a 304. Count submissions are validated, queued and appended to
+data/api_counts.csv in batches (by size or age); /counts unify picks them up.
+
+    GET  /health
+    GET  /periods
+    GET  /forecast/{period}   ?sku=A,B&category=C
+    GET  /buy-plan/{period}   ?sku=...&category=...
+    GET  /pnl/{period}        ?sku=...&category=...
+    GET  /kpis/{period}       ?sku=...&category=...
+    POST /counts              one count object or a list of them
+    POST /counts/flush        write queued counts now
+
+LocalClient drives the same handler in-process, without sockets, for tests.
+"""
+
+import asyncio
+import csv
+import hashlib
+import json
+import re
+import time
+from datetime import datetime
+from http import HTTPStatus
+from pathlib import Path
+from urllib.parse import parse_qs, urlsplit
+
+from table_cache import TableCache, file_stamp
+
+REPORT_FILES = {
+    'forecast': 'forecast_{period}.csv',
+    'buy-plan': 'buy_plan_{period}.csv',
+    'pnl': 'pnl_snapshot_{period}.csv',
+}
+
+# Report frames behind /kpis, under the names compute_kpis expects
+KPI_SOURCES = {'forecast': 'forecast', 'buy_plan': 'buy-plan', 'pnl_snapshot': 'pnl'}
+
+API_COUNTS_FILE = "api_counts.csv"
+COUNT_FIELDS = ['asof_date', 'checkpoint', 'location', 'sku', 'qty', 'uom',
+                'counter_id', 'notes', 'submitted_at', 'unique_key']
+REQUIRED_COUNT_FIELDS = ['asof_date', 'checkpoint', 'location', 'sku', 'qty']
+CHECKPOINTS = ('BOM', 'MID', 'EOM')
+
+PERIOD_PATTERN = re.compile(r"\d{4}-\d{2}")
+MAX_BODY_BYTES = 10 * 1024 * 1024
+MAX_CACHED_RESPONSES = 1024
+
+# A CSV caught mid-write is read again after this pause
+REREAD_DELAY = 0.05
+REREAD_ATTEMPTS = 5
+
+
+def stable_read_csv(path):
+    """Read a CSV whose mtime/size did not move while it was being read"""
+    import pandas as pd
+
+    for _ in range(REREAD_ATTEMPTS):
+        before = file_stamp(path)
+        try:
+            frame = pd.read_csv(path)
+        except (pd.errors.ParserError, pd.errors.EmptyDataError, UnicodeDecodeError):
+            frame = None
+        if frame is not None and file_stamp(path) == before:
+            return frame
+        time.sleep(REREAD_DELAY)
+    raise IOError(f"{path} kept changing while being read")
+
+
+async def run_blocking(func, *args):
+    """Run blocking file work on the default executor (asyncio.to_thread needs 3.9)"""
+    return await asyncio.get_running_loop().run_in_executor(None, func, *args)
+
+
+def validate_count(item, now):
+    """Normalized count row, or a list of problems"""
+    if not isinstance(item, dict):
+        return None, ["count must be a JSON object"]
+    errors = [f"missing {field}" for field in REQUIRED_COUNT_FIELDS if item.get(field) in (None, "")]
+    if errors:
+        return None, errors
+
+    try:
+        qty = float(item['qty'])
+    except (TypeError, ValueError):
+        return None, ["qty must be a number"]
+    if qty < 0:
+        errors.append("qty must be >= 0")
+    checkpoint = str(item['checkpoint']).upper()
+    if checkpoint not in CHECKPOINTS:
+        errors.append(f"checkpoint must be one of {', '.join(CHECKPOINTS)}")
+    try:
+        asof = datetime.strptime(str(item['asof_date'])[:10], "%Y-%m-%d").date().isoformat()
+    except ValueError:
+        errors.append("asof_date must be YYYY-MM-DD")
+    if errors:
+        return None, errors
+
+    row = {
+        'asof_date': asof, 'checkpoint': checkpoint, 'location': str(item['location']),
+        'sku': str(item['sku']), 'qty': int(qty) if qty.is_integer() else qty,
+        'uom': item.get('uom', 'EA'), 'counter_id': str(item.get('counter_id', 'API')),
+        'notes': item.get('notes', ''), 'submitted_at': now,
+    }
+    row['unique_key'] = "|".join([asof.replace('-', ''), checkpoint, row['location'],
+                                  row['sku'], row['counter_id']])
+    return row, []
+
+
+class CountBatcher:
+    """Queues count rows and appends them to the counts store in batches"""
+
+    def __init__(self, path, batch_size=100, flush_seconds=1.0):
+        self.path = Path(path)
+        self.batch_size = batch_size
+        self.flush_seconds = flush_seconds
+        self.pending = []
+        self.written = 0
+        self.batches = 0
+        self._lock = asyncio.Lock()
+        self._task = None
+
+    async def submit(self, rows):
+        self.pending.extend(rows)
+        if len(self.pending) >= self.batch_size:
+            await self.flush()
+        return len(self.pending)
+
+    async def flush(self):
+        async with self._lock:
+            rows, self.pending = self.pending, []
+            if rows:
+                await run_blocking(self._append, rows)
+                self.written += len(rows)
+                self.batches += 1
+            return len(rows)
+
+    def _append(self, rows):
+        new_file = not self.path.exists()
+        with open(self.path, 'a', newline='') as f:
+            writer = csv.DictWriter(f, fieldnames=COUNT_FIELDS)
+            if new_file:
+                writer.writeheader()
+            writer.writerows(rows)
+
+    async def _flush_periodically(self):
+        while True:
+            await asyncio.sleep(self.flush_seconds)
+            await self.flush()
+
+    def start(self):
+        if self._task is None:
+            self._task = asyncio.get_running_loop().create_task(self._flush_periodically())
+
+    async def stop(self):
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+        await self.flush()
+
+
+def _json_body(payload):
+    return json.dumps(payload, default=str, separators=(',', ':')).encode('utf-8')
+
+
+def _filter(frame, query):
+    """Rows matching ?sku=A,B and ?category=C"""
+    for column in ('sku', 'category'):
+        values = query.get(column)
+        if values and column in frame.columns:
+            wanted = {v for value in values for v in value.split(',') if v}
+            frame = frame[frame[column].astype(str).isin(wanted)]
+    return frame
+
+
+class InventoryAPI:
+    """Request handler; one instance per served strategist"""
+
+    def __init__(self, strategist, batch_size=None, flush_seconds=None):
+        self.strategist = strategist
+        self.tables = TableCache.from_config(strategist.config)
+        self._responses = {}
+        self.counts = CountBatcher(
+            Path(strategist.data_path) / API_COUNTS_FILE,
+            batch_size or strategist.config.get('api_count_batch_size', 100),
+            flush_seconds or strategist.config.get('api_count_flush_seconds', 1.0),
+        )
+        self.requests = 0
+
+    async def start(self):
+        self.counts.start()
+
+    async def stop(self):
+        await self.counts.stop()
+
+    def report_path(self, route, period):
+        return Path(self.strategist.reports_path) / REPORT_FILES[route].format(period=period)
+
+    async def _cached(self, key, paths, build, headers):
+        """ETag-tagged body, rebuilt only when one of its source files changed"""
+        stamps = tuple(file_stamp(path) for path in paths)
+        entry = self._responses.get(key)
+        if entry is None or entry[0] != stamps:
+            body = await run_blocking(build)
+            etag = '"' + hashlib.sha1(body).hexdigest() + '"'
+            if len(self._responses) >= MAX_CACHED_RESPONSES:
+                self._responses.pop(next(iter(self._responses)))  # oldest first
+            entry = self._responses[key] = (stamps, etag, body)
+        _, etag, body = entry
+        if headers.get('if-none-match') == etag:
+            return HTTPStatus.NOT_MODIFIED, {'ETag': etag}, b''
+        return HTTPStatus.OK, {'ETag': etag, 'Content-Type': 'application/json'}, body
+
+    def _frame(self, path):
+        return self.tables.get(path, stable_read_csv)
+
+    async def handle(self, method, target, headers=None, body=b''):
+        """(status, headers, body) for one request"""
+        self.requests += 1
+        headers = {k.lower(): v for k, v in (headers or {}).items()}
+        url = urlsplit(target)
+        query = parse_qs(url.query)
+        parts = [p for p in url.path.split('/') if p]
+
+        try:
+            if method == 'GET' and parts == ['health']:
+                return self._json(HTTPStatus.OK, {'status': 'ok', 'queued_counts': len(self.counts.pending)})
+            if method == 'GET' and parts == ['periods']:
+                return self._json(HTTPStatus.OK, {'periods': self.periods()})
+            if method == 'POST' and parts == ['counts']:
+                return await self.post_counts(body)
+            if method == 'POST' and parts == ['counts', 'flush']:
+                return self._json(HTTPStatus.OK, {'written': await self.counts.flush()})
+            if len(parts) == 2 and (parts[0] in REPORT_FILES or parts[0] == 'kpis'):
+                if method != 'GET':
+                    return self._json(HTTPStatus.METHOD_NOT_ALLOWED, {'error': f"{method} not allowed"})
+                if not PERIOD_PATTERN.fullmatch(parts[1]):
+                    return self._json(HTTPStatus.BAD_REQUEST, {'error': "period must be YYYY-MM"})
+                return await self.get_report(parts[0], parts[1], query, headers)
+            return self._json(HTTPStatus.NOT_FOUND, {'error': f"No route for {method} {url.path}"})
+        except Exception as e:
+            return self._json(HTTPStatus.INTERNAL_SERVER_ERROR, {'error': f"{type(e).__name__}: {e}"})
+
+    def _json(self, status, payload):
+        return status, {'Content-Type': 'application/json'}, _json_body(payload)
+
+    def periods(self):
+        pattern = re.compile(r"forecast_(\d{4}-\d{2})\.csv")
+        return sorted(match.group(1) for path in Path(self.strategist.reports_path).glob("forecast_*.csv")
+                      if (match := pattern.fullmatch(path.name)))
+
+    async def get_report(self, route, period, query, headers):
+        key = (route, period, tuple(sorted((k, tuple(v)) for k, v in query.items())))
+        if route == 'kpis':
+            paths = [self.report_path(source, period) for source in KPI_SOURCES.values()]
+        else:
+            paths = [self.report_path(route, period)]
+        if not any(path.exists() for path in paths):
+            return self._json(HTTPStatus.NOT_FOUND, {'error': f"No {route} data for {period}"})
+
+        if route == 'kpis':
+            def build():
+                from report_pack import compute_kpis
+                frames = {name: _filter(self._frame(path), query)
+                          for name, path in zip(KPI_SOURCES, paths) if path.exists()}
+                return _json_body({'period': period, **compute_kpis(frames, self.strategist.config)})
+        else:
+            def build():
+                frame = _filter(self._frame(paths[0]), query)
+                return frame.to_json(orient='records', date_format='iso').encode('utf-8')
+        return await self._cached(key, paths, build, headers)
+
+    async def post_counts(self, body):
+        try:
+            payload = json.loads(body or b'null')
+        except ValueError:
+            return self._json(HTTPStatus.BAD_REQUEST, {'error': "body must be JSON"})
+        items = payload if isinstance(payload, list) else [payload]
+
+        now = datetime.now().isoformat(timespec='seconds')
+        rows, errors = [], {}
+        for i, item in enumerate(items):
+            row, problems = validate_count(item, now)
+            if problems:
+                errors[i] = problems
+            else:
+                rows.append(row)
+        if errors:
+            return self._json(HTTPStatus.BAD_REQUEST, {'error': "invalid counts", 'details': errors})
+
+        queued = await self.counts.submit(rows)
+        return self._json(HTTPStatus.ACCEPTED, {'accepted': len(rows), 'queued': queued})
+
+
+async def _handle_connection(app, reader, writer):
+    """HTTP/1.1 with keep-alive: one request at a time per connection"""
+    try:
+        while True:
+            request_line = await reader.readline()
+            if not request_line.strip():
+                break
+            method, target, version = request_line.decode('latin-1').split()
+            headers = {}
+            while True:
+                line = await reader.readline()
+                if line in (b'\r\n', b'\n', b''):
+                    break
+                name, _, value = line.decode('latin-1').partition(':')
+                headers[name.strip().lower()] = value.strip()
+
+            length = int(headers.get('content-length', 0))
+            if length > MAX_BODY_BYTES:
+                status, out_headers, body = app._json(HTTPStatus.REQUEST_ENTITY_TOO_LARGE,
+                                                      {'error': "body too large"})
+                keep_alive = False
+            else:
+                body = await reader.readexactly(length) if length else b''
+                status, out_headers, body = await app.handle(method, target, headers, body)
+                keep_alive = (version == 'HTTP/1.1' and headers.get('connection', '').lower() != 'close')
+
+            head = [f"HTTP/1.1 {status.value} {status.phrase}", f"Content-Length: {len(body)}",
+                    f"Connection: {'keep-alive' if keep_alive else 'close'}"]
+            head += [f"{name}: {value}" for name, value in out_headers.items()]
+            writer.write(("\r\n".join(head) + "\r\n\r\n").encode('latin-1') + body)
+            await writer.drain()
+            if not keep_alive:
+                break
+    except (ConnectionError, asyncio.IncompleteReadError, ValueError):
+        pass
+    finally:
+        writer.close()
+
+
+async def start_server(app, host="127.0.0.1", port=8080):
+    """Listening asyncio server for app (port 0 picks a free port)"""
+    await app.start()
+    return await asyncio.start_server(lambda r, w: _handle_connection(app, r, w), host, port)
+
+
+class LocalResponse:
+    def __init__(self, status, headers, body):
+        self.status = int(status)
+        self.headers = headers
+        self.body = body
+
+    def json(self):
+        return json.loads(self.body)
+
+
+class LocalClient:
+    """In-process stand-in for an HTTP client: calls InventoryAPI.handle directly"""
+
+    def __init__(self, app):
+        self.app = app
+        self.loop = asyncio.new_event_loop()
+        self.loop.run_until_complete(app.start())
+
+    def request(self, method, path, headers=None, body=b''):
+        return LocalResponse(*self.loop.run_until_complete(self.app.handle(method, path, headers, body)))
+
+    def get(self, path, headers=None):
+        return self.request('GET', path, headers)
+
+    def post(self, path, payload=None):
+        return self.request('POST', path, {'Content-Type': 'application/json'}, _json_body(payload))
+
+    def close(self):
+        self.loop.run_until_complete(self.app.stop())
+        self.loop.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
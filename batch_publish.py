@@ -0,0 +1,83 @@
+"""
+Parallel multi-period report publishing.
+
+The shared inputs (events, sales, unified counts) are loaded once in the
+parent and handed to every pool worker through the initializer, so each
+worker unpickles them once rather than once per period. Workers only read
+them. One task runs forecast → plan → pnl → publish for one period; results
+come back in period order.
+"""
+
+import contextlib
+import io
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+SHARED_TABLES = {
+    'events': 'events_processed.csv',
+    'sales': 'sales_processed.csv',
+    'counts': 'counts_unified.csv',
+}
+
+# Set per worker process by _init_worker
+_shared = None
+_config = None
+
+
+def period_range(start, end):
+    """YYYY-MM strings from start to end inclusive"""
+    import pandas as pd
+
+    if pd.Period(start, 'M') > pd.Period(end, 'M'):
+        raise ValueError(f"Period range {start}..{end} is empty")
+    return [str(p) for p in pd.period_range(start, end, freq='M')]
+
+
+def load_shared(strategist):
+    """Read the period-independent inputs once"""
+    return {name: strategist.load_data(filename) for name, filename in SHARED_TABLES.items()}
+
+
+def _init_worker(shared, config):
+    global _shared, _config
+    _shared, _config = shared, config
+
+
+def publish_period(period, shared=None, config=None):
+    """Worker: forecast, plan, pnl and publish one period, never raising"""
+    from ops_controller import InventoryStrategist
+
+    shared = _shared if shared is None else shared
+    config = _config if config is None else config
+    started = time.perf_counter()
+    result = {'period': period, 'seconds': 0.0, 'archive': None, 'error': None}
+    log = io.StringIO()
+    try:
+        with contextlib.redirect_stdout(log):
+            strategist = InventoryStrategist()
+            strategist.config = dict(config)
+            forecast = strategist.forecast(period, sales_df=shared['sales'], events_df=shared['events'])
+            buy_plan = strategist.plan(period, forecast_df=forecast, counts_df=shared['counts'])
+            pnl = strategist.pnl(period, sales_df=shared['sales'], counts_df=shared['counts'])
+            published = strategist.publish_pack(period, frames={
+                'forecast': forecast, 'buy_plan': buy_plan, 'pnl_snapshot': pnl,
+            })
+        result['archive'] = published[0]
+    except Exception as e:
+        result['error'] = f"{type(e).__name__}: {e}"
+    result['seconds'] = round(time.perf_counter() - started, 4)
+    return result
+
+
+def publish_periods(periods, shared, config, max_workers=None):
+    """Publish every period; returns (per-period results, wall seconds)"""
+    workers = min(max_workers or os.cpu_count() or 1, len(periods)) or 1
+    started = time.perf_counter()
+    if workers == 1:
+        results = [publish_period(period, shared, config) for period in periods]
+    else:
+        with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker,
+                                 initargs=(shared, config)) as pool:
+            results = list(pool.map(publish_period, periods, chunksize=1))
+    return results, time.perf_counter() - started
@@ -0,0 +1,151 @@
+# HTTP API Load Test
+# Serves synthetic reports from a scratch directory on 127.0.0.1 and drives
+# it with concurrent keep-alive clients: a read mix across forecast, buy plan,
+# P&L and KPI endpoints (half revalidating with If-None-Match) plus batched
+# count submissions. Reports requests/sec and p50/p99 latency per scenario.
+#
+# Usage: python benchmarks/bench_api.py [--skus 1000] [--clients 16] [--requests 200]
+
+import argparse
+import asyncio
+import contextlib
+import io
+import json
+import os
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+sys.path.insert(0, str(Path(__file__).resolve().parent))
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from api_server import InventoryAPI, start_server  # noqa: E402
+from bench_workbook_modes import synthetic_tables  # noqa: E402
+from ops_controller import InventoryStrategist  # noqa: E402
+
+PERIOD = "2025-08"
+
+
+def write_reports(reports, n_skus):
+    tables = synthetic_tables(n_skus)
+    buy_plan = tables["buy_plan"]
+    forecast = pd.DataFrame({
+        "sku": buy_plan["sku"], "description": buy_plan["description"], "category": buy_plan["category"],
+        "period": PERIOD, "baseline_daily": buy_plan["daily_demand"], "event_lift": 0.0,
+        "total_forecast": buy_plan["forecast_30d"], "demand_std": buy_plan["demand_std"], "confidence": "HIGH",
+    })
+    forecast.to_csv(reports / f"forecast_{PERIOD}.csv", index=False)
+    buy_plan.to_csv(reports / f"buy_plan_{PERIOD}.csv", index=False)
+    tables["pnl"].to_csv(reports / f"pnl_snapshot_{PERIOD}.csv", index=False)
+    return buy_plan["sku"].tolist()
+
+
+async def _request(reader, writer, method, path, headers=None, body=b""):
+    lines = [f"{method} {path} HTTP/1.1", "Host: localhost", f"Content-Length: {len(body)}"]
+    lines += [f"{k}: {v}" for k, v in (headers or {}).items()]
+    writer.write(("\r\n".join(lines) + "\r\n\r\n").encode() + body)
+    await writer.drain()
+    status = int((await reader.readline()).split()[1])
+    response_headers = {}
+    while (line := await reader.readline()) not in (b"\r\n", b""):
+        name, _, value = line.decode().partition(":")
+        response_headers[name.strip().lower()] = value.strip()
+    await reader.readexactly(int(response_headers.get("content-length", 0)))
+    return status, response_headers
+
+
+async def _client(port, plan, latencies):
+    reader, writer = await asyncio.open_connection("127.0.0.1", port)
+    etags = {}
+    try:
+        for method, path, body in plan:
+            headers = {"If-None-Match": etags[path]} if path in etags and len(latencies) % 2 else {}
+            start = time.perf_counter()
+            status, response_headers = await _request(reader, writer, method, path, headers, body)
+            latencies.append(time.perf_counter() - start)
+            if "etag" in response_headers:
+                etags[path] = response_headers["etag"]
+            assert status in (200, 202, 304), (status, path)
+    finally:
+        writer.close()
+
+
+def _plans(scenario, skus, clients, requests, rng):
+    reads = [f"/forecast/{PERIOD}", f"/buy-plan/{PERIOD}", f"/pnl/{PERIOD}", f"/kpis/{PERIOD}",
+             f"/buy-plan/{PERIOD}?category=Apparel", f"/kpis/{PERIOD}?category=Packaging"]
+    plans = []
+    for _ in range(clients):
+        plan = []
+        for _ in range(requests):
+            if scenario == "reads" or rng.random() < 0.5:
+                plan.append(("GET", reads[rng.integers(len(reads))], b""))
+            else:
+                count = {"asof_date": "2025-08-20", "checkpoint": "EOM", "location": "in_store",
+                         "sku": skus[rng.integers(len(skus))], "qty": int(rng.integers(0, 500))}
+                plan.append(("POST", "/counts", json.dumps(count).encode()))
+        plans.append(plan)
+    return plans
+
+
+async def run_scenario(app, scenario, skus, clients, requests, seed=7):
+    server = await start_server(app, "127.0.0.1", 0)
+    port = server.sockets[0].getsockname()[1]
+    plans = _plans(scenario, skus, clients, requests, np.random.default_rng(seed))
+    latencies = []
+    start = time.perf_counter()
+    await asyncio.gather(*(_client(port, plan, latencies) for plan in plans))
+    wall = time.perf_counter() - start
+    server.close()
+    await server.wait_closed()
+    await app.stop()
+    ms = np.array(latencies) * 1000
+    return {
+        "scenario": scenario, "clients": clients, "requests": len(ms),
+        "req_per_s": round(len(ms) / wall, 1),
+        "p50_ms": round(float(np.percentile(ms, 50)), 2),
+        "p99_ms": round(float(np.percentile(ms, 99)), 2),
+        "counts_batches": app.counts.batches,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--skus", type=int, default=1000)
+    parser.add_argument("--clients", type=int, default=16)
+    parser.add_argument("--requests", type=int, default=200, help="requests per client")
+    parser.add_argument("--out", default="reports/benchmarks")
+    args = parser.parse_args()
+    out_dir = Path(args.out).resolve()
+
+    print(f"⏱️  Load testing the API ({args.skus:,} SKUs, {args.clients} clients)...")
+    cwd = os.getcwd()
+    results = []
+    with tempfile.TemporaryDirectory() as scratch:
+        os.chdir(scratch)
+        try:
+            with contextlib.redirect_stdout(io.StringIO()):
+                strategist = InventoryStrategist()
+            skus = write_reports(strategist.reports_path, args.skus)
+            for scenario in ("reads", "mixed"):
+                app = InventoryAPI(strategist)
+                result = asyncio.run(run_scenario(app, scenario, skus, args.clients, args.requests))
+                results.append(result)
+                print(f"   • {scenario:<6} {result['req_per_s']:>8,.0f} req/s  "
+                      f"p50 {result['p50_ms']:.2f} ms  p99 {result['p99_ms']:.2f} ms")
+        finally:
+            os.chdir(cwd)
+
+    df = pd.DataFrame(results)
+    out_dir.mkdir(parents=True, exist_ok=True)
+    out_file = out_dir / "api_load.csv"
+    df.to_csv(out_file, index=False)
+    print(df.to_string(index=False))
+    print(f"💾 Saved to: {out_file}")
+
+
+if __name__ == "__main__":
+    main()
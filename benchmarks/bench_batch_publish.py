@@ -0,0 +1,71 @@
+# Batch Publish Benchmark
+# Publishes a range of months serially and on a process pool from a scratch
+# copy of data/, and reports wall time and speedup per worker count.
+#
+# Usage: python benchmarks/bench_batch_publish.py [--start 2025-01] [--end 2025-12] [--workers 2 4]
+
+import argparse
+import contextlib
+import io
+import os
+import shutil
+import sys
+import tempfile
+from pathlib import Path
+
+import pandas as pd
+
+REPO_ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(REPO_ROOT))
+
+from batch_publish import load_shared, period_range, publish_periods  # noqa: E402
+from ops_controller import InventoryStrategist  # noqa: E402
+
+
+def run(periods, worker_counts, data_dir):
+    results = []
+    cwd = os.getcwd()
+    with tempfile.TemporaryDirectory() as scratch:
+        shutil.copytree(data_dir, Path(scratch) / "data")
+        os.chdir(scratch)
+        try:
+            with contextlib.redirect_stdout(io.StringIO()):
+                strategist = InventoryStrategist()
+            shared = load_shared(strategist)
+            serial_wall = None
+            for workers in [1] + [w for w in worker_counts if w > 1]:
+                outcome, wall = publish_periods(periods, shared, strategist.config, workers)
+                serial_wall = serial_wall or wall
+                failed = sum(1 for r in outcome if r['error'])
+                results.append({
+                    "periods": len(periods), "workers": workers, "wall_s": round(wall, 3),
+                    "speedup": round(serial_wall / wall, 2), "failed": failed,
+                })
+                print(f"   • {workers} worker(s): {wall:6.2f}s, {serial_wall / wall:4.2f}x")
+        finally:
+            os.chdir(cwd)
+    return pd.DataFrame(results)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--start", default="2025-01")
+    parser.add_argument("--end", default="2025-12")
+    parser.add_argument("--workers", type=int, nargs="+", default=[2, 4])
+    parser.add_argument("--data", default=str(REPO_ROOT / "data"))
+    parser.add_argument("--out", default="reports/benchmarks")
+    args = parser.parse_args()
+
+    periods = period_range(args.start, args.end)
+    print(f"⏱️  Benchmarking batch publish for {len(periods)} periods (CPUs: {os.cpu_count()})...")
+    df = run(periods, args.workers, Path(args.data))
+    out_dir = Path(args.out)
+    out_dir.mkdir(parents=True, exist_ok=True)
+    out_file = out_dir / "batch_publish.csv"
+    df.to_csv(out_file, index=False)
+    print(df.to_string(index=False))
+    print(f"💾 Saved to: {out_file}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,135 @@
+# Command Benchmark Suite
+# Generates a seeded dataset per tier (datagen.py), then runs every batch
+# ops_controller command against it in a scratch directory, one CLI process
+# per command, in pipeline order. Wall time includes process start-up; the
+# per-stage time, peak RSS and rows come from the run's metrics file
+# (reports/metrics/run_*.json). Results are appended to
+# reports/benchmarks/commands.csv and each command is compared with the
+# previous run of the same tier. /serve and /session are long-running and
+# are covered by bench_api.py and bench_startup.py instead.
+#
+# Usage: python benchmarks/bench_commands.py [--tiers small medium large] [--seed 42]
+
+import argparse
+import json
+import os
+import subprocess
+import sys
+import tempfile
+import time
+from datetime import datetime
+from pathlib import Path
+
+import pandas as pd
+
+REPO_ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(REPO_ROOT))
+
+from datagen import MONTHS, START, TIERS, write_dataset  # noqa: E402
+
+PERIOD = str(pd.Period(START, 'M') + MONTHS - 1)
+PREVIOUS = str(pd.Period(PERIOD, 'M') - 1)
+
+COMMANDS = [
+    "/ingest events input/events.csv",
+    "/ingest sales input/sales.csv",
+    "/ingest audits input/counts.csv",
+    "/forms setup ms",
+    "/counts manual enable",
+    "/counts unify",
+    f"/forecast {PERIOD}",
+    f"/plan {PERIOD}",
+    f"/pnl {PERIOD}",
+    f"/publish pack {PERIOD}",
+    f"/publish batch {PREVIOUS} {PERIOD}",
+    f"/run month {PERIOD}",
+    f"/build workbook values {PERIOD}",
+    "/data memory",
+    "/exceptions summary",
+]
+
+
+def latest_metrics(scratch):
+    runs = sorted((Path(scratch) / "reports" / "metrics").glob("run_*.json"))
+    return json.loads(runs[-1].read_text()) if runs else None
+
+
+def run_command(command, scratch):
+    """Run one CLI command; wall time plus its metrics summary"""
+    before = latest_metrics(scratch)
+    started = time.perf_counter()
+    proc = subprocess.run([sys.executable, str(REPO_ROOT / "ops_controller.py"), *command.split()],
+                          cwd=scratch, capture_output=True, text=True)
+    wall = time.perf_counter() - started
+    metrics = latest_metrics(scratch)
+    if metrics == before:
+        metrics = None
+    top = [s for s in metrics['stages'] if '/' not in s['stage']] if metrics else []
+    return {
+        'command': command,
+        'wall_s': round(wall, 3),
+        'stage_s': round(sum(s['wall_s'] for s in top), 3) if top else None,
+        'peak_rss_mb': metrics['total']['peak_rss_mb'] if metrics else None,
+        'rows_in': sum(s['rows_in'] or 0 for s in top) if top else None,
+        'rows_out': sum(s['rows_out'] or 0 for s in top) if top else None,
+        'ok': proc.returncode == 0 and "❌" not in proc.stdout,
+    }
+
+
+def run_tier(tier, seed):
+    sizes = TIERS[tier]
+    print(f"\n🧪 {tier}: {sizes['skus']:,} SKUs, {sizes['events']:,} events, {sizes['sales']:,} sales")
+    with tempfile.TemporaryDirectory() as scratch:
+        started = time.perf_counter()
+        write_dataset(Path(scratch) / "input", seed=seed, **sizes)
+        print(f"   • generated in {time.perf_counter() - started:.2f}s")
+        rows = []
+        for command in COMMANDS:
+            result = run_command(command, scratch)
+            rows.append({'tier': tier, **result})
+            flag = "" if result['ok'] else "  ❌"
+            rss = f"{result['peak_rss_mb']:>7.1f} MB" if result['peak_rss_mb'] is not None else f"{'-':>10}"
+            print(f"   • {command:<40} {result['wall_s']:>8.2f}s  {rss}{flag}")
+    return rows
+
+
+def compare(results, history):
+    """Print per-command wall time against the previous run of the same tier"""
+    if history is None:
+        return
+    for tier, current in results.groupby('tier'):
+        previous = history[history['tier'] == tier]
+        if previous.empty:
+            continue
+        last = previous[previous['run_id'] == previous['run_id'].iloc[-1]].set_index('command')['wall_s']
+        print(f"\n📈 {tier} vs {previous['run_id'].iloc[-1]}:")
+        for row in current.itertuples():
+            if row.command in last.index and last[row.command] > 0:
+                print(f"   • {row.command:<40} {last[row.command]:>8.2f}s → {row.wall_s:.2f}s "
+                      f"({(row.wall_s / last[row.command] - 1) * 100:+.1f}%)")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--tiers", nargs="+", choices=TIERS, default=["small"])
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--out", default="reports/benchmarks")
+    args = parser.parse_args()
+    out_dir = Path(args.out).resolve()
+
+    print(f"⏱️  Benchmarking ops_controller commands (CPUs: {os.cpu_count()})...")
+    run_id = datetime.now().strftime('%Y%m%d-%H%M%S')
+    rows = [row for tier in args.tiers for row in run_tier(tier, args.seed)]
+    results = pd.DataFrame(rows)
+    results.insert(0, 'run_id', run_id)
+
+    out_dir.mkdir(parents=True, exist_ok=True)
+    out_file = out_dir / "commands.csv"
+    history = pd.read_csv(out_file) if out_file.exists() else None
+    compare(results, history)
+    results.to_csv(out_file, mode='a', header=history is None, index=False)
+    print(f"💾 Saved to: {out_file}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,73 @@
+# CLI Startup Benchmark
+# Runs cheap ops_controller commands under `python -X importtime` and reports
+# wall time, total import time and the slowest top-level imports, so modules
+# that sneak back into the startup path show up by name.
+#
+# Usage: python benchmarks/bench_startup.py [--runs 5] [--top 8]
+
+import argparse
+import subprocess
+import sys
+import time
+from pathlib import Path
+
+REPO_ROOT = Path(__file__).resolve().parent.parent
+
+COMMANDS = [["--help"], [], ["/unknown"]]
+
+# Heavy modules only commands that touch data may import
+HEAVY_MODULES = ("pandas", "numpy", "openpyxl")
+
+
+def import_times(stderr):
+    """Cumulative microseconds per top-level import from -X importtime output"""
+    times = {}
+    for line in stderr.splitlines():
+        if not line.startswith("import time:") or "cumulative" in line:
+            continue
+        _, cumulative, name = line.split("|")
+        if not name.startswith("  "):  # nested imports are indented
+            times[name.strip()] = int(cumulative)
+    return times
+
+
+def profile(args, runs=5, cwd=None):
+    """Best wall time over runs plus the import profile of one run"""
+    walls = []
+    for _ in range(runs):
+        start = time.perf_counter()
+        subprocess.run([sys.executable, str(REPO_ROOT / "ops_controller.py"), *args],
+                       capture_output=True, cwd=cwd)
+        walls.append(time.perf_counter() - start)
+    traced = subprocess.run([sys.executable, "-X", "importtime", str(REPO_ROOT / "ops_controller.py"), *args],
+                            capture_output=True, text=True, cwd=cwd)
+    return min(walls), import_times(traced.stderr)
+
+
+def _bare_interpreter():
+    start = time.perf_counter()
+    subprocess.run([sys.executable, "-c", "pass"], capture_output=True)
+    return time.perf_counter() - start
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--runs", type=int, default=5)
+    parser.add_argument("--top", type=int, default=8)
+    args = parser.parse_args()
+
+    baseline = min(_bare_interpreter() for _ in range(args.runs))
+    print(f"⏱️  Bare interpreter: {baseline * 1000:.1f} ms")
+    for command in COMMANDS:
+        wall, times = profile(command, args.runs)
+        heavy = [name for name in times if name.split(".")[0] in HEAVY_MODULES]
+        label = " ".join(command) or "(no args)"
+        print(f"\n▶ {label}: {wall * 1000:.1f} ms wall, {sum(times.values()) / 1000:.1f} ms importing")
+        if heavy:
+            print(f"   ⚠️  Heavy imports on the startup path: {', '.join(heavy)}")
+        for name, micros in sorted(times.items(), key=lambda item: -item[1])[:args.top]:
+            print(f"   • {name:<28} {micros / 1000:7.2f} ms")
+
+
+if __name__ == "__main__":
+    main()
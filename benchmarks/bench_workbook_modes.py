@@ -0,0 +1,168 @@
+# Workbook Mode Benchmark
+# Builds the Command Center workbook in formulas, values and hybrid mode for
+# synthetic SKU counts and reports build time, file size, formula count and
+# the number of cells Excel has to read on a full recalculation.
+#
+# Usage: python benchmarks/bench_workbook_modes.py [--sizes 1000 10000 50000]
+
+import argparse
+import re
+import sys
+import time
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+from openpyxl.formula.tokenizer import Tokenizer
+from openpyxl.utils import column_index_from_string, range_boundaries
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from generate_workbook import create_command_center_workbook  # noqa: E402
+from workbook_modes import WORKBOOK_MODES  # noqa: E402
+
+# Fact rows per SKU assumed behind full-column references to Counts_Entry/Sales
+COUNT_ROWS_PER_SKU = 4
+SALES_ROWS_PER_SKU = 20
+
+_ROW_NUMBERS = re.compile(r"(?<=[A-Z])\d+")
+
+
+def synthetic_tables(n_skus, seed=42):
+    """SKU master, buy plan and P&L frames shaped like plan()/pnl() output"""
+    rng = np.random.default_rng(seed)
+    sku = np.array([f"SKU{i:06d}" for i in range(n_skus)])
+    category = rng.choice(["Promotional", "Packaging", "Apparel"], n_skus)
+    cost = rng.uniform(0.5, 20, n_skus).round(2)
+    price = (cost * rng.uniform(1.5, 4, n_skus)).round(2)
+    lead_time = rng.integers(5, 30, n_skus)
+
+    daily = rng.gamma(2.0, 5.0, n_skus).round(2)
+    std = (daily * rng.uniform(0.2, 0.6, n_skus)).round(2)
+    stock = rng.integers(0, 600, n_skus)
+    safety = (1.65 * np.sqrt(std ** 2 * lead_time + daily ** 2)).round(0)
+    rop = (daily * lead_time + safety).round(0)
+    recommended = np.maximum(0, daily * 30 + safety - stock).round(0)
+    dos = np.where(daily > 0, stock / daily, 999).round(1)
+    priority = np.where(stock < rop, "HIGH", np.where(dos < 15, "MEDIUM", "LOW"))
+
+    skus = pd.DataFrame({"sku": sku, "desc": [f"Item {s}" for s in sku], "category": category,
+                         "cost": cost, "price": price, "lead_time_days": lead_time})
+    buy_plan = pd.DataFrame({
+        "sku": sku, "description": skus["desc"], "category": category,
+        "current_stock": stock, "forecast_30d": (daily * 30).round(1), "daily_demand": daily,
+        "demand_std": std, "safety_stock": safety, "rop": rop, "recommended_qty": recommended,
+        "order_cost": (recommended * cost).round(2), "days_of_supply": dos,
+        "priority": priority, "lead_time_days": lead_time, "notes": "",
+    })
+    units = rng.integers(0, 200, n_skus)
+    revenue = (units * price).round(2)
+    pnl = pd.DataFrame({
+        "sku": sku, "description": skus["desc"], "category": category, "period": "2025-08",
+        "units_sold": units, "revenue": revenue, "cogs": (units * cost).round(2),
+        "gross_margin": (revenue - units * cost).round(2), "gmroi": 0.0,
+        "sell_through": (units / np.maximum(units + stock, 1)).round(4),
+        "avg_unit_price": price,
+    })
+    return {"buy_plan": buy_plan, "pnl": pnl, "skus": skus}
+
+
+def _range_cells(ref, sheet_rows, table_rows, default_sheet):
+    """Cells read through one range operand"""
+    if "[" in ref:  # structured reference: one table column
+        return table_rows.get(ref.split("[", 1)[0], 1)
+    sheet, _, area = ref.rpartition("!")
+    sheet = sheet.strip("'") or default_sheet
+    area = area.replace("$", "")
+    if re.fullmatch(r"[A-Z]+:[A-Z]+", area):
+        first, last = area.split(":")
+        width = column_index_from_string(last) - column_index_from_string(first) + 1
+        return width * sheet_rows.get(sheet, 1)
+    if ":" not in area:
+        return 1
+    min_col, min_row, max_col, max_row = range_boundaries(area)
+    return (max_col - min_col + 1) * (max_row - min_row + 1)
+
+
+def _formula_cells(formula, sheet_rows, table_rows, sheet):
+    """Cells one formula reads; INDEX into a range with a known row reads one cell"""
+    calls, total = [], 0
+    for token in Tokenizer(formula).items:
+        if token.type == "FUNC" and token.subtype == "OPEN":
+            calls.append([token.value.upper(), 0])
+        elif token.type == "FUNC" and token.subtype == "CLOSE":
+            calls.pop()
+        elif token.type == "SEP" and token.subtype == "ARG" and calls:
+            calls[-1][1] += 1
+        elif token.type == "OPERAND" and token.subtype == "RANGE":
+            if calls and calls[-1] == ["INDEX(", 0]:
+                total += 1
+            else:
+                total += _range_cells(token.value, sheet_rows, table_rows, sheet)
+    return total
+
+
+def recalc_cells(wb, n_skus):
+    """Cells referenced by every formula on a full recalculation"""
+    sheet_rows = {ws.title: ws.max_row for ws in wb.worksheets}
+    sheet_rows["Counts_Entry"] = n_skus * COUNT_ROWS_PER_SKU
+    sheet_rows["Sales"] = n_skus * SALES_ROWS_PER_SKU
+    table_rows = {name: n_skus for ws in wb.worksheets for name in ws.tables}
+
+    formulas, cells, shapes = 0, 0, {}
+    for ws in wb.worksheets:
+        for row in ws.iter_rows(min_row=2):
+            for cell in row:
+                if not (isinstance(cell.value, str) and cell.value.startswith("=")):
+                    continue
+                formulas += 1
+                shape = (ws.title, _ROW_NUMBERS.sub("#", cell.value))
+                if shape not in shapes:
+                    shapes[shape] = _formula_cells(cell.value, sheet_rows, table_rows, ws.title)
+                cells += shapes[shape]
+    return formulas, cells
+
+
+def run(sizes, out_dir):
+    out_dir.mkdir(parents=True, exist_ok=True)
+    results = []
+    for n_skus in sizes:
+        tables = synthetic_tables(n_skus)
+        for mode in WORKBOOK_MODES:
+            start = time.perf_counter()
+            wb = create_command_center_workbook(mode=mode, tables=tables)
+            path = out_dir / f"workbook_{mode}_{n_skus}.xlsx"
+            wb.save(path)
+            seconds = time.perf_counter() - start
+            formulas, cells = recalc_cells(wb, n_skus)
+            results.append({
+                "skus": n_skus, "mode": mode, "build_s": round(seconds, 2),
+                "file_mb": round(path.stat().st_size / 1e6, 2),
+                "formulas": formulas, "recalc_cells": cells,
+            })
+            path.unlink()
+            print(f"   • {n_skus:>6,} SKUs {mode:<8} built in {seconds:6.1f}s, "
+                  f"{formulas:>9,} formulas, {cells:>16,} cells read per recalc")
+
+    df = pd.DataFrame(results)
+    baseline = df[df["mode"] == "formulas"].set_index("skus")["recalc_cells"]
+    df["recalc_vs_formulas"] = (df["recalc_cells"] / df["skus"].map(baseline)).round(6)
+    return df
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--sizes", type=int, nargs="+", default=[1000, 10000, 50000])
+    parser.add_argument("--out", default="reports/benchmarks")
+    args = parser.parse_args()
+
+    print("⏱️  Benchmarking workbook modes...")
+    df = run(args.sizes, Path(args.out))
+    out_file = Path(args.out) / "workbook_modes.csv"
+    df.to_csv(out_file, index=False)
+    print(df.to_string(index=False))
+    print(f"💾 Saved to: {out_file}")
+
+
+if __name__ == "__main__":
+    main()
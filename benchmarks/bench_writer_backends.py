@@ -0,0 +1,85 @@
+# Workbook Writer Backend Benchmark
+# Renders the same sheet builders through each writer backend and reports wall
+# time, peak RSS and file size. Every build runs in a fresh process so peak
+# RSS is not shared between runs.
+#
+# Usage: python benchmarks/bench_writer_backends.py [--sizes 1000 10000 50000] [--mode values]
+
+import argparse
+import json
+import resource
+import subprocess
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent))
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from workbook_writers import WRITER_BACKENDS  # noqa: E402
+
+
+def build_once(backend, n_skus, mode, out_file):
+    """Build one workbook in this process and return its measurements"""
+    from bench_workbook_modes import synthetic_tables
+    from generate_workbook import create_command_center_workbook
+
+    tables = synthetic_tables(n_skus)
+    baseline_kb = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    start = time.perf_counter()
+    create_command_center_workbook(mode=mode, tables=tables, backend=backend).save(out_file)
+    seconds = time.perf_counter() - start
+    peak_kb = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return {
+        "backend": backend, "skus": n_skus, "mode": mode,
+        "seconds": round(seconds, 2),
+        "peak_rss_mb": round(peak_kb / 1024, 1),
+        "build_rss_mb": round((peak_kb - baseline_kb) / 1024, 1),
+        "file_mb": round(Path(out_file).stat().st_size / 1e6, 2),
+    }
+
+
+def run(sizes, mode, out_dir):
+    import pandas as pd
+
+    out_dir.mkdir(parents=True, exist_ok=True)
+    results = []
+    for n_skus in sizes:
+        for backend in WRITER_BACKENDS:
+            out_file = out_dir / f"workbook_{backend}_{n_skus}.xlsx"
+            child = subprocess.run(
+                [sys.executable, __file__, "--worker", backend, str(n_skus), mode, str(out_file)],
+                capture_output=True, text=True, check=True,
+            )
+            result = json.loads(child.stdout.strip().splitlines()[-1])
+            out_file.unlink()
+            results.append(result)
+            print(f"   • {n_skus:>6,} SKUs {backend:<9} {result['seconds']:7.1f}s, "
+                  f"peak RSS {result['peak_rss_mb']:7.1f} MB (+{result['build_rss_mb']:.1f} MB for the build)")
+    return pd.DataFrame(results)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Compare workbook writer backends")
+    parser.add_argument("--sizes", type=int, nargs="+", default=[1000, 10000, 50000])
+    parser.add_argument("--mode", default="values")
+    parser.add_argument("--out", default="reports/benchmarks")
+    parser.add_argument("--worker", nargs=4, metavar=("BACKEND", "SKUS", "MODE", "FILE"),
+                        help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.worker:
+        backend, n_skus, mode, out_file = args.worker
+        print(json.dumps(build_once(backend, int(n_skus), mode, out_file)))
+        return
+
+    print(f"⏱️  Benchmarking writer backends ({args.mode} mode)...")
+    df = run(args.sizes, args.mode, Path(args.out))
+    out_file = Path(args.out) / "writer_backends.csv"
+    df.to_csv(out_file, index=False)
+    print(df.to_string(index=False))
+    print(f"💾 Saved to: {out_file}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,415 @@
+# Power BI Export
+# Writes the processed tables as a star schema for Power BI (/export bi):
+#
+#   dim_date       date_key (YYYYMMDD) and calendar attributes
+#   dim_venue      venue_key, venue_area
+#   dim_event      event_key, event_id, venue_key, start/end date keys, details
+#   dim_sku        sku_key, sku, desc, category, cost, price, lead_time_days
+#   fact_sales     date_key, sku_key, event_key, units_sold, revenue
+#   fact_counts    date_key, sku_key, checkpoint, location, qty, uom, source
+#   fact_forecast  date_key (first day of the period), sku_key, forecast measures
+#
+# Surrogate keys are integers that stay stable from one export to the next:
+# every dimension is read back from the previous export and only new members
+# are numbered on, so partitions written earlier still join. Key 0 is the
+# "(none)" member, e.g. the event of a sale that was not at an event.
+#
+# Facts are partitioned by month (fact_sales/month=YYYY-MM/part-00000.parquet)
+# and a partition is only rewritten when its bytes change, so incremental
+# refresh (RangeStart/RangeEnd over the month folders) reads just the new and
+# changed months. Parquet needs pyarrow; without it the same layout is written
+# as CSV and _schema.json carries the column types. queries/<table>.m loads
+# each table from a BiFolder parameter instead of a hard-coded path.
+
+import hashlib
+import io
+import json
+from datetime import datetime
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+from event_delta import _text, event_ids
+
+BI_DIR = "bi"
+SCHEMA_FILE = "_schema.json"
+MANIFEST_FILE = "_manifest.json"
+QUERIES_DIR = "queries"
+PART_NAME = "part-00000"
+UNKNOWN_KEY = 0
+UNKNOWN_MEMBER = "(none)"
+
+# dimension: (surrogate key, natural key)
+DIMENSIONS = {
+    'dim_venue': ('venue_key', 'venue_area'),
+    'dim_event': ('event_key', 'event_id'),
+    'dim_sku': ('sku_key', 'sku'),
+}
+FOREIGN_KEYS = {
+    'date_key': 'dim_date', 'start_date_key': 'dim_date', 'end_date_key': 'dim_date',
+    'venue_key': 'dim_venue', 'event_key': 'dim_event', 'sku_key': 'dim_sku',
+}
+SKU_COLUMNS = ['desc', 'category', 'cost', 'price', 'lead_time_days']
+EVENT_COLUMNS = ['name', 'account', 'event_type', 'in_date', 'start_dt', 'end_dt', 'out_date',
+                 'est_attendance']
+FORECAST_MEASURES = ['baseline_daily', 'baseline_total', 'event_lift', 'total_forecast', 'demand_std']
+M_TYPES = {'int32': 'Int64.Type', 'int64': 'Int64.Type', 'float64': 'type number', 'bool': 'type logical',
+           'date': 'type date', 'datetime': 'type datetime', 'string': 'type text'}
+
+
+def resolve_format(fmt=None):
+    """'parquet' when pyarrow is installed, else 'csv'; an explicit 'parquet' requires it"""
+    try:
+        import pyarrow  # noqa: F401
+        has_pyarrow = True
+    except ImportError:
+        has_pyarrow = False
+    if fmt == 'parquet' and not has_pyarrow:
+        raise ValueError("Parquet output needs pyarrow (pip install pyarrow); use --csv")
+    return fmt or ('parquet' if has_pyarrow else 'csv')
+
+
+def date_keys(values):
+    """YYYYMMDD integer keys of a date column (missing dates stay missing)"""
+    dates = pd.to_datetime(pd.Series(values), errors='coerce')
+    return (dates.dt.year * 10000 + dates.dt.month * 100 + dates.dt.day).astype('Int32')
+
+
+def _plain(frame):
+    """Categoricals back to their values, so files and schema show the real types"""
+    for column in frame.columns:
+        if isinstance(frame[column].dtype, pd.CategoricalDtype):
+            frame[column] = frame[column].astype(frame[column].cat.categories.dtype)
+    return frame
+
+
+def conform(current, previous, key, natural):
+    """Dimension rows with stable surrogate keys
+
+    Members of the previous export keep their key (and, when no longer in
+    the sources, their row), new members are numbered on in natural key order.
+    """
+    current = current.drop_duplicates(natural, keep='last')
+    if previous is not None and len(previous):
+        kept = previous[~previous[natural].isin(current[natural])]
+        current = pd.concat([current, kept.drop(columns=key)], ignore_index=True)
+        known = pd.Series(previous[key].to_numpy(np.int64), index=previous[natural])
+    else:
+        known = pd.Series(dtype=np.int64)
+    new = np.sort(current.loc[~current[natural].isin(known.index), natural].to_numpy().astype(str))
+    first = max(int(known.max()) if len(known) else UNKNOWN_KEY, UNKNOWN_KEY) + 1
+    keys = pd.concat([known, pd.Series(np.arange(first, first + len(new)), index=new)])
+    current.insert(0, key, keys.reindex(current[natural]).to_numpy().astype(np.int32))
+    return current.sort_values(key).reset_index(drop=True)
+
+
+def _with_unknown(dim, key, natural, **labels):
+    unknown = pd.DataFrame([{key: UNKNOWN_KEY, natural: UNKNOWN_MEMBER, **labels}])
+    dim = dim[dim[key] != UNKNOWN_KEY]
+    return pd.concat([unknown.astype({key: np.int32}), dim], ignore_index=True)[list(dim.columns)]
+
+
+def build_dim_date(keys):
+    """One row per day from the first to the last date key used anywhere"""
+    keys = pd.concat([pd.Series(k, dtype='Int32') for k in keys]).dropna()
+    columns = ['date_key', 'date', 'year', 'quarter', 'month', 'month_name', 'period',
+               'day', 'weekday', 'weekday_name', 'is_weekend']
+    if keys.empty:
+        return pd.DataFrame({c: pd.Series(dtype=object) for c in columns}) \
+            .astype({'date_key': np.int32, 'date': 'datetime64[ns]'})
+    first, last = (pd.to_datetime(str(int(k)), format='%Y%m%d') for k in (keys.min(), keys.max()))
+    days = pd.date_range(first, last, freq='D')
+    return pd.DataFrame({
+        'date_key': (days.year * 10000 + days.month * 100 + days.day).astype(np.int32),
+        'date': days,
+        'year': days.year.astype(np.int32),
+        'quarter': days.quarter.astype(np.int32),
+        'month': days.month.astype(np.int32),
+        'month_name': days.strftime('%B'),
+        'period': days.strftime('%Y-%m'),
+        'day': days.day.astype(np.int32),
+        'weekday': (days.weekday + 1).astype(np.int32),
+        'weekday_name': days.strftime('%A'),
+        'is_weekend': days.weekday >= 5,
+    })[columns]
+
+
+def _event_frame(events):
+    if events is None or events.empty or 'event_id' not in events.columns:
+        return pd.DataFrame({'event_id': pd.Series(dtype=object), 'venue_area': pd.Series(dtype=object)})
+    frame = _plain(events.copy())
+    frame['event_id'] = event_ids(frame)
+    frame['venue_area'] = _text(frame['venue_area']) if 'venue_area' in frame.columns else ''
+    return frame
+
+
+def build_dimensions(events, skus, fact_skus, fact_events, previous):
+    """dim_venue, dim_event and dim_sku with keys conformed to the previous export"""
+    events = _event_frame(events)
+
+    venues = pd.DataFrame({'venue_area': pd.unique(events['venue_area'][events['venue_area'] != ''])})
+    dim_venue = _with_unknown(conform(venues, previous.get('dim_venue'), *DIMENSIONS['dim_venue']),
+                              *DIMENSIONS['dim_venue'])
+    venue_keys = pd.Series(dim_venue['venue_key'].to_numpy(), index=dim_venue['venue_area'])
+
+    calendar = events.reindex(columns=['event_id', 'venue_area'] + EVENT_COLUMNS)
+    calendar['venue_key'] = venue_keys.reindex(calendar['venue_area']).fillna(UNKNOWN_KEY) \
+        .to_numpy().astype(np.int32)
+    for column in ('in_date', 'start_dt', 'end_dt', 'out_date'):
+        calendar[column] = pd.to_datetime(calendar[column], errors='coerce')
+    calendar['start_date_key'] = date_keys(calendar['start_dt']).to_numpy()
+    calendar['end_date_key'] = date_keys(calendar['end_dt']).to_numpy()
+    calendar['est_attendance'] = pd.to_numeric(calendar['est_attendance'], errors='coerce').round()
+    # Events only the sales know about still get a member, so every sale joins
+    unlisted = np.setdiff1d(fact_events[fact_events != ''], calendar['event_id'].to_numpy().astype(str))
+    calendar = pd.concat([calendar, pd.DataFrame({'event_id': unlisted, 'venue_key': np.int32(UNKNOWN_KEY)})],
+                         ignore_index=True)
+    calendar = calendar.drop(columns='venue_area')
+    dim_event = _with_unknown(conform(calendar, previous.get('dim_event'), *DIMENSIONS['dim_event']),
+                              *DIMENSIONS['dim_event'], name='(no event)', venue_key=UNKNOWN_KEY)
+
+    master = _plain(skus.copy()).reindex(columns=['sku'] + SKU_COLUMNS)
+    master['sku'] = _text(master['sku'])
+    unlisted = np.setdiff1d(fact_skus[fact_skus != ''], master['sku'].to_numpy().astype(str))
+    master = pd.concat([master, pd.DataFrame({'sku': unlisted, 'category': 'Unknown'})], ignore_index=True)
+    dim_sku = _with_unknown(conform(master, previous.get('dim_sku'), *DIMENSIONS['dim_sku']),
+                            *DIMENSIONS['dim_sku'], desc='(unknown SKU)', category='Unknown')
+
+    dim_event = dim_event.astype({'venue_key': np.int32, 'start_date_key': 'Int32', 'end_date_key': 'Int32',
+                                  'est_attendance': 'Int64'})
+    dim_sku = dim_sku.astype({'lead_time_days': 'Int64'})
+    return {'dim_venue': dim_venue, 'dim_event': dim_event, 'dim_sku': dim_sku}
+
+
+def _keys(dim, values):
+    """Surrogate keys of natural key values; unknown and empty values map to key 0"""
+    key, natural = DIMENSIONS[dim['name']]
+    lookup = pd.Series(dim['frame'][key].to_numpy(), index=dim['frame'][natural].astype(str))
+    return lookup.reindex(values).fillna(UNKNOWN_KEY).to_numpy().astype(np.int32)
+
+
+def _fact(dates, columns):
+    frame = pd.DataFrame({'date_key': date_keys(dates).to_numpy(), **columns})
+    frame = frame[frame['date_key'].notna()].astype({'date_key': np.int32})
+    return frame.sort_values('date_key', kind='stable').reset_index(drop=True)
+
+
+def build_star(sources, skus, previous=None):
+    """Dimension and fact frames of the star schema"""
+    previous = previous or {}
+    sales, counts, forecast = (_plain(sources[name].copy()) if sources.get(name) is not None else None
+                               for name in ('sales', 'counts', 'forecast'))
+    sales_skus = _text(sales['sku']) if sales is not None else np.array([], dtype=object)
+    sales_events = event_ids(sales) if sales is not None and 'event_id' in sales.columns \
+        else np.full(len(sales_skus), '', dtype=object)
+    other_skus = [_text(frame['sku']) for frame in (counts, forecast) if frame is not None]
+    fact_skus = np.concatenate([sales_skus, *other_skus]).astype(str)
+
+    dims = build_dimensions(sources.get('events'), skus, fact_skus, sales_events.astype(str), previous)
+    sku_dim = {'name': 'dim_sku', 'frame': dims['dim_sku']}
+    event_dim = {'name': 'dim_event', 'frame': dims['dim_event']}
+
+    facts = {}
+    if sales is not None:
+        facts['fact_sales'] = _fact(sales['date'], {
+            'sku_key': _keys(sku_dim, sales_skus),
+            'event_key': _keys(event_dim, sales_events),
+            'units_sold': pd.to_numeric(sales['units_sold'], errors='coerce').fillna(0).to_numpy(np.int64),
+            'revenue': pd.to_numeric(sales['revenue'], errors='coerce').fillna(0).to_numpy(float),
+        })
+    if counts is not None:
+        facts['fact_counts'] = _fact(counts['asof_date'], {
+            'sku_key': _keys(sku_dim, _text(counts['sku'])),
+            **{column: _text(counts[column]) for column in ('checkpoint', 'location', 'uom', 'source')
+               if column in counts.columns},
+            'qty': pd.to_numeric(counts['qty'], errors='coerce').to_numpy(float),
+        })
+    if forecast is not None:
+        facts['fact_forecast'] = _fact(pd.to_datetime(forecast['period'].astype(str), format='%Y-%m'), {
+            'sku_key': _keys(sku_dim, _text(forecast['sku'])),
+            **{column: pd.to_numeric(forecast[column], errors='coerce').to_numpy(float)
+               for column in FORECAST_MEASURES if column in forecast.columns},
+            'confidence': _text(forecast['confidence']),
+        })
+
+    date_sources = [f['date_key'] for f in facts.values()] + \
+        [dims['dim_event'][c] for c in ('start_date_key', 'end_date_key')]
+    dims['dim_date'] = build_dim_date(date_sources)
+    return dims, facts
+
+
+def column_type(values):
+    """Logical column type recorded in _schema.json and used for the Power Query types"""
+    dtype = values.dtype
+    if dtype.kind == 'M':
+        present = values.dropna()
+        return 'date' if (present == present.dt.normalize()).all() else 'datetime'
+    if dtype.kind == 'b':
+        return 'bool'
+    if dtype.kind in 'iu':
+        return 'int32' if dtype.itemsize <= 4 else 'int64'
+    if dtype.kind == 'f':
+        return 'float64'
+    return 'string'
+
+
+def table_schema(name, frame):
+    key = DIMENSIONS.get(name, ('date_key',))[0] if name.startswith('dim_') else None
+    return {
+        'columns': [{'name': c, 'type': column_type(frame[c])} for c in frame.columns],
+        'primary_key': key,
+        'foreign_keys': {c: f"{FOREIGN_KEYS[c]}.{'date_key' if FOREIGN_KEYS[c] == 'dim_date' else c}"
+                         for c in frame.columns if c in FOREIGN_KEYS and c != key},
+        'partitioned_by': 'month' if name.startswith('fact_') else None,
+    }
+
+
+def _encode(frame, fmt):
+    buffer = io.BytesIO()
+    if fmt == 'parquet':
+        frame.to_parquet(buffer, index=False)
+    else:
+        frame.to_csv(buffer, index=False)
+    return buffer.getvalue()
+
+
+def _write(out_dir, relative, data, old_files):
+    """Write a file unless the previous export wrote the same bytes; returns (entry, changed)"""
+    sha = hashlib.sha256(data).hexdigest()
+    path = out_dir / relative
+    old = old_files.get(relative)
+    if old and old['sha256'] == sha and path.exists():
+        return old, False
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_bytes(data)
+    return {'bytes': len(data), 'sha256': sha}, True
+
+
+def _partitions(frame):
+    """(YYYY-MM, rows) of a fact frame, by its date_key"""
+    month = frame['date_key'].to_numpy() // 100
+    for value in np.unique(month):
+        yield f"{value // 100:04d}-{value % 100:02d}", frame[month == value]
+
+
+def read_previous(out_dir):
+    """Previous manifest and dimension frames ({} when there is no previous export)"""
+    manifest_file = out_dir / MANIFEST_FILE
+    if not manifest_file.exists():
+        return {}, {}
+    manifest = json.loads(manifest_file.read_text())
+    dims = {}
+    for name, (key, natural) in DIMENSIONS.items():
+        files = list(manifest['tables'].get(name, {}).get('files', {}))
+        if not files or not (out_dir / files[0]).exists():
+            continue
+        path = out_dir / files[0]
+        if path.suffix == '.parquet':
+            frame = pd.read_parquet(path)
+        else:
+            frame = pd.read_csv(path, dtype={natural: str}, keep_default_na=False, na_values=[''])
+            frame[natural] = frame[natural].fillna('')
+        dims[name] = _restore_types(frame, manifest.get('schema', {}).get(name))
+    return manifest, dims
+
+
+def _restore_types(frame, schema):
+    """Apply the recorded column types to a dimension read back from CSV"""
+    for column in (schema or {}).get('columns', []):
+        name, kind = column['name'], column['type']
+        if name not in frame.columns:
+            continue
+        if kind in ('date', 'datetime'):
+            frame[name] = pd.to_datetime(frame[name], errors='coerce')
+        elif kind in ('int32', 'int64') and frame[name].isna().any():
+            frame[name] = frame[name].astype('Int32' if kind == 'int32' else 'Int64')
+    return frame
+
+
+def powerquery_script(name, schema, fmt):
+    """Power Query (M) that loads one table from the BiFolder parameter"""
+    ext = '.parquet' if fmt == 'parquet' else '.csv'
+    if fmt == 'parquet':
+        read = "Parquet.Document([Content])"
+    else:
+        read = ('Table.PromoteHeaders(Csv.Document([Content], [Delimiter=",", Encoding=65001, '
+                'QuoteStyle=QuoteStyle.Csv]), [PromoteAllScalars=true])')
+    partitioned = schema['partitioned_by'] == 'month'
+    lines = [f"// {name} - generated by /export bi from {SCHEMA_FILE}",
+             "// Parameters: BiFolder (text)" +
+             (", RangeStart/RangeEnd (datetime) for incremental refresh" if partitioned else ""),
+             "let"]
+    if partitioned:
+        lines += [
+            f'    Files = Table.SelectRows(Folder.Files(BiFolder & "\\{name}"), each [Extension] = "{ext}"),',
+            '    Months = Table.AddColumn(Files, "Month", each DateTime.From('
+            'Text.BetweenDelimiters([Folder Path], "month=", "\\") & "-01"), type datetime),',
+            '    InRange = Table.SelectRows(Months, each [Month] >= RangeStart and [Month] < RangeEnd),',
+            f'    Parts = Table.AddColumn(InRange, "Data", each {read}),',
+            '    Source = Table.Combine(Parts[Data]),',
+        ]
+    else:
+        lines += [
+            f'    Files = Table.SelectRows(Folder.Files(BiFolder), each [Name] = "{name}{ext}"),',
+            f'    Source = Table.AddColumn(Files, "Data", each {read}){{0}}[Data],',
+        ]
+    types = ", ".join(f'{{"{c["name"]}", {M_TYPES[c["type"]]}}}' for c in schema['columns'])
+    typed = f'Table.TransformColumnTypes(Source, {{{types}}}, "en-US")'
+    if partitioned:  # a refresh range without partitions is an empty table, not an error
+        fields = ", ".join(f'#"{c["name"]}" = {M_TYPES[c["type"]]}' for c in schema['columns'])
+        typed = f'if Table.IsEmpty(Parts) then #table(type table [{fields}], {{}}) else {typed}'
+    lines += [f'    Typed = {typed}', "in", "    Typed", ""]
+    return "\n".join(lines)
+
+
+def export_star(out_dir, sources, skus, fmt='csv'):
+    """Write the star schema; returns the manifest (with 'changed': files written this run)"""
+    out_dir = Path(out_dir)
+    out_dir.mkdir(parents=True, exist_ok=True)
+    old_manifest, previous = read_previous(out_dir)
+    dims, facts = build_star(sources, skus, previous)
+    old_tables = old_manifest.get('tables', {})
+    ext = 'parquet' if fmt == 'parquet' else 'csv'
+
+    tables, schema, changed = {}, {}, []
+    for name, frame in list(dims.items()) + list(facts.items()):
+        old_files = old_tables.get(name, {}).get('files', {})
+        if name.startswith('fact_'):
+            parts = [(f"{name}/month={month}/{PART_NAME}.{ext}", part.reset_index(drop=True), month)
+                     for month, part in _partitions(frame)]
+        else:
+            parts = [(f"{name}.{ext}", frame, None)]
+        files = {}
+        for relative, part, month in parts:
+            entry, written = _write(out_dir, relative, _encode(part, fmt), old_files)
+            files[relative] = {**entry, 'rows': int(len(part)), **({'month': month} if month else {})}
+            if written:
+                changed.append(relative)
+        tables[name] = {'rows': int(len(frame)), 'files': files}
+        schema[name] = table_schema(name, frame)
+
+    # Partitions (or formats) the sources no longer have
+    for name, table in old_tables.items():
+        for relative in set(table.get('files', {})) - set(tables.get(name, {}).get('files', {})):
+            stale = out_dir / relative
+            if stale.exists():
+                stale.unlink()
+            if stale.parent != out_dir and stale.parent.exists() and not any(stale.parent.iterdir()):
+                stale.parent.rmdir()
+
+    queries = out_dir / QUERIES_DIR
+    queries.mkdir(exist_ok=True)
+    for name, table_spec in schema.items():
+        (queries / f"{name}.m").write_text(powerquery_script(name, table_spec, fmt), encoding='utf-8')
+    (out_dir / SCHEMA_FILE).write_text(json.dumps(schema, indent=2))
+
+    manifest = {
+        'exported_at': datetime.now().isoformat(timespec='seconds'),
+        'format': fmt,
+        'tables': tables,
+        'schema': schema,
+        'changed': changed,
+    }
+    (out_dir / MANIFEST_FILE).write_text(json.dumps(manifest, indent=2))
+    return manifest
@@ -0,0 +1,436 @@
+"""
+Seeded synthetic data for load tests and benchmarks.
+
+Generates an SKU master, an event calendar, sales history and BOM/MID/EOM
+counts at any size, vectorized with NumPy. Sales are event-linked: a share of
+transactions belongs to an event (picked in proportion to its attendance and
+dated inside its start/end window), the rest is baseline demand skewed
+towards popular SKUs. Sales are the large table, so they are produced and
+appended to disk chunk by chunk; every chunk draws from its own generator
+spawned from the seed, so the same seed, sizes and chunk size always give
+the same files.
+
+--sales-model events simulates sales from the calendar instead
+(simulate_event_sales): every event-day sells attendance × conversion ×
+attach units with event and day noise, tied to its event_id and dated inside
+the event's run, written as month partitions (sales/month=YYYY-MM/) that
+/ingest sales loads as a batch.
+
+The files use the layouts ops_controller ingests (events CSV, system sales
+and counts layouts). SKU codes start at SKU001 so the built-in planning SKUs
+find their sales and counts. generate_demo_events/write_demo_events produce
+the Events.xlsx column layout instead, for create_demo_events.py.
+
+Usage: python datagen.py [--tier small|medium|large] [--skus N] [--events M]
+                         [--sales K] [--seed 42] [--out data/synthetic]
+                         [--sales-model sampled|events]
+"""
+
+import argparse
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+TIERS = {
+    'small': {'skus': 500, 'events': 2_000, 'sales': 20_000},
+    'medium': {'skus': 5_000, 'events': 20_000, 'sales': 200_000},
+    'large': {'skus': 50_000, 'events': 100_000, 'sales': 1_000_000},
+}
+
+CHUNK_ROWS = 250_000
+START = '2024-09-01'
+MONTHS = 12
+
+CATEGORIES = ['Promotional', 'Packaging', 'Apparel', 'Signage', 'Tech Accessories', 'Giveaways']
+VENUES = ['Grand Convention Center - Main Hall', 'Metro Conference Complex - Hall A',
+          'Downtown Exhibition Center', 'Riverside Meeting Center - Suite B',
+          'Corporate Training Facility', 'Luxury Hotel Ballroom',
+          'Business District Conference Center', 'Innovation Hub - Auditorium']
+EVENT_TYPES = ['Annual Convention', 'Trade Show', 'Tech Conference', 'Product Launch',
+               'Training Workshop', 'Corporate Summit', 'Awards Gala', 'Industry Expo']
+ACCOUNTS = ['TechCorp Industries', 'Global Solutions Inc', 'Innovation Partners LLC',
+            'Metro Business Group', 'Future Systems Co', 'Premier Events Ltd']
+
+# Same tiers as create_demo_events.py: share of events and attendance range
+ATTENDANCE_TIERS = [(0.40, 10, 150), (0.35, 150, 1000), (0.20, 1000, 5000), (0.05, 5000, 18000)]
+DURATION_DAYS = [1, 2, 3, 4, 5]
+DURATION_WEIGHTS = [0.30, 0.25, 0.20, 0.15, 0.10]
+
+POPULARITY_EXPONENT = 1.0
+
+# Events.xlsx-layout demo calendar (create_demo_events.py)
+DEMO_START = '2023-01-01'
+DEMO_DAYS = 730
+DEMO_FIRST_ID = 10000
+DEMO_TITLE = '2023_2025 Events'
+DEMO_COMPANIES = ACCOUNTS + ['Professional Services Corp', 'Advanced Technologies Inc',
+                             'Strategic Partners Group', 'Enterprise Solutions LLC',
+                             'Dynamic Business Systems', 'Visionary Companies Inc']
+DEMO_CONTACTS = ['Smith, Sarah', 'Johnson, Michael', 'Williams, Jennifer', 'Brown, David',
+                 'Davis, Lisa', 'Miller, Robert', 'Wilson, Amanda', 'Moore, Christopher']
+DEMO_SALESPEOPLE = ['Adams, Kelly', 'Baker, Steven', 'Clark, Nicole', 'Evans, Brian',
+                    'Foster, Laura', 'Garcia, Daniel', 'Harris, Jessica', 'King, Matthew']
+# Excel's sheet limit is ~1M rows; past this size a workbook is too slow to be useful
+XLSX_MAX_EVENTS = 100_000
+
+# Share of sales transactions that belong to an event
+EVENT_SALES_SHARE = 0.6
+# Event-driven sales (sales_model='events'): the forecast's defaults for
+# transactions per attendee and units per transaction, and gamma shapes of the
+# per-event and per-day demand noise (shape 4 is a 50% coefficient of variation)
+EVENT_CONVERSION = 0.15
+EVENT_ATTACH = 1.2
+EVENT_NOISE_SHAPE = 4.0
+DAY_NOISE_SHAPE = 10.0
+# Events simulated per chunk (~200 transactions each at the default tiers)
+SIM_CHUNK_EVENTS = 10_000
+CHECKPOINT_DAYS = {'BOM': 0, 'MID': 14}  # EOM is the month's last day
+LOCATIONS = ['in_store', 'back_of_store']
+
+
+def sku_codes(n):
+    return np.char.add('SKU', np.char.zfill(np.arange(1, n + 1).astype(str), 3))
+
+
+def generate_skus(n, rng):
+    """SKU master in the get_sample_skus() layout plus a popularity weight"""
+    category = rng.choice(CATEGORIES, n)
+    cost = rng.lognormal(1.2, 0.9, n).clip(0.25, 400).round(2)
+    codes = sku_codes(n)
+    return pd.DataFrame({
+        'sku': codes,
+        'desc': np.char.add(np.char.add(category.astype(str), ' item '), codes),
+        'category': category,
+        'cost': cost,
+        'price': (cost * rng.uniform(1.4, 3.5, n)).round(2),
+        'lead_time_days': rng.choice([3, 5, 7, 10, 14, 21], n),
+        # Zipf-like by rank, so the first codes are the best sellers
+        'popularity': rng.lognormal(0.0, 0.3, n) / np.arange(1, n + 1) ** POPULARITY_EXPONENT,
+    })
+
+
+def sample_attendance(m, rng):
+    """Forecast attendance drawn from ATTENDANCE_TIERS (tier by share, then uniform in its range)"""
+    tier = rng.choice(len(ATTENDANCE_TIERS), m, p=[t[0] for t in ATTENDANCE_TIERS])
+    low = np.array([t[1] for t in ATTENDANCE_TIERS])[tier]
+    high = np.array([t[2] for t in ATTENDANCE_TIERS])[tier]
+    return rng.integers(low, high, endpoint=True)
+
+
+def generate_events(m, rng, start=START, months=MONTHS):
+    """Event calendar in the events_processed layout over the date range"""
+    first = np.datetime64(start, 'D')
+    days = int((np.datetime64(pd.Timestamp(start) + pd.DateOffset(months=months), 'D') - first).astype(int))
+
+    attendance = sample_attendance(m, rng)
+
+    start_day = first + rng.integers(0, days, m).astype('timedelta64[D]')
+    duration = rng.choice(DURATION_DAYS, m, p=DURATION_WEIGHTS)
+    start_dt = start_day + np.timedelta64(9, 'h')
+    end_dt = start_day + (duration - 1).astype('timedelta64[D]') + np.timedelta64(18, 'h')
+
+    event_type = rng.choice(EVENT_TYPES, m)
+    account = rng.choice(ACCOUNTS, m)
+    return pd.DataFrame({
+        'event_id': np.arange(10000, 10000 + m),
+        'name': np.char.add(np.char.add(event_type.astype(str), ' - '), account.astype(str)),
+        'account': account,
+        'venue_area': rng.choice(VENUES, m),
+        'event_type': event_type,
+        'in_date': start_day - rng.integers(1, 3, m).astype('timedelta64[D]'),
+        'start_dt': start_dt,
+        'end_dt': end_dt,
+        'out_date': start_day + duration.astype('timedelta64[D]') + rng.integers(0, 2, m).astype('timedelta64[D]'),
+        'est_attendance': attendance,
+    })
+
+
+def generate_sales_chunk(rows, skus, events, rng, start=START, months=MONTHS):
+    """One chunk of sales in the system layout (date, sku, units_sold, revenue, event_id)"""
+    first = np.datetime64(start, 'D')
+    days = int((np.datetime64(pd.Timestamp(start) + pd.DateOffset(months=months), 'D') - first).astype(int))
+    popularity = skus['popularity'].to_numpy()
+    sku_index = rng.choice(len(skus), rows, p=popularity / popularity.sum())
+
+    at_event = rng.random(rows) < (EVENT_SALES_SHARE if len(events) else 0)
+    date = first + rng.integers(0, days, rows).astype('timedelta64[D]')
+    event_id = np.full(rows, '', dtype=object)
+    units = rng.poisson(2.0, rows) + 1
+
+    n_event = int(at_event.sum())
+    if n_event:
+        attendance = events['est_attendance'].to_numpy(dtype=float)
+        picked = rng.choice(len(events), n_event, p=attendance / attendance.sum())
+        event_start = events['start_dt'].to_numpy().astype('datetime64[D]')[picked]
+        event_days = (events['end_dt'].to_numpy().astype('datetime64[D]')[picked] - event_start).astype(int) + 1
+        date[at_event] = event_start + (rng.random(n_event) * event_days).astype(int).astype('timedelta64[D]')
+        event_id[at_event] = events['event_id'].to_numpy().astype(str)[picked]
+        # Bigger events sell bigger baskets
+        units[at_event] += rng.poisson(np.log10(attendance[picked]))
+
+    price = skus['price'].to_numpy()[sku_index]
+    return pd.DataFrame({
+        'date': np.datetime_as_string(date, unit='D'),
+        'sku': skus['sku'].to_numpy()[sku_index],
+        'units_sold': units,
+        'revenue': (units * price).round(2),
+        'event_id': event_id,
+    })
+
+
+def expand_event_days(events):
+    """One entry per calendar day of each event's start_dt → end_dt run:
+    (event position, day as datetime64[D], days in that event's run)"""
+    start = pd.to_datetime(events['start_dt']).to_numpy().astype('datetime64[D]')
+    end = pd.to_datetime(events['end_dt']).to_numpy().astype('datetime64[D]')
+    valid = ~(np.isnat(start) | np.isnat(end))
+    days = np.where(valid, np.maximum((end - start).astype(np.int64), 0) + 1, 0)
+    position = np.repeat(np.arange(len(events)), days)
+    offset = np.arange(days.sum()) - np.repeat(np.cumsum(days) - days, days)
+    return position, start[position] + offset.astype('timedelta64[D]'), days
+
+
+def simulate_event_sales(events, skus, rng, conversion=EVENT_CONVERSION, attach=EVENT_ATTACH):
+    """Sales driven by the event calendar, one row per event, day and SKU sold
+
+    Every event-day gets Poisson(attendance × conversion / run days × noise)
+    transactions of 1 + Poisson(attach - 1) units, so an event sells about
+    attendance × conversion × attach units in total. SKUs are picked by
+    popularity and every row carries its event_id and a date inside the run.
+    """
+    position, day, days = expand_event_days(events)
+    attendance = pd.to_numeric(events['est_attendance'], errors='coerce').fillna(0).to_numpy(float)
+    event_noise = rng.gamma(EVENT_NOISE_SHAPE, 1 / EVENT_NOISE_SHAPE, len(events))
+    day_noise = rng.gamma(DAY_NOISE_SHAPE, 1 / DAY_NOISE_SHAPE, len(position))
+    expected = (attendance * conversion * event_noise / np.maximum(days, 1))[position] * day_noise
+    transactions = rng.poisson(expected)
+
+    n_skus = len(skus)
+    popularity = skus['popularity'].to_numpy() if 'popularity' in skus.columns else np.ones(n_skus)
+    line_day = np.repeat(np.arange(len(position)), transactions)
+    sku_index = rng.choice(n_skus, len(line_day), p=popularity / popularity.sum())
+    units = 1 + rng.poisson(max(attach - 1, 0), len(line_day))
+
+    # Transactions of the same SKU on the same event-day become one row
+    keys, inverse = np.unique(line_day * n_skus + sku_index, return_inverse=True)
+    units = np.bincount(inverse, weights=units, minlength=len(keys)).astype(np.int64)
+    event_day, sku_index = keys // n_skus, keys % n_skus
+    return pd.DataFrame({
+        'date': np.datetime_as_string(day[event_day], unit='D'),
+        'sku': skus['sku'].to_numpy()[sku_index],
+        'units_sold': units,
+        'revenue': (units * skus['price'].to_numpy()[sku_index]).round(2),
+        'event_id': events['event_id'].to_numpy().astype(str)[position[event_day]],
+    })
+
+
+def write_event_sales(out_dir, events, skus, seed=42, fmt='csv', chunk_events=SIM_CHUNK_EVENTS,
+                      conversion=EVENT_CONVERSION, attach=EVENT_ATTACH):
+    """Simulate event-driven sales chunk by chunk into month partitions
+    (out_dir/month=YYYY-MM/part-NNNNN.csv|parquet); returns {month: rows}
+
+    seed may be an int or a SeedSequence. CSV partitions load with
+    /ingest sales out_dir (batch ingest); parquet needs pyarrow.
+    """
+    out_dir = Path(out_dir)
+    write_parquet = _parquet_writer() if fmt == 'parquet' else None
+    if fmt == 'parquet' and write_parquet is None:
+        raise ValueError("Parquet output needs pyarrow (pip install pyarrow); use csv")
+    out_dir.mkdir(parents=True, exist_ok=True)
+    for stale in out_dir.glob('month=*/part-*'):  # a rerun replaces the previous simulation
+        stale.unlink()
+
+    sequence = seed if isinstance(seed, np.random.SeedSequence) else np.random.SeedSequence(seed)
+    chunk_seeds = sequence.spawn(max(1, -(-len(events) // chunk_events)))
+    written = {}
+    for i, chunk_seed in enumerate(chunk_seeds):
+        chunk = events.iloc[i * chunk_events:(i + 1) * chunk_events]
+        sales = simulate_event_sales(chunk, skus, np.random.default_rng(chunk_seed), conversion, attach)
+        for month, part in sales.groupby(sales['date'].str[:7], sort=True):
+            path = out_dir / f"month={month}" / f"part-{i:05d}.{fmt}"
+            path.parent.mkdir(exist_ok=True)
+            if write_parquet:
+                write_parquet(part, path)
+            else:
+                part.to_csv(path, index=False)
+            written[month] = written.get(month, 0) + len(part)
+    return dict(sorted(written.items()))
+
+
+def generate_counts(skus, rng, period):
+    """BOM, MID and EOM counts of every SKU in both locations for one YYYY-MM period"""
+    month = pd.Period(period, 'M')
+    dates = {'BOM': month.start_time, 'MID': month.start_time + pd.Timedelta(days=CHECKPOINT_DAYS['MID']),
+             'EOM': month.end_time.normalize()}
+    n = len(skus)
+    level = rng.gamma(2.0, 60.0, n) * np.sqrt(skus['popularity'].to_numpy())
+    frames = []
+    for step, (checkpoint, day) in enumerate(dates.items()):
+        for location, share in zip(LOCATIONS, (0.3, 0.7)):
+            qty = rng.poisson(level * share * (1 - 0.25 * step))
+            frames.append(pd.DataFrame({
+                'asof_date': day.strftime('%Y-%m-%d'), 'checkpoint': checkpoint, 'location': location,
+                'sku': skus['sku'].to_numpy(), 'qty': qty, 'uom': 'EA',
+                'counter_id': np.char.add('C', rng.integers(1, 40, n).astype(str)), 'notes': '',
+            }))
+    return pd.concat(frames, ignore_index=True)
+
+
+def _joined(*parts):
+    """Element-wise string concatenation of arrays and scalars"""
+    joined = np.asarray(parts[0]).astype(str)
+    for part in parts[1:]:
+        joined = np.char.add(joined, np.asarray(part).astype(str))
+    return joined
+
+
+def generate_demo_events(m, rng, first_id=DEMO_FIRST_ID, start=DEMO_START, days=DEMO_DAYS):
+    """Events.xlsx-layout calendar (the columns transform_events_xlsx maps) for ids first_id.."""
+    attendance = sample_attendance(m, rng)
+    first = np.datetime64(start, 'D')
+    start_day = first + rng.integers(0, days, m, endpoint=True).astype('timedelta64[D]')
+    duration = rng.choice(DURATION_DAYS, m, p=DURATION_WEIGHTS)
+    end_day = start_day + (duration - 1).astype('timedelta64[D]')
+
+    company = rng.choice(DEMO_COMPANIES, m)
+    event_type = rng.choice(EVENT_TYPES, m)
+    multi_day = duration > 1
+    return pd.DataFrame({
+        'Event ID': np.arange(first_id, first_id + m),
+        'Account': company,
+        'Description': _joined(event_type, ' - ', company),
+        'Contact': rng.choice(DEMO_CONTACTS, m),
+        'In Date': start_day - rng.integers(1, 2, m, endpoint=True).astype('timedelta64[D]'),
+        'Start Date': start_day,
+        'End Date': end_day,
+        'Out Date': end_day + rng.integers(0, 1, m, endpoint=True).astype('timedelta64[D]'),
+        'Forecast Attendance': attendance,
+        'Peak Room Nights': np.where(multi_day, (attendance * duration * 0.4).astype(int), 0),
+        'Room Nights': np.where(multi_day, (attendance * duration * 0.6).astype(int), 0),
+        'Salesperson': rng.choice(DEMO_SALESPEOPLE, m),
+        'Anchor Venue': rng.choice(VENUES, m),
+        'Span of Attendees': _joined(np.maximum(1, (attendance * 0.8).astype(int)), '-',
+                                     (attendance * 1.2).astype(int)),
+        '# MRs': rng.integers(1, np.clip(attendance // 100, 1, 10), endpoint=True),
+        'Actual Attendance': (attendance * rng.uniform(0.8, 1.2, m)).astype(int),
+        'Attendance - Current': attendance,
+        'Attendance': (attendance * rng.uniform(0.8, 1.2, m)).astype(int),
+        'Revised Attendance': (attendance * rng.uniform(0.9, 1.1, m)).astype(int),
+        'Total Rev/Attendee': np.where(attendance > 50, rng.uniform(25, 750, m), 0.0),
+    })
+
+
+def _parquet_writer():
+    try:
+        import pyarrow  # noqa: F401
+    except ImportError:
+        return None
+    return lambda frame, path: frame.to_parquet(path, index=False)
+
+
+def write_demo_events(out, events, seed=42, chunk_rows=CHUNK_ROWS, fmt='csv', first_id=DEMO_FIRST_ID):
+    """Write an Events.xlsx-layout calendar chunk by chunk; returns (path, rows)
+
+    csv: one file appended per chunk; parquet: a directory of part files
+    (needs pyarrow); xlsx: one sheet like Events.xlsx, up to XLSX_MAX_EVENTS.
+    """
+    out = Path(out)
+    if fmt == 'xlsx' and events > XLSX_MAX_EVENTS:
+        raise ValueError(f"XLSX holds at most {XLSX_MAX_EVENTS:,} demo events; use csv or parquet")
+    write_parquet = _parquet_writer() if fmt == 'parquet' else None
+    if fmt == 'parquet' and write_parquet is None:
+        raise ValueError("Parquet output needs pyarrow (pip install pyarrow); use csv")
+
+    chunk_rows = max(events, 1) if fmt == 'xlsx' else chunk_rows
+    chunk_seeds = np.random.SeedSequence(seed).spawn(max(1, -(-events // chunk_rows)))
+    (out if fmt == 'parquet' else out.parent).mkdir(parents=True, exist_ok=True)
+    remaining, next_id = events, first_id
+    for i, chunk_seed in enumerate(chunk_seeds):
+        rows = min(chunk_rows, remaining)
+        chunk = generate_demo_events(rows, np.random.default_rng(chunk_seed), next_id)
+        if fmt == 'csv':
+            chunk.to_csv(out, mode='w' if i == 0 else 'a', header=i == 0, index=False)
+        elif fmt == 'parquet':
+            write_parquet(chunk, out / f"part-{i:05d}.parquet")
+        else:
+            _write_events_xlsx(out, chunk)
+        remaining, next_id = remaining - rows, next_id + rows
+    return out, events
+
+
+def _write_events_xlsx(path, frame):
+    """Events.xlsx layout: a title row, then the header and rows (ingest reads header=1)"""
+    with pd.ExcelWriter(path, engine='openpyxl') as writer:
+        title = pd.DataFrame([[DEMO_TITLE] + [''] * (len(frame.columns) - 1)])
+        title.to_excel(writer, sheet_name='Sheet1', index=False, header=False, startrow=0)
+        frame.to_excel(writer, sheet_name='Sheet1', index=False, header=True, startrow=1)
+
+
+def write_dataset(out_dir, skus=500, events=2_000, sales=20_000, seed=42, chunk_rows=CHUNK_ROWS,
+                  start=START, months=MONTHS, sales_model='sampled'):
+    """Write sku_master.csv, events.csv, sales.csv and counts.csv; returns {name: (path, rows)}
+
+    sales_model='events' replaces sales.csv with simulate_event_sales month
+    partitions under sales/, sized by the calendar instead of `sales`.
+    """
+    out_dir = Path(out_dir)
+    out_dir.mkdir(parents=True, exist_ok=True)
+    seeds = np.random.SeedSequence(seed).spawn(4)
+    last_period = str(pd.Period(start, 'M') + months - 1)
+
+    sku_df = generate_skus(skus, np.random.default_rng(seeds[0]))
+    event_df = generate_events(events, np.random.default_rng(seeds[1]), start, months)
+    counts_df = generate_counts(sku_df, np.random.default_rng(seeds[2]), last_period)
+
+    written = {}
+    for name, frame in (('sku_master', sku_df.drop(columns='popularity')), ('events', event_df),
+                        ('counts', counts_df)):
+        path = out_dir / f"{name}.csv"
+        frame.to_csv(path, index=False)
+        written[name] = (path, len(frame))
+
+    if sales_model == 'events':
+        months_written = write_event_sales(out_dir / "sales", event_df, sku_df, seeds[3])
+        written['sales'] = (out_dir / "sales", sum(months_written.values()))
+        return written
+
+    sales_path = out_dir / "sales.csv"
+    chunk_seeds = seeds[3].spawn(max(1, -(-sales // chunk_rows)))
+    remaining = sales
+    for i, chunk_seed in enumerate(chunk_seeds):
+        rows = min(chunk_rows, remaining)
+        chunk = generate_sales_chunk(rows, sku_df, event_df, np.random.default_rng(chunk_seed), start, months)
+        chunk.to_csv(sales_path, mode='w' if i == 0 else 'a', header=i == 0, index=False)
+        remaining -= rows
+    written['sales'] = (sales_path, sales)
+    return written
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Seeded synthetic SKUs, events, sales and counts")
+    parser.add_argument("--tier", choices=TIERS, default='small')
+    parser.add_argument("--skus", type=int)
+    parser.add_argument("--events", type=int)
+    parser.add_argument("--sales", type=int)
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--chunk-rows", type=int, default=CHUNK_ROWS)
+    parser.add_argument("--out", default="data/synthetic")
+    parser.add_argument("--sales-model", choices=['sampled', 'events'], default='sampled',
+                        help="events: sales simulated from the calendar into month partitions")
+    args = parser.parse_args(argv)
+
+    sizes = dict(TIERS[args.tier])
+    sizes.update({key: getattr(args, key) for key in sizes if getattr(args, key) is not None})
+    sales = "event-driven" if args.sales_model == 'events' else f"{sizes['sales']:,}"
+    print(f"🧪 Generating {sizes['skus']:,} SKUs, {sizes['events']:,} events, "
+          f"{sales} sales (seed {args.seed})...")
+    written = write_dataset(args.out, seed=args.seed, chunk_rows=args.chunk_rows,
+                            sales_model=args.sales_model, **sizes)
+    for name, (path, rows) in written.items():
+        print(f"   • {path}: {rows:,} rows")
+    return written
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,106 @@
+# Event Calendar Spine
+# Precomputes the Calendar sheet in Python: one row per day across a 2-3 year
+# spine anchored to the event date range, with event counts, concurrent
+# attendance and event-window flags from an interval sweep over the events.
+
+from datetime import datetime
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+from pandas.tseries.holiday import USFederalHolidayCalendar
+
+from table_dtypes import apply_dtypes
+
+CALENDAR_COLUMNS = [
+    "Date", "Day_of_Week", "Is_Weekend", "Is_Holiday", "Holiday_Name",
+    "Event_Window", "Event_Count", "Concurrent_Attendance", "Notes"
+]
+
+MIN_SPINE_YEARS = 2
+MAX_SPINE_YEARS = 3
+
+
+def load_events(events_file):
+    """Processed events with registry dtypes, or None if not ingested yet"""
+    events_file = Path(events_file)
+    if not events_file.exists():
+        return None
+    return apply_dtypes(pd.read_csv(events_file), 'events')
+
+
+def _day_column(events, primary, fallback):
+    """Normalized dates from one column, falling back to another"""
+    days = pd.to_datetime(events[primary], errors='coerce') if primary in events.columns else None
+    backup = pd.to_datetime(events[fallback], errors='coerce')
+    return (backup if days is None else days.fillna(backup)).dt.normalize()
+
+
+def spine_range(events, min_years=MIN_SPINE_YEARS, max_years=MAX_SPINE_YEARS):
+    """First and last day of the calendar spine"""
+    if events is None or events.empty:
+        start = pd.Timestamp(datetime.now().date())
+        return start, start + pd.DateOffset(years=min_years) - pd.Timedelta(days=1)
+
+    first = _day_column(events, 'in_date', 'start_dt').min()
+    last = _day_column(events, 'out_date', 'end_dt').max()
+    start = first.to_period('M').start_time
+    end = last.to_period('M').end_time.normalize()
+
+    if end < start + pd.DateOffset(years=min_years) - pd.Timedelta(days=1):
+        end = start + pd.DateOffset(years=min_years) - pd.Timedelta(days=1)
+    if end > start + pd.DateOffset(years=max_years) - pd.Timedelta(days=1):
+        start = end - pd.DateOffset(years=max_years) + pd.Timedelta(days=1)
+    return start, end
+
+
+def interval_sweep(days, starts, ends, weights=None):
+    """Sum of weights of the [start, end] day intervals covering each day"""
+    n = len(days)
+    weights = np.ones(len(starts)) if weights is None else weights
+    ends = np.maximum(ends, starts)  # an end before its start counts as a one-day interval
+    opens = np.searchsorted(days, starts, side='left')
+    closes = np.searchsorted(days, ends, side='right')
+    delta = (np.bincount(opens, weights=weights, minlength=n + 1)
+             - np.bincount(closes, weights=weights, minlength=n + 1))
+    return np.cumsum(delta[:n])
+
+
+def calendar_frame(events, min_years=MIN_SPINE_YEARS, max_years=MAX_SPINE_YEARS):
+    """One row per day of the spine with precomputed event columns"""
+    start, end = spine_range(events, min_years, max_years)
+    dates = pd.date_range(start, end, freq='D')
+    holidays = USFederalHolidayCalendar().holidays(start, end, return_name=True)
+
+    calendar = pd.DataFrame({
+        "Date": dates,
+        "Day_of_Week": dates.day_name(),
+        "Is_Weekend": dates.dayofweek >= 5,
+        "Is_Holiday": dates.isin(holidays.index),
+        "Holiday_Name": pd.Series(dates).map(holidays).fillna("").to_numpy(),
+    })
+
+    if events is None or events.empty:
+        active = window = attendance = np.zeros(len(dates))
+    else:
+        days = dates.to_numpy()
+        event_start = _day_column(events, 'start_dt', 'start_dt')
+        event_end = _day_column(events, 'end_dt', 'start_dt')
+        load_in = _day_column(events, 'in_date', 'start_dt')
+        load_out = _day_column(events, 'out_date', 'end_dt')
+        valid = event_start.notna() & event_end.notna()
+        head = (pd.to_numeric(events['est_attendance'], errors='coerce').fillna(0)
+                if 'est_attendance' in events.columns else pd.Series(0, index=events.index))
+
+        active = interval_sweep(days, event_start[valid].to_numpy(), event_end[valid].to_numpy())
+        attendance = interval_sweep(days, event_start[valid].to_numpy(), event_end[valid].to_numpy(),
+                                    head[valid].to_numpy(dtype=float))
+        window = interval_sweep(days, load_in[valid].to_numpy(), load_out[valid].to_numpy())
+
+    calendar["Event_Window"] = np.select(
+        [active > 0, window > 0], ["EVENT", "LOAD_IN_OUT"], default=""
+    )
+    calendar["Event_Count"] = active.astype(int)
+    calendar["Concurrent_Attendance"] = attendance.astype(int)
+    calendar["Notes"] = ""
+    return calendar
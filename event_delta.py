@@ -0,0 +1,238 @@
+# Event Deltas
+# Diffs a newly ingested event calendar against the previous
+# events_processed.csv by event_id, so a re-ingest says what changed instead
+# of just overwriting the table.
+#
+# Both calendars are reduced to a canonical form (dates as int64 ns, numeric
+# columns as float64, ids as text), so a frame and its own CSV round trip are
+# identical. One vectorized 64-bit hash per row finds the
+# added, removed and changed events; only the changed rows are then compared
+# field by field. Every change is tagged with the months its event's lifecycle
+# (in_date → out_date, else start_dt → end_dt) touches - old and new window
+# for a change - and appended to data/events_changelog.csv. The latest delta,
+# with its affected months and a digest per month of the events touching it,
+# goes to data/events_delta.json; /run month keys the forecast on that month
+# digest, so an edit to a March event only reruns the March forecast.
+
+import hashlib
+import json
+from datetime import datetime
+
+import numpy as np
+import pandas as pd
+
+from event_index import LIFECYCLES, lifecycle_bounds
+
+KEY = 'event_id'
+DATE_COLUMNS = ['in_date', 'start_dt', 'end_dt', 'out_date']
+CHANGELOG_FILE = "events_changelog.csv"
+DELTA_FILE = "events_delta.json"
+CHANGELOG_COLUMNS = ['ingest_id', 'event_id', 'change', 'field', 'old_value', 'new_value', 'months']
+NAT = np.iinfo(np.int64).min
+# Rows tried before parsing a whole text column as numbers
+SAMPLE_ROWS = 100
+
+
+def _numbers(values):
+    """float64 values of a column that holds only numbers (or numeric text), else None"""
+    if pd.api.types.is_numeric_dtype(values) and not pd.api.types.is_bool_dtype(values):
+        return values.astype(float)
+    sample = values.dropna().head(SAMPLE_ROWS)
+    if pd.to_numeric(sample, errors='coerce').isna().any():
+        return None  # text column: skip parsing every row
+    numbers = pd.to_numeric(values, errors='coerce').astype(float)
+    return numbers if numbers.notna().sum() == values.notna().sum() else None
+
+
+def _text(values):
+    """Object array of str, '' for missing"""
+    text = values.to_numpy(dtype=object, na_value='')
+    if not pd.api.types.is_string_dtype(values.dtype) or values.dtype == object:
+        text = text.astype(str).astype(object)
+    return text
+
+
+def _number_text(numbers):
+    """Object array of number text, integral values without '.0', '' for missing"""
+    values = np.asarray(numbers, dtype=float)
+    present = ~np.isnan(values)
+    whole = present & (np.mod(values, 1, where=present, out=np.zeros_like(values)) == 0)
+    text = np.full(len(values), '', dtype=object)
+    text[whole] = values[whole].astype(np.int64).astype(str)
+    text[present & ~whole] = np.round(values[present & ~whole], 6).astype(str)
+    return text
+
+
+def event_ids(events):
+    """event_id as text, '10000' whether it was read as an int, a float or a string"""
+    values = events[KEY]
+    numbers = _numbers(values)
+    if numbers is not None:
+        return _number_text(numbers)
+    return _text(values)
+
+
+def canonical(events, ids=None):
+    """Calendar indexed by event id with comparable columns: dates as int64 ns (NaT as NAT),
+    all-numeric columns as float64, anything else as text; last row wins for repeated ids"""
+    columns = {}
+    for column in events.columns:
+        if column == KEY:
+            continue
+        values = events[column]
+        if column in DATE_COLUMNS or pd.api.types.is_datetime64_any_dtype(values):
+            dates = pd.DatetimeIndex(pd.to_datetime(values, errors='coerce')).astype('datetime64[ns]')
+            columns[column] = dates.asi8
+            continue
+        numbers = _numbers(values)
+        if numbers is not None:
+            columns[column] = numbers.to_numpy()
+        else:
+            columns[column] = _text(values)
+    ids = event_ids(events) if ids is None else ids
+    index = pd.Index(ids, name=KEY, dtype=object)
+    canon = pd.DataFrame({column: pd.Series(values, index=index, dtype=values.dtype)
+                          for column, values in columns.items()}, index=index)
+    return canon[~canon.index.duplicated(keep='last')]
+
+
+def row_hashes(canon):
+    return pd.Series(pd.util.hash_pandas_object(canon, index=False).to_numpy(), index=canon.index)
+
+
+def display(values, column):
+    """Changelog text of canonical values"""
+    values = pd.Series(values)
+    if column in DATE_COLUMNS:
+        dates = pd.to_datetime(values.astype(np.int64).where(values != NAT), unit='ns')
+        return dates.dt.strftime('%Y-%m-%d %H:%M:%S').fillna('').to_numpy()
+    numbers = _numbers(values.where(values != ''))
+    if numbers is not None:
+        return _number_text(numbers)
+    return values.astype(str).to_numpy()
+
+
+def month_spans(events, ids=None):
+    """(event_id, month ordinal) for every month an event's lifecycle touches"""
+    run_start = LIFECYCLES['event'][0]
+    if run_start not in events.columns or KEY not in events.columns:
+        return pd.DataFrame({KEY: pd.Series(dtype=object), 'month': pd.Series(dtype=np.int64)})
+    starts, ends = lifecycle_bounds(events, 'site')
+    valid = (starts.notna() & ends.notna()).to_numpy()
+    first, last = (((d.dt.year - 1970) * 12 + d.dt.month - 1).to_numpy(np.int64)
+                   for d in (starts[valid], ends[valid]))
+    count = np.maximum(last - first, 0) + 1
+    ordinals = np.repeat(first, count) + (np.arange(count.sum()) - np.repeat(np.cumsum(count) - count, count))
+    ids = event_ids(events) if ids is None else ids
+    return pd.DataFrame({KEY: np.repeat(ids[valid], count), 'month': ordinals})
+
+
+def month_label(ordinal):
+    """'YYYY-MM' of a month ordinal (months since 1970-01)"""
+    return f"{1970 + ordinal // 12:04d}-{ordinal % 12 + 1:02d}"
+
+
+def diff_events(previous, current):
+    """Added/removed ids, field-level changes and affected months between two calendars"""
+    old_ids = event_ids(previous) if KEY in previous.columns else np.array([], dtype=object)
+    new_ids = event_ids(current)
+    old, new = canonical(previous, old_ids), canonical(current, new_ids)
+    columns = list(dict.fromkeys(list(new.columns) + list(old.columns)))
+    for frame, other in ((old, new), (new, old)):
+        for column in columns:
+            if column not in frame.columns:  # a column only one side has compares as empty
+                dtype = other[column].dtype
+                fill = '' if dtype == object else NAT if dtype.kind in 'iu' else np.nan
+                frame[column] = pd.Series(fill, index=frame.index, dtype=dtype)
+    old, new = old[columns], new[columns]
+    for column in columns:  # same value read as number on one side, text on the other
+        if (old[column].dtype == object) != (new[column].dtype == object):
+            old[column] = pd.Series(display(old[column], column), index=old.index, dtype=object)
+            new[column] = pd.Series(display(new[column], column), index=new.index, dtype=object)
+
+    old_hash, new_hash = row_hashes(old), row_hashes(new)
+    added = new.index.difference(old.index)
+    removed = old.index.difference(new.index)
+    common = new.index.intersection(old.index)
+    changed_ids = common[(new_hash[common] != old_hash[common]).to_numpy()]
+
+    changes = []
+    before, after = old.loc[changed_ids], new.loc[changed_ids]
+    for column in columns:
+        a, b = before[column].to_numpy(), after[column].to_numpy()
+        differs = a != b
+        if a.dtype.kind == 'f' and b.dtype.kind == 'f':
+            differs &= ~(np.isnan(a) & np.isnan(b))
+        if differs.any():
+            changes.append(pd.DataFrame({KEY: changed_ids[differs], 'field': column,
+                                         'old_value': display(a[differs], column),
+                                         'new_value': display(b[differs], column)}))
+    changes = pd.concat(changes, ignore_index=True) if changes else \
+        pd.DataFrame(columns=[KEY, 'field', 'old_value', 'new_value'])
+
+    old_spans, new_spans = month_spans(previous, old_ids), month_spans(current, new_ids)
+    touched = pd.concat([new_spans[new_spans[KEY].isin(added.union(changed_ids))],
+                         old_spans[old_spans[KEY].isin(removed.union(changed_ids))]]).drop_duplicates()
+    return {
+        'added': list(added), 'removed': list(removed), 'changed': changes,
+        'months': touched.groupby(KEY)['month'].agg(lambda m: ';'.join(map(month_label, sorted(m)))),
+        'affected_months': [month_label(m) for m in sorted(touched['month'].unique())],
+        'hashes': new_hash, 'spans': new_spans,
+    }
+
+
+def month_digests(hashes, spans):
+    """sha256 per month over the row hashes of the events whose lifecycle touches it"""
+    spans = spans.assign(hash=hashes.reindex(spans[KEY]).to_numpy())
+    spans = spans.dropna(subset=['hash']).sort_values(['month', 'hash'])
+    return {month_label(month): hashlib.sha256(group.to_numpy(np.uint64).tobytes()).hexdigest()
+            for month, group in spans.groupby('month')['hash']}
+
+
+def changelog_frame(delta, ingest_id):
+    """One changelog row per added/removed event and per changed field"""
+    months = delta['months']
+    parts = [
+        pd.DataFrame({KEY: delta['added'], 'change': 'added'}),
+        pd.DataFrame({KEY: delta['removed'], 'change': 'removed'}),
+        delta['changed'].assign(change='changed'),
+    ]
+    log = pd.concat([p for p in parts if len(p)], ignore_index=True) if any(len(p) for p in parts) \
+        else pd.DataFrame(columns=CHANGELOG_COLUMNS)
+    log['ingest_id'] = ingest_id
+    log['months'] = log[KEY].map(months).fillna('')
+    return log.reindex(columns=CHANGELOG_COLUMNS).fillna('')
+
+
+def record_delta(data_path, previous, current, events_digest, source=None):
+    """Diff, append the changelog, write the latest delta summary; returns the summary"""
+    ingest_id = datetime.now().strftime('%Y%m%d-%H%M%S')
+    empty = pd.DataFrame(columns=[KEY])
+    delta = diff_events(previous if previous is not None else empty, current)
+
+    log = changelog_frame(delta, ingest_id)
+    changelog = data_path / CHANGELOG_FILE
+    if len(log):
+        log.to_csv(changelog, mode='a', header=not changelog.exists(), index=False)
+
+    summary = {
+        'ingest_id': ingest_id,
+        'source': source,
+        'baseline': previous is None,
+        'previous_events': 0 if previous is None else int(len(previous)),
+        'events': int(len(current)),
+        'added': len(delta['added']),
+        'removed': len(delta['removed']),
+        'changed': int(delta['changed'][KEY].nunique()) if len(delta['changed']) else 0,
+        'changed_fields': {str(k): int(v) for k, v in delta['changed']['field'].value_counts().items()},
+        'affected_months': delta['affected_months'],
+        'events_digest': events_digest,
+        'month_digests': month_digests(delta['hashes'], delta['spans']),
+    }
+    (data_path / DELTA_FILE).write_text(json.dumps(summary, indent=2, default=str))
+    return summary
+
+
+def load_delta(data_path):
+    path = data_path / DELTA_FILE
+    return json.loads(path.read_text()) if path.exists() else None
@@ -0,0 +1,279 @@
+# Event Interval Index
+# Persisted index over event lifecycles for date and venue overlap queries.
+#
+# Every event is two closed intervals: its run (start_dt → end_dt) and its
+# site footprint (in_date → out_date, load-in to load-out). For each lifecycle
+# the index keeps one partition per venue_area plus one over all venues. A
+# partition stores the intervals sorted by start, the ends sorted on their
+# own, and prefix sums of attendance in both orders, so
+#
+#   overlapping [a, b]  = #(start <= b) - #(end < a)
+#   starting in [a, b]  = #(start <= b) - #(start < a)
+#
+# are two binary searches each (weighted the same way for attendance), and a
+# whole array of query windows is answered in one np.searchsorted call.
+# Listing the overlapping event ids only scans starts in [a - longest, b],
+# where longest is the longest ordinary interval; the rare very long ones are
+# kept aside and checked directly.
+#
+# The index is saved next to events_processed.csv and rebuilt whenever that
+# file's (mtime, size) stamp no longer matches the one it was built from.
+
+import json
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+from table_cache import file_stamp
+
+INDEX_FILE = "event_index.npz"
+EVENTS_FILE = "events_processed.csv"
+
+LIFECYCLES = {
+    'event': ('start_dt', 'end_dt'),
+    'site': ('in_date', 'out_date'),
+}
+ALL_VENUES = '*'
+UNKNOWN_VENUE = 'Unknown'
+
+# Intervals longer than this are kept out of the start-window scan
+LONG_INTERVAL = np.timedelta64(31, 'D').astype('timedelta64[ns]').astype(np.int64)
+
+DAY_NS = np.timedelta64(1, 'D').astype('timedelta64[ns]').astype(np.int64)
+
+PARTITION_ARRAYS = ('starts', 'ends', 'ids', 'weights', 'sorted_ends', 'end_weights')
+
+
+def to_ns(values):
+    """int64 nanoseconds for a scalar or array of dates/timestamps"""
+    values = pd.to_datetime(values)
+    if isinstance(values, pd.Timestamp):
+        return np.int64(values.value)
+    return np.asarray(pd.DatetimeIndex(values).astype('datetime64[ns]').asi8, dtype=np.int64)
+
+
+def _column_ns(events, column, fallback):
+    """Lifecycle bound in ns; missing in/out dates fall back to the event run"""
+    if column not in events.columns and fallback not in events.columns:
+        return pd.Series(pd.NaT, index=events.index, dtype='datetime64[ns]')
+    source = events[column] if column in events.columns else events[fallback]
+    values = pd.to_datetime(source, errors='coerce')
+    if column in events.columns and fallback in events.columns:
+        values = values.fillna(pd.to_datetime(events[fallback], errors='coerce'))
+    return values
+
+
+def lifecycle_bounds(events, lifecycle):
+    """(starts, ends) of a lifecycle; a missing end falls back to the start, like site to run"""
+    start_col, end_col = LIFECYCLES[lifecycle]
+    run_start, run_end = LIFECYCLES['event']
+    starts = _column_ns(events, start_col, run_start)
+    ends = _column_ns(events, end_col, run_end)
+    return starts, ends.fillna(starts)
+
+
+class IntervalPartition:
+    """Closed intervals of one lifecycle and venue, sorted for binary search"""
+
+    def __init__(self, starts, ends, ids, weights, sorted_ends=None, end_weights=None):
+        if sorted_ends is None:
+            order = np.argsort(starts, kind='stable')
+            starts, ends, ids, weights = starts[order], ends[order], ids[order], weights[order]
+            end_order = np.argsort(ends, kind='stable')
+            sorted_ends, end_weights = ends[end_order], weights[end_order]
+        self.starts, self.ends, self.ids, self.weights = starts, ends, ids, weights
+        self.sorted_ends, self.end_weights = sorted_ends, end_weights
+        self.start_cum = np.concatenate([[0.0], np.cumsum(weights)])
+        self.end_cum = np.concatenate([[0.0], np.cumsum(end_weights)])
+
+        lengths = ends - starts
+        long = lengths > LONG_INTERVAL
+        self.longest = int(lengths[~long].max()) if (~long).any() else 0
+        self.long_positions = np.flatnonzero(long)
+
+    def __len__(self):
+        return len(self.starts)
+
+    def arrays(self):
+        return {name: getattr(self, name) for name in PARTITION_ARRAYS}
+
+    def _overlap_bounds(self, a, b):
+        return np.searchsorted(self.starts, b, side='right'), np.searchsorted(self.sorted_ends, a, side='left')
+
+    def count_overlapping(self, a, b):
+        started, ended = self._overlap_bounds(a, b)
+        return started - ended
+
+    def weight_overlapping(self, a, b):
+        started, ended = self._overlap_bounds(a, b)
+        return self.start_cum[started] - self.end_cum[ended]
+
+    def _start_bounds(self, a, b):
+        return np.searchsorted(self.starts, a, side='left'), np.searchsorted(self.starts, b, side='right')
+
+    def count_starting(self, a, b):
+        lo, hi = self._start_bounds(a, b)
+        return hi - lo
+
+    def weight_starting(self, a, b):
+        lo, hi = self._start_bounds(a, b)
+        return self.start_cum[hi] - self.start_cum[lo]
+
+    def overlapping(self, a, b):
+        """(query positions, interval positions) of every overlapping pair"""
+        lo = np.searchsorted(self.starts, a - self.longest, side='left')
+        hi = np.searchsorted(self.starts, b, side='right')
+        sizes = np.maximum(hi - lo, 0)
+        queries = np.repeat(np.arange(len(a)), sizes)
+        offsets = np.arange(sizes.sum()) - np.repeat(np.cumsum(sizes) - sizes, sizes)
+        positions = np.repeat(lo, sizes) + offsets
+        keep = self.ends[positions] >= a[queries]
+        queries, positions = queries[keep], positions[keep]
+
+        if len(self.long_positions):
+            hits = ((self.starts[self.long_positions][None, :] <= b[:, None])
+                    & (self.ends[self.long_positions][None, :] >= a[:, None]))
+            # long intervals that started inside the scanned window were found above
+            hits &= self.starts[self.long_positions][None, :] < (a - self.longest)[:, None]
+            extra_q, extra_p = np.nonzero(hits)
+            queries = np.concatenate([queries, extra_q])
+            positions = np.concatenate([positions, self.long_positions[extra_p]])
+        return queries, positions
+
+
+def venue_names(events):
+    """venue_area as str per event; blank or missing venues become UNKNOWN_VENUE"""
+    if 'venue_area' not in events.columns:
+        return np.full(len(events), UNKNOWN_VENUE)
+    venues = events['venue_area'].astype(object)
+    venues = venues.where(venues.notna() & (venues.astype(str).str.strip() != ''), UNKNOWN_VENUE)
+    return venues.astype(str).to_numpy()
+
+
+class EventIndex:
+    """Interval partitions per lifecycle and venue_area, plus an all-venue partition"""
+
+    def __init__(self, partitions, stamp=None):
+        self.partitions = partitions  # {(lifecycle, venue): IntervalPartition}
+        self.stamp = stamp
+
+    @classmethod
+    def from_events(cls, events, stamp=None):
+        venues = venue_names(events)
+        ids = events['event_id'].to_numpy() if 'event_id' in events.columns else np.arange(len(events))
+        ids = ids.astype(np.int64) if pd.api.types.is_integer_dtype(ids) else ids.astype(str)
+        weights = (pd.to_numeric(events['est_attendance'], errors='coerce').fillna(0).to_numpy(float)
+                   if 'est_attendance' in events.columns else np.zeros(len(events)))
+
+        partitions = {}
+        for lifecycle in LIFECYCLES:
+            starts, ends = lifecycle_bounds(events, lifecycle)
+            valid = (starts.notna() & ends.notna()).to_numpy()
+            s, e = to_ns(starts[valid]), to_ns(ends[valid])
+            e = np.maximum(e, s)  # a bad end date never makes an interval negative
+            v, i, w = venues[valid], ids[valid], weights[valid]
+            partitions[(lifecycle, ALL_VENUES)] = IntervalPartition(s, e, i, w)
+            for venue in np.unique(v):
+                mask = v == venue
+                partitions[(lifecycle, str(venue))] = IntervalPartition(s[mask], e[mask], i[mask], w[mask])
+        return cls(partitions, stamp)
+
+    @property
+    def venues(self):
+        return sorted({venue for _, venue in self.partitions if venue != ALL_VENUES})
+
+    def partition(self, venue=None, lifecycle='event'):
+        if lifecycle not in LIFECYCLES:
+            raise ValueError(f"Unknown lifecycle '{lifecycle}' (expected one of {list(LIFECYCLES)})")
+        part = self.partitions.get((lifecycle, venue or ALL_VENUES))
+        if part is None:
+            raise KeyError(f"No events at venue '{venue}'")
+        return part
+
+    def _windows(self, start, end):
+        a = np.atleast_1d(to_ns(start))
+        b = a.copy() if end is None else np.atleast_1d(to_ns(end))
+        return np.broadcast_arrays(a, b)
+
+    def count_overlapping(self, start, end=None, venue=None, lifecycle='event'):
+        """Events whose interval overlaps each [start, end] window (end defaults to start)"""
+        return self.partition(venue, lifecycle).count_overlapping(*self._windows(start, end))
+
+    def attendance_overlapping(self, start, end=None, venue=None, lifecycle='event'):
+        """Summed est_attendance of the events overlapping each window"""
+        return self.partition(venue, lifecycle).weight_overlapping(*self._windows(start, end))
+
+    def count_starting(self, start, end, venue=None, lifecycle='event'):
+        """Events whose interval starts inside each [start, end] window"""
+        return self.partition(venue, lifecycle).count_starting(*self._windows(start, end))
+
+    def attendance_starting(self, start, end, venue=None, lifecycle='event'):
+        return self.partition(venue, lifecycle).weight_starting(*self._windows(start, end))
+
+    def _days(self, days):
+        a = to_ns(pd.DatetimeIndex(np.atleast_1d(pd.to_datetime(days))).normalize())
+        return a, a + DAY_NS - 1
+
+    def active_on(self, days, venue=None, lifecycle='event'):
+        """Events active at any time on each calendar day"""
+        return self.partition(venue, lifecycle).count_overlapping(*self._days(days))
+
+    def attendance_on(self, days, venue=None, lifecycle='event'):
+        return self.partition(venue, lifecycle).weight_overlapping(*self._days(days))
+
+    def overlapping(self, start, end=None, venue=None, lifecycle='event'):
+        """Every (query, event) overlap pair as a frame, ordered by query then event start"""
+        part = self.partition(venue, lifecycle)
+        a, b = self._windows(start, end)
+        queries, positions = part.overlapping(a, b)
+        order = np.lexsort((part.starts[positions], queries))
+        queries, positions = queries[order], positions[order]
+        return pd.DataFrame({
+            'query': queries,
+            'event_id': part.ids[positions],
+            'start': pd.to_datetime(part.starts[positions]),
+            'end': pd.to_datetime(part.ends[positions]),
+            'est_attendance': part.weights[positions],
+        })
+
+    def save(self, path):
+        arrays, keys = {}, []
+        for n, ((lifecycle, venue), part) in enumerate(self.partitions.items()):
+            keys.append([lifecycle, venue])
+            for name, values in part.arrays().items():
+                arrays[f"p{n}_{name}"] = values
+        meta = {'partitions': keys, 'stamp': list(self.stamp) if self.stamp else None}
+        with open(path, 'wb') as f:
+            np.savez(f, meta=np.array(json.dumps(meta)), **arrays)
+        return Path(path)
+
+    @classmethod
+    def load(cls, path):
+        with np.load(path, allow_pickle=False) as stored:
+            meta = json.loads(str(stored['meta']))
+            partitions = {}
+            for n, (lifecycle, venue) in enumerate(meta['partitions']):
+                partitions[(lifecycle, venue)] = IntervalPartition(
+                    *(stored[f"p{n}_{name}"] for name in PARTITION_ARRAYS))
+        return cls(partitions, tuple(meta['stamp']) if meta['stamp'] else None)
+
+    @classmethod
+    def load_or_build(cls, events_file, index_file=None, load_events=None):
+        """Saved index if it matches events_file, else rebuilt from it and saved; None without events"""
+        events_file = Path(events_file)
+        index_file = Path(index_file) if index_file else events_file.with_name(INDEX_FILE)
+        stamp = file_stamp(events_file)
+        if stamp is None:
+            return None
+        if index_file.exists():
+            try:
+                index = cls.load(index_file)
+            except (OSError, ValueError, KeyError):
+                index = None
+            if index is not None and index.stamp == stamp:
+                return index
+        events = load_events(events_file) if load_events else pd.read_csv(events_file)
+        index = cls.from_events(events, stamp)
+        index.save(index_file)
+        return index
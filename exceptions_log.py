@@ -0,0 +1,144 @@
+"""
+Append-only structured exceptions log.
+
+Exceptions are written as JSON lines with typed fields (timestamp, type,
+severity, status, source, sku, unique_key and the offending row under
+`details`) to data/exceptions/exceptions_YYYY-MM-DD[.N].jsonl. Writes are
+buffered and appended in batches (callers flush() when an ingest ends), files
+rotate by date and size, and a small summary index keeps counts by
+type/severity/status so the Exceptions sheet never has to scan the log.
+"""
+
+import json
+import threading
+from datetime import datetime
+from pathlib import Path
+
+SUMMARY_FILE = "summary.json"
+SUMMARY_KEYS = ['exception_type', 'severity', 'status']
+
+
+class ExceptionLog:
+    """Buffered JSONL sink for data quality exceptions"""
+
+    def __init__(self, log_dir, batch_size=500, max_bytes=10 * 1024 * 1024):
+        # Absolute, so a later chdir (tests, servers) cannot redirect the writes
+        self.log_dir = Path(log_dir).absolute()
+        self.batch_size = batch_size
+        self.max_bytes = max_bytes
+        self._lines = []
+        self._counts = {}
+        self._lock = threading.Lock()  # stages log from MonthPipeline worker threads
+
+    def add(self, rows_df, exception_type, severity='HIGH', source=None, status='OPEN'):
+        """Queue one exception record per row of rows_df"""
+        if rows_df is None or rows_df.empty:
+            return 0
+
+        # Serialize all rows in one vectorized call, then wrap each line
+        details = rows_df.to_json(orient='records', lines=True, date_format='iso')
+        skus = rows_df['sku'].astype(str).tolist() if 'sku' in rows_df.columns else None
+        keys = rows_df['unique_key'].astype(str).tolist() if 'unique_key' in rows_df.columns else None
+        timestamp = datetime.now().isoformat(timespec='seconds')
+
+        lines = []
+        for i, row_json in enumerate(details.splitlines()):
+            record = {
+                'timestamp': timestamp,
+                'exception_type': exception_type,
+                'severity': severity,
+                'status': status,
+                'source': source,
+                'sku': skus[i] if skus else None,
+                'unique_key': keys[i] if keys else None,
+            }
+            lines.append(json.dumps(record)[:-1] + ', "details": ' + row_json + '}')
+
+        summary_key = '|'.join([exception_type, severity, status])
+        with self._lock:
+            self._lines.extend(lines)
+            self._counts[summary_key] = self._counts.get(summary_key, 0) + len(rows_df)
+            full = len(self._lines) >= self.batch_size
+
+        if full:
+            self.flush()
+        return len(rows_df)
+
+    def flush(self):
+        """Append buffered records to the current log file"""
+        with self._lock:
+            if not self._lines:
+                return
+            self.log_dir.mkdir(parents=True, exist_ok=True)
+            payload = ('\n'.join(self._lines) + '\n').encode('utf-8')
+
+            target = self._current_file(len(payload))
+            with open(target, 'ab') as f:
+                f.write(payload)
+
+            self._update_summary(self._counts)
+            self._lines = []
+            self._counts = {}
+
+    def _current_file(self, incoming_bytes):
+        """Today's log file, rotated to a new part once it passes max_bytes"""
+        stem = f"exceptions_{datetime.now():%Y-%m-%d}"
+        parts = sorted(self.log_dir.glob(f"{stem}*.jsonl"), key=self._part_number)
+        if not parts:
+            return self.log_dir / f"{stem}.jsonl"
+        current = parts[-1]
+        if current.stat().st_size + incoming_bytes > self.max_bytes:
+            return self.log_dir / f"{stem}.{self._part_number(current) + 1}.jsonl"
+        return current
+
+    @staticmethod
+    def _part_number(path):
+        """Rotation index from a file name (exceptions_DATE.N.jsonl)"""
+        suffix = path.stem.split('.')[-1]
+        return int(suffix) if suffix.isdigit() else 0
+
+    def _update_summary(self, counts):
+        """Fold new counts into the summary index"""
+        summary_file = self.log_dir / SUMMARY_FILE
+        summary = json.loads(summary_file.read_text()) if summary_file.exists() else {}
+        for key, count in counts.items():
+            summary[key] = summary.get(key, 0) + count
+        summary_file.write_text(json.dumps(summary, indent=2, sort_keys=True))
+
+    def summary(self):
+        """Counts by exception type, severity and status (includes unflushed)"""
+        import pandas as pd
+
+        summary_file = self.log_dir / SUMMARY_FILE
+        with self._lock:
+            totals = json.loads(summary_file.read_text()) if summary_file.exists() else {}
+            pending = dict(self._counts)
+        for key, count in pending.items():
+            totals[key] = totals.get(key, 0) + count
+
+        rows = [dict(zip(SUMMARY_KEYS, key.split('|')), count=count)
+                for key, count in sorted(totals.items())]
+        return pd.DataFrame(rows, columns=SUMMARY_KEYS + ['count'])
+
+    def rebuild_summary(self):
+        """Recompute the summary index from the log files"""
+        self.flush()
+        totals = {}
+        for log_file in sorted(self.log_dir.glob("exceptions_*.jsonl")):
+            with open(log_file, encoding='utf-8') as f:
+                for line in f:
+                    record = json.loads(line)
+                    key = '|'.join(str(record[k]) for k in SUMMARY_KEYS)
+                    totals[key] = totals.get(key, 0) + 1
+        (self.log_dir / SUMMARY_FILE).write_text(json.dumps(totals, indent=2, sort_keys=True))
+        return self.summary()
+
+    def read(self):
+        """Load every logged record into a DataFrame"""
+        import pandas as pd
+
+        self.flush()
+        files = sorted(self.log_dir.glob("exceptions_*.jsonl"))
+        if not files:
+            return pd.DataFrame(columns=['timestamp'] + SUMMARY_KEYS + ['source', 'sku', 'unique_key', 'details'])
+        return pd.concat([pd.read_json(f, lines=True) for f in files], ignore_index=True)
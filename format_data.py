@@ -1,30 +1,20 @@
 import pandas as pd
-from datetime import datetime
+
+from schema_adapters import read_adapted
 
 print("🔧 Converting data to proper system format...")
 
-# Fix sales data format
+# Fix sales data format (layout detected from the header)
 print("💰 Converting sales data...")
-sales_df = pd.read_csv('complete_sales_data.csv')
-sales_formatted = sales_df.rename(columns={
-    'quantity': 'units_sold',
-    'unit_price': 'revenue_per_unit'
-})
+sales_formatted = read_adapted('complete_sales_data.csv', 'sales')
 sales_formatted.to_csv('complete_sales_formatted.csv', index=False)
-print(f"✅ Formatted {len(sales_formatted)} sales records")
+print(f"✅ Formatted {len(sales_formatted)} sales records ({sales_formatted.attrs['layout']} layout)")
 
-# Fix counts data format  
+# Fix counts data format
 print("📊 Converting counts data...")
-counts_df = pd.read_csv('complete_counts_data.csv')
-counts_formatted = counts_df.rename(columns={
-    'date': 'asof_date',
-    'physical_count': 'qty',
-    'counter': 'checkpoint'
-})
-# Add location column
-counts_formatted['location'] = 'MAIN-WAREHOUSE'
+counts_formatted = read_adapted('complete_counts_data.csv', 'counts')
 counts_formatted.to_csv('complete_counts_formatted.csv', index=False)
-print(f"✅ Formatted {len(counts_formatted)} count records")
+print(f"✅ Formatted {len(counts_formatted)} count records ({counts_formatted.attrs['layout']} layout)")
 
 # Create proper SKU master file
 print("📦 Creating SKU master file...")
@@ -33,3 +23,4 @@ sku_df.to_csv('complete_sku_master.csv', index=False)
 print(f"✅ SKU master with {len(sku_df)} items")
 
 print("🎯 All data formatted for system ingestion!")
+print("💡 /ingest sales|audits also accept the raw files directly")
@@ -12,55 +12,55 @@ from openpyxl.chart import LineChart, BarChart, PieChart, Reference
 from openpyxl.comments import Comment
 import os
 
-def create_command_center_workbook():
-    """Generate the complete Event-Inventory-CommandCenter.xlsx workbook"""
+from workbook_writers import get_writer
+
+# Processed events feeding the Calendar sheet
+EVENTS_FILE = "data/events_processed.csv"
+# Exceptions log whose summary index feeds the Exceptions sheet
+EXCEPTIONS_DIR = "data/exceptions"
+
+def create_command_center_workbook(mode="formulas", tables=None, backend="openpyxl"):
+    """Generate the complete Event-Inventory-CommandCenter.xlsx workbook
+
+    With tables (buy_plan, pnl and skus frames) the planning sheets are filled
+    from real data in the given mode: formulas, values or hybrid. The backend
+    picks the writer the sheets render through (see workbook_writers.py).
+    """
+    frames = None
+    if tables is not None:
+        from workbook_modes import fill_sheet, sheet_frames
+        frames = sheet_frames(tables)
     
     # Create workbook
-    wb = openpyxl.Workbook()
-    
-    # Remove default sheet
-    wb.remove(wb.active)
+    writer = get_writer(backend)
     
     # Define styling
-    header_fill = PatternFill(start_color="366092", end_color="366092", fill_type="solid")
-    header_font = Font(color="FFFFFF", bold=True)
+    header_fill, header_font = header_styles()
     warning_fill = PatternFill(start_color="FFE6CC", end_color="FFE6CC", fill_type="solid")
     danger_fill = PatternFill(start_color="FFCCCC", end_color="FFCCCC", fill_type="solid")
     success_fill = PatternFill(start_color="D4EDDA", end_color="D4EDDA", fill_type="solid")
     
-    # Sheets to create (ordered)
-    sheets_config = [
-        ("Dashboard", create_dashboard_sheet),
-        ("Plan_Buy", create_plan_buy_sheet),
-        ("ROP_SS", create_rop_ss_sheet),
-        ("PnL", create_pnl_sheet),
-        ("Shrink", create_shrink_sheet),
-        ("Counts_Entry", create_counts_entry_sheet),
-        ("Forms_Inbox", create_forms_inbox_sheet),
-        ("Counts_Manual", create_counts_manual_sheet),
-        ("Events", create_events_sheet),
-        ("SKU", create_sku_sheet),
-        ("Sales", create_sales_sheet),
-        ("Audits", create_audits_sheet),
-        ("Config", create_config_sheet),
-        ("Mappings", create_mappings_sheet),
-        ("Calendar", create_calendar_sheet),
-        ("Staging", create_staging_sheet),
-        ("Exceptions", create_exceptions_sheet),
-    ]
-    
-    for sheet_name, creator_func in sheets_config:
-        ws = wb.create_sheet(sheet_name)
+    for sheet_name, creator_func in SHEET_BUILDERS:
+        formatted = sheet_name not in UNFORMATTED_SHEETS
+        ws = writer.create_sheet(sheet_name, table=formatted)
         creator_func(ws, header_fill, header_font)
+        if frames is not None:
+            fill_sheet(ws, sheet_name, mode, frames)
         
-        # Apply table formatting if this is a data sheet
-        if sheet_name not in ["Dashboard", "Staging"]:
+        # Apply table formatting if this is a data sheet (streaming sheets
+        # format their rows as they are written)
+        if formatted and not writer.streaming:
             format_as_table(ws, sheet_name)
+        writer.finish_sheet(ws)
     
     # Set Dashboard as active sheet
-    wb.active = wb["Dashboard"]
-    
-    return wb
+    return writer.finish(active="Dashboard")
+
+def header_styles():
+    """Fill and font shared by every header row"""
+    header_fill = PatternFill(start_color="366092", end_color="366092", fill_type="solid")
+    header_font = Font(color="FFFFFF", bold=True)
+    return header_fill, header_font
 
 def create_dashboard_sheet(ws, header_fill, header_font):
     """Create the Dashboard sheet with KPIs and visuals"""
@@ -142,8 +142,8 @@ def create_dashboard_sheet(ws, header_fill, header_font):
     ws.conditional_formatting.add("D7:D13", 
         CellIsRule(operator="equal", formula=["⚠"], fill=warning_fill))
 
-def create_plan_buy_sheet(ws, header_fill, header_font):
-    """Create Plan_Buy sheet with forecast and purchase recommendations"""
+def create_plan_buy_sheet(ws, header_fill, header_font, header_only=False):
+    """Create Plan_Buy sheet with forecast and purchase recommendations (header only: no sample rows)"""
     
     headers = [
         "SKU", "Description", "Category", "Current_Stock", "Forecast_30d", 
@@ -155,6 +155,8 @@ def create_plan_buy_sheet(ws, header_fill, header_font):
         cell = ws.cell(row=1, column=i, value=header)
         cell.fill = header_fill
         cell.font = header_font
+    if header_only:
+        return
     
     # Sample formula rows
     sample_formulas = [
@@ -175,8 +177,8 @@ def create_plan_buy_sheet(ws, header_fill, header_font):
             if i + 1 < len(formula_set):
                 ws[formula_set[i]] = formula_set[i + 1]
 
-def create_rop_ss_sheet(ws, header_fill, header_font):
-    """Create ROP & Safety Stock calculation sheet"""
+def create_rop_ss_sheet(ws, header_fill, header_font, header_only=False):
+    """Create ROP & Safety Stock calculation sheet (header only: no sample rows)"""
     
     headers = [
         "SKU", "Description", "Avg_Daily_Demand", "Lead_Time_Days", 
@@ -188,6 +190,8 @@ def create_rop_ss_sheet(ws, header_fill, header_font):
         cell = ws.cell(row=1, column=i, value=header)
         cell.fill = header_fill
         cell.font = header_font
+    if header_only:
+        return
     
     # Sample calculations
     ws["A2"] = "SKU001"
@@ -227,8 +231,8 @@ def create_shrink_sheet(ws, header_fill, header_font):
         cell.fill = header_fill
         cell.font = header_font
 
-def create_counts_entry_sheet(ws, header_fill, header_font):
-    """Create unified counts entry sheet (canonical table)"""
+def create_counts_entry_sheet(ws, header_fill, header_font, header_only=False):
+    """Create unified counts entry sheet (canonical table; header only: no formula row)"""
     
     headers = [
         "Unique_Key", "AsOf_Date", "Checkpoint", "Location", "SKU", 
@@ -240,6 +244,8 @@ def create_counts_entry_sheet(ws, header_fill, header_font):
         cell = ws.cell(row=1, column=i, value=header)
         cell.fill = header_fill
         cell.font = header_font
+    if header_only:
+        return
     
     # Add sample validation formulas
     ws["A2"] = "=TEXT(B2,\"yyyymmdd\")&\"|\"&C2&\"|\"&D2&\"|\"&E2&\"|\"&H2"
@@ -275,8 +281,8 @@ def create_counts_manual_sheet(ws, header_fill, header_font):
     ws["C2"].comment = Comment("BOM, MID, or EOM", "System")
     ws["D2"].comment = Comment("in_store or back_of_store", "System")
 
-def create_events_sheet(ws, header_fill, header_font):
-    """Create events master sheet"""
+def create_events_sheet(ws, header_fill, header_font, header_only=False):
+    """Create events master sheet (header only: no sample rows)"""
     
     headers = [
         "Event_ID", "Name", "Venue_Area", "Event_Type", "Start_DateTime", 
@@ -288,6 +294,8 @@ def create_events_sheet(ws, header_fill, header_font):
         cell = ws.cell(row=1, column=i, value=header)
         cell.fill = header_fill
         cell.font = header_font
+    if header_only:
+        return
     
     # Sample events
     sample_events = [
@@ -300,8 +308,8 @@ def create_events_sheet(ws, header_fill, header_font):
         for j, value in enumerate(event, 1):
             ws.cell(row=i, column=j, value=value)
 
-def create_sku_sheet(ws, header_fill, header_font):
-    """Create SKU master sheet"""
+def create_sku_sheet(ws, header_fill, header_font, header_only=False):
+    """Create SKU master sheet (header only: no sample rows)"""
     
     headers = [
         "SKU", "Description", "Category", "Cost", "Price", "Lead_Time_Days", 
@@ -312,6 +320,8 @@ def create_sku_sheet(ws, header_fill, header_font):
         cell = ws.cell(row=1, column=i, value=header)
         cell.fill = header_fill
         cell.font = header_font
+    if header_only:
+        return
     
     # Sample SKUs
     sample_skus = [
@@ -432,30 +442,34 @@ def create_mappings_sheet(ws, header_fill, header_font):
         for j, value in enumerate(row_data):
             ws.cell(row=i, column=5+j, value=value)
 
-def create_calendar_sheet(ws, header_fill, header_font):
-    """Create calendar spine sheet"""
+def create_calendar_sheet(ws, header_fill, header_font, events_file=EVENTS_FILE, header_only=False):
+    """Create calendar spine sheet with precomputed event columns (header only: no rows or chart)"""
+    from event_calendar import CALENDAR_COLUMNS, calendar_frame, load_events
     
-    headers = [
-        "Date", "Day_of_Week", "Is_Weekend", "Is_Holiday", "Holiday_Name", 
-        "Event_Window", "Event_Count", "Notes"
-    ]
-    
-    for i, header in enumerate(headers, 1):
+    for i, header in enumerate(CALENDAR_COLUMNS, 1):
         cell = ws.cell(row=1, column=i, value=header)
         cell.fill = header_fill
         cell.font = header_font
-    
-    # Generate 365 days starting from today
-    base_date = datetime.now().date()
-    for i in range(365):
-        current_date = base_date + timedelta(days=i)
-        row = i + 2
-        
-        ws[f"A{row}"] = current_date
-        ws[f"B{row}"] = current_date.strftime("%A")
-        ws[f"C{row}"] = "TRUE" if current_date.weekday() >= 5 else "FALSE"
-        # Add formulas for event counting
-        ws[f"G{row}"] = f"=COUNTIFS(Events!E:E,\">=\"&A{row},Events!F:F,\"<=\"&A{row}+1)"
+    if header_only:
+        return
+    
+    # Values, not per-row COUNTIFS over whole Events columns
+    calendar = calendar_frame(load_events(events_file))
+    calendar["Date"] = calendar["Date"].dt.date
+    for row in calendar.itertuples(index=False):
+        ws.append(list(row))
+    add_calendar_chart(ws, len(calendar) + 1)
+
+def add_calendar_chart(ws, last_row):
+    """Concurrent attendance across the spine (rows 2..last_row)"""
+    chart = LineChart()
+    chart.title = "Concurrent Attendance"
+    chart.y_axis.title = "Attendees"
+    chart.x_axis.number_format = "yyyy-mm"
+    chart.width, chart.height = 24, 10
+    chart.add_data(Reference(ws, min_col=8, min_row=1, max_row=last_row), titles_from_data=True)
+    chart.set_categories(Reference(ws, min_col=1, min_row=2, max_row=last_row))
+    ws.add_chart(chart, "K2")
 
 def create_staging_sheet(ws, header_fill, header_font):
     """Create staging area for Power Query transformations"""
@@ -466,32 +480,50 @@ def create_staging_sheet(ws, header_fill, header_font):
     ws["A4"] = "Data will appear here during refresh operations."
     ws["A5"] = "Sheet may be hidden in production."
 
-def create_exceptions_sheet(ws, header_fill, header_font):
-    """Create exceptions tracking sheet"""
+def create_exceptions_sheet(ws, header_fill, header_font, log_dir=EXCEPTIONS_DIR):
+    """Create exceptions sheet from the exceptions log summary index"""
+    from exceptions_log import ExceptionLog
     
-    headers = [
-        "Exception_ID", "Date_Found", "Source_Sheet", "Source_Row", "Exception_Type", 
-        "Description", "Severity", "Resolution_Required", "Status", "Notes"
-    ]
+    headers = ["Exception_Type", "Severity", "Status", "Count"]
     
     for i, header in enumerate(headers, 1):
         cell = ws.cell(row=1, column=i, value=header)
         cell.fill = header_fill
         cell.font = header_font
     
-    # Sample exception types
-    sample_exceptions = [
-        ["EXC001", "2025-08-20", "Forms_Inbox", "5", "Invalid SKU", "SKU 'XYZ999' not found in master", "HIGH", "Verify and correct SKU", "OPEN", "Check with counter"],
-        ["EXC002", "2025-08-20", "Counts_Manual", "12", "Duplicate Entry", "Same count submitted twice", "MEDIUM", "Remove duplicate", "RESOLVED", "Kept latest entry"],
-        ["EXC003", "2025-08-20", "Counts_Entry", "25", "Negative Quantity", "Qty = -5 for SKU001", "HIGH", "Verify count", "OPEN", "Impossible negative stock"],
-    ]
-    
-    for i, exc in enumerate(sample_exceptions, 2):
-        for j, value in enumerate(exc, 1):
-            ws.cell(row=i, column=j, value=value)
+    # Counts by type/severity/status (data/exceptions/summary.json), no log scan
+    for row in ExceptionLog(log_dir).summary().itertuples(index=False):
+        ws.append([row.exception_type, row.severity, row.status, int(row.count)])
+
+# Sheets to create (ordered)
+SHEET_BUILDERS = [
+    ("Dashboard", create_dashboard_sheet),
+    ("Plan_Buy", create_plan_buy_sheet),
+    ("ROP_SS", create_rop_ss_sheet),
+    ("PnL", create_pnl_sheet),
+    ("Shrink", create_shrink_sheet),
+    ("Counts_Entry", create_counts_entry_sheet),
+    ("Forms_Inbox", create_forms_inbox_sheet),
+    ("Counts_Manual", create_counts_manual_sheet),
+    ("Events", create_events_sheet),
+    ("SKU", create_sku_sheet),
+    ("Sales", create_sales_sheet),
+    ("Audits", create_audits_sheet),
+    ("Config", create_config_sheet),
+    ("Mappings", create_mappings_sheet),
+    ("Calendar", create_calendar_sheet),
+    ("Staging", create_staging_sheet),
+    ("Exceptions", create_exceptions_sheet),
+]
+
+# Layout-only sheets that are not formatted as tables
+UNFORMATTED_SHEETS = ["Dashboard", "Staging"]
+
+# Sheets whose layout writes rows below the header; header_only skips them
+LAYOUT_ROW_SHEETS = ["Plan_Buy", "ROP_SS", "Counts_Entry", "Events", "SKU", "Calendar"]
 
 def format_as_table(ws, sheet_name):
-    """Apply table formatting and create named range"""
+    """Apply table borders, header alignment, column widths and a frozen header row"""
     
     # Find the data range
     max_row = ws.max_row if ws.max_row > 1 else 2
@@ -0,0 +1,288 @@
+"""
+Per-stage run metrics.
+
+Every InventoryStrategist stage (ingest, forecast, plan, pnl, publish, ...)
+and its sub-steps (load, validate, write) is timed into a Metrics recorder:
+wall time, CPU time of the running thread, peak memory and rows in/out. A
+step nested in another is recorded under its parent's path
+("forecast/load:sales_processed.csv"); rows loaded by a sub-step count as
+the parent's rows in. The CLI writes one JSON file per run under
+reports/metrics/, and /metrics compare lines two runs of the same command
+up stage by stage to catch regressions.
+
+Peak memory is the process high-water RSS when the step ends (a cheap,
+monotonic figure). `--profile` also turns on tracemalloc, adding how far
+traced allocations peaked above their level when the step started
+(alloc_peak_mb), and cProfile for the top functions of the run.
+"""
+
+import contextlib
+import functools
+import json
+import re
+import sys
+import threading
+import time
+from datetime import datetime
+from pathlib import Path
+
+try:
+    import resource
+except ImportError:  # Windows
+    resource = None
+
+RUN_PATTERN = "run_*.json"
+TOP_FUNCTIONS = 25
+TOP_ALLOCATIONS = 10
+
+# Changes smaller than this are timer noise, whatever the percentage
+NOISE_FLOOR_S = 0.005
+
+
+def max_rss_mb():
+    """Process peak resident set size so far, or None where unsupported"""
+    if resource is None:
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return round(peak / (1024 * 1024 if sys.platform == 'darwin' else 1024), 1)
+
+
+def tracemalloc_current():
+    import tracemalloc
+    return tracemalloc.get_traced_memory()[0]
+
+
+def _rows(value):
+    """Row count of a frame-like value, else None"""
+    if hasattr(value, 'columns') and hasattr(value, '__len__'):
+        return len(value)
+    return None
+
+
+class Metrics:
+    """Records nested, timed steps; safe to use from several threads"""
+
+    def __init__(self):
+        self.records = []
+        self.started = datetime.now()
+        self._wall = time.perf_counter()
+        self._cpu = time.process_time()
+        self.profiler = None
+        self._local = threading.local()
+        self._lock = threading.Lock()
+
+    def reset(self):
+        """Drop recorded steps and restart the run clocks, e.g. between session commands"""
+        with self._lock:
+            self.records = []
+        self.started = datetime.now()
+        self._wall = time.perf_counter()
+        self._cpu = time.process_time()
+
+    @property
+    def tracing(self):
+        import tracemalloc
+        return self.profiler is not None and tracemalloc.is_tracing()
+
+    def _stack(self):
+        if not hasattr(self._local, 'stack'):
+            self._local.stack = []
+        return self._local.stack
+
+    @contextlib.contextmanager
+    def step(self, name, rows_in=None):
+        """Time a block; set record['rows_out'] inside it to report its output rows"""
+        stack = self._stack()
+        path = f"{stack[-1]['path']}/{name}" if stack else name
+        record = {'path': path, 'rows_in': rows_in, 'rows_out': None, 'children_s': 0.0, '_peak': 0}
+        tracing = self.tracing
+        if tracing:
+            self._fold_peak(stack)
+            record['_base'] = tracemalloc_current()
+        stack.append(record)
+        wall, cpu = time.perf_counter(), time.thread_time()
+        try:
+            yield record
+        finally:
+            record['wall_s'] = time.perf_counter() - wall
+            record['cpu_s'] = time.thread_time() - cpu
+            stack.pop()
+            if tracing:
+                self._fold_peak(stack + [record])
+                record['alloc_peak_mb'] = round((record['_peak'] - record['_base']) / (1024 * 1024), 2)
+            record['peak_rss_mb'] = max_rss_mb()
+            if stack:
+                parent = stack[-1]
+                parent['children_s'] += record['wall_s']
+                if tracing:
+                    parent['_peak'] = max(parent['_peak'], record['_peak'])
+                if name.startswith('load') and record['rows_out'] is not None:
+                    parent['rows_in'] = (parent['rows_in'] or 0) + record['rows_out']
+            with self._lock:
+                self.records.append(record)
+
+    def _fold_peak(self, stack):
+        """Credit the traced peak since the last reset to every open step, then reset it
+
+        Python 3.8 has no tracemalloc.reset_peak(); there the peak runs from
+        start_profile(), so a step may be credited an earlier step's peak.
+        """
+        import tracemalloc
+        peak = tracemalloc.get_traced_memory()[1]
+        for record in stack:
+            record['_peak'] = max(record['_peak'], peak)
+        if hasattr(tracemalloc, 'reset_peak'):
+            tracemalloc.reset_peak()
+
+    def start_profile(self):
+        """cProfile the calling thread and trace allocations until save()"""
+        import cProfile
+        import tracemalloc
+
+        tracemalloc.start()
+        self.profiler = cProfile.Profile()
+        self.profiler.enable()
+
+    def summary(self):
+        """Records aggregated per path, in order of first completion"""
+        stages = {}
+        for record in self.records:
+            entry = stages.setdefault(record['path'], {
+                'stage': record['path'], 'calls': 0, 'wall_s': 0.0, 'cpu_s': 0.0, 'self_s': 0.0,
+                'rows_in': None, 'rows_out': None, 'peak_rss_mb': None,
+            })
+            entry['calls'] += 1
+            entry['wall_s'] += record['wall_s']
+            entry['cpu_s'] += record['cpu_s']
+            entry['self_s'] += record['wall_s'] - record['children_s']
+            for key in ('rows_in', 'rows_out'):
+                if record[key] is not None:
+                    entry[key] = (entry[key] or 0) + record[key]
+            for key in ('peak_rss_mb', 'alloc_peak_mb'):
+                if record.get(key) is not None:
+                    entry[key] = max(entry.get(key) or 0, record[key])
+        for entry in stages.values():
+            for key in ('wall_s', 'cpu_s', 'self_s'):
+                entry[key] = round(entry[key], 6)
+        return list(stages.values())
+
+    def _profile_report(self, prof_file):
+        import io
+        import pstats
+        import tracemalloc
+
+        self.profiler.disable()
+        self.profiler.dump_stats(prof_file)
+        stats = pstats.Stats(self.profiler, stream=io.StringIO()).sort_stats('cumulative')
+        functions = []
+        for (filename, line, function), (_, calls, total, cumulative, _) in stats.stats.items():
+            functions.append({'function': f"{Path(filename).name}:{line}({function})", 'calls': calls,
+                              'tottime_s': round(total, 6), 'cumtime_s': round(cumulative, 6)})
+        functions.sort(key=lambda f: f['cumtime_s'], reverse=True)
+
+        allocations = []
+        if tracemalloc.is_tracing():
+            snapshot = tracemalloc.take_snapshot()
+            for stat in snapshot.statistics('lineno')[:TOP_ALLOCATIONS]:
+                frame = stat.traceback[0]
+                allocations.append({'site': f"{Path(frame.filename).name}:{frame.lineno}",
+                                    'mb': round(stat.size / (1024 * 1024), 3), 'blocks': stat.count})
+            tracemalloc.stop()
+        self.profiler = None
+        return {'cprofile': str(prof_file), 'top_functions': functions[:TOP_FUNCTIONS],
+                'top_allocations': allocations}
+
+    def save(self, metrics_dir, command, keep=None):
+        """Write this run's metrics as JSON; returns the file, or None if nothing was recorded"""
+        if not self.records and self.profiler is None:
+            return None
+        metrics_dir = Path(metrics_dir)
+        metrics_dir.mkdir(parents=True, exist_ok=True)
+        slug = re.sub(r"[^A-Za-z0-9]+", "-", command).strip('-').lower() or "run"
+        run_id = f"run_{self.started.strftime('%Y%m%d-%H%M%S-%f')}_{slug[:60]}"
+
+        run = {
+            'run_id': run_id,
+            'command': command,
+            'started': self.started.isoformat(timespec='seconds'),
+            'python': sys.version.split()[0],
+            'total': {
+                'wall_s': round(time.perf_counter() - self._wall, 6),
+                'cpu_s': round(time.process_time() - self._cpu, 6),  # every thread
+                'peak_rss_mb': max_rss_mb(),
+            },
+            'stages': self.summary(),
+        }
+        if self.profiler is not None:
+            run['profile'] = self._profile_report(metrics_dir / f"{run_id}.prof")
+
+        out_file = metrics_dir / f"{run_id}.json"
+        out_file.write_text(json.dumps(run, indent=2))
+        if keep:
+            prune_runs(metrics_dir, keep)
+        return out_file
+
+
+def stage(name):
+    """Decorator: record an InventoryStrategist method as a step of self.metrics"""
+    def decorate(method):
+        @functools.wraps(method)
+        def timed(self, *args, **kwargs):
+            rows_in = [n for n in map(_rows, (*args, *kwargs.values())) if n is not None]
+            with self.metrics.step(name, sum(rows_in) if rows_in else None) as record:
+                result = method(self, *args, **kwargs)
+                record['rows_out'] = _rows(result)
+            return result
+        return timed
+    return decorate
+
+
+def list_runs(metrics_dir):
+    """Run files oldest first"""
+    return sorted(Path(metrics_dir).glob(RUN_PATTERN))
+
+
+def prune_runs(metrics_dir, keep):
+    """Drop all but the newest keep runs (and their .prof files)"""
+    for old in list_runs(metrics_dir)[:-keep]:
+        old.unlink()
+        old.with_suffix('.prof').unlink(missing_ok=True)
+
+
+def load_run(metrics_dir, ref):
+    """Run by file name, run id or negative index (-1 is the latest)"""
+    runs = list_runs(metrics_dir)
+    if isinstance(ref, int) or re.fullmatch(r"-?\d+", str(ref)):
+        return json.loads(runs[int(ref)].read_text())
+    path = Path(ref)
+    if not path.exists():
+        path = Path(metrics_dir) / (ref if ref.endswith('.json') else f"{ref}.json")
+    return json.loads(path.read_text())
+
+
+def latest_pair(metrics_dir):
+    """The two newest runs of the same command as the newest run, oldest first"""
+    runs = [json.loads(path.read_text()) for path in list_runs(metrics_dir)]
+    if not runs:
+        return None, None
+    same = [run for run in runs if run['command'] == runs[-1]['command']]
+    return (same[-2], same[-1]) if len(same) >= 2 else (None, same[-1])
+
+
+def compare_runs(baseline, current, threshold_pct=20.0):
+    """Per-stage deltas between two runs; a stage regresses when it is slower
+    by more than threshold_pct and by more than the timer noise floor"""
+    before = {s['stage']: s for s in baseline['stages']}
+    rows = []
+    for entry in current['stages']:
+        old = before.get(entry['stage'])
+        row = {'stage': entry['stage'], 'wall_s': entry['wall_s'],
+               'baseline_wall_s': old['wall_s'] if old else None,
+               'peak_rss_mb': entry.get('peak_rss_mb'), 'delta_pct': None, 'regressed': False}
+        if old:
+            delta = entry['wall_s'] - old['wall_s']
+            row['delta_pct'] = round(delta / old['wall_s'] * 100, 1) if old['wall_s'] > 0 else None
+            row['regressed'] = (delta > NOISE_FLOOR_S and row['delta_pct'] is not None
+                                and row['delta_pct'] > threshold_pct)
+        rows.append(row)
+    return rows
@@ -4,12 +4,13 @@ ConventiCore - Convention Events Inventory Management System
 Senior Economics & Inventory Strategist Command Interface
 
 This script provides operational commands for managing the inventory system.
-Usage: python ops_controller.py [command] [args]
+Usage: python ops_controller.py [command] [args] [--profile]
 
 Commands:
   /ingest events [file]     - Parse event calendar into system
   /ingest audits [file]     - Load BOM/MID/EOM counts 
   /ingest sales [file]      - Load optional sales history
+  /ingest sales|audits [glob|dir ...] - Parallel ingest of monthly file drops
   /forms setup ms           - Generate Microsoft Forms integration
   /counts manual enable     - Build manual transcription capability
   /counts unify            - Normalize & dedupe all count sources
@@ -17,22 +18,40 @@ Commands:
   /plan [YYYY-MM]          - Compute ROP, safety stock, buy recommendations
   /pnl [YYYY-MM]           - Calculate GM, GMROI, sell-through metrics
   /build workbook          - Generate complete Excel workbook
-  /publish pack [YYYY-MM]  - Export dashboard + CSVs to reports
+  /build workbook stream [YYYY-MM] - Stream real data into a write-only workbook
+  /build workbook refresh [YYYY-MM] - Rewrite only sheets whose data changed
+  /build workbook values|hybrid|formulas [YYYY-MM] - Fill Plan_Buy/ROP_SS/PnL from plan outputs
+  /data memory             - Table memory before/after the dtype registry
+  /events active FROM [TO] [venue=NAME] [--site] - Events overlapping a date range (interval index)
+  /venues load [YYYY-MM] [--site] - Concurrent events/attendance per venue per day, peak windows, stocking targets
+  /exceptions summary      - Exception counts by type, severity and status
+  /metrics list            - Saved run metrics (reports/metrics/run_*.json)
+  /metrics compare [RUN_A RUN_B] - Per-stage time deltas; defaults to the last two runs of the latest command
+  /export bi [DIR] [--csv]  - Star schema (dims + monthly fact partitions) for Power BI incremental refresh
+  /publish pack [YYYY-MM]  - Export dashboard + CSVs as one checksummed archive
+  /publish batch YYYY-MM YYYY-MM [--serial] - Publish every month in a range on a process pool
+  /run month YYYY-MM [events=F] [sales=F] [audits=F] [--force] - Run every stage up to publish, skipping up-to-date ones
+  /serve api [port]        - HTTP API: cached report reads with ETags, batched count submissions
+  /session [--no-socket]   - Interactive shell that keeps tables in memory (+ local socket)
+  /session serve           - Headless session daemon on the local socket
+  /session send "CMD"      - Run one command in a running session
+
+Every command records wall time, CPU time, peak memory and rows in/out per
+stage and sub-step into reports/metrics/run_*.json. Add --profile to any
+command to also capture cProfile (top functions + a .prof file) and
+tracemalloc (per-step allocation peaks + top allocation sites).
 
 Author: Senior Economics & Inventory Strategist — Convention Events
 Motto: "Let's turn stock into profit, not décor"
 """
 
 import sys
-import os
-import argparse
-import pandas as pd
-import numpy as np
 from datetime import datetime, timedelta
 import json
-import csv
 from pathlib import Path
 
+from metrics import Metrics, stage
+
 class InventoryStrategist:
     """Senior Economics & Inventory Strategist — Convention Events"""
     
@@ -41,6 +60,18 @@ class InventoryStrategist:
         self.data_path = self.base_path / "data"
         self.reports_path = self.base_path / "reports"
         self.config = self.load_config()
+        # Parsed tables reused until their file changes (None: always read from disk)
+        from table_cache import TableCache
+        self.table_cache = TableCache.from_config(self.config)
+        # Wall/CPU/memory/rows per stage; the CLI saves them under reports/metrics/
+        self.metrics = Metrics()
+        # Shared exceptions sink, created up front so MonthPipeline threads never race to build it
+        from exceptions_log import ExceptionLog
+        self._exception_log = ExceptionLog(
+            self.data_path / "exceptions",
+            batch_size=self.config['exceptions_batch_size'],
+            max_bytes=int(self.config['exceptions_max_mb'] * 1024 * 1024)
+        )
         
         # Ensure directories exist
         self.data_path.mkdir(exist_ok=True)
@@ -63,7 +94,22 @@ class InventoryStrategist:
             'default_event_conversion': 0.15,
             'default_attach_rate': 1.2,
             'forms_integration_enabled': True,
-            'manual_entry_enabled': True
+            'manual_entry_enabled': True,
+            'ingest_workers': None,
+            'exceptions_batch_size': 500,
+            'exceptions_max_mb': 10,
+            'workbook_chunk_rows': 10000,
+            'workbook_backend': 'openpyxl',
+            'pipeline_workers': 4,
+            'publish_workers': None,
+            'session_port': 8765,
+            'api_port': 8080,
+            'api_count_batch_size': 100,
+            'api_count_flush_seconds': 1.0,
+            'table_cache_mb': 256,
+            'metrics_keep_runs': 200,
+            'metrics_regression_pct': 20,
+            'venue_peak_share': 0.9
         }
         
         config_file = self.base_path / "config.json"
@@ -80,11 +126,14 @@ class InventoryStrategist:
         with open(config_file, 'w') as f:
             json.dump(self.config, f, indent=2)
 
+    @stage('ingest_events')
     def ingest_events(self, file_path=None, data=None):
         """Parse event calendar into system with full event lifecycle rules"""
+        import pandas as pd
+
         print("📅 Ingesting Event Calendar with Event Rules...")
         
-        if data:
+        if data is not None:
             # Direct data input
             events_df = self.parse_data_input(data, 'events')
         elif file_path:
@@ -94,7 +143,12 @@ class InventoryStrategist:
                 events_df = pd.read_excel(file_path, sheet_name=0, header=1)
                 events_df = self.transform_events_xlsx(events_df)
             else:
-                events_df = pd.read_csv(file_path)
+                if file_path.endswith('.parquet') or Path(file_path).is_dir():
+                    events_df = pd.read_parquet(file_path)  # create_demo_events.py --format parquet
+                else:
+                    events_df = pd.read_csv(file_path)
+                if 'Event ID' in events_df.columns:  # Events.xlsx layout exported as CSV/Parquet
+                    events_df = self.transform_events_xlsx(events_df)
         else:
             # Use sample data
             events_df = self.get_sample_events()
@@ -102,12 +156,22 @@ class InventoryStrategist:
         # Validate and normalize with event rules
         events_df = self.validate_events_with_rules(events_df)
         
-        # Save processed events
+        # Save processed events, keeping the calendar it replaces for the delta
         output_file = self.data_path / "events_processed.csv"
-        events_df.to_csv(output_file, index=False)
+        previous = pd.read_csv(output_file) if output_file.exists() else None
+        with self.metrics.step('write', len(events_df)):
+            events_df.to_csv(output_file, index=False)
         
         print(f"✅ Processed {len(events_df)} events")
         print(f"💾 Saved to: {output_file}")
+        if 'event_id' in events_df.columns:
+            self.report_event_delta(previous, events_df, output_file, file_path)
+        events_df = self.apply_dtypes(events_df, 'events')
+
+        from event_index import INDEX_FILE, EventIndex
+        from table_cache import file_stamp
+        with self.metrics.step('index', len(events_df)):
+            EventIndex.from_events(events_df, file_stamp(output_file)).save(self.data_path / INDEX_FILE)
         self.show_assumptions("Event ingestion with rules", [
             "In-Date = Event setup begins, crews arrive onsite", 
             "Out-Date = Load-out date, crews depart",
@@ -118,8 +182,31 @@ class InventoryStrategist:
         ])
         return events_df
 
+    def report_event_delta(self, previous, events_df, output_file, source=None):
+        """Diff the new calendar against the one it replaced; log changes and affected months"""
+        from event_delta import CHANGELOG_FILE, record_delta
+        from pipeline import file_digest
+
+        with self.metrics.step('delta', len(events_df)):
+            delta = record_delta(self.data_path, previous, events_df, file_digest(output_file), source)
+        months = delta['affected_months']
+        if delta['baseline']:
+            print(f"🆕 Baseline calendar: {delta['events']} events across {len(months)} months")
+            return delta
+        print(f"🔁 Changes vs previous calendar: +{delta['added']} added, -{delta['removed']} removed, "
+              f"~{delta['changed']} changed")
+        if delta['changed_fields']:
+            print("   • Changed fields: " + ", ".join(f"{field} {count}"
+                                                   for field, count in delta['changed_fields'].items()))
+        print(f"🗓️  Affected months: {', '.join(months) if months else 'none'}")
+        if months:
+            print(f"📝 Changelog: {self.data_path / CHANGELOG_FILE}")
+        return delta
+
     def transform_events_xlsx(self, events_df):
         """Transform Events.xlsx format to system format with all required columns"""
+        import pandas as pd
+
         print("🔄 Transforming Events.xlsx columns...")
         
         # Column mapping from Events.xlsx to system format
@@ -161,8 +248,11 @@ class InventoryStrategist:
         print(f"✅ Transformed {len(transformed_df)} events with full column set")
         return transformed_df
 
+    @stage('validate')
     def validate_events_with_rules(self, events_df):
         """Validate events according to the 8 event rules"""
+        import pandas as pd
+
         print("✅ Validating events with lifecycle rules...")
         
         validated_df = events_df.copy()
@@ -189,14 +279,15 @@ class InventoryStrategist:
         
         return validated_df
 
+    @stage('ingest_audits')
     def ingest_audits(self, file_path=None, data=None):
         """Load BOM/MID/EOM inventory counts"""
         print("📋 Ingesting Inventory Counts...")
         
-        if data:
+        if data is not None:
             audits_df = self.parse_data_input(data, 'audits')
         elif file_path:
-            audits_df = pd.read_csv(file_path)
+            audits_df = self.read_source_file(file_path, 'counts')
         else:
             audits_df = self.get_sample_counts()
         
@@ -216,24 +307,30 @@ class InventoryStrategist:
         duplicates = audits_df[audits_df.duplicated(['unique_key'], keep=False)]
         if not duplicates.empty:
             print(f"⚠️  Found {len(duplicates)} duplicate count entries")
-            self.log_exceptions(duplicates, "Duplicate count entries")
+            self.log_exceptions(duplicates, "Duplicate count entries", source='ingest_audits')
         
         # Save processed counts
         output_file = self.data_path / "counts_processed.csv"
-        audits_df.to_csv(output_file, index=False)
+        with self.metrics.step('write', len(audits_df)):
+            audits_df.to_csv(output_file, index=False)
+        
+        self.get_exception_log().flush()
         
         print(f"✅ Processed {len(audits_df)} inventory counts")
         print(f"💾 Saved to: {output_file}")
-        return audits_df
+        return self.apply_dtypes(audits_df, 'counts')
 
+    @stage('ingest_sales')
     def ingest_sales(self, file_path=None, data=None):
         """Load optional sales history"""
+        import pandas as pd
+
         print("💰 Ingesting Sales History...")
         
-        if data:
+        if data is not None:
             sales_df = self.parse_data_input(data, 'sales')
         elif file_path:
-            sales_df = pd.read_csv(file_path)
+            sales_df = self.read_source_file(file_path, 'sales')
         else:
             sales_df = self.get_sample_sales()
         
@@ -244,11 +341,51 @@ class InventoryStrategist:
         
         # Save processed sales
         output_file = self.data_path / "sales_processed.csv"
-        sales_df.to_csv(output_file, index=False)
+        with self.metrics.step('write', len(sales_df)):
+            sales_df.to_csv(output_file, index=False)
         
         print(f"✅ Processed {len(sales_df)} sales transactions")
         print(f"💾 Saved to: {output_file}")
-        return sales_df
+        return self.apply_dtypes(sales_df, 'sales')
+
+    @stage('ingest_batch')
+    def ingest_batch(self, sources, data_type):
+        """Ingest many sales/audit files (globs, directories) in parallel"""
+        from batch_ingest import expand_sources, parse_files
+
+        table = 'counts' if data_type == 'audits' else 'sales'
+        paths = expand_sources(sources)
+        print(f"🗂️  Batch ingesting {len(paths)} {data_type} files...")
+        if not paths:
+            print("❌ No files matched")
+            return None
+
+        start = datetime.now()
+        results, merged, rejects = parse_files(paths, table, self.config['ingest_workers'])
+        elapsed = (datetime.now() - start).total_seconds()
+
+        for result in results:
+            name = result['file']
+            if result['error']:
+                print(f"   ❌ {name}: {result['error']}")
+            else:
+                rejected = f", {result['rejected']} rejected" if result['rejected'] else ""
+                print(f"   ✅ {name}: {result['rows_out']} rows ({result['layout']}{rejected})")
+
+        failed = [r for r in results if r['error']]
+        print(f"⏱️  Parsed {len(results) - len(failed)}/{len(results)} files in {elapsed:.2f}s")
+
+        # Same exception the single-file path logs in validate_counts
+        if data_type == 'audits' and rejects is not None:
+            self.log_exceptions(rejects, "Negative quantities", source='ingest_batch')
+            self.get_exception_log().flush()
+        if merged is None:
+            print("❌ No valid files to ingest")
+            return None
+
+        if data_type == 'audits':
+            return self.ingest_audits(data=merged)
+        return self.ingest_sales(data=merged)
 
     def forms_setup_ms(self):
         """Generate Microsoft Forms integration setup"""
@@ -352,6 +489,8 @@ class InventoryStrategist:
 
     def counts_manual_enable(self):
         """Build manual transcription capability"""
+        import pandas as pd
+
         print("✏️  Enabling Manual Count Transcription...")
         
         # Generate manual entry template
@@ -394,8 +533,11 @@ class InventoryStrategist:
         
         return manual_template
 
-    def counts_unify(self):
+    @stage('counts_unify')
+    def counts_unify(self, audits_df=None):
         """Normalize & dedupe all count sources"""
+        import pandas as pd
+
         print("🔄 Unifying Count Sources...")
         
         unified_counts = []
@@ -403,24 +545,30 @@ class InventoryStrategist:
         # Load Forms data (if exists)
         forms_file = self.data_path / "forms_responses.csv"
         if forms_file.exists():
-            forms_df = pd.read_csv(forms_file)
-            forms_df['source'] = 'Forms'
+            forms_df = self.load_data(forms_file.name).assign(source='Forms')
             unified_counts.append(forms_df)
             print(f"📱 Loaded {len(forms_df)} Forms responses")
         
         # Load Manual data (if exists)  
         manual_file = self.data_path / "manual_entries.csv"
         if manual_file.exists():
-            manual_df = pd.read_csv(manual_file)
-            manual_df['source'] = 'Manual'
+            manual_df = self.load_data(manual_file.name).assign(source='Manual')
             unified_counts.append(manual_df)
             print(f"✏️  Loaded {len(manual_df)} manual entries")
         
-        # Load processed audits
+        # Load counts submitted through the HTTP API (if exists)
+        api_file = self.data_path / "api_counts.csv"
+        if api_file.exists():
+            api_df = self.load_data(api_file.name).assign(source='API')
+            unified_counts.append(api_df)
+            print(f"🌐 Loaded {len(api_df)} API submissions")
+        
+        # Load processed audits (handed over in memory by /run month)
         audits_file = self.data_path / "counts_processed.csv"
-        if audits_file.exists():
-            audits_df = pd.read_csv(audits_file)
-            audits_df['source'] = 'System'
+        if audits_df is None and audits_file.exists():
+            audits_df = self.load_data(audits_file.name)
+        if audits_df is not None:
+            audits_df = audits_df.assign(source='System')
             unified_counts.append(audits_df)
             print(f"📋 Loaded {len(audits_df)} system counts")
         
@@ -439,23 +587,28 @@ class InventoryStrategist:
         duplicates = combined_df[combined_df.duplicated(['unique_key'], keep=False)]
         if not duplicates.empty:
             print(f"⚠️  Found {len(duplicates)} duplicate keys across sources")
-            self.log_exceptions(duplicates, "Cross-source duplicates")
+            self.log_exceptions(duplicates, "Cross-source duplicates", source='counts_unify')
         
         # Keep only latest version of each unique_key
         unified_df = combined_df.drop_duplicates(['unique_key'], keep='first')
         
         # Save unified counts
         output_file = self.data_path / "counts_unified.csv"
-        unified_df.to_csv(output_file, index=False)
+        with self.metrics.step('write', len(unified_df)):
+            unified_df.to_csv(output_file, index=False)
+        self.get_exception_log().flush()
         
         print(f"✅ Unified to {len(unified_df)} unique count records")
         print(f"💾 Saved to: {output_file}")
         print(f"🔍 Removed {len(combined_df) - len(unified_df)} duplicates")
         
-        return unified_df
+        return self.apply_dtypes(unified_df, 'counts')
 
-    def forecast(self, period):
+    @stage('forecast')
+    def forecast(self, period, sales_df=None, events_df=None):
         """Generate event-aware demand forecast"""
+        import pandas as pd
+
         print(f"🔮 Generating Demand Forecast for {period}...")
         
         # Parse period
@@ -464,9 +617,20 @@ class InventoryStrategist:
         end_date = (start_date + timedelta(days=32)).replace(day=1) - timedelta(days=1)
         
         # Load required data
-        sales_df = self.load_data('sales_processed.csv')
-        events_df = self.load_data('events_processed.csv')
+        if sales_df is None:
+            sales_df = self.load_data('sales_processed.csv')
+        if events_df is None:
+            events = self.load_event_index()
+        else:
+            from event_index import EventIndex
+            events = EventIndex.from_events(events_df)
         skus_df = self.get_sample_skus()
+
+        # Event lift is the same for every SKU: attendance of events starting in the period
+        period_attendance = float(events.attendance_starting(start_date, end_date)[0]) if events else 0.0
+        conversion_rate = self.config['default_event_conversion']
+        attach_rate = self.config['default_attach_rate']
+        event_lift = period_attendance * conversion_rate * attach_rate
         
         forecasts = []
         
@@ -483,22 +647,6 @@ class InventoryStrategist:
                 baseline_daily = 1.0  # Default assumption
                 demand_std = 0.5
             
-            # Calculate event lift
-            period_events = events_df[
-                (pd.to_datetime(events_df['start_dt']) >= start_date) &
-                (pd.to_datetime(events_df['start_dt']) <= end_date)
-            ]
-            
-            event_lift = 0
-            for _, event in period_events.iterrows():
-                # Get conversion and attach rates for this SKU/event combination
-                conversion_rate = self.config['default_event_conversion']
-                attach_rate = self.config['default_attach_rate']
-                
-                # Calculate event demand
-                event_demand = event['est_attendance'] * conversion_rate * attach_rate
-                event_lift += event_demand
-            
             # Total forecast
             days_in_period = (end_date - start_date).days + 1
             baseline_demand = baseline_daily * days_in_period
@@ -521,7 +669,8 @@ class InventoryStrategist:
         
         # Save forecast
         output_file = self.reports_path / f"forecast_{period}.csv"
-        forecast_df.to_csv(output_file, index=False)
+        with self.metrics.step('write', len(forecast_df)):
+            forecast_df.to_csv(output_file, index=False)
         
         print(f"✅ Generated forecasts for {len(forecast_df)} SKUs")
         print(f"📊 Total period demand: {forecast_df['total_forecast'].sum():.0f} units")
@@ -537,17 +686,23 @@ class InventoryStrategist:
         
         return forecast_df
 
-    def plan(self, period):
+    @stage('plan')
+    def plan(self, period, forecast_df=None, counts_df=None):
         """Compute ROP, safety stock, buy recommendations"""
+        import pandas as pd
+        import numpy as np
+
         print(f"📦 Generating Buy Plan for {period}...")
         
         # Load required data
-        forecast_df = self.load_data(f"forecast_{period}.csv", self.reports_path)
+        if forecast_df is None:
+            forecast_df = self.load_data(f"forecast_{period}.csv", self.reports_path)
         if forecast_df is None:
             print(f"❌ Forecast for {period} not found. Run /forecast {period} first.")
             return None
         
-        counts_df = self.load_data('counts_unified.csv')
+        if counts_df is None:
+            counts_df = self.load_data('counts_unified.csv')
         skus_df = self.get_sample_skus()
         
         buy_plans = []
@@ -604,6 +759,7 @@ class InventoryStrategist:
                 'current_stock': current_stock,
                 'forecast_30d': forecast['total_forecast'],
                 'daily_demand': round(daily_demand, 2),
+                'demand_std': round(demand_std, 2),
                 'safety_stock': round(safety_stock, 0),
                 'rop': round(rop, 0),
                 'target_stock': round(target_stock, 0),
@@ -625,7 +781,8 @@ class InventoryStrategist:
         
         # Save buy plan
         output_file = self.reports_path / f"buy_plan_{period}.csv"
-        buy_plan_df.to_csv(output_file, index=False)
+        with self.metrics.step('write', len(buy_plan_df)):
+            buy_plan_df.to_csv(output_file, index=False)
         
         # Generate summary statistics
         high_priority = len(buy_plan_df[buy_plan_df['priority'] == 'HIGH'])
@@ -646,14 +803,19 @@ class InventoryStrategist:
         
         return buy_plan_df
 
-    def pnl(self, period):
+    @stage('pnl')
+    def pnl(self, period, sales_df=None, counts_df=None):
         """Calculate GM, GMROI, sell-through metrics"""
+        import pandas as pd
+
         print(f"💹 Generating P&L Analysis for {period}...")
         
         # Load required data
-        sales_df = self.load_data('sales_processed.csv')
+        if sales_df is None:
+            sales_df = self.load_data('sales_processed.csv')
         skus_df = self.get_sample_skus()
-        counts_df = self.load_data('counts_unified.csv')
+        if counts_df is None:
+            counts_df = self.load_data('counts_unified.csv')
         
         if sales_df is None:
             print("❌ Sales data required for P&L analysis")
@@ -664,10 +826,11 @@ class InventoryStrategist:
         period_start = datetime(year, month, 1)
         period_end = (period_start + timedelta(days=32)).replace(day=1) - timedelta(days=1)
         
-        sales_df['date'] = pd.to_datetime(sales_df['date'])
+        # Shared frames are read-only here, so the dates are parsed on the side
+        sales_dates = pd.to_datetime(sales_df['date'])
         period_sales = sales_df[
-            (sales_df['date'] >= period_start) & 
-            (sales_df['date'] <= period_end)
+            (sales_dates >= period_start) & 
+            (sales_dates <= period_end)
         ]
         
         pnl_data = []
@@ -725,7 +888,8 @@ class InventoryStrategist:
         
         # Save P&L analysis
         output_file = self.reports_path / f"pnl_snapshot_{period}.csv"
-        pnl_df.to_csv(output_file, index=False)
+        with self.metrics.step('write', len(pnl_df)):
+            pnl_df.to_csv(output_file, index=False)
         
         # Generate summary metrics
         total_revenue = pnl_df['revenue'].sum()
@@ -735,7 +899,7 @@ class InventoryStrategist:
         
         print(f"✅ Generated P&L for {len(pnl_df)} SKUs")
         print(f"💰 Total Revenue: ${total_revenue:,.2f}")
-        print(f"💚 Total GM: ${total_gm:,.2f} ({total_gm/total_revenue*100:.1f}%)")
+        print(f"💚 Total GM: ${total_gm:,.2f} ({total_gm/total_revenue*100 if total_revenue else 0:.1f}%)")
         print(f"📊 Avg GMROI: {avg_gmroi:.2f}x")
         print(f"📈 Avg Sell-Through: {avg_sell_through:.1%}")
         print(f"💾 Saved to: {output_file}")
@@ -758,16 +922,34 @@ class InventoryStrategist:
         
         return pnl_df
 
-    def build_workbook(self):
+    @stage('build_workbook')
+    def build_workbook(self, stream=False, period=None, refresh=False, mode=None):
         """Generate complete Excel workbook"""
+        if refresh:
+            return self.refresh_workbook(period)
+        if stream:
+            return self.build_workbook_stream(period)
+
         print("🏗️  Building Complete Excel Workbook...")
         
         try:
             # Import the workbook generator
             from generate_workbook import create_command_center_workbook
             
+            # Fill the planning sheets from plan()/pnl() outputs when a mode is given
+            tables = None
+            if mode:
+                tables = self.load_planning_tables(period)
+                if tables is None:
+                    return None
+                print(f"📐 Planning sheets in {mode} mode for {tables['period']}")
+            
             # Generate the workbook
-            wb = create_command_center_workbook()
+            backend = self.config['workbook_backend']
+            if backend != 'openpyxl':
+                print(f"🧱 Rendering sheets with the {backend} writer")
+            wb = create_command_center_workbook(mode=mode or "formulas", tables=tables,
+                                                backend=backend)
             
             # Save workbook
             filename = "Event-Inventory-CommandCenter.xlsx"
@@ -794,50 +976,203 @@ class InventoryStrategist:
             print("💡 Run: pip install openpyxl pandas numpy")
             return None
 
-    def publish_pack(self, period):
-        """Export dashboard + CSVs to reports"""
+    def load_planning_tables(self, period=None):
+        """Buy plan, P&L and SKU master feeding the planning sheets"""
+        from workbook_stream import latest_period
+
+        period = period or latest_period(self.reports_path)
+        buy_plan = self.load_data(f"buy_plan_{period}.csv", self.reports_path) if period else None
+        pnl = self.load_data(f"pnl_snapshot_{period}.csv", self.reports_path) if period else None
+        if buy_plan is None or pnl is None:
+            print(f"❌ Buy plan and P&L for {period or 'the period'} not found. Run /plan and /pnl first.")
+            return None
+        return {'period': period, 'buy_plan': buy_plan, 'pnl': pnl, 'skus': self.get_sample_skus()}
+
+    def build_workbook_stream(self, period=None):
+        """Stream the real processed tables into a write-only workbook"""
+        print("🏗️  Streaming Excel Workbook from processed data...")
+
+        try:
+            from workbook_stream import build_streaming_workbook
+        except ImportError:
+            print("❌ Excel workbook generator not available")
+            print("💡 Run: pip install openpyxl pandas numpy")
+            return None
+
+        from workbook_refresh import record_build
+        from workbook_stream import latest_period
+
+        filename = "Event-Inventory-CommandCenter.xlsx"
+        period = period or latest_period(self.reports_path)
+        frames = {'skus': self.get_sample_skus()}
+        start = datetime.now()
+        rows_written = build_streaming_workbook(
+            filename, self.data_path, self.reports_path, period,
+            frames=frames, chunk_size=self.config['workbook_chunk_rows']
+        )
+        record_build(filename, self.data_path, self.reports_path, period, frames)
+        elapsed = (datetime.now() - start).total_seconds()
+
+        print(f"✅ Workbook '{filename}' streamed in {elapsed:.1f}s")
+        for sheet, rows in rows_written.items():
+            print(f"   • {sheet}: {rows:,} rows")
+        return filename
+
+    def refresh_workbook(self, period=None):
+        """Rewrite only the workbook sheets whose source tables changed"""
+        print("🔁 Refreshing Excel Workbook...")
+
+        try:
+            from workbook_refresh import refresh_workbook
+        except ImportError:
+            print("❌ Excel workbook generator not available")
+            print("💡 Run: pip install openpyxl pandas numpy")
+            return None
+
+        filename = "Event-Inventory-CommandCenter.xlsx"
+        start = datetime.now()
+        result = refresh_workbook(
+            filename, self.data_path, self.reports_path, period,
+            frames={'skus': self.get_sample_skus()},
+            chunk_size=self.config['workbook_chunk_rows']
+        )
+        elapsed = (datetime.now() - start).total_seconds()
+
+        if result['mode'] == 'full':
+            print("📦 No refresh manifest or data sheets to patch - performed a full streaming build")
+        if not result['rebuilt']:
+            print(f"✅ Workbook '{filename}' is up to date ({elapsed:.2f}s)")
+        else:
+            print(f"✅ Refreshed {len(result['rebuilt'])} sheet(s) in {elapsed:.2f}s")
+            for sheet in result['rebuilt']:
+                print(f"   • {sheet}: {result['rows'][sheet]:,} rows")
+        return filename
+
+    @stage('publish_pack')
+    def publish_pack(self, period, frames=None):
+        """Export dashboard + CSVs to reports as one checksummed archive"""
+        import io
+
+        import pandas as pd
+        from report_pack import PACK_REPORTS, compute_kpis, read_reports, report_files, write_pack
+
         print(f"📦 Publishing Report Pack for {period}...")
-        
-        # Create period-specific reports directory
-        period_dir = self.reports_path / period
-        period_dir.mkdir(exist_ok=True)
-        
-        published_files = []
-        
-        # Copy all period-specific reports
-        for report_type in ['forecast', 'buy_plan', 'pnl_snapshot']:
-            source_file = self.reports_path / f"{report_type}_{period}.csv"
-            if source_file.exists():
-                dest_file = period_dir / f"{report_type}_{period}.csv"
-                dest_file.write_bytes(source_file.read_bytes())
-                published_files.append(str(dest_file))
-        
-        # Generate summary report
-        summary = self.generate_summary_report(period)
-        summary_file = period_dir / f"executive_summary_{period}.txt"
-        with open(summary_file, 'w') as f:
-            f.write(summary)
-        published_files.append(str(summary_file))
-        
-        # Generate dashboard snapshot (text version)
-        dashboard_file = period_dir / f"dashboard_{period}.txt"
-        with open(dashboard_file, 'w') as f:
-            f.write(self.generate_dashboard_text(period))
-        published_files.append(str(dashboard_file))
-        
-        print(f"✅ Published {len(published_files)} report files")
-        print(f"📁 Reports directory: {period_dir}")
+
+        # Read each period output once: the same bytes feed the KPIs and the archive
+        files = report_files(self.reports_path, period)
+        contents = read_reports(files)
+        frames = {name: frames[name] if frames and frames.get(name) is not None
+                  else pd.read_csv(io.BytesIO(contents[name]))
+                  for name in files}
+        for name in PACK_REPORTS:
+            if name not in files:
+                print(f"⚠️  No {name}_{period}.csv found - its section will be empty")
+        kpis = compute_kpis(frames, self.config)
+
+        artifacts = {
+            f"executive_summary_{period}.txt": self.generate_summary_report(period, kpis),
+            f"dashboard_{period}.txt": self.generate_dashboard_text(period, kpis),
+        }
+        with self.metrics.step('write'):
+            archive, manifest_file, manifest = write_pack(
+                self.reports_path / period, period, files, artifacts, kpis, contents
+            )
+
+        print(f"✅ Published {len(manifest['members'])} report files "
+              f"({manifest['archive_bytes'] / 1024:,.1f} KB compressed)")
+        print(f"📁 Archive: {archive}")
+        print(f"🧾 Manifest: {manifest_file}")
+        print(f"🔒 SHA-256: {manifest['archive_sha256']}")
         print("📋 Published files:")
-        for file in published_files:
-            print(f"   • {Path(file).name}")
-        
-        return published_files
+        for member in manifest['members']:
+            print(f"   • {member['name']}")
+
+        return [str(archive), str(manifest_file)]
+
+    @stage('publish_batch')
+    def publish_batch(self, start, end, serial=False):
+        """Forecast, plan, pnl and publish every period in a range in parallel"""
+        from batch_publish import load_shared, period_range, publish_periods
+
+        periods = period_range(start, end)
+        workers = 1 if serial else self.config['publish_workers']
+        print(f"🗓️  Batch publishing {len(periods)} periods ({periods[0]} → {periods[-1]})...")
+
+        shared = load_shared(self)
+        if shared['sales'] is None or shared['events'] is None:
+            print("❌ Ingest events and sales first")
+            return None
+
+        results, wall = publish_periods(periods, shared, self.config, workers)
+
+        for result in results:
+            if result['error']:
+                print(f"   ❌ {result['period']}: {result['error']}")
+            else:
+                print(f"   ✅ {result['period']}: {Path(result['archive']).name} ({result['seconds']:.2f}s)")
+
+        serial_seconds = sum(r['seconds'] for r in results)
+        failed = sum(1 for r in results if r['error'])
+        print(f"⏱️  Wall time: {wall:.2f}s for {len(results) - failed}/{len(results)} periods")
+        # Per-period seconds were measured while workers shared the CPUs, so
+        # their sum only approximates a serial run; no serial run is timed
+        print(f"🧮 Sum of per-period times: {serial_seconds:.2f}s")
+        print(f"🚀 Estimated speedup vs serial: {serial_seconds / wall if wall > 0 else 0:.2f}x "
+              f"(sum of per-period times / wall time)")
+        return results
+
+    def serve_api(self, port=None):
+        """Serve reports and count submissions over HTTP until interrupted"""
+        import asyncio
+        from api_server import InventoryAPI, start_server
+
+        port = port or self.config['api_port']
+        app = InventoryAPI(self)
+
+        async def run():
+            server = await start_server(app, "127.0.0.1", port)
+            print(f"🌐 Inventory API listening on http://127.0.0.1:{port}")
+            try:
+                async with server:
+                    await server.serve_forever()
+            finally:
+                written = await app.counts.flush()
+                print(f"💾 Flushed {written} queued counts")
+
+        try:
+            asyncio.run(run())
+        except KeyboardInterrupt:
+            print("👋 API stopped")
+
+    @stage('run_month')
+    def run_month(self, period, sources=None, force=False):
+        """Run the ingest → forecast/plan/pnl → publish DAG for one period"""
+        from pipeline import MonthPipeline
+
+        print(f"🛠️  Running month pipeline for {period}...")
+        start = datetime.now()
+        pipeline = MonthPipeline(self, period, sources, self.config['pipeline_workers'], force)
+        results = pipeline.run()
+        elapsed = (datetime.now() - start).total_seconds()
+
+        icons = {'ran': '✅', 'skipped': '⏭️ ', 'failed': '❌', 'blocked': '⛔'}
+        print(f"\n📋 Pipeline summary ({elapsed:.2f}s):")
+        for name, result in results.items():
+            print(f"   {icons[result['status']]} {name:<9} {result['status']:<8} {result['seconds']:.2f}s")
+        ran = sum(r['status'] == 'ran' for r in results.values())
+        skipped = sum(r['status'] == 'skipped' for r in results.values())
+        print(f"🔁 {ran} stages ran, {skipped} up to date")
+        return results
 
     # Helper methods
     
     def parse_data_input(self, data, data_type):
         """Parse various data input formats"""
-        if isinstance(data, str):
+        import pandas as pd
+
+        if isinstance(data, pd.DataFrame):
+            return data
+        elif isinstance(data, str):
             # Try to parse as JSON first, then CSV
             try:
                 return pd.read_json(data)
@@ -852,8 +1187,20 @@ class InventoryStrategist:
         else:
             return pd.DataFrame(data)
 
+    @stage('load:source')
+    def read_source_file(self, file_path, table):
+        """Read a sales/counts file through its detected schema adapter"""
+        from schema_adapters import read_adapted
+
+        df = read_adapted(file_path, table)
+        print(f"🔌 Detected {table} layout: {df.attrs['layout']}")
+        return df
+
+    @stage('validate')
     def validate_events(self, events_df):
         """Validate event data"""
+        import pandas as pd
+
         required_cols = ['event_id', 'name', 'start_dt', 'end_dt', 'est_attendance']
         missing_cols = [col for col in required_cols if col not in events_df.columns]
         
@@ -870,8 +1217,11 @@ class InventoryStrategist:
         
         return events_df
 
+    @stage('validate')
     def validate_counts(self, counts_df):
         """Validate inventory count data"""
+        import pandas as pd
+
         required_cols = ['asof_date', 'checkpoint', 'location', 'sku', 'qty']
         missing_cols = [col for col in required_cols if col not in counts_df.columns]
         
@@ -886,43 +1236,254 @@ class InventoryStrategist:
         invalid_qty = counts_df[counts_df['qty'] < 0]
         if not invalid_qty.empty:
             print(f"⚠️  Removing {len(invalid_qty)} entries with negative quantities")
-            self.log_exceptions(invalid_qty, "Negative quantities")
+            self.log_exceptions(invalid_qty, "Negative quantities", source='validate_counts')
             counts_df = counts_df[counts_df['qty'] >= 0]
         
         return counts_df
 
-    def log_exceptions(self, exception_data, exception_type):
+    def log_exceptions(self, exception_data, exception_type, severity='HIGH', source=None):
         """Log data quality exceptions"""
-        exceptions_file = self.data_path / "exceptions_log.csv"
-        
-        exception_log = pd.DataFrame({
-            'timestamp': [datetime.now()] * len(exception_data),
-            'exception_type': [exception_type] * len(exception_data),
-            'severity': ['HIGH'] * len(exception_data),
-            'data': [str(row) for _, row in exception_data.iterrows()],
-            'status': ['OPEN'] * len(exception_data)
-        })
-        
-        # Append to existing log or create new
-        if exceptions_file.exists():
-            existing_log = pd.read_csv(exceptions_file)
-            combined_log = pd.concat([existing_log, exception_log], ignore_index=True)
-        else:
-            combined_log = exception_log
-        
-        combined_log.to_csv(exceptions_file, index=False)
+        self.get_exception_log().add(exception_data, exception_type, severity, source)
+
+    def get_exception_log(self):
+        """Shared append-only exceptions sink (data/exceptions/*.jsonl)"""
+        return self._exception_log
+
+    def exceptions_summary(self):
+        """Show open/resolved exception counts by type and severity"""
+        print("🚩 Exceptions Summary...")
+        summary_df = self.get_exception_log().summary()
+        if summary_df.empty:
+            print("✅ No exceptions logged")
+            return summary_df
+
+        for row in summary_df.itertuples():
+            print(f"   • {row.exception_type:<28} {row.severity:<7} {row.status:<9} {row.count:>8,}")
+        print(f"📊 Total: {summary_df['count'].sum():,} exceptions")
+        return summary_df
 
     def load_data(self, filename, path=None):
         """Load data file with error handling"""
+        import pandas as pd
+
         if path is None:
             path = self.data_path
         
         file_path = path / filename
         if file_path.exists():
-            return pd.read_csv(file_path)
+            from table_dtypes import table_for_file
+            read = lambda p: self.apply_dtypes(pd.read_csv(p), table_for_file(filename))
+            with self.metrics.step(f"load:{filename}") as step:
+                if self.table_cache is not None:
+                    df = self.table_cache.get(file_path, read)
+                else:
+                    df = read(file_path)
+                step['rows_out'] = len(df)
+            return df
         else:
             return None
 
+    def load_event_index(self):
+        """Interval index over processed events, rebuilt when events_processed.csv changes"""
+        from event_index import EVENTS_FILE, EventIndex
+
+        with self.metrics.step("load:event_index") as step:
+            index = EventIndex.load_or_build(self.data_path / EVENTS_FILE,
+                                             load_events=lambda p: self.load_data(p.name))
+            step['rows_out'] = len(index.partition()) if index else 0
+        return index
+
+    def apply_dtypes(self, df, table):
+        """Apply the central dtype registry to a loaded or ingested table"""
+        from table_dtypes import apply_dtypes
+        return apply_dtypes(df, table)
+
+    def data_memory_report(self):
+        """Report bytes per core table before and after the dtype registry"""
+        import pandas as pd
+        from table_dtypes import memory_report, table_for_file
+
+        print("🧮 Measuring table memory...")
+
+        frames = {}
+        for folder in (self.data_path, self.reports_path):
+            for file_path in sorted(folder.glob("*.csv")):
+                table = table_for_file(file_path.name)
+                if table:
+                    frames[file_path.name] = (table, pd.read_csv(file_path))
+
+        if not frames:
+            print("❌ No core tables found. Run the /ingest commands first.")
+            return None
+
+        report_df = memory_report(frames)
+        for row in report_df.itertuples():
+            print(f"   • {row.table:<28} {row.rows:>8,} rows  "
+                  f"{row.bytes_before:>12,} → {row.bytes_after:>12,} bytes  (-{row.saved_pct}%)")
+
+        total_before = report_df['bytes_before'].sum()
+        total_after = report_df['bytes_after'].sum()
+        print(f"✅ Total: {total_before:,} → {total_after:,} bytes")
+
+        output_file = self.reports_path / "memory_report.csv"
+        report_df.to_csv(output_file, index=False)
+        print(f"💾 Saved to: {output_file}")
+        return report_df
+
+    def events_active(self, start, end=None, venue=None, lifecycle='event'):
+        """Events whose run (or site footprint) overlaps a date range, per venue"""
+        import pandas as pd
+
+        index = self.load_event_index()
+        if index is None:
+            print("❌ No processed events (run /ingest events first)")
+            return None
+        first = pd.Timestamp(start).normalize()
+        last = pd.Timestamp(end or start).normalize() + pd.Timedelta(days=1) - pd.Timedelta(1, 'ns')
+        if venue and venue not in index.venues:
+            print(f"❌ No events at venue '{venue}' (venues: {', '.join(index.venues)})")
+            return None
+
+        label = "on site" if lifecycle == 'site' else "running"
+        active = index.overlapping(first, last, venue, lifecycle).drop(columns='query')
+        print(f"📅 {len(active)} events {label} {first:%Y-%m-%d} → {last:%Y-%m-%d}"
+              f"{f' at {venue}' if venue else ''}")
+        for name in ([venue] if venue else index.venues):
+            count = int(index.count_overlapping(first, last, name, lifecycle)[0])
+            if count:
+                attendance = index.attendance_overlapping(first, last, name, lifecycle)[0]
+                print(f"   • {name:<40} {count:>6} events  {attendance:>10,.0f} attendance")
+        return active
+
+    @stage('venues_load')
+    def venues_load(self, period=None, lifecycle='event'):
+        """Sweep-line venue concurrency: daily load, peak windows and stocking targets"""
+        import pandas as pd
+        from venue_load import daily_load, peak_windows, stocking_targets
+
+        label = "site footprint" if lifecycle == 'site' else "event run"
+        print(f"🏟️  Computing Venue Load ({label}){f' for {period}' if period else ''}...")
+        events_df = self.load_data('events_processed.csv')
+        if events_df is None:
+            print("❌ No processed events (run /ingest events first)")
+            return None
+
+        first = last = None
+        if period:
+            month = pd.Period(period, 'M')
+            first, last = month.start_time, month.end_time.normalize()
+        with self.metrics.step('sweep', len(events_df)) as step:
+            daily = daily_load(events_df, lifecycle, first, last)
+            step['rows_out'] = len(daily)
+        peaks = peak_windows(daily, self.config['venue_peak_share'])
+        targets = stocking_targets(daily, self.config['default_event_conversion'],
+                                   self.config['default_attach_rate'])
+
+        suffix = period or "all"
+        outputs = {'venue_load': daily, 'venue_peaks': peaks, 'venue_targets': targets}
+        with self.metrics.step('write', len(daily)):
+            for name, frame in outputs.items():
+                frame.to_csv(self.reports_path / f"{name}_{suffix}.csv", index=False)
+
+        print(f"✅ {len(targets)} venues, {len(daily):,} venue-days with events, {len(peaks)} peak windows")
+        for row in targets.itertuples():
+            print(f"   • {row.venue_area:<40} peak {row.peak_attendance:>9,.0f} onsite "
+                  f"({row.peak_events} events, {row.peak_date:%Y-%m-%d}) → stock {row.target_units:,} units")
+        print(f"💾 Saved to: {self.reports_path}/venue_{{load,peaks,targets}}_{suffix}.csv")
+
+        self.show_assumptions("Venue load", [
+            f"Onsite window = {'In-Date → Out-Date' if lifecycle == 'site' else 'Start → End'} of each event",
+            "Peak = most attendees onsite at the same moment (events overlapping in time)",
+            f"Peak windows = consecutive days at ≥{self.config['venue_peak_share']:.0%} of the venue's peak",
+            "Target units = peak attendance × conversion × attach rate",
+        ])
+        return targets
+
+    @stage('export_bi')
+    def export_bi(self, out_dir=None, fmt=None):
+        """Star schema for Power BI: dimensions plus month-partitioned facts"""
+        import pandas as pd
+        from bi_export import BI_DIR, MANIFEST_FILE, QUERIES_DIR, export_star, resolve_format
+
+        try:
+            fmt = resolve_format(fmt)
+        except ValueError as e:
+            print(f"❌ {e}")
+            return None
+        out_dir = Path(out_dir) if out_dir else self.reports_path / BI_DIR
+        print(f"📤 Exporting Power BI star schema ({fmt}) to {out_dir}...")
+
+        counts_df = self.load_data('counts_unified.csv')
+        forecasts = [self.load_data(p.name, self.reports_path)
+                     for p in sorted(self.reports_path.glob('forecast_????-??.csv'))]
+        sources = {
+            'events': self.load_data('events_processed.csv'),
+            'sales': self.load_data('sales_processed.csv'),
+            'counts': counts_df if counts_df is not None else self.load_data('counts_processed.csv'),
+            'forecast': pd.concat(forecasts, ignore_index=True) if forecasts else None,
+        }
+        for name, frame in sources.items():
+            if frame is None:
+                print(f"⚠️  No processed {name} found - its tables will be empty")
+
+        with self.metrics.step('write') as step:
+            manifest = export_star(out_dir, sources, self.get_sample_skus(), fmt)
+            step['rows_out'] = sum(t['rows'] for t in manifest['tables'].values())
+
+        for name, table in manifest['tables'].items():
+            parts = f", {len(table['files'])} monthly partitions" if name.startswith('fact_') else ""
+            print(f"   • {name:<14} {table['rows']:>10,} rows{parts}")
+        print(f"✅ Wrote {len(manifest['changed'])} new or changed files "
+              f"(unchanged partitions left as they were)")
+        print(f"🧾 Manifest: {out_dir / MANIFEST_FILE}")
+        print(f"📜 Power Query scripts: {out_dir / QUERIES_DIR} (set the BiFolder parameter)")
+
+        self.show_assumptions("Power BI export", [
+            "Surrogate keys stay stable across exports; key 0 is the '(none)' member",
+            "Facts are partitioned by month for incremental refresh on RangeStart/RangeEnd",
+            "dim_sku comes from the planning SKU master plus any SKU seen in the facts",
+        ])
+        return manifest
+
+    def metrics_list(self):
+        """Saved run metrics, oldest first"""
+        from metrics import list_runs
+
+        runs = list_runs(self.reports_path / "metrics")
+        print(f"📈 {len(runs)} saved runs in {self.reports_path / 'metrics'}")
+        for path in runs[-20:]:
+            run = json.loads(path.read_text())
+            print(f"   • {run['run_id']:<48} {run['total']['wall_s']:>8.3f}s  {run['command']}")
+        return runs
+
+    def metrics_compare(self, baseline=None, current=None):
+        """Per-stage time deltas between two runs, flagging regressions"""
+        from metrics import compare_runs, latest_pair, load_run
+
+        metrics_dir = self.reports_path / "metrics"
+        if baseline and current:
+            baseline, current = load_run(metrics_dir, baseline), load_run(metrics_dir, current)
+        else:
+            baseline, current = latest_pair(metrics_dir)
+        if baseline is None:
+            print("❌ Need two runs of the same command to compare (see /metrics list)")
+            return None
+
+        threshold = self.config['metrics_regression_pct']
+        rows = compare_runs(baseline, current, threshold)
+        print(f"📈 {current['command']}: {baseline['run_id']} → {current['run_id']}")
+        for row in rows:
+            before = f"{row['baseline_wall_s']:.4f}s" if row['baseline_wall_s'] is not None else "new"
+            delta = f"{row['delta_pct']:+.1f}%" if row['delta_pct'] is not None else ""
+            flag = "🔺" if row['regressed'] else "  "
+            print(f"   {flag} {row['stage']:<44} {before:>10} → {row['wall_s']:.4f}s {delta:>8}")
+        regressed = [row['stage'] for row in rows if row['regressed']]
+        if regressed:
+            print(f"⚠️  {len(regressed)} stage(s) slower by more than {threshold}%: {', '.join(regressed)}")
+        else:
+            print(f"✅ No stage slower by more than {threshold}%")
+        return rows
+
     def show_assumptions(self, context, assumptions):
         """Display assumptions made during analysis"""
         print(f"\n📋 Assumptions ({context}):")
@@ -930,23 +1491,50 @@ class InventoryStrategist:
             print(f"   {i}. {assumption}")
         print()
 
-    def generate_summary_report(self, period):
-        """Generate executive summary report"""
+    def generate_summary_report(self, period, kpis):
+        """Generate executive summary report from the publish KPIs"""
+        forecast, buy, pnl = kpis['forecast'], kpis['buy_plan'], kpis['pnl']
+        na = "n/a - run the command for this period"
+
+        if forecast:
+            forecast_line = (f"{forecast['total_units']:,.0f} units across {forecast['skus']} SKUs "
+                             f"({forecast['event_lift_units']:,.0f} from event lift)")
+        else:
+            forecast_line = na
+        if buy:
+            buy_lines = (f"• Reorder: {buy['skus_to_order']} SKUs, {buy['units_to_order']:,.0f} units, "
+                         f"${buy['order_cost']:,.2f} ({buy['budget_used_pct']:.1%} of "
+                         f"${buy['budget']:,.0f} budget)\n"
+                         f"• Priority: {buy['priority']['HIGH']} HIGH / {buy['priority']['MEDIUM']} MEDIUM / "
+                         f"{buy['priority']['LOW']} LOW; {buy['below_rop']} below ROP")
+        else:
+            buy_lines = f"• Buy Plan: {na}"
+        if pnl:
+            pnl_lines = (f"• Revenue: ${pnl['revenue']:,.2f} on {pnl['units_sold']:,} units\n"
+                         f"• Gross Margin: ${pnl['gross_margin']:,.2f} ({pnl['gm_pct']:.1%}), "
+                         f"GMROI {pnl['gmroi']:.2f}x, sell-through {pnl['sell_through']:.1%}")
+        else:
+            pnl_lines = f"• P&L: {na}"
+
+        critical = ", ".join(buy['critical_skus']) if buy and buy['critical_skus'] else "none"
+        low_dos = buy['low_dos'] if buy else 0
+        low_gmroi = pnl['low_gmroi_skus'] if pnl else 0
+
         return f"""
 EXECUTIVE SUMMARY - CONVENTION INVENTORY MANAGEMENT
 Period: {period}
 Generated: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}
 
 OPERATIONAL METRICS:
-• Forecasting: Event-aware demand planning with baseline + event lift
+• Forecast Demand: {forecast_line}
+{buy_lines}
+{pnl_lines}
 • Safety Stock: Calculated at {self.config['z_service_level']:.2f} sigma service level
-• Buy Planning: Target {self.config['target_days_of_supply']} days of supply
-• Budget Constraint: ${self.config['max_cash_per_order']:,.0f} per purchase order
 
 KEY RECOMMENDATIONS:
-1. Focus on HIGH priority SKUs for immediate reordering
-2. Monitor DoS levels below {self.config['low_dos_warning']} days  
-3. Review SKUs with GMROI < 2.0x for profitability
+1. Reorder HIGH priority SKUs now: {critical}
+2. Monitor {low_dos} SKUs with DoS below {self.config['low_dos_warning']} days
+3. Review {low_gmroi} SKUs with GMROI < 2.0x for profitability
 4. Investigate shrink variances > {self.config['shrink_threshold_pct']:.1%}
 
 NEXT ACTIONS:
@@ -959,32 +1547,59 @@ Senior Economics & Inventory Strategist
 "Let's turn stock into profit, not décor"
 """
 
-    def generate_dashboard_text(self, period):
-        """Generate text version of dashboard"""
+    def generate_dashboard_text(self, period, kpis):
+        """Generate text version of dashboard from the publish KPIs"""
+        forecast, buy, pnl = kpis['forecast'], kpis['buy_plan'], kpis['pnl']
+
+        indicators = []
+        if pnl:
+            indicators += [
+                f"• Revenue: ${pnl['revenue']:,.2f}",
+                f"• Gross Margin: ${pnl['gross_margin']:,.2f} ({pnl['gm_pct']:.1%})",
+                f"• GMROI: {pnl['gmroi']:.2f}x (target >3.0x)",
+                f"• Sell-Through: {pnl['sell_through']:.1%} (target >75%)",
+            ]
+        if buy:
+            indicators += [
+                f"• Avg Days of Supply: {buy['avg_days_of_supply']:.1f} (optimal 20-40)",
+                f"• Stockout Risk: {buy['below_rop']} of {buy['skus']} SKUs below ROP",
+            ]
+        if not indicators:
+            indicators = ["• No P&L or buy plan outputs for this period"]
+
+        categories = [f"• {category:<15} ${values['revenue']:>12,.2f}  GM ${values['gross_margin']:>12,.2f}"
+                      for category, values in (pnl['by_category'] if pnl else {}).items()]
+
+        planning = []
+        if forecast:
+            confidence = ", ".join(f"{level} {count}" for level, count in forecast['confidence'].items())
+            planning.append(f"• Forecast: {forecast['total_units']:,.0f} units ({confidence})")
+        if buy:
+            planning.append(f"• Purchase Orders: ${buy['order_cost']:,.2f} for {buy['skus_to_order']} SKUs "
+                            f"({buy['budget_used_pct']:.1%} of budget)")
+            planning.append(f"• Priority Mix: HIGH {buy['priority']['HIGH']} | "
+                            f"MEDIUM {buy['priority']['MEDIUM']} | LOW {buy['priority']['LOW']}")
+
+        venues = [f"• {name:<40} peak {values['peak_attendance']:>9,.0f} on {values['peak_date']}  "
+                  f"stock {values['target_units']:,} units"
+                  for name, values in (kpis.get('venues') or {}).get('by_venue', {}).items()]
+
+        newline = "\n"
         return f"""
 CONVENTION INVENTORY DASHBOARD - {period}
 {'='*50}
 
 PERFORMANCE INDICATORS:
-• Revenue Target: Track against monthly goals
-• Gross Margin: Monitor profitability by category
-• GMROI: Target >3.0x for healthy inventory turns
-• Sell-Through: Target >75% for demand accuracy  
-• Days of Supply: Maintain 20-40 days optimal range
-• Stockout Risk: Minimize SKUs below ROP
-• Shrink Control: Keep variance <2%
-
-OPERATIONAL STATUS:
-• Dual intake counting system active
-• Microsoft Forms + Manual transcription enabled
-• Power Query refresh automating data flow
-• Exception monitoring identifying data quality issues
+{newline.join(indicators)}
+
+REVENUE BY CATEGORY:
+{newline.join(categories) or '• No sales recorded'}
 
 INVENTORY PLANNING:
-• Event-aware forecasting incorporating attendance estimates
-• Safety stock calculations based on demand variability  
-• Purchase recommendations within budget constraints
-• Performance metrics guiding strategic decisions
+{newline.join(planning) or '• No forecast or buy plan for this period'}
+
+VENUE PEAK LOAD:
+{newline.join(venues) or '• Run /venues load for venue peaks and stocking targets'}
 
 Last Updated: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}
 """
@@ -993,6 +1608,8 @@ Last Updated: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}
     
     def get_sample_events(self):
         """Generate sample events data"""
+        import pandas as pd
+
         return pd.DataFrame([
             {"event_id": "EVT001", "name": "Q4 Tech Conference", "venue_area": "Main Hall", 
              "event_type": "Conference", "start_dt": "2025-09-15 09:00:00", 
@@ -1004,6 +1621,8 @@ Last Updated: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}
 
     def get_sample_skus(self):
         """Generate sample SKU data"""
+        import pandas as pd
+
         return pd.DataFrame([
             {"sku": "SKU001", "desc": "Branded Pen", "category": "Promotional", 
              "cost": 0.50, "price": 2.00, "lead_time_days": 14},
@@ -1015,6 +1634,8 @@ Last Updated: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}
 
     def get_sample_counts(self):
         """Generate sample count data"""
+        import pandas as pd
+
         return pd.DataFrame([
             {"asof_date": "2025-08-01", "checkpoint": "BOM", "location": "in_store",
              "sku": "SKU001", "qty": 150, "uom": "EA", "counter_id": "JD001", "notes": ""},
@@ -1026,6 +1647,8 @@ Last Updated: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}
 
     def get_sample_sales(self):
         """Generate sample sales data"""
+        import pandas as pd
+
         return pd.DataFrame([
             {"date": "2025-08-02", "sku": "SKU001", "units_sold": 12, "revenue": 24.00, "event_id": ""},
             {"date": "2025-08-03", "sku": "SKU002", "units_sold": 15, "revenue": 52.50, "event_id": ""},
@@ -1033,75 +1656,156 @@ Last Updated: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}
         ])
 
 
+# Commands that need an InventoryStrategist; anything else is answered before one is built
+COMMANDS = ("/ingest", "/forms", "/counts", "/forecast", "/plan", "/pnl",
+            "/exceptions", "/data", "/build", "/publish", "/run", "/serve", "/metrics", "/events",
+            "/venues", "/export")
+
+
+def dispatch(strategist, command, args):
+    """Run one command against a strategist (shared by the CLI and /session)"""
+    if command == "/ingest" and len(args) >= 1:
+        data_type = args[0]
+        file_path = args[1] if len(args) > 1 else None
+        
+        if data_type in ("audits", "sales") and file_path:
+            from batch_ingest import needs_batch
+            if needs_batch(args[1:]):
+                strategist.ingest_batch(args[1:], data_type)
+                return
+        
+        if data_type == "events":
+            strategist.ingest_events(file_path)
+        elif data_type == "audits":
+            strategist.ingest_audits(file_path)  
+        elif data_type == "sales":
+            strategist.ingest_sales(file_path)
+        else:
+            print(f"❌ Unknown data type: {data_type}")
+            
+    elif command == "/forms" and len(args) >= 1 and args[0] == "setup" and len(args) >= 2 and args[1] == "ms":
+        strategist.forms_setup_ms()
+        
+    elif command == "/counts":
+        if len(args) >= 1:
+            if args[0] == "manual" and len(args) >= 2 and args[1] == "enable":
+                strategist.counts_manual_enable()
+            elif args[0] == "unify":
+                strategist.counts_unify()
+            else:
+                print(f"❌ Unknown counts command: {' '.join(args)}")
+        else:
+            print("❌ Missing counts subcommand")
+            
+    elif command == "/forecast" and len(args) >= 1:
+        period = args[0]
+        strategist.forecast(period)
+        
+    elif command == "/plan" and len(args) >= 1:
+        period = args[0]
+        strategist.plan(period)
+        
+    elif command == "/pnl" and len(args) >= 1:
+        period = args[0]
+        strategist.pnl(period)
+        
+    elif command == "/exceptions" and len(args) >= 1 and args[0] == "summary":
+        strategist.exceptions_summary()
+        
+    elif command == "/data" and len(args) >= 1 and args[0] == "memory":
+        strategist.data_memory_report()
+        
+    elif command == "/build" and len(args) >= 1 and args[0] == "workbook":
+        mode = args[1] if len(args) >= 2 else None
+        period = args[2] if len(args) >= 3 else None
+        strategist.build_workbook(stream=mode == "stream", period=period,
+                                  refresh=mode == "refresh",
+                                  mode=mode if mode in ("formulas", "values", "hybrid") else None)
+        
+    elif command == "/publish" and len(args) >= 3 and args[0] == "batch":
+        strategist.publish_batch(args[1], args[2], serial="--serial" in args)
+        
+    elif command == "/publish" and len(args) >= 2 and args[0] == "pack":
+        period = args[1]
+        strategist.publish_pack(period)
+        
+    elif command == "/events" and len(args) >= 2 and args[0] == "active":
+        options = dict(arg.split("=", 1) for arg in args[1:] if "=" in arg)
+        dates = [arg for arg in args[1:] if "=" not in arg and not arg.startswith("--")]
+        strategist.events_active(dates[0], dates[1] if len(dates) > 1 else None, options.get("venue"),
+                                 'site' if "--site" in args else 'event')
+        
+    elif command == "/venues" and len(args) >= 1 and args[0] == "load":
+        periods = [arg for arg in args[1:] if not arg.startswith("--")]
+        strategist.venues_load(periods[0] if periods else None, 'site' if "--site" in args else 'event')
+        
+    elif command == "/export" and len(args) >= 1 and args[0] == "bi":
+        paths = [arg for arg in args[1:] if not arg.startswith("--")]
+        strategist.export_bi(paths[0] if paths else None, 'csv' if "--csv" in args else None)
+        
+    elif command == "/metrics" and len(args) >= 1 and args[0] == "list":
+        strategist.metrics_list()
+        
+    elif command == "/metrics" and len(args) >= 1 and args[0] == "compare":
+        strategist.metrics_compare(*args[1:3])
+        
+    elif command == "/serve" and len(args) >= 1 and args[0] == "api":
+        strategist.serve_api(int(args[1]) if len(args) >= 2 else None)
+        
+    elif command == "/run" and len(args) >= 2 and args[0] == "month":
+        period = args[1]
+        sources = dict(arg.split("=", 1) for arg in args[2:] if "=" in arg)
+        unknown = set(sources) - {"events", "sales", "audits"}
+        if unknown:
+            print(f"❌ Unknown pipeline source: {', '.join(sorted(unknown))}")
+        else:
+            strategist.run_month(period, sources, force="--force" in args)
+        
+    else:
+        print(f"❌ Unknown command: {command}")
+        print("Run 'python ops_controller.py --help' for available commands")
+
+
 def main():
     """Main CLI interface"""
-    strategist = InventoryStrategist()
+    argv = sys.argv[1:]
+    profile = "--profile" in argv
+    if profile:
+        argv = [arg for arg in argv if arg != "--profile"]
+    if not argv:
+        print("Usage: python ops_controller.py [command] [args] [--profile]")
+        print("Run 'python ops_controller.py --help' for available commands")
+        return
     
-    if len(sys.argv) < 2:
-        print("Usage: python ops_controller.py [command] [args]")
+    command = argv[0].lower()
+    args = argv[1:]
+    
+    if command in ("--help", "-h"):
+        print(__doc__)
+        return
+    if command == "/session":
+        from session import session_main
+        session_main(args)
+        return
+    if command not in COMMANDS:
+        print(f"❌ Unknown command: {command}")
         print("Run 'python ops_controller.py --help' for available commands")
         return
     
-    command = sys.argv[1].lower()
-    args = sys.argv[2:] if len(sys.argv) > 2 else []
+    strategist = InventoryStrategist()
+    if profile:
+        strategist.metrics.start_profile()
     
     try:
-        if command == "/ingest" and len(args) >= 1:
-            data_type = args[0]
-            file_path = args[1] if len(args) > 1 else None
-            
-            if data_type == "events":
-                strategist.ingest_events(file_path)
-            elif data_type == "audits":
-                strategist.ingest_audits(file_path)  
-            elif data_type == "sales":
-                strategist.ingest_sales(file_path)
-            else:
-                print(f"❌ Unknown data type: {data_type}")
-                
-        elif command == "/forms" and len(args) >= 1 and args[0] == "setup" and len(args) >= 2 and args[1] == "ms":
-            strategist.forms_setup_ms()
-            
-        elif command == "/counts":
-            if len(args) >= 1:
-                if args[0] == "manual" and len(args) >= 2 and args[1] == "enable":
-                    strategist.counts_manual_enable()
-                elif args[0] == "unify":
-                    strategist.counts_unify()
-                else:
-                    print(f"❌ Unknown counts command: {' '.join(args)}")
-            else:
-                print("❌ Missing counts subcommand")
-                
-        elif command == "/forecast" and len(args) >= 1:
-            period = args[0]
-            strategist.forecast(period)
-            
-        elif command == "/plan" and len(args) >= 1:
-            period = args[0]
-            strategist.plan(period)
-            
-        elif command == "/pnl" and len(args) >= 1:
-            period = args[0]
-            strategist.pnl(period)
-            
-        elif command == "/build" and len(args) >= 1 and args[0] == "workbook":
-            strategist.build_workbook()
-            
-        elif command == "/publish" and len(args) >= 2 and args[0] == "pack":
-            period = args[1]
-            strategist.publish_pack(period)
-            
-        elif command == "--help":
-            print(__doc__)
-            
-        else:
-            print(f"❌ Unknown command: {command}")
-            print("Run 'python ops_controller.py --help' for available commands")
-            
+        dispatch(strategist, command, args)
     except Exception as e:
         print(f"❌ Error executing command: {e}")
         print("📞 Contact: Senior Economics & Inventory Strategist")
+    
+    metrics_file = strategist.metrics.save(strategist.reports_path / "metrics", " ".join([command] + args),
+                                           strategist.config['metrics_keep_runs'])
+    if profile and metrics_file:
+        print(f"📈 Metrics and profile: {metrics_file}")
 
 
 if __name__ == "__main__":
@@ -0,0 +1,272 @@
+# Month Pipeline Runner
+# Declares the InventoryStrategist stages behind a monthly report pack as a DAG
+#
+#   events ─────────┐
+#   sales ──────────┼─> forecast ──> plan ──┐
+#   audits ─> counts ┼─────────────────┘     ├─> publish
+#                   └─> pnl ────────────────┘
+#
+# Every stage gets a key from its inputs (upstream keys, source files, the
+# config values it reads). A stage whose key matches the one recorded for its
+# output file is skipped. The forecast sees only the digest of the events
+# touching its month, so editing one month's events reruns that month alone.
+# Ready stages run concurrently in threads and hand their frames to downstream
+# stages in memory; frames of skipped stages are only read back from disk when
+# a stage that does run needs them.
+
+import hashlib
+import io
+import json
+import sys
+import threading
+import time
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from pathlib import Path
+
+STATE_FILE = "pipeline_state.json"
+
+# Ingest stages turn a raw source file into a processed table under data/
+INGEST_STAGES = ['events', 'sales', 'audits']
+
+STAGES = {
+    'events': {'deps': [], 'output': 'data/events_processed.csv', 'config': []},
+    'sales': {'deps': [], 'output': 'data/sales_processed.csv', 'config': []},
+    'audits': {'deps': [], 'output': 'data/counts_processed.csv', 'config': []},
+    'counts': {
+        'deps': ['audits'], 'output': 'data/counts_unified.csv', 'config': [],
+        'files': ['data/forms_responses.csv', 'data/manual_entries.csv'],
+        'optional': True,  # no count sources still lets plan/pnl run with zero stock
+    },
+    'forecast': {
+        'deps': ['sales', 'events'], 'output': 'reports/forecast_{period}.csv',
+        'config': ['default_event_conversion', 'default_attach_rate'],
+        # only the events touching the period count (events_delta.json month digests)
+        'period_deps': ['events'],
+    },
+    'plan': {
+        'deps': ['forecast', 'counts'], 'output': 'reports/buy_plan_{period}.csv',
+        'config': ['z_service_level', 'default_lead_time_days', 'target_days_of_supply',
+                   'max_cash_per_order', 'low_dos_warning'],
+    },
+    'pnl': {
+        'deps': ['sales', 'counts'], 'output': 'reports/pnl_snapshot_{period}.csv', 'config': [],
+    },
+    'publish': {
+        'deps': ['forecast', 'plan', 'pnl'], 'output': 'reports/{period}/report_pack_{period}.zip',
+        'config': ['z_service_level', 'max_cash_per_order', 'low_dos_warning', 'shrink_threshold_pct'],
+    },
+}
+
+
+def run_stage(strategist, name, period, inputs, source=None):
+    """Call the InventoryStrategist method behind one stage"""
+    if name == 'events':
+        return strategist.ingest_events(source)
+    if name == 'sales':
+        return strategist.ingest_sales(source)
+    if name == 'audits':
+        return strategist.ingest_audits(source)
+    if name == 'counts':
+        return strategist.counts_unify(audits_df=inputs['audits'])
+    if name == 'forecast':
+        return strategist.forecast(period, sales_df=inputs['sales'], events_df=inputs['events'])
+    if name == 'plan':
+        return strategist.plan(period, forecast_df=inputs['forecast'], counts_df=inputs['counts'])
+    if name == 'pnl':
+        return strategist.pnl(period, sales_df=inputs['sales'], counts_df=inputs['counts'])
+    if name == 'publish':
+        return strategist.publish_pack(period, frames={
+            'forecast': inputs['forecast'], 'buy_plan': inputs['plan'], 'pnl_snapshot': inputs['pnl'],
+        })
+    raise ValueError(f"Unknown pipeline stage '{name}'")
+
+
+def topological_order(stages=STAGES):
+    """Stage names with every stage after its dependencies"""
+    order, seen = [], set()
+
+    def visit(name):
+        if name not in seen:
+            seen.add(name)
+            for dep in stages[name]['deps']:
+                visit(dep)
+            order.append(name)
+
+    for name in stages:
+        visit(name)
+    return order
+
+
+def file_digest(path):
+    """sha256 of a file's bytes, or None if it does not exist"""
+    path = Path(path)
+    if not path.exists():
+        return None
+    digest = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for block in iter(lambda: f.read(1 << 20), b''):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+class ThreadLocalOutput:
+    """sys.stdout stand-in that routes a thread's prints to its own buffer when it has one"""
+
+    def __init__(self, stream):
+        self.stream = stream
+        self.local = threading.local()
+
+    def write(self, text):
+        buffer = getattr(self.local, 'buffer', None)
+        return (buffer if buffer is not None else self.stream).write(text)
+
+    def flush(self):
+        self.stream.flush()
+
+
+class MonthPipeline:
+    """Runs the stages for one period, skipping the ones already up to date"""
+
+    def __init__(self, strategist, period, sources=None, workers=4, force=False, quiet=False):
+        self.strategist = strategist
+        self.period = period
+        self.sources = sources or {}
+        self.workers = max(1, workers or 1)
+        self.force = force
+        self.quiet = quiet
+        self.base_path = Path(strategist.base_path)
+        self.state_path = Path(strategist.data_path) / STATE_FILE
+        self.state = json.loads(self.state_path.read_text()) if self.state_path.exists() else {}
+        self.keys = {}
+        self.frames = {}
+        self.results = {}
+        self._frame_lock = threading.Lock()
+
+    def output(self, name):
+        return self.base_path / STAGES[name]['output'].format(period=self.period)
+
+    def stage_key(self, name):
+        """Key over everything the stage reads; None means it must run
+
+        Ingest stages are keyed by their source file; downstream stages see
+        the digest of the processed table instead (see _settle).
+        """
+        spec = STAGES[name]
+        if name in INGEST_STAGES:
+            source = self.sources.get(name)
+            return file_digest(source) if source else None
+
+        digest = hashlib.sha256()
+        config = {key: self.strategist.config.get(key) for key in spec['config']}
+        files = {f: file_digest(self.base_path / f) for f in spec.get('files', [])}
+        upstream = {dep: self.upstream_key(dep) if dep in spec.get('period_deps', []) else self.keys[dep]
+                    for dep in spec['deps']}
+        digest.update(json.dumps([name, self.period, config, files, upstream],
+                                 sort_keys=True, default=str).encode())
+        return digest.hexdigest()
+
+    def upstream_key(self, dep):
+        """Digest of the dependency's rows touching this period, when its ingest recorded one"""
+        from event_delta import load_delta
+
+        delta = load_delta(Path(self.strategist.data_path))
+        if delta is None or delta.get('events_digest') != self.keys[dep]:
+            return self.keys[dep]
+        return delta['month_digests'].get(self.period, 'none')
+
+    def is_current(self, name, key):
+        output = self.output(name)
+        if name in INGEST_STAGES and name not in self.sources:
+            return output.exists()  # nothing new to ingest; the processed table is the input
+        return (not self.force and key is not None and output.exists()
+                and self.state.get(str(output)) == key)
+
+    def input_frame(self, name):
+        """Frame of an upstream stage, read from its output file if it was skipped"""
+        with self._frame_lock:
+            if name not in self.frames:
+                output = self.output(name)
+                self.frames[name] = self.strategist.load_data(output.name, output.parent)
+            return self.frames[name]
+
+    def _execute(self, name, stdout):
+        """Worker: run one stage with its prints captured"""
+        buffer = io.StringIO()
+        stdout.local.buffer = buffer
+        started = time.perf_counter()
+        try:
+            inputs = {dep: self.input_frame(dep) for dep in STAGES[name]['deps']}
+            result = run_stage(self.strategist, name, self.period, inputs, self.sources.get(name))
+            error = None
+        except Exception as e:
+            result, error = None, f"{type(e).__name__}: {e}"
+        finally:
+            stdout.local.buffer = None
+        return result, error, time.perf_counter() - started, buffer.getvalue()
+
+    def _settle(self, name, status, seconds=0.0):
+        """Record a finished stage; ingest stages expose their output digest downstream"""
+        if name in INGEST_STAGES and status in ('ran', 'skipped'):
+            self.keys[name] = file_digest(self.output(name))
+        self.results[name] = {'status': status, 'seconds': round(seconds, 3)}
+
+    def _finish(self, name, result, error, seconds, log):
+        """Record a finished stage and its key; returns its status"""
+        if not self.quiet:
+            print(f"\n── {name} ──")
+            print(log.rstrip())
+        if error is not None or (result is None and not STAGES[name].get('optional')):
+            status = 'failed'
+            if not self.quiet:
+                print(f"❌ Stage {name} failed" + (f": {error}" if error else ""))
+        else:
+            status = 'ran'
+            if isinstance(result, list):  # publish returns the written paths
+                result = None
+            with self._frame_lock:
+                self.frames[name] = result
+            self.state[str(self.output(name))] = self.keys[name]
+        self._settle(name, status, seconds)
+        return status
+
+    def _ready(self, pending, done):
+        """Pending stages whose dependencies have all finished"""
+        return [name for name in pending if all(dep in done for dep in STAGES[name]['deps'])]
+
+    def run(self):
+        """Run the DAG; returns {stage: {'status', 'seconds'}}"""
+        order = topological_order()
+        pending, done, running = list(order), set(), {}
+        stdout = ThreadLocalOutput(sys.stdout)
+        real_stdout, sys.stdout = sys.stdout, stdout
+
+        try:
+            with ThreadPoolExecutor(max_workers=self.workers) as pool:
+                while pending or running:
+                    for name in self._ready(pending, done):
+                        pending.remove(name)
+                        if any(self.results[dep]['status'] in ('failed', 'blocked')
+                               for dep in STAGES[name]['deps']):
+                            self._settle(name, 'blocked')
+                            done.add(name)
+                            continue
+                        self.keys[name] = self.stage_key(name)
+                        if self.is_current(name, self.keys[name]):
+                            self._settle(name, 'skipped')
+                            done.add(name)
+                            continue
+                        running[pool.submit(self._execute, name, stdout)] = name
+
+                    if not running:
+                        continue
+                    finished, _ = wait(running, return_when=FIRST_COMPLETED)
+                    for future in finished:
+                        name = running.pop(future)
+                        self._finish(name, *future.result())
+                        done.add(name)
+        finally:
+            sys.stdout = real_stdout
+            self.state_path.parent.mkdir(parents=True, exist_ok=True)
+            self.state_path.write_text(json.dumps(self.state, indent=2, sort_keys=True))
+
+        return {name: self.results[name] for name in order}
@@ -0,0 +1,272 @@
+"""
+Golden-file regression harness with time and memory budgets.
+
+Drives InventoryStrategist in-process on a fixed-seed datagen dataset, then
+checks each case two ways:
+
+- outputs: the forecast, buy plan and P&L CSVs and the published KPIs are
+  compared with the golden copies in tests/golden/ (numbers within a
+  relative/absolute tolerance, everything else exactly);
+- budgets: each case's best-of-N wall time and its tracemalloc peak must
+  stay within TIME_TOLERANCE / MEMORY_TOLERANCE of the recorded baseline
+  (plus a small absolute slack, so timer noise on millisecond cases does
+  not fail the run).
+
+Wall times are stored as multiples of a fixed pandas/NumPy calibration
+workload timed on the same machine, so a budget recorded on a laptop still
+holds on a slower CI runner, while a command that becomes 2x slower fails.
+Timing still varies across operating systems and Python versions, so the
+budget test only runs with REGRESSION_BUDGETS=1 (set by this script and by
+one pinned CI job); the golden outputs are checked everywhere.
+
+The forecast, buy plan and P&L cover the planning SKUs from
+get_sample_skus() (3 rows each), not the 200 generated SKUs; the full
+dataset only reaches the golden files through the ingest and the KPIs.
+
+Usage: python regression.py [--update]   (--update rewrites tests/golden/)
+"""
+
+import argparse
+import contextlib
+import io
+import json
+import math
+import os
+import time
+import tracemalloc
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+GOLDEN_DIR = Path(__file__).resolve().parent / "tests" / "golden"
+BUDGETS_FILE = "budgets.json"
+
+PERIOD = '2025-08'
+DATASET = {'skus': 200, 'events': 1_000, 'sales': 100_000, 'seed': 2025}
+GOLDEN_REPORTS = {'forecast': f"forecast_{PERIOD}.csv", 'buy_plan': f"buy_plan_{PERIOD}.csv",
+                  'pnl_snapshot': f"pnl_snapshot_{PERIOD}.csv"}
+
+RTOL = 1e-6
+ATOL = 1e-6
+
+# A case fails when slower than baseline * TIME_TOLERANCE (2x slower always fails)
+TIME_TOLERANCE = float(os.environ.get('REGRESSION_TIME_TOLERANCE', 1.6))
+MEMORY_TOLERANCE = float(os.environ.get('REGRESSION_MEMORY_TOLERANCE', 1.5))
+MEMORY_SLACK_MB = 1.0
+# Slowdowns smaller than this are timer noise on short cases
+TIME_SLACK_S = 0.010
+
+# Budgets are machine-sensitive; only checked where this is set to 1
+BUDGETS_ENV = 'REGRESSION_BUDGETS'
+
+# Short cases repeat until they have run this long (best run counts)
+MIN_REPEATS = 3
+MAX_REPEATS = 15
+MIN_TIMED_S = 0.5
+
+# Cases in run order; each one is a call on a strategist with its inputs ingested
+CASES = {
+    'ingest_sales': lambda s, inputs: s.ingest_sales(str(inputs / "sales.csv")),
+    'counts_unify': lambda s, inputs: s.counts_unify(),
+    'forecast': lambda s, inputs: s.forecast(PERIOD),
+    'plan': lambda s, inputs: s.plan(PERIOD),
+    'pnl': lambda s, inputs: s.pnl(PERIOD),
+    'publish_pack': lambda s, inputs: s.publish_pack(PERIOD),
+}
+
+
+def calibrate(repeats=MIN_REPEATS + 2):
+    """Best-of-N seconds for a fixed pandas/NumPy workload on this machine"""
+    rng = np.random.default_rng(0)
+    frame = pd.DataFrame({'key': rng.integers(0, 5_000, 200_000), 'value': rng.random(200_000)})
+    best = math.inf
+    for _ in range(repeats):
+        started = time.perf_counter()
+        grouped = frame.groupby('key')['value'].agg(['sum', 'mean', 'std']).sort_values('sum')
+        buffer = io.StringIO()
+        frame.head(20_000).to_csv(buffer, index=False)
+        pd.read_csv(io.StringIO(buffer.getvalue()))
+        np.sort(frame['value'].to_numpy())
+        best = min(best, time.perf_counter() - started)
+    assert len(grouped)
+    return best
+
+
+def prepare(workdir):
+    """Fixed-seed inputs under workdir/input and a strategist with them ingested (cwd must be workdir)"""
+    from datagen import write_dataset
+    from ops_controller import InventoryStrategist
+
+    inputs = Path(workdir) / "input"
+    sizes = {key: DATASET[key] for key in ('skus', 'events', 'sales')}
+    write_dataset(inputs, seed=DATASET['seed'], **sizes)
+    with contextlib.redirect_stdout(io.StringIO()):
+        strategist = InventoryStrategist()
+        strategist.ingest_events(str(inputs / "events.csv"))
+        strategist.ingest_audits(str(inputs / "counts.csv"))
+    return strategist, inputs
+
+
+def run_case(strategist, name, inputs):
+    """Best-of-N seconds (cold table cache each time) and tracemalloc peak MB of one case"""
+    case = CASES[name]
+    best, spent, runs = math.inf, 0.0, 0
+    with contextlib.redirect_stdout(io.StringIO()):
+        while runs < MIN_REPEATS or (spent < MIN_TIMED_S and runs < MAX_REPEATS):
+            strategist.table_cache.clear()
+            started = time.perf_counter()
+            case(strategist, inputs)
+            elapsed = time.perf_counter() - started
+            best, spent, runs = min(best, elapsed), spent + elapsed, runs + 1
+
+        strategist.table_cache.clear()
+        tracemalloc.start()
+        try:
+            case(strategist, inputs)
+            peak = tracemalloc.get_traced_memory()[1]
+        finally:
+            tracemalloc.stop()
+    return best, peak / (1024 * 1024)
+
+
+def budgets_enabled():
+    return os.environ.get(BUDGETS_ENV) == '1'
+
+
+def run_cases(strategist, inputs):
+    return {name: run_case(strategist, name, inputs) for name in CASES}
+
+
+def run_outputs(strategist, inputs):
+    """Every case once, in order, for the golden outputs alone"""
+    with contextlib.redirect_stdout(io.StringIO()):
+        for case in CASES.values():
+            case(strategist, inputs)
+
+
+def outputs(strategist):
+    """The outputs under golden test: report frames and the published KPIs"""
+    frames = {name: pd.read_csv(strategist.reports_path / filename)
+              for name, filename in GOLDEN_REPORTS.items()}
+    manifest = json.loads((strategist.reports_path / PERIOD / f"manifest_{PERIOD}.json").read_text())
+    return frames, manifest['kpis']
+
+
+def compare_frame(actual, golden, key='sku', rtol=RTOL, atol=ATOL):
+    """Differences between two report frames, matched on key"""
+    problems = []
+    if list(actual.columns) != list(golden.columns):
+        return [f"columns {list(actual.columns)} != {list(golden.columns)}"]
+    if len(actual) != len(golden):
+        return [f"{len(actual)} rows != {len(golden)}"]
+    actual = actual.sort_values(key).reset_index(drop=True)
+    golden = golden.sort_values(key).reset_index(drop=True)
+    for column in golden.columns:
+        a, g = actual[column], golden[column]
+        if pd.api.types.is_numeric_dtype(g) and pd.api.types.is_numeric_dtype(a):
+            close = np.isclose(a.to_numpy(float), g.to_numpy(float), rtol=rtol, atol=atol, equal_nan=True)
+        else:
+            close = (a.astype(str) == g.astype(str)).to_numpy()
+        for i in np.flatnonzero(~close)[:3]:
+            problems.append(f"{column} @ {key}={golden.at[i, key]}: {a.iloc[i]!r} != {g.iloc[i]!r}")
+    return problems
+
+
+def compare_values(actual, golden, path='kpis', rtol=RTOL, atol=ATOL):
+    """Differences between two JSON-like values, numbers within tolerance"""
+    if isinstance(golden, dict) and isinstance(actual, dict):
+        if set(actual) != set(golden):
+            return [f"{path}: keys {sorted(actual)} != {sorted(golden)}"]
+        return [p for k in golden for p in compare_values(actual[k], golden[k], f"{path}.{k}", rtol, atol)]
+    if isinstance(golden, list) and isinstance(actual, list):
+        if len(actual) != len(golden):
+            return [f"{path}: {len(actual)} items != {len(golden)}"]
+        return [p for i, (a, g) in enumerate(zip(actual, golden))
+                for p in compare_values(a, g, f"{path}[{i}]", rtol, atol)]
+    numbers = (int, float)
+    if isinstance(golden, numbers) and isinstance(actual, numbers) and not isinstance(golden, bool):
+        return [] if math.isclose(actual, golden, rel_tol=rtol, abs_tol=atol) else [f"{path}: {actual} != {golden}"]
+    return [] if actual == golden else [f"{path}: {actual!r} != {golden!r}"]
+
+
+def check_outputs(strategist, golden_dir=GOLDEN_DIR):
+    """Every golden mismatch as a message (empty when the outputs match)"""
+    frames, kpis = outputs(strategist)
+    problems = []
+    for name, filename in GOLDEN_REPORTS.items():
+        golden = pd.read_csv(Path(golden_dir) / filename)
+        problems += [f"{filename}: {p}" for p in compare_frame(frames[name], golden)]
+    golden_kpis = json.loads((Path(golden_dir) / f"kpis_{PERIOD}.json").read_text())
+    return problems + compare_values(kpis, golden_kpis)
+
+
+def check_budgets(measured, calibration, budgets):
+    """Cases over their time or memory budget, as messages"""
+    problems = []
+    for name, (seconds, peak_mb) in measured.items():
+        budget = budgets['cases'].get(name)
+        if budget is None:
+            problems.append(f"{name}: no budget recorded (run python regression.py --update)")
+            continue
+        units = seconds / calibration
+        allowed = budget['time_units'] * TIME_TOLERANCE
+        if units > allowed and seconds - allowed * calibration > TIME_SLACK_S:
+            problems.append(f"{name}: {seconds * 1000:.1f} ms is {units / budget['time_units']:.2f}x "
+                            f"its budget ({budget['time_units']:.2f} calibration units)")
+        if peak_mb > budget['alloc_mb'] * MEMORY_TOLERANCE + MEMORY_SLACK_MB:
+            problems.append(f"{name}: peak {peak_mb:.1f} MB over its {budget['alloc_mb']:.1f} MB budget")
+    return problems
+
+
+def update_golden(golden_dir=GOLDEN_DIR):
+    """Rerun every case in a scratch directory and rewrite the golden files and budgets"""
+    import tempfile
+
+    golden_dir = Path(golden_dir)
+    golden_dir.mkdir(parents=True, exist_ok=True)
+    cwd = os.getcwd()
+    with tempfile.TemporaryDirectory() as scratch:
+        os.chdir(scratch)
+        try:
+            strategist, inputs = prepare(scratch)
+            calibration = calibrate()
+            measured = run_cases(strategist, inputs)
+            frames, kpis = outputs(strategist)
+        finally:
+            os.chdir(cwd)
+
+    for name, filename in GOLDEN_REPORTS.items():
+        frames[name].to_csv(golden_dir / filename, index=False)
+    (golden_dir / f"kpis_{PERIOD}.json").write_text(json.dumps(kpis, indent=2, sort_keys=True) + "\n")
+    budgets = {
+        'dataset': DATASET,
+        'calibration_s': round(calibration, 6),
+        'cases': {name: {'time_units': round(seconds / calibration, 4), 'seconds': round(seconds, 6),
+                         'alloc_mb': round(peak_mb, 2)}
+                  for name, (seconds, peak_mb) in measured.items()},
+    }
+    (golden_dir / BUDGETS_FILE).write_text(json.dumps(budgets, indent=2) + "\n")
+    return budgets
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Golden-file regression checks with time/memory budgets")
+    parser.add_argument("--update", action="store_true", help="rewrite tests/golden/ from this tree")
+    args = parser.parse_args(argv)
+
+    if args.update:
+        budgets = update_golden()
+        print(f"📝 Golden files and budgets written to {GOLDEN_DIR}")
+        for name, budget in budgets['cases'].items():
+            print(f"   • {name:<14} {budget['seconds'] * 1000:>8.1f} ms  "
+                  f"({budget['time_units']:.2f} units)  {budget['alloc_mb']:>7.1f} MB")
+        return 0
+
+    import pytest
+    os.environ[BUDGETS_ENV] = '1'
+    return pytest.main(["-q", str(Path(__file__).resolve().parent / "tests" / "test_regression.py")])
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,221 @@
+# Report Pack Publishing
+# Reads the forecast, buy plan and P&L outputs once, aggregates the KPIs every
+# artifact needs into one in-memory result, and writes those same bytes plus the
+# rendered text artifacts into a single compressed archive. Checksums are taken
+# while the bytes pass through, so nothing is staged or read back afterwards.
+
+import hashlib
+import json
+import zipfile
+from datetime import datetime
+from pathlib import Path
+
+import pandas as pd
+
+PACK_REPORTS = ['forecast', 'buy_plan', 'pnl_snapshot']
+# Packed and summarised when present (/venues load YYYY-MM), never warned about
+OPTIONAL_REPORTS = ['venue_targets']
+
+# GMROI below this flags a SKU for profitability review
+LOW_GMROI = 2.0
+
+COPY_BLOCK = 1 << 20
+
+
+def report_files(reports_path, period):
+    """Source CSV per report type that exists for the period"""
+    files = {}
+    for report_type in PACK_REPORTS + OPTIONAL_REPORTS:
+        path = Path(reports_path) / f"{report_type}_{period}.csv"
+        if path.exists():
+            files[report_type] = path
+    return files
+
+
+def read_reports(files):
+    """Bytes of each report file, read once for both the KPIs and the archive"""
+    return {name: Path(path).read_bytes() for name, path in files.items()}
+
+
+def _num(frame, column):
+    return pd.to_numeric(frame[column], errors='coerce').fillna(0)
+
+
+def _forecast_kpis(forecast):
+    return {
+        'skus': int(len(forecast)),
+        'total_units': round(float(_num(forecast, 'total_forecast').sum()), 1),
+        'event_lift_units': round(float(_num(forecast, 'event_lift').sum()), 1),
+        'confidence': {str(level): int(count) for level, count
+                       in forecast['confidence'].astype(str).value_counts().items()},
+    }
+
+
+def _buy_plan_kpis(buy_plan, config):
+    order_cost = float(_num(buy_plan, 'order_cost').sum())
+    to_order = buy_plan[_num(buy_plan, 'recommended_qty') > 0]
+    budget = config['max_cash_per_order']
+    high = buy_plan[buy_plan['priority'] == 'HIGH']
+    return {
+        'skus': int(len(buy_plan)),
+        'skus_to_order': int(len(to_order)),
+        'units_to_order': round(float(_num(to_order, 'recommended_qty').sum()), 0),
+        'order_cost': round(order_cost, 2),
+        'budget': budget,
+        'budget_used_pct': round(order_cost / budget, 4) if budget else 0.0,
+        'priority': {p: int((buy_plan['priority'] == p).sum()) for p in ('HIGH', 'MEDIUM', 'LOW')},
+        'below_rop': int((_num(buy_plan, 'current_stock') < _num(buy_plan, 'rop')).sum()),
+        'low_dos': int((_num(buy_plan, 'days_of_supply') < config['low_dos_warning']).sum()),
+        'avg_days_of_supply': round(float(_num(buy_plan, 'days_of_supply').mean()), 1) if len(buy_plan) else 0.0,
+        'critical_skus': high.sort_values('order_cost', ascending=False)['sku'].head(5).tolist(),
+    }
+
+
+def _pnl_kpis(pnl):
+    revenue = float(_num(pnl, 'revenue').sum())
+    margin = float(_num(pnl, 'gross_margin').sum())
+    units = float(_num(pnl, 'units_sold').sum())
+    stock = float(_num(pnl, 'current_stock').sum()) if 'current_stock' in pnl.columns else 0.0
+    inventory = float(_num(pnl, 'avg_inventory_value').sum()) if 'avg_inventory_value' in pnl.columns else 0.0
+
+    by_category = pnl.assign(revenue=_num(pnl, 'revenue'), gross_margin=_num(pnl, 'gross_margin')) \
+        .groupby('category', observed=True)[['revenue', 'gross_margin']].sum().round(2)
+    top = pnl.assign(gross_margin=_num(pnl, 'gross_margin')).nlargest(3, 'gross_margin')
+    gmroi = _num(pnl, 'gmroi')
+    return {
+        'skus': int(len(pnl)),
+        'units_sold': int(units),
+        'revenue': round(revenue, 2),
+        'cogs': round(float(_num(pnl, 'cogs').sum()), 2),
+        'gross_margin': round(margin, 2),
+        'gm_pct': round(margin / revenue, 4) if revenue > 0 else 0.0,
+        'gmroi': round(margin / inventory, 2) if inventory > 0 else 0.0,
+        'sell_through': round(units / (units + stock), 4) if units + stock > 0 else 0.0,
+        'low_gmroi_skus': int(((gmroi > 0) & (gmroi < LOW_GMROI)).sum()),
+        'by_category': by_category.to_dict(orient='index'),
+        'top_margin_skus': top['sku'].tolist(),
+    }
+
+
+def _venue_kpis(targets):
+    return {
+        'venues': int(len(targets)),
+        'peak_attendance': round(float(_num(targets, 'peak_attendance').max()), 0) if len(targets) else 0.0,
+        'target_units': int(_num(targets, 'target_units').sum()),
+        'by_venue': {str(row.venue_area): {'peak_attendance': float(row.peak_attendance),
+                                           'peak_date': str(row.peak_date)[:10],
+                                           'target_units': int(row.target_units)}
+                     for row in targets.itertuples()},
+    }
+
+
+def compute_kpis(frames, config):
+    """KPI aggregates shared by every artifact; sections are None when a report is missing
+    (the optional venue section is only added when venue targets were computed)"""
+    forecast, buy_plan, pnl = (frames.get(name) for name in PACK_REPORTS)
+    kpis = {
+        'forecast': _forecast_kpis(forecast) if forecast is not None else None,
+        'buy_plan': _buy_plan_kpis(buy_plan, config) if buy_plan is not None else None,
+        'pnl': _pnl_kpis(pnl) if pnl is not None else None,
+    }
+    if frames.get('venue_targets') is not None:
+        kpis['venues'] = _venue_kpis(frames['venue_targets'])
+    return kpis
+
+
+class _HashingWriter:
+    """Write-through file wrapper that hashes every byte on its way to disk
+
+    It has no tell/seek, so zipfile streams members with data descriptors
+    instead of seeking back to patch headers - the hash stays valid.
+    """
+
+    def __init__(self, f):
+        self._f = f
+        self.digest = hashlib.sha256()
+        self.size = 0
+
+    def write(self, data):
+        self.digest.update(data)
+        self.size += len(data)
+        return self._f.write(data)
+
+    def flush(self):
+        self._f.flush()
+
+
+def _write_member(zf, name, chunks):
+    """Stream chunks into one archive member; returns its size and sha256"""
+    digest = hashlib.sha256()
+    size = 0
+    with zf.open(name, 'w') as dst:
+        for block in chunks:
+            digest.update(block)
+            size += len(block)
+            dst.write(block)
+    return {'name': name, 'bytes': size, 'sha256': digest.hexdigest()}
+
+
+def _file_blocks(path):
+    with open(path, 'rb') as f:
+        yield from iter(lambda: f.read(COPY_BLOCK), b'')
+
+
+def write_pack(period_dir, period, files, artifacts, kpis, contents=None):
+    """Stream CSVs and rendered artifacts into report_pack_{period}.zip and write its manifest
+
+    contents (from read_reports) supplies bytes already in memory; other
+    files are copied from disk in blocks.
+    """
+    contents = contents or {}
+    period_dir = Path(period_dir)
+    period_dir.mkdir(parents=True, exist_ok=True)
+    archive = period_dir / f"report_pack_{period}.zip"
+    manifest_file = period_dir / f"manifest_{period}.json"
+
+    members = []
+    with open(archive, 'wb') as raw:
+        out = _HashingWriter(raw)
+        with zipfile.ZipFile(out, 'w', zipfile.ZIP_DEFLATED) as zf:
+            for report_type, path in files.items():
+                blocks = [contents[report_type]] if report_type in contents else _file_blocks(path)
+                members.append(_write_member(zf, Path(path).name, blocks))
+            for name, text in artifacts.items():
+                members.append(_write_member(zf, name, [text.encode('utf-8')]))
+            compressed = {info.filename: info.compress_size for info in zf.infolist()}
+
+    for member in members:
+        member['compressed_bytes'] = compressed[member['name']]
+
+    manifest = {
+        'period': period,
+        'generated': datetime.now().isoformat(timespec='seconds'),
+        'archive': archive.name,
+        'archive_bytes': out.size,
+        'archive_sha256': out.digest.hexdigest(),
+        'members': members,
+        'kpis': kpis,
+    }
+    manifest_file.write_text(json.dumps(manifest, indent=2, default=str))
+    return archive, manifest_file, manifest
+
+
+def verify_pack(archive, manifest):
+    """Names of members whose bytes no longer match the manifest (archive checksum first)"""
+    archive = Path(archive)
+    digest = hashlib.sha256()
+    for block in _file_blocks(archive):
+        digest.update(block)
+    if digest.hexdigest() != manifest['archive_sha256']:
+        return [archive.name]
+
+    mismatched = []
+    with zipfile.ZipFile(archive) as zf:
+        for member in manifest['members']:
+            with zf.open(member['name']) as src:
+                member_digest = hashlib.sha256()
+                for block in iter(lambda: src.read(COPY_BLOCK), b''):
+                    member_digest.update(block)
+            if member_digest.hexdigest() != member['sha256']:
+                mismatched.append(member['name'])
+    return mismatched
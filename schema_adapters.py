@@ -0,0 +1,200 @@
+"""
+Schema adapters for the sales and counts file layouts we receive.
+
+Every layout is declared once in ADAPTERS: the header columns that identify
+it, how its columns map onto system names, and any derived or default
+columns. compile_plan() turns the declaration for a given header into a read
+plan (usecols, dtypes, date parsing, renames, derivations) and read_adapted()
+executes that plan inside pd.read_csv, so the file is never copied into a
+second full frame just to fix its column names.
+"""
+
+import csv
+from functools import lru_cache
+
+import numpy as np
+import pandas as pd
+
+# System column types per table. Strings are read as str so identifiers such
+# as event_id or counter_id are not mangled into floats.
+SYSTEM_TYPES = {
+    'sales': {
+        'date': 'date',
+        'sku': 'str',
+        'units_sold': 'numeric',
+        'unit_price': 'numeric',
+        'revenue': 'numeric',
+        'event_id': 'str',
+        'channel': 'str',
+        'customer': 'str',
+    },
+    'counts': {
+        'asof_date': 'date',
+        'checkpoint': 'str',
+        'location': 'str',
+        'sku': 'str',
+        'qty': 'numeric',
+        'system_count': 'numeric',
+        'variance': 'numeric',
+        'uom': 'str',
+        'counter_id': 'str',
+        'notes': 'str',
+    },
+}
+
+# Known file layouts. The most specific matching signature wins, so a layout
+# that only adds columns to another one must list them in its signature.
+ADAPTERS = {
+    'sales': [
+        {
+            'name': 'system',  # sample_sales_data.csv, sales_processed.csv
+            'signature': ['date', 'sku', 'units_sold', 'revenue'],
+        },
+        {
+            'name': 'client_export',  # CLIENT_Sales.csv
+            'signature': ['date', 'sku', 'units_sold', 'revenue_per_unit', 'total_revenue'],
+            'rename': {'revenue_per_unit': 'unit_price', 'total_revenue': 'revenue'},
+        },
+        {
+            'name': 'dataset_generator',  # complete_sales_data.csv
+            'signature': ['date', 'sku', 'quantity', 'unit_price'],
+            'rename': {'quantity': 'units_sold'},
+            'drop': ['total_revenue'],
+            'derive': [('revenue', 'product', ('units_sold', 'unit_price'))],
+        },
+    ],
+    'counts': [
+        {
+            'name': 'system',  # sample_inventory_counts.csv, counts_processed.csv
+            'signature': ['asof_date', 'checkpoint', 'location', 'sku', 'qty'],
+        },
+        {
+            # CLIENT_Counts.csv stores the counter name in `checkpoint`
+            'name': 'client_export',
+            'signature': ['asof_date', 'sku', 'qty', 'checkpoint', 'system_count', 'variance'],
+            'absent': ['counter_id'],
+            'rename': {'checkpoint': 'counter_id'},
+            'derive': [('checkpoint', 'checkpoint_from_date', ('asof_date',))],
+            'defaults': {'location': 'MAIN-WAREHOUSE', 'uom': 'EA'},
+        },
+        {
+            'name': 'dataset_generator',  # complete_counts_data.csv
+            'signature': ['date', 'sku', 'physical_count', 'counter'],
+            'rename': {'date': 'asof_date', 'physical_count': 'qty', 'counter': 'counter_id'},
+            'derive': [('checkpoint', 'checkpoint_from_date', ('asof_date',))],
+            'defaults': {'location': 'MAIN-WAREHOUSE', 'uom': 'EA'},
+        },
+    ],
+}
+
+
+def _product(df, left, right):
+    """Row-wise product of two numeric columns"""
+    return df[left] * df[right]
+
+
+def _checkpoint_from_date(df, date_col):
+    """Derive BOM/MID/EOM from the count date (days 1-10, 11-20, 21+)"""
+    day = df[date_col].dt.day
+    return np.select([day <= 10, day <= 20], ['BOM', 'MID'], default='EOM')
+
+
+DERIVATIONS = {
+    'product': _product,
+    'checkpoint_from_date': _checkpoint_from_date,
+}
+
+
+def read_header(file_path):
+    """Read just the header row of a CSV file"""
+    with open(file_path, newline='', encoding='utf-8-sig') as f:
+        header = next(csv.reader(f), [])
+    return tuple(header)
+
+
+def detect_layout(table, header):
+    """Pick the most specific adapter whose signature matches the header"""
+    columns = set(header)
+    matches = [
+        adapter for adapter in ADAPTERS[table]
+        if set(adapter['signature']) <= columns
+        and not set(adapter.get('absent', [])) & columns
+    ]
+    if not matches:
+        raise ValueError(
+            f"No {table} layout matches header {list(header)}. "
+            f"Known layouts: {[a['name'] for a in ADAPTERS[table]]}"
+        )
+    return max(matches, key=lambda adapter: len(adapter['signature']))
+
+
+@lru_cache(maxsize=64)
+def compile_plan(table, header):
+    """Compile the read plan for a table given its header (cached per layout)"""
+    adapter = detect_layout(table, header)
+    rename = adapter.get('rename', {})
+    types = SYSTEM_TYPES[table]
+
+    usecols = [col for col in header if col not in adapter.get('drop', [])]
+    dtype = {}
+    parse_dates = []
+    numeric = []
+    for source in usecols:
+        kind = types.get(rename.get(source, source))
+        if kind == 'str':
+            dtype[source] = str
+        elif kind == 'date':
+            parse_dates.append(source)
+        elif kind == 'numeric':
+            numeric.append(rename.get(source, source))
+
+    derive = []
+    available = {rename.get(col, col) for col in usecols}
+    for target, func_name, args in adapter.get('derive', []):
+        missing = [arg for arg in args if arg not in available]
+        if missing:
+            raise ValueError(f"Layout '{adapter['name']}' cannot derive {target}: missing {missing}")
+        derive.append((target, DERIVATIONS[func_name], args))
+        available.add(target)
+
+    return {
+        'table': table,
+        'layout': adapter['name'],
+        'usecols': usecols,
+        'dtype': dtype,
+        'parse_dates': parse_dates,
+        'rename': {src: dst for src, dst in rename.items() if src in usecols},
+        'numeric': numeric,
+        'derive': derive,
+        'defaults': {
+            col: value for col, value in adapter.get('defaults', {}).items()
+            if col not in available
+        },
+    }
+
+
+def read_adapted(file_path, table, **read_kwargs):
+    """Read a sales/counts file of any known layout into system columns"""
+    plan = compile_plan(table, read_header(file_path))
+    df = pd.read_csv(
+        file_path,
+        usecols=plan['usecols'],
+        dtype=plan['dtype'],
+        parse_dates=plan['parse_dates'],
+        **read_kwargs
+    )
+    return apply_plan(df, plan)
+
+
+def apply_plan(df, plan):
+    """Apply renames, casts, derivations and defaults in place"""
+    df.rename(columns=plan['rename'], inplace=True)
+    for col in plan['numeric']:
+        if df[col].dtype == object or pd.api.types.is_string_dtype(df[col]):
+            df[col] = pd.to_numeric(df[col], errors='coerce')
+    for target, func, args in plan['derive']:
+        df[target] = func(df, *args)
+    for col, value in plan['defaults'].items():
+        df[col] = value
+    df.attrs['layout'] = plan['layout']
+    return df
@@ -0,0 +1,252 @@
+"""
+Long-lived session mode.
+
+One InventoryStrategist and the tables it has parsed stay in memory across
+commands, so pandas and the CSVs are loaded once instead of once per process.
+A table is re-read only when its file changes on disk (mtime or size), and
+config.json is re-read when it changes. Commands come from an interactive
+shell, a local socket for scripted clients (one JSON line per request and
+per response), or both at once; they run one at a time.
+"""
+
+import contextlib
+import io
+import json
+import shlex
+import socket
+import socketserver
+import sys
+import threading
+import time
+
+from table_cache import file_stamp
+
+HOST = "127.0.0.1"
+DEFAULT_PORT = 8765
+PROMPT = "conventicore> "
+
+SESSION_HELP = """Session commands:
+  set KEY VALUE   - Override a config value for this session (e.g. set z_service_level 2.33)
+  unset KEY       - Drop an override
+  config          - Show the session overrides
+  stats           - Table cache size, hits, misses, invalidations and evictions
+  reload          - Forget every cached table
+  exit | quit     - Leave the session
+Any ops_controller command (/forecast, /plan, /pnl, ...) runs against the cached tables."""
+
+
+def _parse_value(text):
+    """JSON value if it parses (numbers, true/false, null), else the raw string"""
+    try:
+        return json.loads(text)
+    except ValueError:
+        return text
+
+
+class Session:
+    """An InventoryStrategist that keeps its tables between commands"""
+
+    def __init__(self, strategist=None):
+        from ops_controller import InventoryStrategist
+
+        self.strategist = strategist or InventoryStrategist()
+        self.overrides = {}
+        self.config_file = self.strategist.base_path / "config.json"
+        self._config_stamp = file_stamp(self.config_file)
+        self._lock = threading.Lock()
+
+    @property
+    def tables(self):
+        return self.strategist.table_cache
+
+    def refresh_config(self):
+        """Re-read config.json if it changed, keeping the session overrides on top"""
+        stamp = file_stamp(self.config_file)
+        if stamp != self._config_stamp:
+            self._config_stamp = stamp
+            self.strategist.config = self.strategist.load_config()
+            self.strategist.config.update(self.overrides)
+            print("🔄 config.json changed - reloaded")
+
+    def run(self, line):
+        """Run one command line, printing its output; returns False to end the session"""
+        from ops_controller import COMMANDS, dispatch
+
+        try:
+            words = shlex.split(line)
+        except ValueError as e:
+            print(f"❌ {e}")
+            return True
+        if not words:
+            return True
+
+        command, args = words[0].lower(), words[1:]
+        if command in ("exit", "quit"):
+            return False
+        if command == "help":
+            print(SESSION_HELP)
+        elif command == "set" and len(args) == 2:
+            self.overrides[args[0]] = _parse_value(args[1])
+            self.strategist.config[args[0]] = self.overrides[args[0]]
+            print(f"⚙️  {args[0]} = {self.overrides[args[0]]!r}")
+        elif command == "unset" and len(args) == 1:
+            self.overrides.pop(args[0], None)
+            self.strategist.config = self.strategist.load_config()
+            self.strategist.config.update(self.overrides)
+            print(f"⚙️  {args[0]} = {self.strategist.config.get(args[0])!r}")
+        elif command == "config":
+            print(json.dumps(self.overrides, indent=2) if self.overrides else "No session overrides")
+        elif command == "stats":
+            print(json.dumps(self.tables.stats(), indent=2))
+        elif command == "reload":
+            self.tables.clear()
+            print("🧹 Table cache cleared")
+        elif command in COMMANDS:
+            self.refresh_config()
+            try:
+                dispatch(self.strategist, command, args)
+            except Exception as e:
+                print(f"❌ Error executing command: {e}")
+            finally:
+                self.save_metrics(line)
+        else:
+            print(f"❌ Unknown command: {command} (type 'help')")
+        return True
+
+    def save_metrics(self, line):
+        """Save the last command's metrics as its own run, then start a fresh one"""
+        metrics = self.strategist.metrics
+        try:
+            metrics.save(self.strategist.reports_path / "metrics", line.strip(),
+                         self.strategist.config['metrics_keep_runs'])
+        finally:
+            metrics.reset()
+
+    def execute(self, line):
+        """Run one command with its output captured; returns a response dict"""
+        from pipeline import ThreadLocalOutput
+
+        buffer = io.StringIO()
+        with self._lock:
+            started = time.perf_counter()
+            if isinstance(sys.stdout, ThreadLocalOutput):
+                sys.stdout.local.buffer = buffer
+                try:
+                    keep_going = self.run(line)
+                finally:
+                    sys.stdout.local.buffer = None
+            else:
+                with contextlib.redirect_stdout(buffer):
+                    keep_going = self.run(line)
+            elapsed = time.perf_counter() - started
+        return {'output': buffer.getvalue(), 'ms': round(elapsed * 1000, 2), 'exit': not keep_going}
+
+    def shell(self, stdin=None):
+        """Interactive loop until exit/quit or end of input"""
+        stdin = stdin or sys.stdin
+        print("🧠 Session ready - tables stay in memory between commands (type 'help')")
+        while True:
+            print(PROMPT, end="", flush=True)
+            line = stdin.readline()
+            if not line:
+                print()
+                return
+            with self._lock:
+                started = time.perf_counter()
+                keep_going = self.run(line)
+                elapsed = time.perf_counter() - started
+            if not keep_going:
+                return
+            if line.strip():
+                print(f"⏱️  {elapsed * 1000:.1f} ms")
+
+
+class _SessionHandler(socketserver.StreamRequestHandler):
+    """One JSON line in ({"command": "..."} or plain text), one JSON line out"""
+
+    def handle(self):
+        for raw in self.rfile:
+            text = raw.decode("utf-8").strip()
+            if not text:
+                continue
+            try:
+                line = json.loads(text)["command"] if text.startswith("{") else text
+            except (ValueError, KeyError):
+                response = {'output': "❌ Expected {\"command\": \"...\"}\n", 'ms': 0.0, 'exit': False}
+            else:
+                response = self.server.session.execute(line)
+            self.wfile.write((json.dumps(response) + "\n").encode("utf-8"))
+            self.wfile.flush()
+
+
+class SessionServer(socketserver.ThreadingTCPServer):
+    """Local-only socket in front of a Session"""
+
+    daemon_threads = True
+    allow_reuse_address = True
+
+    def __init__(self, session, port=DEFAULT_PORT, host=HOST):
+        self.session = session
+        super().__init__((host, port), _SessionHandler)
+
+
+def send_command(line, port=DEFAULT_PORT, host=HOST, timeout=300):
+    """Client: run one command in a running session and return its response"""
+    with socket.create_connection((host, port), timeout=timeout) as sock:
+        sock.sendall((json.dumps({'command': line}) + "\n").encode("utf-8"))
+        with sock.makefile("rb") as reply:
+            return json.loads(reply.readline())
+
+
+def configured_port(config_file="config.json"):
+    """session_port from config.json without building a strategist"""
+    try:
+        with open(config_file) as f:
+            return int(json.load(f).get('session_port', DEFAULT_PORT))
+    except (OSError, ValueError):
+        return DEFAULT_PORT
+
+
+def session_main(args):
+    """/session [--no-socket] | /session serve | /session send "CMD" """
+    port = configured_port()
+    if args and args[0] == "send":
+        try:
+            response = send_command(" ".join(args[1:]), port)
+        except OSError as e:
+            print(f"❌ No session listening on {HOST}:{port} ({e})")
+            return
+        print(response['output'], end="")
+        print(f"⏱️  {response['ms']:.1f} ms in session")
+        return
+
+    from pipeline import ThreadLocalOutput
+
+    sys.stdout = ThreadLocalOutput(sys.stdout)
+    session = Session()
+    serve = not args or args[0] == "serve"
+    serve = serve and "--no-socket" not in args
+    server = SessionServer(session, port) if serve else None
+    if server:
+        print(f"🛰️  Listening on {HOST}:{port} for scripted clients")
+
+    if args and args[0] == "serve":
+        try:
+            server.serve_forever()
+        except KeyboardInterrupt:
+            print("\n👋 Session stopped")
+        finally:
+            server.server_close()
+        return
+
+    if server:
+        threading.Thread(target=server.serve_forever, daemon=True).start()
+    try:
+        session.shell()
+    except KeyboardInterrupt:
+        print()
+    finally:
+        if server:
+            server.shutdown()
+            server.server_close()
+    print("👋 Session closed")
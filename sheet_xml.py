@@ -0,0 +1,81 @@
+# Worksheet XML Rendering
+# Vectorized rendering of DataFrame chunks into SpreadsheetML <row> elements.
+# Strings are written inline (like openpyxl does), so rendered rows never
+# depend on a workbook's shared strings table.
+
+import re
+
+import pandas as pd
+from openpyxl.utils import get_column_letter
+
+EXCEL_EPOCH = pd.Timestamp("1899-12-30")
+
+# Characters that are not allowed in XML 1.0 text
+_INVALID_XML = re.compile("[\x00-\x08\x0b\x0c\x0e-\x1f]")
+
+
+def escape_text(series):
+    """XML-escape a string Series"""
+    return (series.str.replace(_INVALID_XML, "", regex=True)
+                  .str.replace("&", "&amp;", regex=False)
+                  .str.replace("<", "&lt;", regex=False)
+                  .str.replace(">", "&gt;", regex=False))
+
+
+def render_rows(chunk, source_cols, first_row, date_style, cell_style=None):
+    """<row> XML strings for a chunk; source_cols maps sheet columns to chunk columns
+
+    With a cell_style every cell in the row, blank ones included, carries it
+    (dates carry date_style), so the rows keep the table border.
+    """
+    rownums = pd.Series(range(first_row, first_row + len(chunk)), index=chunk.index).astype(str)
+    cells = pd.Series("", index=chunk.index, dtype=object)
+    styled = f'" s="{cell_style}"' if cell_style is not None else '"'
+
+    for idx, col in enumerate(source_cols, 1):
+        ref = '<c r="' + get_column_letter(idx) + rownums
+        blank = ref + styled + "/>" if cell_style is not None else ""
+        if col is None:
+            cells = cells + blank
+            continue
+        values = chunk[col]
+
+        if pd.api.types.is_datetime64_any_dtype(values):
+            serial = (values - EXCEL_EPOCH) / pd.Timedelta(days=1)
+            cell = ref + f'" s="{date_style}"><v>' + serial.astype(str) + "</v></c>"
+            present = values.notna()
+        elif pd.api.types.is_bool_dtype(values):
+            cell = ref + styled + ' t="b"><v>' + values.astype(int).astype(str) + "</v></c>"
+            present = values.notna()
+        elif pd.api.types.is_numeric_dtype(values):
+            cell = ref + styled + "><v>" + values.astype(str) + "</v></c>"
+            present = values.notna() & ~values.isin([float("inf"), float("-inf")])
+        else:
+            text = values.astype(str)
+            cell = (ref + styled + ' t="inlineStr"><is><t xml:space="preserve">'
+                    + escape_text(text) + "</t></is></c>")
+            present = values.notna() & (text != "")
+
+        cells = cells + cell.where(present, blank)
+
+    return ('<row r="' + rownums + '">' + cells + "</row>").tolist()
+
+
+def blank_row(row, n_cols, cell_style):
+    """<row> XML of empty cells carrying cell_style"""
+    cells = "".join(f'<c r="{get_column_letter(idx)}{row}" s="{cell_style}"/>' for idx in range(1, n_cols + 1))
+    return f'<row r="{row}">{cells}</row>'
+
+
+def render_cols(widths):
+    """<cols> element for a list of column widths"""
+    cols = "".join(
+        f'<col min="{idx}" max="{idx}" width="{width}" customWidth="1"/>'
+        for idx, width in enumerate(widths, 1)
+    )
+    return f"<cols>{cols}</cols>"
+
+
+def dimension_ref(n_cols, n_rows):
+    """Used range reference, e.g. A1:L3735"""
+    return f"A1:{get_column_letter(max(n_cols, 1))}{max(n_rows, 1)}"
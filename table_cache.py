@@ -0,0 +1,113 @@
+"""
+In-process cache of parsed tables.
+
+InventoryStrategist.load_data() goes through one TableCache, so a command
+that reads the same file several times (plan and pnl both read the unified
+counts, forecast reads sales and events) parses it once. Entries are keyed by
+path and validated against the file's (mtime, size) on every lookup; a changed
+file is re-read. The cache holds at most max_bytes of frame memory and evicts
+the least recently used table first.
+
+Callers get their own copy of the cached frame, so no caller can change
+what the next caller sees. Under pandas copy-on-write (the default from
+pandas 3, opt-in on 2.x) that is a shallow copy, a read-only view in practice:
+it shares the cached buffers and any write through it copies first. Without
+copy-on-write (pandas 1.x/2.x defaults) a shallow copy would let .loc writes
+reach the cached buffers, so those versions get a deep copy instead.
+"""
+
+import os
+import threading
+from collections import OrderedDict
+
+DEFAULT_MAX_MB = 256
+
+
+def file_stamp(path):
+    """(mtime_ns, size) of a file, or None if it does not exist"""
+    try:
+        stat = os.stat(path)
+    except OSError:
+        return None
+    return stat.st_mtime_ns, stat.st_size
+
+
+def copy_on_write():
+    """True when pandas copy-on-write is active (always on pandas 3+)"""
+    import pandas as pd
+
+    if int(pd.__version__.split('.')[0]) >= 3:
+        return True
+    return getattr(pd.options.mode, 'copy_on_write', False) is True
+
+
+def caller_copy(frame):
+    """Copy of a cached frame that writes cannot leak back into the cache"""
+    return frame.copy(deep=not copy_on_write())
+
+
+def frame_bytes(frame):
+    """Deep memory footprint of a frame"""
+    return int(frame.memory_usage(deep=True, index=True).sum())
+
+
+class TableCache:
+    """LRU cache of parsed tables under a memory cap"""
+
+    def __init__(self, max_bytes=DEFAULT_MAX_MB * 1024 * 1024):
+        self.max_bytes = max_bytes
+        self._tables = OrderedDict()  # path -> (stamp, frame, bytes), oldest first
+        self.bytes = 0
+        self.hits = 0
+        self.misses = 0
+        self.invalidations = 0
+        self.evictions = 0
+        self._lock = threading.Lock()
+
+    @classmethod
+    def from_config(cls, config):
+        """Cache sized by config['table_cache_mb'] (0 disables caching)"""
+        return cls(int(float(config.get('table_cache_mb', DEFAULT_MAX_MB)) * 1024 * 1024))
+
+    def get(self, path, load):
+        """Caller copy of the table at path (see caller_copy), parsed with load(path) on a miss"""
+        key = str(path)
+        stamp = file_stamp(path)
+        with self._lock:
+            entry = self._tables.get(key)
+            if entry is not None and entry[0] == stamp:
+                self._tables.move_to_end(key)
+                self.hits += 1
+                return caller_copy(entry[1])
+            if entry is not None:
+                self._drop(key)
+                self.invalidations += 1
+            self.misses += 1
+
+        frame = load(path)
+        size = frame_bytes(frame)
+        with self._lock:
+            if key in self._tables:  # another thread loaded it meanwhile
+                self._drop(key)
+            if size <= self.max_bytes:
+                while self.bytes + size > self.max_bytes:
+                    self._drop(next(iter(self._tables)))
+                    self.evictions += 1
+                self._tables[key] = (stamp, frame, size)
+                self.bytes += size
+        return caller_copy(frame)
+
+    def _drop(self, key):
+        _, _, size = self._tables.pop(key)
+        self.bytes -= size
+
+    def clear(self):
+        with self._lock:
+            self._tables.clear()
+            self.bytes = 0
+
+    def stats(self):
+        with self._lock:
+            return {'tables': len(self._tables), 'bytes': self.bytes, 'max_bytes': self.max_bytes,
+                    'hits': self.hits, 'misses': self.misses,
+                    'invalidations': self.invalidations, 'evictions': self.evictions}
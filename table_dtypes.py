@@ -0,0 +1,149 @@
+"""
+Central dtype registry for the core tables.
+
+Low-cardinality strings become categoricals, whole-number quantities are
+downcast to int32 (never narrower, so sums and differences of quantities
+do not wrap around), and dates are parsed
+with explicit formats (cached, so repeated values are parsed once). Every
+load and ingest path in InventoryStrategist goes through apply_dtypes().
+"""
+
+import fnmatch
+
+import pandas as pd
+
+# Formats tried in order; the first one that parses every value wins
+DATE_FORMATS = ['%Y-%m-%d', '%Y-%m-%d %H:%M:%S']
+
+# A string column only becomes categorical when it repeats enough
+MAX_CATEGORY_RATIO = 0.5
+
+# Narrowest integer dtype handed out; int8/int16 overflow on ordinary arithmetic
+MIN_INTEGER_DTYPE = 'int32'
+
+DTYPE_REGISTRY = {
+    'events': {
+        'categories': ['account', 'venue_area', 'contact', 'salesperson'],
+        'integers': ['event_id', 'est_attendance'],
+        'dates': ['in_date', 'start_dt', 'end_dt', 'out_date'],
+    },
+    'sales': {
+        'categories': ['sku', 'event_id', 'channel', 'customer', 'salesperson', 'source_file'],
+        'integers': ['units_sold'],
+        'dates': ['date'],
+    },
+    'counts': {
+        'categories': ['sku', 'checkpoint', 'location', 'uom', 'counter_id', 'notes', 'source', 'source_file'],
+        'integers': ['qty', 'system_count', 'variance'],
+        'dates': ['asof_date', 'submitted_at'],
+    },
+    'skus': {
+        'categories': ['category', 'vendor', 'supplier', 'location'],
+        'integers': ['lead_time', 'lead_time_days', 'current_stock'],
+        'dates': [],
+    },
+    'forecast': {
+        'categories': ['category', 'period', 'confidence'],
+        'integers': [],
+        'dates': [],
+    },
+    'buy_plan': {
+        'categories': ['category', 'priority'],
+        'integers': ['lead_time_days'],
+        'dates': [],
+    },
+    'pnl': {
+        'categories': ['category', 'period'],
+        'integers': ['units_sold', 'current_stock'],
+        'dates': [],
+    },
+}
+
+# File name patterns for the tables written under data/ and reports/
+TABLE_FILES = {
+    'events_processed.csv': 'events',
+    'sales_processed.csv': 'sales',
+    'counts_processed.csv': 'counts',
+    'counts_unified.csv': 'counts',
+    'forms_responses.csv': 'counts',
+    'manual_entries.csv': 'counts',
+    'api_counts.csv': 'counts',
+    '*sku_master*.csv': 'skus',
+    'forecast_*.csv': 'forecast',
+    'buy_plan_*.csv': 'buy_plan',
+    'pnl_snapshot_*.csv': 'pnl',
+}
+
+
+def table_for_file(filename):
+    """Registry table name for a data/report file, or None"""
+    for pattern, table in TABLE_FILES.items():
+        if fnmatch.fnmatch(filename, pattern):
+            return table
+    return None
+
+
+def parse_dates(series, formats=DATE_FORMATS):
+    """Parse dates with explicit formats, falling back to inference"""
+    if pd.api.types.is_datetime64_any_dtype(series):
+        return series
+    expected_missing = series.isna().sum()
+    for fmt in formats:
+        parsed = pd.to_datetime(series, format=fmt, errors='coerce', cache=True)
+        if parsed.isna().sum() == expected_missing:
+            return parsed
+    return pd.to_datetime(series, errors='coerce', cache=True)
+
+
+def downcast_integers(series):
+    """Downcast whole-number columns to int32 where they fit; leave anything with gaps or fractions"""
+    if not pd.api.types.is_numeric_dtype(series) or series.isna().any():
+        return series
+    if pd.api.types.is_float_dtype(series) and not (series % 1 == 0).all():
+        return series
+    downcast = pd.to_numeric(series, downcast='integer')
+    if downcast.dtype.itemsize < pd.api.types.pandas_dtype(MIN_INTEGER_DTYPE).itemsize:
+        return downcast.astype(MIN_INTEGER_DTYPE)
+    return downcast
+
+
+def to_category(series):
+    """Convert a repetitive string column to categorical"""
+    if isinstance(series.dtype, pd.CategoricalDtype) or pd.api.types.is_numeric_dtype(series):
+        return series
+    if series.nunique(dropna=True) > max(1, len(series) * MAX_CATEGORY_RATIO):
+        return series
+    return series.astype('category')
+
+
+def apply_dtypes(df, table):
+    """Apply the registry dtypes for a table in place and return the frame"""
+    spec = DTYPE_REGISTRY.get(table)
+    if df is None or spec is None:
+        return df
+    for col in spec['dates']:
+        if col in df.columns:
+            df[col] = parse_dates(df[col])
+    for col in spec['integers']:
+        if col in df.columns:
+            df[col] = downcast_integers(df[col])
+    for col in spec['categories']:
+        if col in df.columns:
+            df[col] = to_category(df[col])
+    return df
+
+
+def memory_report(frames):
+    """Bytes per table before and after applying the registry"""
+    rows = []
+    for name, (table, df) in frames.items():
+        before = int(df.memory_usage(deep=True).sum())
+        after = int(apply_dtypes(df.copy(), table).memory_usage(deep=True).sum())
+        rows.append({
+            'table': name,
+            'rows': len(df),
+            'bytes_before': before,
+            'bytes_after': after,
+            'saved_pct': round((1 - after / before) * 100, 1) if before else 0.0,
+        })
+    return pd.DataFrame(rows)
@@ -126,7 +126,8 @@ def main():
         ("reports/forecast_2025-09.csv", "Forecast output", 3, 9),
         ("reports/buy_plan_2025-09.csv", "Buy plan output", 3, 12),
         ("Event-Inventory-CommandCenter.xlsx", "Excel workbook", None, None),
-        ("reports/2025-09/executive_summary_2025-09.txt", "Executive summary", None, None),
+        ("reports/2025-09/report_pack_2025-09.zip", "Report pack archive", None, None),
+        ("reports/2025-09/manifest_2025-09.json", "Report pack manifest", None, None),
     ]
     
     for filepath, description, min_rows, min_cols in file_tests:
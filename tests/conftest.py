@@ -0,0 +1,7 @@
+"""Shared pytest setup: make the top-level modules importable from tests/"""
+
+import sys
+from pathlib import Path
+
+REPO_ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(REPO_ROOT))
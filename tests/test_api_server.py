@@ -0,0 +1,93 @@
+"""HTTP API: ETag revalidation, filtered reads and batched count writes, without a socket"""
+
+import asyncio
+import json
+
+import pandas as pd
+import pytest
+
+from api_server import InventoryAPI, LocalClient, start_server
+from ops_controller import InventoryStrategist, dispatch
+
+
+@pytest.fixture
+def strategist(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    strategist = InventoryStrategist()
+    for command, args in (("/ingest", ["sales"]), ("/ingest", ["audits"]), ("/counts", ["unify"]),
+                          ("/ingest", ["events"]), ("/forecast", ["2025-08"]), ("/plan", ["2025-08"]),
+                          ("/pnl", ["2025-08"])):
+        dispatch(strategist, command, args)
+    return strategist
+
+
+def test_reports_revalidate_with_etags_and_filter(strategist):
+    with LocalClient(InventoryAPI(strategist)) as client:
+        first = client.get("/buy-plan/2025-08")
+        assert first.status == 200 and first.json()
+        etag = first.headers['ETag']
+        assert client.get("/buy-plan/2025-08", {'If-None-Match': etag}).status == 304
+
+        sku = first.json()[0]['sku']
+        filtered = client.get(f"/buy-plan/2025-08?sku={sku}").json()
+        assert [row['sku'] for row in filtered] == [sku]
+
+        path = strategist.reports_path / "buy_plan_2025-08.csv"
+        pd.read_csv(path).head(1).to_csv(path, index=False)
+        changed = client.get("/buy-plan/2025-08", {'If-None-Match': etag})
+        assert changed.status == 200 and changed.headers['ETag'] != etag
+        assert len(changed.json()) == 1
+
+        kpis = client.get("/kpis/2025-08").json()
+        assert kpis['buy_plan']['skus'] == 1 and kpis['pnl']['revenue'] > 0
+        assert client.get("/forecast/2025-13x").status == 400
+        assert client.get("/pnl/2030-01").status == 404
+        assert client.get("/periods").json() == {'periods': ['2025-08']}
+
+
+def test_counts_are_validated_batched_and_unified(strategist, capsys):
+    count = {'asof_date': '2025-08-31', 'checkpoint': 'EOM', 'location': 'in_store',
+             'sku': 'BADGE-001', 'qty': 42}
+    store = strategist.data_path / "api_counts.csv"
+    with LocalClient(InventoryAPI(strategist, batch_size=2, flush_seconds=60)) as client:
+        bad = client.post("/counts", {**count, 'qty': -1, 'checkpoint': 'LATE'})
+        assert bad.status == 400 and bad.json()['details']
+
+        assert client.post("/counts", count).json() == {'accepted': 1, 'queued': 1}
+        assert not store.exists()
+        assert client.post("/counts", [count, {**count, 'sku': 'TEE-001'}]).status == 202
+        assert len(pd.read_csv(store)) == 3
+
+        client.post("/counts", {**count, 'qty': 7})
+        assert client.post("/counts/flush").json() == {'written': 1}
+    assert pd.read_csv(store)['qty'].tolist() == [42, 42, 42, 7]
+
+    capsys.readouterr()
+    unified = strategist.counts_unify()
+    assert "Loaded 4 API submissions" in capsys.readouterr().out
+    assert 'API' in set(unified['source'])
+
+
+def test_socket_server_keeps_connections_alive(strategist):
+    async def exchange():
+        app = InventoryAPI(strategist)
+        server = await start_server(app, "127.0.0.1", 0)
+        reader, writer = await asyncio.open_connection("127.0.0.1", server.sockets[0].getsockname()[1])
+        statuses = []
+        for _ in range(2):
+            writer.write(b"GET /health HTTP/1.1\r\nHost: localhost\r\n\r\n")
+            await writer.drain()
+            statuses.append((await reader.readline()).split()[1])
+            length = 0
+            while (line := await reader.readline()) != b"\r\n":
+                if line.lower().startswith(b"content-length"):
+                    length = int(line.split(b":")[1])
+            body = json.loads(await reader.readexactly(length))
+        writer.close()
+        server.close()
+        await server.wait_closed()
+        await app.stop()
+        return statuses, body
+
+    statuses, body = asyncio.run(exchange())
+    assert statuses == [b"200", b"200"] and body['status'] == 'ok'
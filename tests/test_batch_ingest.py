@@ -0,0 +1,43 @@
+"""Multi-file ingest: bad files are reported, good ones merged in path order"""
+
+import shutil
+
+from batch_ingest import expand_sources, needs_batch, parse_files
+from conftest import REPO_ROOT
+
+
+def test_bad_file_does_not_abort_batch(tmp_path):
+    shutil.copy(REPO_ROOT / "CLIENT_Sales.csv", tmp_path / "b_venue_2025-01.csv")
+    shutil.copy(REPO_ROOT / "sample_sales_data.csv", tmp_path / "a_venue_2025-01.csv")
+    (tmp_path / "c_broken.csv").write_text("when,what\n1,2\n")
+
+    paths = expand_sources([str(tmp_path)])
+    results, merged, _ = parse_files(paths, 'sales', max_workers=2)
+
+    assert [r['error'] is None for r in results] == [True, True, False]
+    assert merged['source_file'].drop_duplicates().tolist() == paths[:2]
+    assert len(merged) == sum(r['rows_out'] for r in results)
+
+
+def test_needs_batch_for_globs_dirs_and_multiple_files(tmp_path):
+    assert needs_batch([str(tmp_path)])
+    assert needs_batch(["drops/*/sales_*.csv"])
+    assert needs_batch(["a.csv", "b.csv"])
+    assert not needs_batch(["sample_sales_data.csv"])
+
+
+def test_batch_audits_log_negative_quantities(tmp_path, monkeypatch):
+    from ops_controller import InventoryStrategist
+
+    monkeypatch.chdir(tmp_path)
+    strategist = InventoryStrategist()
+    counts = strategist.get_sample_counts()
+    counts.to_csv(tmp_path / "a_counts.csv", index=False)
+    counts.assign(qty=-counts['qty'].abs() - 1).head(2).to_csv(tmp_path / "b_counts.csv", index=False)
+
+    strategist.ingest_batch([str(tmp_path / "*_counts.csv")], 'audits')
+
+    logged = strategist.get_exception_log().read()
+    negative = logged[logged['exception_type'] == "Negative quantities"]
+    assert len(negative) == 2
+    assert negative['details'].map(lambda row: row['source_file']).str.endswith("b_counts.csv").all()
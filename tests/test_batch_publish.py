@@ -0,0 +1,40 @@
+"""Batch publish: one archive per period, same results serially and on a pool"""
+
+import json
+
+import pytest
+
+from batch_publish import load_shared, period_range, publish_periods
+from ops_controller import InventoryStrategist
+
+
+def test_period_range_is_inclusive_and_rejects_reversed_ranges():
+    assert period_range("2024-11", "2025-02") == ["2024-11", "2024-12", "2025-01", "2025-02"]
+    with pytest.raises(ValueError):
+        period_range("2025-03", "2025-01")
+
+
+def test_pool_matches_serial(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    strategist = InventoryStrategist()
+    strategist.ingest_events()
+    strategist.ingest_sales()
+    strategist.ingest_audits()
+    strategist.counts_unify()
+    shared = load_shared(strategist)
+    periods = period_range("2025-07", "2025-09")
+
+    def member_digests():
+        return {p: {m['name']: m['sha256'] for m in
+                    json.loads((tmp_path / "reports" / p / f"manifest_{p}.json").read_text())['members']
+                    if m['name'].endswith(".csv")}
+                for p in periods}
+
+    serial, _ = publish_periods(periods, shared, strategist.config, max_workers=1)
+    expected = member_digests()
+    pooled, wall = publish_periods(periods, shared, strategist.config, max_workers=2)
+
+    assert [r['period'] for r in pooled] == periods
+    assert all(r['error'] is None for r in serial + pooled)
+    assert member_digests() == expected
+    assert wall > 0
@@ -0,0 +1,86 @@
+"""Power BI star schema: stable surrogate keys, month partitions rewritten only on change"""
+
+import json
+
+import pandas as pd
+
+from bi_export import MANIFEST_FILE, export_star
+
+SKUS = pd.DataFrame({'sku': ['SKU001', 'SKU002'], 'desc': ['Pen', 'Box'], 'category': ['Promo', 'Pack'],
+                     'cost': [0.5, 1.25], 'price': [2.0, 3.5], 'lead_time_days': [14, 7]})
+
+
+def _events(ids, venues):
+    start = pd.to_datetime(['2025-07-10 09:00'] * len(ids))
+    return pd.DataFrame({'event_id': ids, 'name': [f"Event {i}" for i in ids], 'venue_area': venues,
+                         'start_dt': start, 'end_dt': start + pd.Timedelta(hours=30),
+                         'est_attendance': 500})
+
+
+def _sales():
+    return pd.DataFrame({
+        'date': ['2025-07-10', '2025-07-11', '2025-08-02', '2025-08-20'],
+        'sku': ['SKU001', 'SKU002', 'SKU001', 'SKU009'],
+        'units_sold': [3, 1, 2, 5], 'revenue': [6.0, 3.5, 4.0, 10.0],
+        'event_id': [20, 10, '', 99],
+    })
+
+
+def _read(path):
+    return pd.read_csv(path, keep_default_na=False)
+
+
+def test_star_keys_stay_stable_and_only_changed_months_are_rewritten(tmp_path):
+    out = tmp_path / "bi"
+    first = export_star(out, {'events': _events([10, 20], ['Hall B', 'Hall A']), 'sales': _sales()}, SKUS, 'csv')
+    assert set(first['tables']['fact_sales']['files']) == {
+        'fact_sales/month=2025-07/part-00000.csv', 'fact_sales/month=2025-08/part-00000.csv'}
+
+    events = _read(out / "dim_event.csv").set_index('event_id')
+    skus = _read(out / "dim_sku.csv").set_index('sku')
+    july = _read(out / "fact_sales/month=2025-07/part-00000.csv")
+    assert list(july['event_key']) == [events.loc['20', 'event_key'], events.loc['10', 'event_key']]
+    august = _read(out / "fact_sales/month=2025-08/part-00000.csv")
+    assert august['event_key'].iloc[0] == 0 and skus.loc['SKU009', 'category'] == 'Unknown'
+    assert events.loc['99', 'venue_key'] == 0  # only the sales know event 99
+    dates = _read(out / "dim_date.csv")
+    assert dates['date_key'].iloc[0] == 20250710 and dates['date_key'].iloc[-1] == 20250820
+
+    # A new event and a new August sale: existing keys hold, July is left alone
+    sales = pd.concat([_sales(), pd.DataFrame({'date': ['2025-08-25'], 'sku': ['SKU002'], 'units_sold': [1],
+                                               'revenue': [3.5], 'event_id': [5]})])
+    july_mtime = (out / "fact_sales/month=2025-07/part-00000.csv").stat().st_mtime_ns
+    second = export_star(out, {'events': _events([5, 10, 20], ['Hall C', 'Hall B', 'Hall A']), 'sales': sales},
+                         SKUS, 'csv')
+    again = _read(out / "dim_event.csv").set_index('event_id')
+    assert (again.loc[events.index, 'event_key'] == events['event_key']).all()
+    assert again.loc['5', 'event_key'] == events['event_key'].max() + 1
+    assert 'fact_sales/month=2025-08/part-00000.csv' in second['changed']
+    assert 'fact_sales/month=2025-07/part-00000.csv' not in second['changed']
+    assert (out / "fact_sales/month=2025-07/part-00000.csv").stat().st_mtime_ns == july_mtime
+
+    third = export_star(out, {'events': _events([5, 10, 20], ['Hall C', 'Hall B', 'Hall A']), 'sales': sales},
+                        SKUS, 'csv')
+    assert third['changed'] == []
+
+
+def test_export_bi_command_writes_schema_and_queries(tmp_path, monkeypatch):
+    from ops_controller import InventoryStrategist, dispatch
+
+    monkeypatch.chdir(tmp_path)
+    strategist = InventoryStrategist()
+    strategist.ingest_events()
+    strategist.ingest_sales()
+    strategist.ingest_audits()
+    strategist.forecast("2025-08")
+    dispatch(strategist, "/export", ["bi", "--csv"])
+
+    out = tmp_path / "reports" / "bi"
+    manifest = json.loads((out / MANIFEST_FILE).read_text())
+    assert manifest['tables']['fact_forecast']['rows'] == 3
+    schema = json.loads((out / "_schema.json").read_text())
+    assert schema['fact_sales']['foreign_keys'] == {'date_key': 'dim_date.date_key', 'sku_key': 'dim_sku.sku_key',
+                                                    'event_key': 'dim_event.event_key'}
+    assert {c['name']: c['type'] for c in schema['dim_date']['columns']}['date'] == 'date'
+    query = (out / "queries" / "fact_sales.m").read_text()
+    assert 'RangeStart' in query and 'E:\\' not in query
@@ -0,0 +1,56 @@
+"""CLI startup budget: cheap commands dispatch before pandas/numpy/openpyxl load"""
+
+import subprocess
+import sys
+import time
+
+from conftest import REPO_ROOT
+
+HEAVY_MODULES = ("pandas", "numpy", "openpyxl")
+
+# Generous against the ~25 ms measured locally so slow CI runners still pass
+IMPORT_BUDGET_MS = 150
+WALL_BUDGET_MS = 500
+
+
+def _run(args, cwd, importtime=False):
+    flags = ["-X", "importtime"] if importtime else []
+    return subprocess.run([sys.executable, *flags, str(REPO_ROOT / "ops_controller.py"), *args],
+                          capture_output=True, text=True, cwd=cwd)
+
+
+def _imported(stderr):
+    """Module name -> cumulative microseconds for every import in the trace"""
+    modules = {}
+    for line in stderr.splitlines():
+        if line.startswith("import time:") and "cumulative" not in line:
+            _, cumulative, name = line.split("|")
+            modules[name.strip()] = (int(cumulative), not name.startswith("  "))
+    return modules
+
+
+def test_help_skips_heavy_imports_and_setup(tmp_path):
+    result = _run(["--help"], tmp_path, importtime=True)
+    assert "Commands:" in result.stdout
+    assert "Ready" not in result.stdout  # no InventoryStrategist banner
+    assert not (tmp_path / "data").exists()
+
+    modules = _imported(result.stderr)
+    heavy = [name for name in modules if name.split(".")[0] in HEAVY_MODULES]
+    assert heavy == []
+    top_level_ms = sum(micros for micros, top in modules.values() if top) / 1000
+    assert top_level_ms < IMPORT_BUDGET_MS
+
+
+def test_trivial_commands_fit_the_wall_budget(tmp_path):
+    for args in (["--help"], ["/unknown"], []):
+        best = min(_timed(args, tmp_path) for _ in range(3))
+        assert best * 1000 < WALL_BUDGET_MS, args
+
+    assert "Unknown command" in _run(["/unknown"], tmp_path).stdout
+
+
+def _timed(args, cwd):
+    start = time.perf_counter()
+    _run(args, cwd)
+    return time.perf_counter() - start
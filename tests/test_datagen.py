@@ -0,0 +1,89 @@
+"""Synthetic data: seeded, chunk-streamed, event-linked and ingestible"""
+
+import pandas as pd
+import pytest
+
+from datagen import write_dataset
+from ops_controller import InventoryStrategist
+
+
+def test_same_seed_same_files_and_sales_follow_events(tmp_path):
+    first = write_dataset(tmp_path / "a", skus=50, events=40, sales=5_000, seed=7, chunk_rows=1_000)
+    second = write_dataset(tmp_path / "b", skus=50, events=40, sales=5_000, seed=7, chunk_rows=1_000)
+    for name, (path, rows) in first.items():
+        assert path.read_bytes() == second[name][0].read_bytes()
+
+    sales = pd.read_csv(first['sales'][0], dtype={'event_id': str})
+    events = pd.read_csv(first['events'][0], parse_dates=['start_dt', 'end_dt']).set_index('event_id')
+    assert len(sales) == 5_000 and 0.5 < sales['event_id'].notna().mean() < 0.7
+
+    linked = sales.dropna(subset=['event_id'])
+    windows = events.loc[linked['event_id'].astype(int)]
+    dates = pd.to_datetime(linked['date']).to_numpy()
+    assert ((dates >= windows['start_dt'].dt.normalize().to_numpy()) &
+            (dates <= windows['end_dt'].to_numpy())).all()
+
+    counts = pd.read_csv(first['counts'][0])
+    assert len(counts) == 50 * 3 * 2 and set(counts['checkpoint']) == {'BOM', 'MID', 'EOM'}
+
+
+def test_generated_files_run_through_ingest_and_plan(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    files = write_dataset(tmp_path / "input", skus=20, events=30, sales=2_000, seed=1)
+    strategist = InventoryStrategist()
+    strategist.ingest_events(str(files['events'][0]))
+    strategist.ingest_sales(str(files['sales'][0]))
+    strategist.ingest_audits(str(files['counts'][0]))
+    strategist.counts_unify()
+
+    forecast = strategist.forecast("2025-08")
+    assert (forecast['confidence'] == 'HIGH').all() and forecast['event_lift'].sum() > 0
+    assert (strategist.plan("2025-08")['current_stock'] > 0).all()
+
+
+def test_demo_events_stream_in_chunks_and_ingest(tmp_path, monkeypatch):
+    from datagen import XLSX_MAX_EVENTS, write_demo_events
+
+    path, rows = write_demo_events(tmp_path / "Events.csv", 2_500, seed=3, chunk_rows=1_000)
+    again, _ = write_demo_events(tmp_path / "again.csv", 2_500, seed=3, chunk_rows=1_000)
+    assert path.read_bytes() == again.read_bytes()
+
+    events = pd.read_csv(path)
+    assert rows == len(events) == 2_500 and len(events.columns) == 20
+    assert (events['Event ID'].diff().dropna() == 1).all()
+    assert (events['Forecast Attendance'] < 150).mean() > 0.3
+    assert (pd.to_datetime(events['In Date']) <= pd.to_datetime(events['Start Date'])).all()
+
+    with pytest.raises(ValueError):
+        write_demo_events(tmp_path / "big.xlsx", XLSX_MAX_EVENTS + 1, fmt='xlsx')
+
+    monkeypatch.chdir(tmp_path)
+    strategist = InventoryStrategist()
+    strategist.ingest_events(str(path))
+    processed = pd.read_csv(tmp_path / "data" / "events_processed.csv")
+    assert len(processed) == 2_500 and processed['est_attendance'].sum() == events['Forecast Attendance'].sum()
+
+
+def test_event_sales_follow_the_calendar_in_month_partitions(tmp_path, monkeypatch):
+    files = write_dataset(tmp_path / "input", skus=30, events=200, seed=5, sales_model='events')
+    again = write_dataset(tmp_path / "again", skus=30, events=200, seed=5, sales_model='events')
+    sales_dir, rows = files['sales']
+    parts = sorted(sales_dir.rglob('*.csv'))
+    assert [p.read_bytes() for p in parts] == [p.read_bytes() for p in sorted(again['sales'][0].rglob('*.csv'))]
+
+    sales = pd.concat([pd.read_csv(p, dtype={'event_id': str}).assign(part=p.parent.name) for p in parts])
+    assert len(sales) == rows and (sales['part'] == 'month=' + sales['date'].str[:7]).all()
+    assert not sales.duplicated(['date', 'sku', 'event_id']).any()
+
+    events = pd.read_csv(files['events'][0], parse_dates=['start_dt', 'end_dt'])
+    windows = events.set_index(events['event_id'].astype(str)).loc[sales['event_id']]
+    dates = pd.to_datetime(sales['date']).to_numpy()
+    assert ((dates >= windows['start_dt'].dt.normalize().to_numpy()) &
+            (dates <= windows['end_dt'].to_numpy())).all()
+    expected = (events['est_attendance'] * 0.15 * 1.2).sum()
+    assert abs(sales['units_sold'].sum() / expected - 1) < 0.25  # noisy per event, unbiased overall
+
+    monkeypatch.chdir(tmp_path)
+    strategist = InventoryStrategist()
+    ingested = strategist.ingest_batch([str(sales_dir)], 'sales')
+    assert len(ingested) == rows
@@ -0,0 +1,70 @@
+"""Calendar spine: interval sweep matches a brute-force count, spine bounds"""
+
+import numpy as np
+import pandas as pd
+
+from event_calendar import calendar_frame, spine_range
+
+
+def _events(n=200, seed=7):
+    rng = np.random.default_rng(seed)
+    offsets = rng.integers(0, 500, n)
+    offsets[0] = 0  # first event starts 2024-01-01, loads in 2023-12-31
+    start = pd.Timestamp("2024-01-01") + pd.to_timedelta(offsets, unit="D")
+    end = start + pd.to_timedelta(rng.integers(0, 4, n), unit="D")
+    return pd.DataFrame({
+        'event_id': range(n),
+        'in_date': start - pd.Timedelta(days=1),
+        'start_dt': start + pd.Timedelta(hours=9),
+        'end_dt': end + pd.Timedelta(hours=17),
+        'out_date': end + pd.Timedelta(days=1),
+        'est_attendance': rng.integers(10, 500, n),
+    })
+
+
+def test_sweep_matches_brute_force():
+    events = _events()
+    calendar = calendar_frame(events)
+
+    starts = events['start_dt'].dt.normalize()
+    ends = events['end_dt'].dt.normalize()
+    for _, day in calendar.sample(60, random_state=1).iterrows():
+        active = (starts <= day['Date']) & (ends >= day['Date'])
+        assert day['Event_Count'] == active.sum()
+        assert day['Concurrent_Attendance'] == events.loc[active, 'est_attendance'].sum()
+        if not active.any():
+            loading = (events['in_date'] <= day['Date']) & (events['out_date'] >= day['Date'])
+            assert day['Event_Window'] == ("LOAD_IN_OUT" if loading.any() else "")
+
+
+def test_spine_is_anchored_to_events_and_spans_two_to_three_years():
+    start, end = spine_range(_events())
+    assert start == pd.Timestamp("2023-12-01")
+    assert end == pd.Timestamp("2025-11-30")  # extended to the 2 year minimum
+
+    wide = _events()
+    wide.loc[0, 'out_date'] = pd.Timestamp("2029-06-15")
+    start, end = spine_range(wide)
+    assert end == pd.Timestamp("2029-06-30")
+    assert start == pd.Timestamp("2026-07-01")  # capped at 3 years
+
+
+def test_calendar_without_events_starts_today():
+    calendar = calendar_frame(None)
+    assert calendar['Date'].iloc[0] == pd.Timestamp.now().normalize()
+    assert calendar['Event_Count'].sum() == 0
+    assert calendar.loc[calendar['Date'].dt.dayofweek >= 5, 'Is_Weekend'].all()
+
+
+def test_end_before_start_never_goes_negative():
+    events = pd.DataFrame({
+        'event_id': [1, 2],
+        'start_dt': pd.to_datetime(['2025-08-10 09:00', '2025-08-06 09:00']),
+        'end_dt': pd.to_datetime(['2025-08-05 17:00', '2025-08-07 17:00']),  # event 1 ends before it starts
+        'est_attendance': [100, 40],
+    })
+    calendar = calendar_frame(events).set_index('Date')
+    assert (calendar['Event_Count'] >= 0).all() and (calendar['Concurrent_Attendance'] >= 0).all()
+    assert calendar.loc['2025-08-08', 'Event_Count'] == 0
+    assert calendar.loc['2025-08-10', 'Event_Count'] == 1
+    assert calendar.loc['2025-08-10', 'Concurrent_Attendance'] == 100
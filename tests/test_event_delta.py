@@ -0,0 +1,86 @@
+"""Event deltas: CSV round trip is unchanged, field changes and affected months, ingest changelog"""
+
+import json
+
+import pandas as pd
+
+from event_delta import CHANGELOG_FILE, DELTA_FILE, diff_events, month_spans
+
+
+def _events():
+    return pd.DataFrame({
+        'event_id': [101, 102, 103],
+        'name': ['Expo', 'Summit', 'Gala'],
+        'venue_area': ['Hall A', 'Hall B', 'Ballroom'],
+        'in_date': pd.to_datetime(['2025-03-30', '2025-05-10', '2025-06-01']),
+        'start_dt': pd.to_datetime(['2025-04-01 09:00', '2025-05-12 09:00', '2025-06-02 18:00']),
+        'end_dt': pd.to_datetime(['2025-04-03 17:00', '2025-05-12 17:00', '2025-06-02 23:00']),
+        'out_date': pd.to_datetime(['2025-04-04', '2025-05-13', '2025-06-03']),
+        'est_attendance': [1200.0, 300.0, 450.0],
+    })
+
+
+def test_round_trip_is_unchanged_and_edits_are_located(tmp_path):
+    events = _events()
+    events.to_csv(tmp_path / "events.csv", index=False)
+    reread = pd.read_csv(tmp_path / "events.csv")
+    delta = diff_events(reread, events)
+    assert (delta['added'], delta['removed'], len(delta['changed'])) == ([], [], 0)
+    assert delta['affected_months'] == []
+
+    edited = events.copy()
+    edited.loc[1, 'est_attendance'] = 350
+    edited.loc[0, 'start_dt'] = pd.Timestamp('2025-04-01 10:00')
+    edited = pd.concat([edited.drop(index=2), pd.DataFrame({
+        'event_id': [104], 'name': ['Launch'], 'venue_area': ['Hall A'],
+        'start_dt': [pd.Timestamp('2025-08-05 09:00')], 'end_dt': [pd.Timestamp('2025-08-05 17:00')],
+        'est_attendance': [80.0]})], ignore_index=True)
+
+    delta = diff_events(reread, edited)
+    assert delta['added'] == ['104'] and delta['removed'] == ['103']
+    changes = {(row.event_id, row.field): (row.old_value, row.new_value) for row in delta['changed'].itertuples()}
+    assert changes == {('101', 'start_dt'): ('2025-04-01 09:00:00', '2025-04-01 10:00:00'),
+                       ('102', 'est_attendance'): ('300', '350')}
+    # in_date 03-30 pulls March in for 101; 104 has no site dates and falls back to its run
+    assert delta['affected_months'] == ['2025-03', '2025-04', '2025-05', '2025-06', '2025-08']
+    assert delta['months']['101'] == '2025-03;2025-04'
+
+
+def test_reingest_writes_changelog_and_delta(tmp_path, monkeypatch, capsys):
+    from ops_controller import InventoryStrategist
+
+    monkeypatch.chdir(tmp_path)
+    strategist = InventoryStrategist()
+    strategist.ingest_events(data=_events())
+    delta = json.loads((tmp_path / "data" / DELTA_FILE).read_text())
+    assert delta['baseline'] and delta['added'] == 3
+    assert set(delta['month_digests']) == {'2025-03', '2025-04', '2025-05', '2025-06'}
+
+    edited = _events()
+    edited.loc[2, 'venue_area'] = 'Hall A'
+    capsys.readouterr()
+    strategist.ingest_events(data=edited)
+    assert "Affected months: 2025-06" in capsys.readouterr().out
+
+    latest = json.loads((tmp_path / "data" / DELTA_FILE).read_text())
+    assert (latest['added'], latest['removed'], latest['changed']) == (0, 0, 1)
+    assert latest['changed_fields'] == {'venue_area': 1}
+    assert latest['month_digests']['2025-04'] == delta['month_digests']['2025-04']
+    assert latest['month_digests']['2025-06'] != delta['month_digests']['2025-06']
+
+    log = pd.read_csv(tmp_path / "data" / CHANGELOG_FILE, dtype=str, keep_default_na=False)
+    assert list(log['change']) == ['added'] * 3 + ['changed']
+    assert log.iloc[-1][['event_id', 'field', 'old_value', 'new_value', 'months']].tolist() == \
+        ['103', 'venue_area', 'Ballroom', 'Hall A', '2025-06']
+
+
+def test_event_without_an_end_still_marks_its_start_month():
+    events = _events().drop(columns=['in_date', 'out_date'])
+    events.loc[2, 'end_dt'] = pd.NaT
+
+    spans = month_spans(events)
+    assert spans[spans['event_id'] == '103']['month'].tolist() == [(2025 - 1970) * 12 + 5]
+
+    edited = events.copy()
+    edited.loc[2, 'est_attendance'] = 500.0
+    assert diff_events(events, edited)['affected_months'] == ['2025-06']
@@ -0,0 +1,126 @@
+"""Event interval index: batch queries match brute force, persistence and staleness"""
+
+import numpy as np
+import pandas as pd
+
+from event_index import INDEX_FILE, EventIndex
+
+VENUES = ['Hall A', 'Hall B', 'Ballroom']
+
+
+def _events(n=300, seed=11):
+    rng = np.random.default_rng(seed)
+    start = pd.Timestamp("2025-01-01") + pd.to_timedelta(rng.integers(0, 200, n), unit="D")
+    days = rng.integers(0, 5, n)
+    days[:4] = [60, 90, 45, 120]  # a few multi-month residencies
+    end = start + pd.to_timedelta(days, unit="D")
+    return pd.DataFrame({
+        'event_id': np.arange(1000, 1000 + n),
+        'venue_area': rng.choice(VENUES, n),
+        'in_date': start - pd.Timedelta(days=2),
+        'start_dt': start + pd.Timedelta(hours=9),
+        'end_dt': end + pd.Timedelta(hours=18),
+        'out_date': end + pd.Timedelta(days=1),
+        'est_attendance': rng.integers(10, 5000, n),
+    })
+
+
+def _brute(events, a, b, venue=None, start_col='start_dt', end_col='end_dt'):
+    mask = (events[start_col] <= b) & (events[end_col] >= a)
+    if venue:
+        mask &= events['venue_area'] == venue
+    return events[mask]
+
+
+def test_batch_queries_match_brute_force():
+    events = _events()
+    index = EventIndex.from_events(events)
+    rng = np.random.default_rng(3)
+    a = pd.Timestamp("2024-12-15") + pd.to_timedelta(rng.integers(0, 240 * 24, 400), unit="h")
+    b = a + pd.to_timedelta(rng.integers(0, 10 * 24, 400), unit="h")
+
+    for venue in (None, 'Hall B'):
+        for lifecycle, cols in (('event', ('start_dt', 'end_dt')), ('site', ('in_date', 'out_date'))):
+            counts = index.count_overlapping(a, b, venue, lifecycle)
+            attendance = index.attendance_overlapping(a, b, venue, lifecycle)
+            pairs = index.overlapping(a, b, venue, lifecycle)
+            for q in range(len(a)):
+                expected = _brute(events, a[q], b[q], venue, *cols)
+                assert counts[q] == len(expected)
+                assert attendance[q] == expected['est_attendance'].sum()
+                assert sorted(pairs.loc[pairs['query'] == q, 'event_id']) == sorted(expected['event_id'])
+
+    days = pd.date_range("2025-01-01", "2025-08-31")
+    active = index.active_on(days)
+    for i, day in enumerate(days):
+        assert active[i] == len(_brute(events, day, day + pd.Timedelta(days=1) - pd.Timedelta(1, 'ns')))
+
+    starting = index.attendance_starting("2025-03-01", "2025-03-31")[0]
+    in_march = events['start_dt'].between("2025-03-01", "2025-03-31")
+    assert starting == events.loc[in_march, 'est_attendance'].sum()
+
+
+def test_index_persists_and_rebuilds_when_events_change(tmp_path):
+    events_file = tmp_path / "events_processed.csv"
+    _events(50).to_csv(events_file, index=False)
+
+    built = EventIndex.load_or_build(events_file)
+    assert (tmp_path / INDEX_FILE).exists()
+    loaded = EventIndex.load_or_build(events_file)
+    assert loaded.stamp == built.stamp
+    assert loaded.venues == sorted(VENUES)
+    assert (loaded.active_on(["2025-02-01", "2025-05-01"]) == built.active_on(["2025-02-01", "2025-05-01"])).all()
+
+    _events(80, seed=5).to_csv(events_file, index=False)
+    rebuilt = EventIndex.load_or_build(events_file)
+    assert len(rebuilt.partition()) == 80
+    assert EventIndex.load_or_build(tmp_path / "missing.csv") is None
+
+
+def test_ingest_builds_index_and_events_active_lists_overlaps(tmp_path, monkeypatch):
+    from ops_controller import InventoryStrategist
+
+    monkeypatch.chdir(tmp_path)
+    strategist = InventoryStrategist()
+    strategist.ingest_events()
+    assert (tmp_path / "data" / INDEX_FILE).exists()
+
+    active = strategist.events_active("2025-08-01", "2025-08-31")
+    events = pd.read_csv(tmp_path / "data" / "events_processed.csv", parse_dates=['start_dt', 'end_dt'])
+    expected = _brute(events, pd.Timestamp("2025-08-01"), pd.Timestamp("2025-09-01") - pd.Timedelta(1, 'ns'))
+    assert sorted(active['event_id'].astype(str)) == sorted(expected['event_id'].astype(str))
+
+
+def test_blank_venue_is_indexed_as_unknown(tmp_path, monkeypatch):
+    from ops_controller import InventoryStrategist
+    from venue_load import daily_load
+
+    events = _events(20)
+    events['venue_area'] = events['venue_area'].astype(object)
+    events.loc[3, 'venue_area'] = None
+    events.loc[4, 'venue_area'] = ''
+    source = tmp_path / "events.csv"
+    events.to_csv(source, index=False)
+
+    monkeypatch.chdir(tmp_path)
+    InventoryStrategist().ingest_events(str(source))
+    index = EventIndex.load_or_build(tmp_path / "data" / "events_processed.csv")
+    assert 'Unknown' in index.venues
+    assert len(index.partition('Unknown')) == 2
+    assert 'Unknown' in set(daily_load(pd.read_csv(tmp_path / "data" / "events_processed.csv"))['venue_area'])
+
+
+def test_event_without_an_end_is_indexed_as_ending_at_its_start():
+    events = pd.DataFrame({
+        'event_id': [1, 2],
+        'venue_area': ['Hall A', 'Hall A'],
+        'start_dt': pd.to_datetime(['2025-08-05 09:00', '2025-08-12 09:00']),
+        'end_dt': pd.to_datetime(['2025-08-06 17:00', None]),
+        'est_attendance': [100, 500],
+    })
+    index = EventIndex.from_events(events)
+
+    for lifecycle in ('event', 'site'):
+        assert index.attendance_starting("2025-08-01", "2025-08-31 23:59", lifecycle=lifecycle)[0] == 600
+        assert index.count_starting("2025-08-01", "2025-08-31 23:59", venue='Hall A', lifecycle=lifecycle)[0] == 2
+    assert index.active_on(["2025-08-12", "2025-08-13"]).tolist() == [1, 0]
@@ -0,0 +1,93 @@
+"""Batched JSONL exceptions sink: buffering, rotation and summary counts"""
+
+import json
+
+import pandas as pd
+
+from exceptions_log import ExceptionLog
+
+
+def _rows(n):
+    return pd.DataFrame({
+        'sku': [f"SKU{i:03d}" for i in range(n)],
+        'qty': range(n),
+        'asof_date': pd.to_datetime(['2025-08-01'] * n),
+    })
+
+
+def test_records_are_buffered_until_batch_is_full(tmp_path):
+    log = ExceptionLog(tmp_path, batch_size=10)
+
+    log.add(_rows(4), "Negative quantities")
+    assert not list(tmp_path.glob("*.jsonl"))
+
+    log.add(_rows(6), "Negative quantities")
+    [log_file] = tmp_path.glob("*.jsonl")
+    records = [json.loads(line) for line in log_file.read_text().splitlines()]
+    assert len(records) == 10
+    assert records[0]['sku'] == "SKU000"
+    assert records[1]['details']['qty'] == 1  # typed, not str(row)
+
+
+def test_files_rotate_by_size(tmp_path):
+    log = ExceptionLog(tmp_path, batch_size=1, max_bytes=400)
+
+    for _ in range(3):
+        log.add(_rows(1), "Duplicate count entries")
+
+    assert len(list(tmp_path.glob("exceptions_*.jsonl"))) == 3
+
+
+def test_summary_counts_by_type_severity_status(tmp_path):
+    log = ExceptionLog(tmp_path, batch_size=100)
+    log.add(_rows(3), "Duplicate count entries")
+    log.add(_rows(2), "Negative quantities", severity='MEDIUM')
+    log.flush()
+    log.add(_rows(1), "Negative quantities", severity='MEDIUM')
+
+    summary = log.summary().set_index('exception_type')
+    assert summary.loc["Duplicate count entries", 'count'] == 3
+    assert summary.loc["Negative quantities", 'count'] == 3
+    assert summary.loc["Negative quantities", 'severity'] == 'MEDIUM'
+    assert log.rebuild_summary()['count'].sum() == 6
+
+
+def test_ingest_flushes_to_absolute_dir_and_feeds_exceptions_sheet(tmp_path, monkeypatch):
+    from openpyxl import Workbook
+
+    from generate_workbook import create_exceptions_sheet, header_styles
+    from ops_controller import InventoryStrategist
+
+    monkeypatch.chdir(tmp_path)
+    strategist = InventoryStrategist()
+    counts = strategist.get_sample_counts()
+    strategist.ingest_audits(data=pd.concat([counts, counts.iloc[[0]]]))
+
+    # Written when the ingest ends, not at interpreter exit, under the original cwd
+    log_dir = tmp_path / "data" / "exceptions"
+    assert strategist.get_exception_log().log_dir == log_dir
+    assert len(list(log_dir.glob("exceptions_*.jsonl"))) == 1
+    monkeypatch.chdir(tmp_path.parent)
+    strategist.log_exceptions(_rows(1), "Negative quantities")
+    strategist.get_exception_log().flush()
+    assert strategist.get_exception_log().summary()['count'].sum() == 3
+
+    ws = Workbook().active
+    create_exceptions_sheet(ws, *header_styles(), log_dir=log_dir)
+    rows = list(ws.iter_rows(values_only=True))
+    assert rows[0] == ("Exception_Type", "Severity", "Status", "Count")
+    assert ("Duplicate count entries", "HIGH", "OPEN", 2) in rows[1:]
+
+
+def test_concurrent_adds_and_flushes_keep_every_record(tmp_path):
+    from concurrent.futures import ThreadPoolExecutor
+
+    log = ExceptionLog(tmp_path, batch_size=3)
+    rows = _rows(2)
+    with ThreadPoolExecutor(max_workers=8) as pool:
+        list(pool.map(lambda _: log.add(rows, "Negative quantities"), range(200)))
+    log.flush()
+
+    lines = sum(len(f.read_text().splitlines()) for f in tmp_path.glob("exceptions_*.jsonl"))
+    assert lines == 400
+    assert log.summary()['count'].sum() == 400
@@ -0,0 +1,56 @@
+"""Run metrics: nested stage records, JSON run files with --profile, run comparison"""
+
+import json
+import sys
+
+import ops_controller
+from metrics import Metrics, compare_runs
+from ops_controller import InventoryStrategist, dispatch
+
+
+def test_stages_record_sub_steps_and_rows(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    strategist = InventoryStrategist()
+    for command, args in (("/ingest", ["sales"]), ("/ingest", ["events"]), ("/forecast", ["2025-08"])):
+        dispatch(strategist, command, args)
+
+    stages = {s['stage']: s for s in strategist.metrics.summary()}
+    assert {'ingest_sales', 'ingest_sales/write', 'ingest_events/validate', 'forecast/write'} <= set(stages)
+    loads = stages['forecast/load:sales_processed.csv']['rows_out'] + \
+        stages['forecast/load:event_index']['rows_out']
+    assert stages['forecast']['rows_in'] == loads
+    assert stages['forecast']['rows_out'] == stages['forecast/write']['rows_in'] > 0
+    assert stages['forecast']['wall_s'] >= stages['forecast']['self_s'] > 0
+
+
+def test_profile_flag_writes_run_file_with_profile(tmp_path, monkeypatch, capsys):
+    monkeypatch.chdir(tmp_path)
+    monkeypatch.setattr(sys, 'argv', ["ops_controller.py", "/ingest", "sales", "--profile"])
+    ops_controller.main()
+    assert "Metrics and profile" in capsys.readouterr().out
+
+    run_file, = (tmp_path / "reports" / "metrics").glob("run_*.json")
+    run = json.loads(run_file.read_text())
+    assert run['command'] == "/ingest sales"
+    assert run['profile']['top_functions'] and run_file.with_suffix('.prof').exists()
+    stage = next(s for s in run['stages'] if s['stage'] == 'ingest_sales')
+    assert stage['alloc_peak_mb'] >= 0 and stage['rows_out'] > 0
+
+
+def test_compare_flags_only_regressions_above_threshold_and_noise():
+    def run(**walls):
+        return {'stages': [{'stage': name, 'wall_s': wall} for name, wall in walls.items()]}
+
+    baseline = run(plan=1.0, load=0.001, pnl=1.0)
+    current = run(plan=1.5, load=0.003, pnl=1.1, publish=0.2)
+    rows = {row['stage']: row for row in compare_runs(baseline, current, threshold_pct=20)}
+    assert rows['plan']['regressed'] and rows['plan']['delta_pct'] == 50.0
+    assert not rows['load']['regressed']  # +200% but under the noise floor
+    assert not rows['pnl']['regressed'] and rows['publish']['baseline_wall_s'] is None
+
+    metrics = Metrics()
+    with metrics.step('outer'):
+        with metrics.step('load:x') as inner:
+            inner['rows_out'] = 5
+    assert [s['stage'] for s in metrics.summary()] == ['outer/load:x', 'outer']
+    assert metrics.summary()[1]['rows_in'] == 5
@@ -0,0 +1,61 @@
+"""/run month pipeline: DAG order, in-memory handoff and fingerprint skipping"""
+
+from ops_controller import InventoryStrategist
+from pipeline import STAGES, MonthPipeline, topological_order
+
+
+def _strategist(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    return InventoryStrategist()
+
+
+def test_topological_order_puts_dependencies_first():
+    order = topological_order()
+    for name, spec in STAGES.items():
+        assert all(order.index(dep) < order.index(name) for dep in spec['deps'])
+
+
+def test_first_run_hands_frames_over_in_memory(tmp_path, monkeypatch):
+    strategist = _strategist(tmp_path, monkeypatch)
+    reads = []
+    load_data = strategist.load_data
+    monkeypatch.setattr(strategist, 'load_data', lambda name, path=None: reads.append(name) or load_data(name, path))
+
+    results = MonthPipeline(strategist, "2025-08", quiet=True).run()
+
+    assert {r['status'] for r in results.values()} == {'ran'}
+    assert reads == []
+    assert (tmp_path / "reports" / "2025-08" / "report_pack_2025-08.zip").exists()
+
+
+def test_rerun_skips_current_stages_and_config_change_reruns_dependents(tmp_path, monkeypatch):
+    strategist = _strategist(tmp_path, monkeypatch)
+    MonthPipeline(strategist, "2025-08", quiet=True).run()
+
+    results = MonthPipeline(strategist, "2025-08", quiet=True).run()
+    assert {r['status'] for r in results.values()} == {'skipped'}
+
+    strategist.config['z_service_level'] = 2.33
+    results = MonthPipeline(strategist, "2025-08", quiet=True).run()
+    ran = [name for name, r in results.items() if r['status'] == 'ran']
+    assert ran == ['plan', 'publish']
+
+
+def test_event_edit_reruns_only_forecasts_of_touched_months(tmp_path, monkeypatch):
+    strategist = _strategist(tmp_path, monkeypatch)
+    MonthPipeline(strategist, "2025-08", quiet=True).run()
+
+    # Sample events are in September: editing one leaves the August forecast current
+    events = strategist.get_sample_events()
+    events.loc[0, 'est_attendance'] = 650
+    events.to_csv(tmp_path / "events.csv", index=False)
+    results = MonthPipeline(strategist, "2025-08", sources={'events': "events.csv"}, quiet=True).run()
+    assert results['events']['status'] == 'ran'
+    assert results['forecast']['status'] == 'skipped'
+
+    events.loc[1, 'start_dt'] = "2025-08-20 10:00:00"
+    events.loc[1, 'end_dt'] = "2025-08-20 16:00:00"
+    events.to_csv(tmp_path / "events.csv", index=False)
+    results = MonthPipeline(strategist, "2025-08", sources={'events': "events.csv"}, quiet=True).run()
+    ran = [name for name, r in results.items() if r['status'] == 'ran']
+    assert ran == ['events', 'forecast', 'plan', 'publish']
@@ -0,0 +1,55 @@
+"""Golden outputs and per-case time/memory budgets on a fixed-seed dataset (see regression.py)
+
+Budgets only run with REGRESSION_BUDGETS=1, in one pinned CI job.
+"""
+
+import json
+import os
+
+import pytest
+
+from regression import (BUDGETS_ENV, BUDGETS_FILE, GOLDEN_DIR, budgets_enabled, calibrate,
+                        check_budgets, check_outputs, compare_frame, prepare, run_cases, run_outputs)
+
+
+@pytest.fixture(scope="module")
+def regression_run(tmp_path_factory):
+    workdir = tmp_path_factory.mktemp("regression")
+    cwd = os.getcwd()
+    os.chdir(workdir)
+    try:
+        strategist, inputs = prepare(workdir)
+        if budgets_enabled():
+            yield strategist, calibrate(), run_cases(strategist, inputs)
+        else:
+            run_outputs(strategist, inputs)
+            yield strategist, None, None
+    finally:
+        os.chdir(cwd)
+
+
+def test_outputs_match_golden_files(regression_run):
+    strategist, _, _ = regression_run
+    assert check_outputs(strategist) == []
+
+
+@pytest.mark.skipif(not budgets_enabled(), reason=f"timing budgets need {BUDGETS_ENV}=1")
+def test_cases_stay_within_time_and_memory_budgets(regression_run):
+    _, calibration, measured = regression_run
+    budgets = json.loads((GOLDEN_DIR / BUDGETS_FILE).read_text())
+    assert check_budgets(measured, calibration, budgets) == []
+
+
+def test_budget_and_golden_checks_catch_regressions():
+    import pandas as pd
+
+    budgets = {'cases': {'plan': {'time_units': 1.0, 'alloc_mb': 10.0}}}
+    assert check_budgets({'plan': (0.1, 10.0)}, 0.1, budgets) == []
+    slower, = check_budgets({'plan': (0.2, 10.0)}, 0.1, budgets)
+    assert "2.00x" in slower
+    assert check_budgets({'plan': (0.1, 30.0)}, 0.1, budgets)
+
+    golden = pd.DataFrame({'sku': ['A', 'B'], 'rop': [10.0, 20.0], 'priority': ['HIGH', 'LOW']})
+    assert compare_frame(golden.iloc[::-1].assign(rop=[20.0 + 1e-9, 10.0]), golden) == []
+    wrong, = compare_frame(golden.assign(rop=[10.0, 21.0]), golden)
+    assert wrong.startswith("rop @ sku=B")
@@ -0,0 +1,88 @@
+"""Report pack: KPIs computed once, one streamed archive with a checksummed manifest"""
+
+import hashlib
+import json
+import zipfile
+
+import pandas as pd
+
+from report_pack import compute_kpis, report_files, verify_pack, write_pack
+
+CONFIG = {'max_cash_per_order': 1000, 'low_dos_warning': 15}
+
+
+def _reports(tmp_path):
+    pd.DataFrame({
+        'sku': ['A', 'B'], 'total_forecast': [100.0, 50.0], 'event_lift': [20.0, 0.0],
+        'confidence': ['HIGH', 'LOW'],
+    }).to_csv(tmp_path / "forecast_2025-08.csv", index=False)
+    pd.DataFrame({
+        'sku': ['A', 'B'], 'current_stock': [0, 80], 'rop': [40, 30],
+        'recommended_qty': [120, 0], 'order_cost': [600.0, 0.0],
+        'days_of_supply': [0.0, 48.0], 'priority': ['HIGH', 'LOW'],
+    }).to_csv(tmp_path / "buy_plan_2025-08.csv", index=False)
+    pd.DataFrame({
+        'sku': ['A', 'B'], 'category': ['Apparel', 'Apparel'], 'units_sold': [30, 10],
+        'revenue': [300.0, 100.0], 'cogs': [120.0, 60.0], 'gross_margin': [180.0, 40.0],
+        'current_stock': [0, 80], 'avg_inventory_value': [0.0, 240.0], 'gmroi': [0.0, 0.17],
+    }).to_csv(tmp_path / "pnl_snapshot_2025-08.csv", index=False)
+    return report_files(tmp_path, "2025-08")
+
+
+def test_kpis_aggregate_all_three_outputs(tmp_path):
+    files = _reports(tmp_path)
+    kpis = compute_kpis({name: pd.read_csv(path) for name, path in files.items()}, CONFIG)
+
+    assert kpis['forecast']['total_units'] == 150.0
+    assert kpis['forecast']['event_lift_units'] == 20.0
+    assert kpis['buy_plan']['skus_to_order'] == 1
+    assert kpis['buy_plan']['budget_used_pct'] == 0.6
+    assert kpis['buy_plan']['below_rop'] == 1
+    assert kpis['buy_plan']['critical_skus'] == ['A']
+    assert kpis['pnl']['revenue'] == 400.0
+    assert kpis['pnl']['gm_pct'] == 0.55
+    assert kpis['pnl']['low_gmroi_skus'] == 1
+    assert kpis['pnl']['by_category'] == {'Apparel': {'revenue': 400.0, 'gross_margin': 220.0}}
+
+    assert compute_kpis({}, CONFIG) == {'forecast': None, 'buy_plan': None, 'pnl': None}
+
+
+def test_pack_checksums_match_streamed_bytes(tmp_path):
+    files = _reports(tmp_path)
+    artifacts = {"summary.txt": "Revenue: $400.00\n"}
+    archive, manifest_file, manifest = write_pack(tmp_path / "2025-08", "2025-08", files,
+                                                  artifacts, {'pnl': {'revenue': 400.0}})
+
+    assert json.loads(manifest_file.read_text()) == manifest
+    assert manifest['archive_sha256'] == hashlib.sha256(archive.read_bytes()).hexdigest()
+    assert manifest['archive_bytes'] == archive.stat().st_size
+    assert [m['name'] for m in manifest['members']] == [
+        "forecast_2025-08.csv", "buy_plan_2025-08.csv", "pnl_snapshot_2025-08.csv", "summary.txt"]
+
+    with zipfile.ZipFile(archive) as zf:
+        assert zf.testzip() is None
+        assert zf.read("summary.txt").decode() == artifacts["summary.txt"]
+        assert zf.read("buy_plan_2025-08.csv") == files['buy_plan'].read_bytes()
+    assert verify_pack(archive, manifest) == []
+
+    manifest['members'][0]['sha256'] = "0" * 64
+    assert verify_pack(archive, manifest) == ["forecast_2025-08.csv"]
+
+
+def test_publish_reads_each_report_once(tmp_path, monkeypatch):
+    import report_pack
+    from ops_controller import InventoryStrategist
+
+    monkeypatch.chdir(tmp_path)
+    strategist = InventoryStrategist()
+    files = _reports(strategist.reports_path)
+    reads = []
+    monkeypatch.setattr(report_pack, "_file_blocks", lambda path: reads.append(path) or iter(()))
+    original_read_csv = pd.read_csv
+    monkeypatch.setattr(pd, "read_csv", lambda src, *a, **k: reads.append(src) or original_read_csv(src, *a, **k))
+
+    archive, _ = strategist.publish_pack("2025-08")
+
+    assert not [src for src in reads if not hasattr(src, 'read')]  # no second pass over a file
+    with zipfile.ZipFile(archive) as zf:
+        assert zf.read("pnl_snapshot_2025-08.csv") == files['pnl_snapshot'].read_bytes()
@@ -0,0 +1,58 @@
+"""Layout detection and read plans for the sales/counts schema adapters"""
+
+import pytest
+
+from conftest import REPO_ROOT
+from schema_adapters import compile_plan, read_adapted, read_header
+
+
+@pytest.mark.parametrize("filename, layout", [
+    ("sample_sales_data.csv", "system"),
+    ("CLIENT_Sales.csv", "client_export"),
+    ("complete_sales_data.csv", "dataset_generator"),
+])
+def test_sales_layouts_map_to_system_columns(filename, layout):
+    df = read_adapted(REPO_ROOT / filename, 'sales')
+
+    assert df.attrs['layout'] == layout
+    assert {'date', 'sku', 'units_sold', 'revenue'} <= set(df.columns)
+    assert str(df['date'].dtype).startswith('datetime64')
+    assert (df['revenue'] > 0).all()
+
+
+def test_generator_sales_derive_revenue_from_units_and_price():
+    df = read_adapted(REPO_ROOT / "complete_sales_data.csv", 'sales')
+
+    assert 'total_revenue' not in df.columns
+    assert (df['revenue'] - df['units_sold'] * df['unit_price']).abs().max() < 1e-9
+
+
+@pytest.mark.parametrize("filename, layout", [
+    ("sample_inventory_counts.csv", "system"),
+    ("CLIENT_Counts.csv", "client_export"),
+    ("complete_counts_data.csv", "dataset_generator"),
+])
+def test_counts_layouts_map_to_system_columns(filename, layout):
+    df = read_adapted(REPO_ROOT / filename, 'counts')
+
+    assert df.attrs['layout'] == layout
+    assert {'asof_date', 'checkpoint', 'location', 'sku', 'qty', 'counter_id'} <= set(df.columns)
+    assert set(df['checkpoint']) <= {'BOM', 'MID', 'EOM'}
+
+
+def test_client_counts_move_counter_name_out_of_checkpoint():
+    df = read_adapted(REPO_ROOT / "CLIENT_Counts.csv", 'counts')
+
+    assert df['counter_id'].str.startswith('Counter-').all()
+    assert (df['checkpoint'] == 'EOM').all()  # counted on the 25th
+
+
+def test_plans_are_compiled_once_per_header():
+    header = read_header(REPO_ROOT / "CLIENT_Sales.csv")
+
+    assert compile_plan('sales', header) is compile_plan('sales', header)
+
+
+def test_unknown_layout_is_rejected():
+    with pytest.raises(ValueError, match="No sales layout"):
+        compile_plan('sales', ('when', 'what', 'how_many'))
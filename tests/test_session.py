@@ -0,0 +1,48 @@
+"""Session mode: tables stay cached until their file changes; socket clients share them"""
+
+import threading
+
+import pandas as pd
+
+from session import Session, SessionServer, send_command
+
+
+def test_socket_client_replans_from_cached_tables(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    session = Session()
+    for line in ("/ingest sales", "/ingest audits", "/counts unify", "/ingest events"):
+        session.execute(line)
+
+    server = SessionServer(session, port=0)
+    port = server.server_address[1]
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    try:
+        assert "Forecast" in send_command("/forecast 2025-08", port)['output']
+        send_command("/plan 2025-08", port)
+        low = pd.read_csv(tmp_path / "reports" / "buy_plan_2025-08.csv").set_index('sku')['safety_stock']
+
+        assert "2.33" in send_command("set z_service_level 2.33", port)['output']
+        response = send_command("/plan 2025-08", port)
+        high = pd.read_csv(tmp_path / "reports" / "buy_plan_2025-08.csv").set_index('sku')['safety_stock']
+    finally:
+        server.shutdown()
+        server.server_close()
+
+    assert "Buy Plan" in response['output']
+    assert (high > low).all()
+    assert session.tables.stats()['hits'] >= 2  # counts and forecast came from memory
+
+
+def test_each_command_saves_its_own_metrics_run(tmp_path, monkeypatch):
+    import json
+
+    monkeypatch.chdir(tmp_path)
+    session = Session()
+    session.execute("/ingest sales")
+    session.execute("/ingest audits")
+
+    runs = sorted((tmp_path / "reports" / "metrics").glob("run_*.json"))
+    assert [json.loads(run.read_text())['command'] for run in runs] == ["/ingest sales", "/ingest audits"]
+    assert session.strategist.metrics.records == []
+    stages = {stage['stage'] for stage in json.loads(runs[1].read_text())['stages']}
+    assert not any(stage.startswith('ingest_sales') for stage in stages)
@@ -0,0 +1,75 @@
+"""Table cache: stamp invalidation, LRU eviction under the memory cap, read-only views"""
+
+import pandas as pd
+
+from ops_controller import InventoryStrategist
+from table_cache import TableCache, frame_bytes
+
+
+def _write(path, rows):
+    pd.DataFrame({'sku': [f"SKU-{i:04d}" for i in range(rows)], 'qty': range(rows)}).to_csv(path, index=False)
+
+
+def test_reload_only_changed_files(tmp_path):
+    path = tmp_path / "t.csv"
+    _write(path, 2)
+    cache = TableCache()
+
+    assert len(cache.get(path, pd.read_csv)) == 2
+    assert len(cache.get(path, pd.read_csv)) == 2
+    _write(path, 3)
+    assert len(cache.get(path, pd.read_csv)) == 3
+    stats = cache.stats()
+    assert (stats['tables'], stats['hits'], stats['misses'], stats['invalidations']) == (1, 1, 2, 1)
+
+
+def test_memory_cap_evicts_least_recently_used(tmp_path):
+    paths = [tmp_path / f"t{i}.csv" for i in range(3)]
+    for path in paths:
+        _write(path, 100)
+    size = frame_bytes(pd.read_csv(paths[0]))
+    cache = TableCache(max_bytes=2 * size)
+
+    cache.get(paths[0], pd.read_csv)
+    cache.get(paths[1], pd.read_csv)
+    cache.get(paths[0], pd.read_csv)  # t1 is now least recently used
+    cache.get(paths[2], pd.read_csv)
+    cache.get(paths[0], pd.read_csv)
+    stats = cache.stats()
+    assert (stats['tables'], stats['bytes'], stats['evictions'], stats['hits']) == (2, 2 * size, 1, 2)
+
+    cache.get(paths[1], pd.read_csv)
+    assert cache.stats()['misses'] == 4
+    assert TableCache(max_bytes=0).get(paths[0], pd.read_csv) is not None
+
+
+def test_load_data_hands_out_views_callers_cannot_mutate(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    strategist = InventoryStrategist()
+    _write(strategist.data_path / "counts_unified.csv", 5)
+
+    first = strategist.load_data("counts_unified.csv")
+    first['qty'] = 0
+    first.loc[0, 'sku'] = "CHANGED"
+    first.drop(columns=['sku'], inplace=True)
+
+    again = strategist.load_data("counts_unified.csv")
+    assert again['qty'].tolist() == [0, 1, 2, 3, 4] and again.loc[0, 'sku'] == "SKU-0000"
+    assert strategist.table_cache.stats()['hits'] == 1
+
+
+def test_without_copy_on_write_callers_get_deep_copies(tmp_path, monkeypatch):
+    import numpy as np
+
+    import table_cache
+
+    monkeypatch.setattr(table_cache, "copy_on_write", lambda: False)
+    monkeypatch.chdir(tmp_path)
+    strategist = InventoryStrategist()
+    _write(strategist.data_path / "counts_unified.csv", 5)
+
+    first = strategist.load_data("counts_unified.csv")
+    again = strategist.load_data("counts_unified.csv")
+    assert not np.shares_memory(first['qty'].to_numpy(), again['qty'].to_numpy())
+    first.loc[0, 'qty'] = 99
+    assert strategist.load_data("counts_unified.csv").loc[0, 'qty'] == 0
@@ -0,0 +1,46 @@
+"""Dtype registry: categories below the cardinality cutoff, explicit date formats, int32 downcasts"""
+
+import pandas as pd
+
+from table_dtypes import apply_dtypes, downcast_integers, parse_dates, table_for_file, to_category
+
+
+def test_repetitive_strings_become_categories_unique_ones_do_not():
+    repeated = pd.Series(['Bar', 'Kitchen', 'Bar', 'Bar'])
+    unique = pd.Series(['SKU-1', 'SKU-2', 'SKU-3', 'SKU-1'])
+
+    assert isinstance(to_category(repeated).dtype, pd.CategoricalDtype)
+    assert not isinstance(to_category(unique).dtype, pd.CategoricalDtype)  # 3 distinct > 4 * 0.5
+    assert to_category(pd.Series([1, 1, 1])).dtype.kind == 'i'
+
+
+def test_dates_use_the_first_format_that_parses_every_value():
+    plain = parse_dates(pd.Series(['2025-08-01', '2025-08-02', None]))
+    timed = parse_dates(pd.Series(['2025-08-01 09:30:00', '2025-08-02 17:00:00']))
+
+    assert plain.iloc[1] == pd.Timestamp('2025-08-02') and plain.isna().sum() == 1
+    assert timed.iloc[0] == pd.Timestamp('2025-08-01 09:30:00')
+
+
+def test_integers_downcast_no_narrower_than_int32():
+    small = downcast_integers(pd.Series([1, 2, 120]))
+    whole = downcast_integers(pd.Series([1.0, 2.0]))
+    wide = downcast_integers(pd.Series([0, 2 ** 40]))
+
+    assert small.dtype == 'int32' and whole.dtype == 'int32' and wide.dtype == 'int64'
+    assert (small * 1000).max() == 120000  # int8 would have wrapped
+    assert downcast_integers(pd.Series([1.5, 2.0])).dtype == 'float64'
+    assert downcast_integers(pd.Series([1.0, None])).dtype == 'float64'
+
+
+def test_apply_dtypes_follows_the_registry_for_a_file():
+    df = pd.DataFrame({'sku': ['A', 'A', 'B', 'A'], 'units_sold': [1, 2, 3, 4],
+                       'date': ['2025-08-01'] * 4, 'price': [9.5, 9.5, 9.5, 9.5]})
+
+    out = apply_dtypes(df, table_for_file('sales_processed.csv'))
+
+    assert isinstance(out['sku'].dtype, pd.CategoricalDtype)
+    assert out['units_sold'].dtype == 'int32'
+    assert pd.api.types.is_datetime64_any_dtype(out['date'])
+    assert out['price'].dtype == 'float64'
+    assert table_for_file('forecast_2025-08.csv') == 'forecast' and table_for_file('notes.csv') is None
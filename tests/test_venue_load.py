@@ -0,0 +1,86 @@
+"""Venue load sweep: daily active/peak levels match brute force, peak windows, CLI + dashboard"""
+
+import json
+
+import numpy as np
+import pandas as pd
+
+from venue_load import daily_load, peak_windows, stocking_targets
+
+
+def _events(n=150, seed=4):
+    rng = np.random.default_rng(seed)
+    start = (pd.Timestamp("2025-03-01") + pd.to_timedelta(rng.integers(0, 40 * 24, n), unit="h")).floor("h")
+    end = start + pd.to_timedelta(rng.integers(1, 72, n), unit="h")
+    return pd.DataFrame({
+        'event_id': range(n),
+        'venue_area': rng.choice(['Hall A', 'Hall B'], n),
+        'start_dt': start,
+        'end_dt': end,
+        'est_attendance': rng.integers(10, 2000, n),
+    })
+
+
+def test_daily_levels_match_brute_force():
+    events = _events()
+    daily = daily_load(events)
+
+    for row in daily.sample(60, random_state=2).itertuples():
+        venue = events[events['venue_area'] == row.venue_area]
+        day_end = row.date + pd.Timedelta(days=1) - pd.Timedelta(1, 'ns')
+        active = venue[(venue['start_dt'] <= day_end) & (venue['end_dt'] >= row.date)]
+        assert row.events_active == len(active)
+        assert row.attendance_active == active['est_attendance'].sum()
+
+        # the onsite level only rises at a start, so the peak is at the day start or a start inside it
+        instants = [row.date] + [t for t in active['start_dt'] if t >= row.date]
+        onsite = [venue[(venue['start_dt'] <= t) & (venue['end_dt'] >= t)] for t in instants]
+        assert row.peak_events == max(len(o) for o in onsite)
+        assert row.peak_attendance == max(o['est_attendance'].sum() for o in onsite)
+
+    # every venue-day with an overlapping event is present
+    days = sum(((e.end_dt.normalize() - e.start_dt.normalize()).days + 1) for e in events.itertuples())
+    assert daily['events_active'].sum() == days
+
+
+def test_peak_windows_and_targets():
+    daily = pd.DataFrame({
+        'venue_area': ['A'] * 6 + ['B'] * 2,
+        'date': pd.to_datetime(['2025-01-01', '2025-01-02', '2025-01-03', '2025-01-05', '2025-01-06',
+                                '2025-01-09', '2025-01-01', '2025-01-02']),
+        'events_active': 1, 'attendance_active': 0, 'peak_events': 1,
+        'peak_attendance': [100, 950, 1000, 920, 300, 990, 50, 40],
+    })
+    windows = peak_windows(daily, 0.9)
+    a = windows[windows['venue_area'] == 'A']
+    assert list(a['days']) == [2, 1, 1]  # Jan 2-3, then Jan 9 and Jan 5 by peak
+    assert list(a['window_start'].dt.day) == [2, 9, 5]
+    assert list(windows.loc[windows['venue_area'] == 'B', 'peak_attendance']) == [50]
+
+    targets = stocking_targets(daily, 0.15, 1.2).set_index('venue_area')
+    assert targets.loc['A', 'peak_attendance'] == 1000
+    assert targets.loc['A', 'peak_date'] == pd.Timestamp('2025-01-03')
+    assert targets.loc['A', 'target_units'] == 180
+
+
+def test_venues_load_writes_reports_and_feeds_dashboard(tmp_path, monkeypatch):
+    from ops_controller import InventoryStrategist, dispatch
+
+    monkeypatch.chdir(tmp_path)
+    strategist = InventoryStrategist()
+    events = _events(40)
+    events['start_dt'] = events['start_dt'] + pd.DateOffset(months=5)  # into 2025-08
+    events['end_dt'] = events['end_dt'] + pd.DateOffset(months=5)
+    strategist.ingest_events(data=events)
+    dispatch(strategist, "/venues", ["load", "2025-08"])
+
+    targets = pd.read_csv(tmp_path / "reports" / "venue_targets_2025-08.csv")
+    assert set(targets['venue_area']) == {'Hall A', 'Hall B'}
+    assert (tmp_path / "reports" / "venue_load_2025-08.csv").exists()
+
+    strategist.ingest_sales()
+    strategist.forecast("2025-08")
+    strategist.publish_pack("2025-08")
+    manifest = json.loads((tmp_path / "reports" / "2025-08" / "manifest_2025-08.json").read_text())
+    assert manifest['kpis']['venues']['venues'] == 2
+    assert "venue_targets_2025-08.csv" in [m['name'] for m in manifest['members']]
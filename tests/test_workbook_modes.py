@@ -0,0 +1,61 @@
+"""Workbook fill modes for the planning sheets"""
+
+import re
+import sys
+
+import pytest
+
+from conftest import REPO_ROOT
+
+sys.path.insert(0, str(REPO_ROOT / "benchmarks"))
+
+from bench_workbook_modes import recalc_cells, synthetic_tables  # noqa: E402
+from generate_workbook import create_command_center_workbook  # noqa: E402
+
+
+FULL_COLUMN = re.compile(r"\b[A-Z]+:[A-Z]+\b")
+
+
+@pytest.fixture(scope="module")
+def tables():
+    return synthetic_tables(50)
+
+
+def _body_formulas(ws):
+    return [c.value for row in ws.iter_rows(min_row=2) for c in row
+            if isinstance(c.value, str) and c.value.startswith("=")]
+
+
+def test_values_mode_writes_plan_outputs_without_formulas(tables):
+    wb = create_command_center_workbook(mode="values", tables=tables)
+    for sheet in ["Plan_Buy", "ROP_SS", "PnL"]:
+        assert wb[sheet].max_row == 51
+        assert _body_formulas(wb[sheet]) == []
+    buy_plan = tables["buy_plan"]
+    assert wb["Plan_Buy"]["I2"].value == buy_plan["recommended_qty"].iloc[0]
+    assert wb["ROP_SS"]["J2"].value in {"REORDER NOW", "MONITOR", "OK"}
+
+
+def test_hybrid_mode_uses_bounded_references_and_one_match_per_row(tables):
+    wb = create_command_center_workbook(mode="hybrid", tables=tables)
+    assert "tblSKU" in wb["SKU"].tables
+    for sheet in ["Plan_Buy", "ROP_SS", "PnL"]:
+        formulas = _body_formulas(wb[sheet])
+        assert formulas
+        assert not any(FULL_COLUMN.search(f) for f in formulas)
+        assert not any("VLOOKUP" in f or "SUMIFS" in f for f in formulas)
+    assert sum("MATCH(" in f for f in _body_formulas(wb["ROP_SS"])) == 50
+    assert sum("MATCH(" in f for f in _body_formulas(wb["Plan_Buy"])) == 0
+
+
+def test_formulas_mode_copies_template_down_per_sku(tables):
+    wb = create_command_center_workbook(mode="formulas", tables=tables)
+    ws = wb["Plan_Buy"]
+    assert ws["A51"].value == tables["buy_plan"]["sku"].iloc[49]
+    assert ws["B51"].value == "=VLOOKUP(A51,SKU!A:B,2,FALSE)"
+
+
+def test_hybrid_recalc_reads_far_fewer_cells_than_full_column_formulas(tables):
+    _, full = recalc_cells(create_command_center_workbook(mode="formulas", tables=tables), 50)
+    _, hybrid = recalc_cells(create_command_center_workbook(mode="hybrid", tables=tables), 50)
+    assert hybrid * 5 < full
@@ -0,0 +1,126 @@
+"""Incremental workbook refresh: only sheets with changed inputs are rewritten"""
+
+import zipfile
+
+import openpyxl
+import pandas as pd
+
+from workbook_refresh import refresh_workbook, sheet_parts
+
+
+def _counts(qty):
+    return pd.DataFrame({
+        'unique_key': ['K1', 'K2'],
+        'asof_date': ['2025-08-01', '2025-08-02'],
+        'checkpoint': ['BOM', 'MID'],
+        'location': ['MAIN', 'MAIN'],
+        'sku': ['SKU1', 'SKU2'],
+        'qty': qty,
+    })
+
+
+def _build(tmp_path):
+    data = tmp_path / "data"
+    reports = tmp_path / "reports"
+    data.mkdir()
+    reports.mkdir()
+    _counts([5, 7]).to_csv(data / "counts_processed.csv", index=False)
+    pd.DataFrame({'date': ['2025-08-01'], 'sku': ['SKU1'], 'units_sold': [3]}).to_csv(
+        data / "sales_processed.csv", index=False)
+    workbook = tmp_path / "wb.xlsx"
+    result = refresh_workbook(workbook, data, reports)
+    return workbook, data, reports, result
+
+
+def test_first_refresh_is_a_full_build_and_second_is_a_no_op(tmp_path):
+    workbook, data, reports, result = _build(tmp_path)
+    assert result['mode'] == "full"
+    assert result['rows'] == {'Counts_Entry': 2, 'Sales': 1}
+
+    before = workbook.stat().st_mtime_ns
+    again = refresh_workbook(workbook, data, reports)
+    assert again['rebuilt'] == []
+    assert workbook.stat().st_mtime_ns == before
+
+
+def test_only_changed_sheet_part_is_rewritten(tmp_path):
+    workbook, data, reports, _ = _build(tmp_path)
+    with zipfile.ZipFile(workbook) as zf:
+        parts = sheet_parts(zf)
+        sales_before = zf.read(parts['Sales'])
+
+    _counts([50, 70]).to_csv(data / "counts_processed.csv", index=False)
+    result = refresh_workbook(workbook, data, reports)
+    assert result['rebuilt'] == ['Counts_Entry']
+
+    with zipfile.ZipFile(workbook) as zf:
+        assert zf.read(parts['Sales']) == sales_before
+
+    ws = openpyxl.load_workbook(workbook)['Counts_Entry']
+    assert [c.value for c in ws['F']] == ['Qty', 50, 70]
+    assert ws['B2'].is_date
+    assert ws['B2'].border.left.style == ws['F3'].border.left.style == ws['M3'].border.left.style == "thin"
+    assert ws['A1'].font.bold
+    assert ws.freeze_panes == "A2"
+
+
+def test_sheet_whose_source_disappeared_is_emptied(tmp_path):
+    workbook, data, reports, _ = _build(tmp_path)
+    (data / "sales_processed.csv").unlink()
+
+    result = refresh_workbook(workbook, data, reports)
+    assert result['rebuilt'] == ['Sales'] and result['rows'] == {'Sales': 0}
+
+    ws = openpyxl.load_workbook(workbook)['Sales']
+    assert ws['A1'].value == "Date" and ws.max_row == 2 and ws['B2'].value is None
+    assert refresh_workbook(workbook, data, reports)['rebuilt'] == []
+
+
+def test_calendar_chart_follows_a_shorter_spine(tmp_path):
+    from event_calendar import calendar_frame
+    from workbook_refresh import chart_parts
+
+    def events(last_end):
+        frame = pd.DataFrame({'event_id': [1, 2], 'start_dt': ['2025-08-05 09:00', '2025-09-01 09:00'],
+                              'end_dt': ['2025-08-05 17:00', last_end], 'est_attendance': [100, 40]})
+        frame.to_csv(tmp_path / "data" / "events_processed.csv", index=False)
+        return len(calendar_frame(frame.astype({'start_dt': 'datetime64[ns]', 'end_dt': 'datetime64[ns]'})))
+
+    workbook, data, reports, _ = _build(tmp_path)
+    long_spine = events('2027-10-01 17:00')
+    refresh_workbook(workbook, data, reports)
+    short_spine = events('2025-09-01 17:00')
+    assert short_spine < long_spine
+    assert 'Calendar' in refresh_workbook(workbook, data, reports)['rebuilt']
+
+    with zipfile.ZipFile(workbook) as zf:
+        [chart] = chart_parts(zf, sheet_parts(zf)['Calendar'])
+        chart_xml = zf.read(chart).decode()
+    assert f"'Calendar'!$A$2:$A${short_spine + 1}<" in chart_xml
+    assert f"'Calendar'!$H$2:$H${short_spine + 1}<" in chart_xml
+    assert openpyxl.load_workbook(workbook)['Calendar'].max_row == short_spine + 1
+
+
+def test_workbook_saved_elsewhere_is_patched_not_rebuilt(tmp_path):
+    workbook, data, reports, _ = _build(tmp_path)
+    edited = openpyxl.load_workbook(workbook)  # re-saved like Excel would: shared strings, new parts
+    edited['Config']['F1'] = "=SUM(B1:B3)"
+    edited.save(workbook)
+
+    assert refresh_workbook(workbook, data, reports)['rebuilt'] == []
+    _counts([50, 70]).to_csv(data / "counts_processed.csv", index=False)
+    result = refresh_workbook(workbook, data, reports)
+    assert result['mode'] == "incremental" and result['rebuilt'] == ['Counts_Entry']
+
+    wb = openpyxl.load_workbook(workbook)
+    assert wb['Config']['F1'].value == "=SUM(B1:B3)"
+    assert [c.value for c in wb['Counts_Entry']['F']] == ['Qty', 50, 70]
+
+
+def test_unreadable_workbook_falls_back_to_a_full_build(tmp_path):
+    workbook, data, reports, _ = _build(tmp_path)
+    workbook.write_bytes(b"not a zip")
+    _counts([50, 70]).to_csv(data / "counts_processed.csv", index=False)
+
+    assert refresh_workbook(workbook, data, reports)['mode'] == "full"
+    assert [c.value for c in openpyxl.load_workbook(workbook)['Counts_Entry']['F']] == ['Qty', 50, 70]
@@ -0,0 +1,91 @@
+"""Streaming build: tables streamed in several chunks match the openpyxl writer's table"""
+
+import zipfile
+
+import openpyxl
+import pandas as pd
+
+from generate_workbook import create_sales_sheet, format_as_table, header_styles
+from table_dtypes import apply_dtypes
+from workbook_stream import SHEET_TABLES, _chunk_rows, _pick_columns, build_streaming_workbook
+from workbook_writers import get_writer
+
+
+def _sales(rows):
+    return pd.DataFrame({
+        'date': pd.date_range('2025-08-01', periods=rows).strftime('%Y-%m-%d'),
+        'sku': [f"SKU{i % 4}" for i in range(rows)],
+        'units_sold': range(rows),
+        'revenue': [i * 2.5 for i in range(rows)],
+        'channel': ['POS'] * rows,
+        'salesperson': ['Ann'] * (rows - 1) + ['Bartholomew Featherstonehaugh'],  # only in the last chunk
+    })
+
+
+def _openpyxl_sales(sales, path):
+    writer = get_writer("openpyxl")
+    ws = writer.create_sheet("Sales", table=True)
+    create_sales_sheet(ws, *header_styles())
+    headers = [cell.value for cell in ws[1]]
+    frame = apply_dtypes(sales.copy(), "sales")
+    for row in _chunk_rows(frame, _pick_columns(frame, headers, SHEET_TABLES["Sales"]["columns"])):
+        ws.append(list(row))
+    format_as_table(ws, "Sales")
+    writer.finish().save(path)
+    return openpyxl.load_workbook(path)["Sales"]
+
+
+def test_multi_chunk_table_matches_the_openpyxl_writer(tmp_path):
+    sales = _sales(25)
+    rows = build_streaming_workbook(tmp_path / "streamed.xlsx", tmp_path / "data", tmp_path / "reports",
+                                    frames={'sales': sales}, chunk_size=10)
+    streamed = openpyxl.load_workbook(tmp_path / "streamed.xlsx")["Sales"]
+    regular = _openpyxl_sales(sales, tmp_path / "regular.xlsx")
+
+    assert rows['Sales'] == 25
+    assert streamed.dimensions == regular.dimensions == "A1:I26"
+    assert [[c.value for c in row] for row in streamed.iter_rows()] == \
+           [[c.value for c in row] for row in regular.iter_rows()]
+    for coord in ("A1", "I1", "D14", "I26"):
+        assert streamed[coord].border.left.style == regular[coord].border.left.style == "thin", coord
+    assert streamed["A1"].alignment.horizontal == "center"
+    for col in "BEGHI":  # text and header-only columns; the widest name is in the last chunk
+        assert streamed.column_dimensions[col].width == regular.column_dimensions[col].width, col
+    assert streamed.freeze_panes == regular.freeze_panes == "A2"
+
+
+def test_empty_table_keeps_a_bordered_body_row(tmp_path):
+    build_streaming_workbook(tmp_path / "wb.xlsx", tmp_path / "data", tmp_path / "reports",
+                             frames={'sales': _sales(1).iloc[:0]}, chunk_size=10)
+    ws = openpyxl.load_workbook(tmp_path / "wb.xlsx")["Sales"]
+
+    assert ws.max_row == 2
+    assert ws["I2"].border.bottom.style == "thin" and ws["A2"].value is None
+
+
+def test_streamed_calendar_is_not_mixed_with_layout_rows(tmp_path, monkeypatch):
+    import workbook_stream
+    from event_calendar import calendar_frame
+    from workbook_writers import StreamingWriter
+
+    # A window far smaller than the spine, so layout rows would already have streamed out
+    monkeypatch.setattr(workbook_stream, "StreamingWriter", lambda: StreamingWriter(window=50))
+    events = pd.DataFrame({
+        'event_id': [1, 2],
+        'start_dt': pd.to_datetime(['2025-08-05 09:00', '2025-08-06 09:00']),
+        'end_dt': pd.to_datetime(['2025-08-05 17:00', '2025-08-07 17:00']),
+        'est_attendance': [100, 40],
+    })
+    rows = build_streaming_workbook(tmp_path / "wb.xlsx", tmp_path / "data", tmp_path / "reports",
+                                    frames={'events': events}, chunk_size=100)
+    wb = openpyxl.load_workbook(tmp_path / "wb.xlsx")
+    ws = wb["Calendar"]
+
+    expected = calendar_frame(events)
+    assert rows['Calendar'] == len(expected) > 2 * 50
+    assert ws.max_row == len(expected) + 1
+    dates = [row[0] for row in ws.iter_rows(min_row=2, max_col=1, values_only=True)]
+    assert dates == list(expected['Date'])
+    with zipfile.ZipFile(tmp_path / "wb.xlsx") as zf:
+        assert any(name.startswith("xl/charts/chart") for name in zf.namelist())
+    assert [c.value for c in wb["Events"]["A"]] == ["Event_ID", 1, 2]  # no sample events
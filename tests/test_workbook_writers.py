@@ -0,0 +1,69 @@
+"""Writer backends: the same sheet builders render through openpyxl and streaming"""
+
+import openpyxl
+import pytest
+
+from generate_workbook import create_command_center_workbook
+from workbook_writers import get_writer
+
+
+def _values(ws):
+    return [[cell.value for cell in row] for row in ws.iter_rows()]
+
+
+@pytest.fixture(scope="module")
+def workbooks(tmp_path_factory):
+    out = tmp_path_factory.mktemp("writers")
+    loaded = {}
+    for backend in ["openpyxl", "streaming"]:
+        path = out / f"{backend}.xlsx"
+        create_command_center_workbook(backend=backend).save(path)
+        loaded[backend] = openpyxl.load_workbook(path)
+    return loaded
+
+
+def test_backends_render_identical_cells(workbooks):
+    regular, streamed = workbooks["openpyxl"], workbooks["streaming"]
+    assert regular.sheetnames == streamed.sheetnames
+    for name in regular.sheetnames:
+        assert _values(regular[name]) == _values(streamed[name]), name
+        assert regular[name].freeze_panes == streamed[name].freeze_panes, name
+
+
+def test_streaming_keeps_styles_formats_merges_and_charts(workbooks):
+    wb = workbooks["streaming"]
+    dashboard = wb["Dashboard"]
+    assert wb.active.title == "Dashboard"
+    assert dashboard["A1"].font.size == 18
+    assert "A1:H1" in {str(r) for r in dashboard.merged_cells.ranges}
+    assert len(dashboard.conditional_formatting) == 1
+    assert len(wb["Calendar"]._charts) == 1
+
+    sku = wb["SKU"]
+    assert sku["A1"].fill.start_color.rgb == "00366092"
+    assert sku["A1"].alignment.horizontal == "center"
+    assert sku["B3"].border.left.style == "thin"
+
+
+def test_streaming_sheet_flushes_rows_outside_the_window(tmp_path):
+    writer = get_writer("streaming", window=10)
+    ws = writer.create_sheet("Rows", table=True)
+    ws.append(["Header"])
+    for i in range(100):
+        ws.append([i])
+        assert len(ws._rows) <= 21
+
+    ws["A100"] = "edited"  # still inside the window
+    ws["A101"].number_format = "0.00"
+    with pytest.raises(ValueError):
+        ws["A2"] = "too late"
+
+    writer.finish_sheet(ws)
+    writer.finish().save(tmp_path / "rows.xlsx")
+    saved = openpyxl.load_workbook(tmp_path / "rows.xlsx")["Rows"]
+    rows = _values(saved)
+    assert rows[0] == ["Header"] and rows[1] == [0] and rows[99] == ["edited"]
+    assert len(rows) == 101
+    for coord in ("A1", "A2", "A101"):  # flushed early, last, and with its own number format
+        assert saved[coord].border.bottom.style == "thin", coord
+    assert saved["A101"].number_format == "0.00"
@@ -0,0 +1,135 @@
+# Venue Load
+# Concurrent events and attendance per venue from one sweep-line over event
+# windows. Every event adds +1 event / +attendance at its start and takes them
+# off again at its end. Sorting all 2E boundaries by (venue, time, starts
+# before ends) and taking one running sum gives the exact onsite level after
+# every boundary, for all venues at once: each venue's run nets back to zero
+# before the next venue begins. That is O(E log E) for the sort and linear
+# after it, so 100k+ events take well under a second.
+#
+# From the levels:
+#   daily    - per venue and day: events/attendance active at some point in
+#              the day, and the peak simultaneous events/attendance
+#   peaks    - contiguous days at or above peak_share of the venue's peak
+#   targets  - per venue stocking targets sized from the peak attendance
+
+import numpy as np
+import pandas as pd
+
+from event_index import DAY_NS, LIFECYCLES, _column_ns, to_ns, venue_names
+
+DAILY_COLUMNS = ['venue_area', 'date', 'events_active', 'attendance_active',
+                 'peak_events', 'peak_attendance']
+PEAK_SHARE = 0.9
+
+
+def sweep_levels(venues, starts, ends, weights):
+    """Boundaries sorted by venue then time: (venue, time, events and attendance onsite after it,
+    attendance it adds if it opens an event)"""
+    n = len(starts)
+    kind = np.concatenate([np.zeros(n, np.int8), np.ones(n, np.int8)])  # closed intervals: starts first
+    times = np.concatenate([starts, ends])
+    codes = np.concatenate([venues, venues])
+    order = np.lexsort((kind, times, codes))
+    opening = kind[order] == 0
+    sign = np.where(opening, 1, -1)
+    step = np.concatenate([weights, weights])[order]
+    events = np.cumsum(sign)
+    attendance = np.cumsum(sign * step)
+    return codes[order], times[order], events, attendance, np.where(opening, step, 0.0)
+
+
+def _windows(events, lifecycle):
+    start_col, end_col = LIFECYCLES[lifecycle]
+    starts = _column_ns(events, start_col, LIFECYCLES['event'][0])
+    ends = _column_ns(events, end_col, LIFECYCLES['event'][1])
+    valid = (starts.notna() & ends.notna()).to_numpy()
+    s, e = to_ns(starts[valid]), to_ns(ends[valid])
+    venues = venue_names(events)[valid]
+    weights = pd.to_numeric(events['est_attendance'], errors='coerce').fillna(0).to_numpy(float)[valid]
+    return venues, s, np.maximum(e, s), weights
+
+
+def daily_load(events, lifecycle='event', first=None, last=None):
+    """Per venue and day: active and peak concurrent events/attendance (days with activity only)"""
+    venues, starts, ends, weights = _windows(events, lifecycle)
+    if not len(starts):
+        return pd.DataFrame(columns=DAILY_COLUMNS)
+    names, codes = np.unique(venues, return_inverse=True)
+    codes, times, level_events, level_att, added = sweep_levels(codes, starts, ends, weights)
+
+    day0 = (starts.min() // DAY_NS) * DAY_NS
+    n_days = int((ends.max() - day0) // DAY_NS) + 1
+    day = (times - day0) // DAY_NS
+    keys = codes * n_days + day  # non-decreasing, as points are sorted by venue then time
+
+    # Peak inside each (venue, day) that has boundaries, plus what starts that day
+    segment = np.flatnonzero(np.r_[True, keys[1:] != keys[:-1]])
+    point_keys = keys[segment]
+    day_events = np.maximum.reduceat(level_events, segment)
+    day_att = np.maximum.reduceat(level_att, segment)
+    opened = np.add.reduceat((np.diff(level_events, prepend=0) > 0).astype(np.int64), segment)
+    opened_att = np.add.reduceat(added, segment)
+
+    # Level carried into the start of every venue-day from the last boundary before it
+    grid = np.arange(len(names) * n_days)
+    before = np.searchsorted(keys, grid, side='left') - 1
+    carried_events = np.where(before >= 0, level_events[np.maximum(before, 0)], 0)
+    carried_att = np.where(before >= 0, level_att[np.maximum(before, 0)], 0.0)
+
+    peak_events, peak_att = carried_events.copy(), carried_att.copy()
+    active_events, active_att = carried_events.copy(), carried_att.copy()
+    peak_events[point_keys] = np.maximum(peak_events[point_keys], day_events)
+    peak_att[point_keys] = np.maximum(peak_att[point_keys], day_att)
+    active_events[point_keys] += opened
+    active_att[point_keys] += opened_att
+
+    daily = pd.DataFrame({
+        'venue_area': names[grid // n_days],
+        'date': pd.to_datetime(day0 + (grid % n_days) * DAY_NS),
+        'events_active': active_events,
+        'attendance_active': active_att,
+        'peak_events': peak_events,
+        'peak_attendance': peak_att,
+    })
+    daily = daily[daily['events_active'] > 0]
+    if first is not None:
+        daily = daily[daily['date'] >= pd.Timestamp(first)]
+    if last is not None:
+        daily = daily[daily['date'] <= pd.Timestamp(last)]
+    return daily.reset_index(drop=True)
+
+
+def peak_windows(daily, peak_share=PEAK_SHARE):
+    """Runs of consecutive days at or above peak_share of each venue's peak attendance"""
+    columns = ['venue_area', 'window_start', 'window_end', 'days', 'peak_attendance', 'peak_events']
+    if daily.empty:
+        return pd.DataFrame(columns=columns)
+    venue_peak = daily.groupby('venue_area')['peak_attendance'].transform('max')
+    hot = daily[daily['peak_attendance'] >= venue_peak * peak_share]
+    gap = (hot['date'].diff() != pd.Timedelta(days=1)) | (hot['venue_area'] != hot['venue_area'].shift())
+    windows = hot.groupby([hot['venue_area'], gap.cumsum()]).agg(
+        window_start=('date', 'min'), window_end=('date', 'max'), days=('date', 'size'),
+        peak_attendance=('peak_attendance', 'max'), peak_events=('peak_events', 'max'),
+    ).reset_index(level=0).reset_index(drop=True)
+    return windows.sort_values(['venue_area', 'peak_attendance', 'window_start'],
+                               ascending=[True, False, True])[columns].reset_index(drop=True)
+
+
+def stocking_targets(daily, conversion, attach):
+    """Per venue: peak and p90 daily peak attendance and the units to hold onsite for each"""
+    columns = ['venue_area', 'days_active', 'peak_date', 'peak_events', 'peak_attendance',
+               'p90_attendance', 'target_units', 'typical_units']
+    if daily.empty:
+        return pd.DataFrame(columns=columns)
+    grouped = daily.groupby('venue_area')
+    targets = grouped.agg(days_active=('date', 'size'), peak_events=('peak_events', 'max'),
+                          peak_attendance=('peak_attendance', 'max'),
+                          p90_attendance=('peak_attendance', lambda x: x.quantile(0.9)))
+    targets['peak_date'] = daily.loc[grouped['peak_attendance'].idxmax(), ['venue_area', 'date']] \
+        .set_index('venue_area')['date']
+    targets['p90_attendance'] = targets['p90_attendance'].round(0)
+    targets['target_units'] = np.ceil(targets['peak_attendance'] * conversion * attach).astype(int)
+    targets['typical_units'] = np.ceil(targets['p90_attendance'] * conversion * attach).astype(int)
+    return targets.reset_index().sort_values('peak_attendance', ascending=False)[columns] \
+        .reset_index(drop=True)
@@ -0,0 +1,180 @@
+# Workbook Fill Modes for the planning sheets
+# formulas - the template's full-column lookup formulas copied down per SKU
+# values   - Plan_Buy, ROP_SS and PnL written straight from the plan()/pnl() outputs
+# hybrid   - live formulas over bounded structured-table references, with a
+#            single MATCH key column per sheet feeding INDEX lookups
+
+from copy import copy
+
+from openpyxl.formula.translate import Translator
+from openpyxl.utils import get_column_letter
+from openpyxl.worksheet.table import Table, TableColumn, TableStyleInfo
+
+from workbook_stream import SHEET_TABLES, _chunk_rows, _pick_columns, rop_ss_frame
+
+WORKBOOK_MODES = ("formulas", "values", "hybrid")
+
+# Sheets filled from real data when tables are supplied
+PLANNING_SHEETS = ["Plan_Buy", "ROP_SS", "PnL", "SKU"]
+
+SKU_TABLE = "tblSKU"
+KEY_HEADER = "SKU_Row"
+
+# Row used to turn a row-2 template formula into a per-row pattern
+_MARKER_ROW = 1000003
+
+
+def sheet_frames(tables):
+    """Source frame per planning sheet from plan()/pnl() outputs and the SKU master"""
+    buy_plan = tables["buy_plan"].copy()
+    skus = tables["skus"]
+    prices = skus.set_index("sku")[["cost", "price"]]
+    margin = buy_plan["sku"].map(prices["price"] - prices["cost"]).fillna(0)
+    buy_plan["gm_impact"] = (buy_plan["recommended_qty"] * margin).round(2)
+    return {
+        "Plan_Buy": buy_plan,
+        "ROP_SS": rop_ss_frame(buy_plan),
+        "PnL": tables["pnl"],
+        "SKU": skus,
+    }
+
+
+def _headers(ws):
+    return [cell.value for cell in ws[1]]
+
+
+def _clear_rows(ws):
+    if ws.max_row > 1:
+        ws.delete_rows(2, ws.max_row - 1)
+
+
+def write_values(ws, sheet_name, frame, formulas=None):
+    """Replace the sheet body with frame values mapped onto its headers
+
+    formulas(r) may supply {column letter: formula} overrides per row; they are
+    set as each row is written so streaming sheets never revisit a row.
+    """
+    headers = _headers(ws)
+    source_cols = _pick_columns(frame, headers, SHEET_TABLES[sheet_name]["columns"])
+    _clear_rows(ws)
+    for r, row in enumerate(_chunk_rows(frame, source_cols), 2):
+        ws.append(list(row))
+        if formulas is not None:
+            for col, formula in formulas(r).items():
+                ws[f"{col}{r}"] = formula
+
+
+def add_sku_table(ws, n_rows):
+    """Structured table over the SKU master for bounded lookups"""
+    ref = f"A1:{get_column_letter(ws.max_column)}{max(n_rows + 1, 2)}"
+    table = Table(displayName=SKU_TABLE, ref=ref)
+    # Named explicitly: write-only sheets cannot read the header cells back
+    table.tableColumns = [TableColumn(id=idx, name=header)
+                          for idx, header in enumerate(_headers(ws), 1)]
+    table.tableStyleInfo = TableStyleInfo(name="TableStyleLight1", showRowStripes=True)
+    ws.add_table(table)
+
+
+def copy_down(ws, skus):
+    """Copy the row-2 template formulas down for each SKU"""
+    templates = {}
+    for cell in ws[2]:
+        if isinstance(cell.value, str) and cell.value.startswith("="):
+            target = f"{cell.column_letter}{_MARKER_ROW}"
+            templates[cell.column] = Translator(cell.value, origin=cell.coordinate).translate_formula(target)
+    _clear_rows(ws)
+    for r, sku in enumerate(skus, 2):
+        ws.cell(row=r, column=1, value=sku)
+        for col, template in templates.items():
+            ws.cell(row=r, column=col, value=template.replace(str(_MARKER_ROW), str(r)))
+
+
+def _lookup(column, key):
+    return f"INDEX({SKU_TABLE}[{column}],{key})"
+
+
+def rop_ss_formulas(r):
+    """Hybrid ROP_SS row: K holds the only MATCH into the SKU table"""
+    key = f"K{r}"
+    return {
+        "B": f"={_lookup('Description', key)}",
+        "D": f"={_lookup('Lead_Time_Days', key)}",
+        "F": f"=Config!$B$1*SQRT(E{r}^2*D{r}+C{r}^2)",
+        "G": f"=C{r}*D{r}+F{r}",
+        "I": f"=IF(C{r}>0,H{r}/C{r},999)",
+        "J": f'=IF(H{r}<G{r},"REORDER NOW",IF(I{r}<Config!$B$6,"MONITOR","OK"))',
+        "K": f"=MATCH(A{r},{SKU_TABLE}[SKU],0)",
+    }
+
+
+def plan_buy_formulas(r):
+    """Hybrid Plan_Buy row, aligned with the same row of ROP_SS"""
+    key = f"ROP_SS!K{r}"
+    return {
+        "B": f"=ROP_SS!B{r}",
+        "C": f"={_lookup('Category', key)}",
+        "D": f"=ROP_SS!H{r}",
+        "E": f"=ROP_SS!C{r}*30",
+        "F": f"=ROP_SS!F{r}",
+        "G": f"=IF(E{r}>0,D{r}/E{r}*30,999)",
+        "H": f"=ROP_SS!G{r}",
+        "I": f"=MAX(0,ROUND(ROP_SS!C{r}*Config!$B$3+F{r}-D{r},0))",
+        "J": f"=I{r}*{_lookup('Cost', key)}",
+        "K": f"=I{r}*{_lookup('Price', key)}-J{r}",
+        "L": f'=IF(D{r}<H{r},"HIGH",IF(G{r}<Config!$B$6,"MEDIUM","LOW"))',
+    }
+
+
+def pnl_formulas(r):
+    """Hybrid PnL row: sales aggregates stay values, SKU attributes are live"""
+    key = f"L{r}"
+    return {
+        "C": f"={_lookup('Description', key)}",
+        "D": f"={_lookup('Category', key)}",
+        "F": f"=J{r}*{_lookup('Cost', key)}",
+        "G": f"=E{r}-F{r}",
+        "K": f"=IF(J{r}>0,E{r}/J{r},0)",
+        "L": f"=MATCH(B{r},{SKU_TABLE}[SKU],0)",
+    }
+
+
+# Sheets that carry their own MATCH key column (Plan_Buy reuses ROP_SS's)
+KEY_SHEETS = ["ROP_SS", "PnL"]
+
+HYBRID_FORMULAS = {
+    "ROP_SS": rop_ss_formulas,
+    "Plan_Buy": plan_buy_formulas,
+    "PnL": pnl_formulas,
+}
+
+
+def write_hybrid(ws, sheet_name, frame):
+    """Values for inputs, bounded formulas for everything derived"""
+    if sheet_name in KEY_SHEETS:
+        key_header = ws.cell(row=1, column=ws.max_column + 1, value=KEY_HEADER)
+        key_header.fill = copy(ws["A1"].fill)
+        key_header.font = copy(ws["A1"].font)
+
+    write_values(ws, sheet_name, frame, formulas=HYBRID_FORMULAS[sheet_name])
+
+
+def fill_sheet(ws, sheet_name, mode, frames):
+    """Fill one planning sheet for the chosen mode; other sheets are left alone"""
+    if sheet_name not in PLANNING_SHEETS:
+        return
+    if mode not in WORKBOOK_MODES:
+        raise ValueError(f"Unknown workbook mode '{mode}' (use {', '.join(WORKBOOK_MODES)})")
+
+    frame = frames[sheet_name]
+    if sheet_name == "SKU":
+        write_values(ws, sheet_name, frame)
+        if mode == "hybrid":
+            add_sku_table(ws, len(frame))
+    elif mode == "values":
+        write_values(ws, sheet_name, frame)
+    elif mode == "hybrid":
+        write_hybrid(ws, sheet_name, frame)
+    elif sheet_name == "PnL":  # the template has no PnL formulas to copy
+        write_values(ws, sheet_name, frame)
+    else:
+        copy_down(ws, frame["sku"].tolist())
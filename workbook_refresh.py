@@ -0,0 +1,322 @@
+# Incremental Command Center Workbook Refresh
+# Fingerprints the source table behind every data sheet and rewrites only the
+# worksheet parts whose inputs changed. All other parts of the .xlsx package
+# (untouched sheets, styles, named ranges, conditional formats) are carried
+# through unchanged - also after the workbook was edited and saved in Excel,
+# which becomes the base the next refresh patches.
+
+import hashlib
+import json
+import os
+import posixpath
+import re
+import zipfile
+from pathlib import Path, PurePosixPath
+
+import pandas as pd
+
+from sheet_xml import blank_row, dimension_ref, render_cols, render_rows
+from table_dtypes import apply_dtypes
+from workbook_stream import (SHEET_TABLES, _pick_columns, build_streaming_workbook,
+                             iter_chunks, latest_period, resolve_source, source_header,
+                             table_widths)
+
+MANIFEST_FILE = "workbook_manifest.json"
+STYLES_PART = "xl/styles.xml"
+
+
+def fingerprint_source(source, sheet_name, period):
+    """Hash of a sheet's source table plus the mapping used to render it"""
+    digest = hashlib.sha256()
+    spec = SHEET_TABLES[sheet_name]
+    digest.update(json.dumps([sheet_name, period, spec], sort_keys=True).encode())
+    if isinstance(source, pd.DataFrame):
+        digest.update(pd.util.hash_pandas_object(source, index=False).values.tobytes())
+        digest.update(",".join(map(str, source.columns)).encode())
+    else:
+        with open(source, "rb") as f:
+            for block in iter(lambda: f.read(1 << 20), b""):
+                digest.update(block)
+    return digest.hexdigest()
+
+
+def current_fingerprints(data_path, reports_path, period, frames):
+    """Fingerprint every data sheet that has a source table"""
+    fingerprints = {}
+    for sheet_name in SHEET_TABLES:
+        source = resolve_source(sheet_name, data_path, reports_path, period, frames)
+        if source is not None:
+            fingerprints[sheet_name] = fingerprint_source(source, sheet_name, period)
+    return fingerprints
+
+
+def save_manifest(manifest_path, filename, period, fingerprints):
+    """Record the sources the workbook's data sheets were rendered from"""
+    manifest = {
+        "workbook": str(Path(filename).resolve()),
+        "period": period,
+        "sheets": fingerprints,
+    }
+    Path(manifest_path).write_text(json.dumps(manifest, indent=2))
+
+
+def record_build(filename, data_path, reports_path, period, frames=None):
+    """Write the manifest after a full streaming build"""
+    fingerprints = current_fingerprints(data_path, reports_path, period, frames or {})
+    save_manifest(Path(data_path) / MANIFEST_FILE, filename, period, fingerprints)
+
+
+def load_manifest(manifest_path, filename):
+    """Manifest for the workbook, or None if either is missing
+
+    Saving the workbook elsewhere (Excel) does not invalidate it: freshness
+    is decided by the source fingerprints alone.
+    """
+    manifest_path = Path(manifest_path)
+    if not manifest_path.exists() or not Path(filename).exists():
+        return None
+    manifest = json.loads(manifest_path.read_text())
+    if manifest.get("workbook") != str(Path(filename).resolve()):
+        return None
+    return manifest
+
+
+def part_rels(zf, part):
+    """Relationship id -> (type, target part path) for a package part"""
+    part = PurePosixPath(part)
+    rels_name = str(part.parent / "_rels" / f"{part.name}.rels")
+    if rels_name not in zf.namelist():
+        return {}
+    rels = {}
+    for rel in re.finditer(r"<Relationship\b[^>]*>", zf.read(rels_name).decode("utf-8")):
+        attrs = dict(re.findall(r'(\w+)="([^"]*)"', rel.group(0)))
+        if attrs.get("TargetMode") == "External":
+            continue
+        target = attrs.get("Target", "")
+        if target.startswith("/"):
+            target = target[1:]
+        else:
+            target = posixpath.normpath(str(part.parent / target))
+        rels[attrs.get("Id")] = (attrs.get("Type", ""), target)
+    return rels
+
+
+def sheet_parts(zf):
+    """Map sheet name -> worksheet part path inside the package"""
+    workbook_xml = zf.read("xl/workbook.xml").decode("utf-8")
+    targets = part_rels(zf, "xl/workbook.xml")
+
+    parts = {}
+    for sheet in re.finditer(r"<sheet\b[^>]*>", workbook_xml):
+        tag = sheet.group(0)
+        name = re.search(r'\bname="([^"]*)"', tag).group(1)
+        rel_id = re.search(r'\br:id="([^"]*)"', tag).group(1)
+        parts[name.replace("&amp;", "&")] = targets[rel_id][1]
+    return parts
+
+
+def shared_strings(zf):
+    """The workbook's shared strings table (Excel stores header text there)"""
+    targets = [target for kind, target in part_rels(zf, "xl/workbook.xml").values()
+               if kind.endswith("/sharedStrings")]
+    if not targets or targets[0] not in zf.namelist():
+        return []
+    xml = zf.read(targets[0]).decode("utf-8")
+    return ["".join(re.findall(r"<t\b[^>]*>(.*?)</t>", si, re.S))
+            for si in re.findall(r"<si>(.*?)</si>", xml, re.S)]
+
+
+def row_values(row_xml, strings):
+    """Text of each cell in a <row>, inline or shared"""
+    values = []
+    for cell in re.finditer(r"<c\b([^>]*?)(?:/>|>(.*?)</c>)", row_xml, re.S):
+        attrs, body = cell.group(1), cell.group(2) or ""
+        if 't="s"' in attrs:
+            values.append(strings[int(re.search(r"<v>(\d+)</v>", body).group(1))])
+        else:
+            text = re.search(r"<(?:t|v)\b[^>]*>(.*?)</(?:t|v)>", body, re.S)
+            values.append(text.group(1) if text else None)
+    return values
+
+
+def chart_parts(zf, sheet_part):
+    """Chart parts drawn on a worksheet (worksheet -> drawing -> chart)"""
+    charts = []
+    for rel_type, drawing in part_rels(zf, sheet_part).values():
+        if rel_type.endswith("/drawing"):
+            charts += [target for kind, target in part_rels(zf, drawing).values()
+                       if kind.endswith("/chart")]
+    return charts
+
+
+def retarget_chart(chart_xml, sheet_name, last_row):
+    """Point a chart's ranges on sheet_name at rows ending at last_row
+
+    Cached values of those series are dropped; Excel rebuilds them on open.
+    """
+    quoted = sheet_name.replace("'", "''").replace("&", "&amp;")
+    ref = re.compile(rf"((?:'{re.escape(quoted)}'|{re.escape(quoted)})!\$?[A-Z]+\$?\d+:\$?[A-Z]+\$?)\d+")
+
+    def rewrite(block):
+        tag, body = block.group(1), block.group(2)
+        formula = re.search(r"<((?:\w+:)?f)>(.*?)</\1>", body, re.S)
+        if formula is None or not ref.search(formula.group(2)):
+            return block.group(0)
+        updated = ref.sub(rf"\g<1>{last_row}", formula.group(2))
+        return f"<{tag}><{formula.group(1)}>{updated}</{formula.group(1)}></{tag}>"
+
+    return re.sub(r"<((?:\w+:)?(?:num|str)Ref)>(.*?)</\1>", rewrite, chart_xml, flags=re.S)
+
+
+THIN_BORDER = ('<border><left style="thin"/><right style="thin"/><top style="thin"/>'
+               '<bottom style="thin"/><diagonal/></border>')
+
+
+def _style_list(styles_xml, tag, item):
+    """Span of a counted styles.xml list and its entries"""
+    match = re.search(rf'<{tag} count="\d+">(.*?)</{tag}>', styles_xml, re.S)
+    return match, re.findall(rf"<{item}\b[^>]*?(?:/>|>.*?</{item}>)", match.group(1), re.S)
+
+
+def _append_style(styles_xml, tag, item, element):
+    """Append an entry to a styles.xml list; returns the xml and the entry's index"""
+    match, entries = _style_list(styles_xml, tag, item)
+    updated = (styles_xml[:match.start()]
+               + f'<{tag} count="{len(entries) + 1}">' + match.group(1) + element + f"</{tag}>"
+               + styles_xml[match.end():])
+    return updated, len(entries)
+
+
+def ensure_table_styles(styles_xml):
+    """Indexes of bordered general and date cell formats, appending them if needed
+
+    Matches the thin table border the full build gives every data cell.
+    """
+    _, borders = _style_list(styles_xml, "borders", "border")
+    border_id = next((idx for idx, border in enumerate(borders)
+                      if all(f'<{side} style="thin"' in border for side in ("left", "right", "top", "bottom"))),
+                     None)
+    if border_id is None:
+        styles_xml, border_id = _append_style(styles_xml, "borders", "border", THIN_BORDER)
+
+    found = []
+    for num_fmt, ids in ((0, "0"), (22, "14|22")):
+        _, xfs = _style_list(styles_xml, "cellXfs", "xf")
+        idx = next((idx for idx, xf in enumerate(xfs)
+                    if re.search(rf'numFmtId="({ids})"', xf) and f'borderId="{border_id}"' in xf
+                    and 'fontId="0"' in xf and 'fillId="0"' in xf and "<alignment" not in xf), None)
+        if idx is None:
+            styles_xml, idx = _append_style(
+                styles_xml, "cellXfs", "xf",
+                f'<xf numFmtId="{num_fmt}" fontId="0" fillId="0" borderId="{border_id}" '
+                f'applyNumberFormat="1" applyBorder="1" pivotButton="0" quotePrefix="0"/>')
+        found.append(idx)
+    return styles_xml, found[0], found[1]
+
+
+def render_sheet(old_xml, source, spec, cell_style, date_style, chunk_size, strings=()):
+    """New worksheet XML: old head/tail and header row, fresh data rows"""
+    data_start = old_xml.find("<sheetData")
+    data_end = old_xml.find("</sheetData>")
+    if data_end == -1:  # empty <sheetData/>
+        data_end = old_xml.find(">", data_start) + 1
+        tail = old_xml[data_end:]
+        old_rows = ""
+    else:
+        tail = old_xml[data_end + len("</sheetData>"):]
+        old_rows = old_xml[old_xml.find(">", data_start) + 1:data_end]
+    head = old_xml[:data_start]
+
+    header_match = re.search(r'<row r="1"[^>]*>.*?</row>', old_rows, re.S)
+    header_row = header_match.group(0) if header_match else ""
+    headers = row_values(header_row, strings)
+
+    source_cols = _pick_columns(source_header(source), headers, spec["columns"])
+    widths = table_widths(source, headers, source_cols, spec, chunk_size)
+
+    body = [header_row]
+    next_row = 2
+    for chunk in iter_chunks(source, chunk_size):
+        chunk = apply_dtypes(chunk.copy(), spec["table"])
+        body.extend(render_rows(chunk, source_cols, next_row, date_style, cell_style))
+        next_row += len(chunk)
+    rows = next_row - 2
+    if rows == 0:  # an empty bordered body row, like a full build
+        body.append(blank_row(2, len(headers), cell_style))
+        next_row += 1
+
+    head = re.sub(r'<dimension ref="[^"]*"\s*/>',
+                  f'<dimension ref="{dimension_ref(len(headers), next_row - 1)}"/>', head)
+    if "<cols>" in head:
+        head = re.sub(r"<cols>.*?</cols>", render_cols(widths), head, flags=re.S)
+    else:
+        head = head + render_cols(widths)
+    return head + "<sheetData>" + "".join(body) + "</sheetData>" + tail, rows
+
+
+def _full_build(filename, data_path, reports_path, period, frames, chunk_size):
+    """Build the workbook from scratch and record what it was built from"""
+    rows = build_streaming_workbook(filename, data_path, reports_path, period, frames, chunk_size)
+    record_build(filename, data_path, reports_path, period, frames)
+    return {"mode": "full", "rebuilt": list(rows), "rows": rows}
+
+
+def refresh_workbook(filename, data_path="data", reports_path="reports",
+                     period=None, frames=None, chunk_size=10000):
+    """Rewrite only the data sheets whose inputs changed; returns a summary"""
+    frames = frames or {}
+    period = period or latest_period(reports_path)
+    manifest_path = Path(data_path) / MANIFEST_FILE
+    manifest = load_manifest(manifest_path, filename)
+
+    if manifest is None:
+        return _full_build(filename, data_path, reports_path, period, frames, chunk_size)
+
+    fingerprints = current_fingerprints(data_path, reports_path, period, frames)
+
+    # A sheet whose source went away is changed too: it is re-rendered empty
+    previous = manifest["sheets"]
+    changed = [name for name in SHEET_TABLES if fingerprints.get(name) != previous.get(name)]
+    if not changed:
+        return {"mode": "incremental", "rebuilt": [], "rows": {}}
+
+    try:
+        with zipfile.ZipFile(filename) as zin:
+            parts = sheet_parts(zin)
+    except (zipfile.BadZipFile, KeyError):
+        parts = {}
+    if any(name not in parts for name in changed):
+        return _full_build(filename, data_path, reports_path, period, frames, chunk_size)
+
+    tmp_name = f"{filename}.tmp"
+    rows = {}
+    with zipfile.ZipFile(filename) as zin:
+        strings = shared_strings(zin)
+        styles_xml, cell_style, date_style = ensure_table_styles(zin.read(STYLES_PART).decode("utf-8"))
+        replaced = {STYLES_PART: styles_xml}
+        for sheet_name in changed:
+            source = resolve_source(sheet_name, data_path, reports_path, period, frames)
+            if source is None:
+                source = pd.DataFrame()
+            old_xml = zin.read(parts[sheet_name]).decode("utf-8")
+            replaced[parts[sheet_name]], rows[sheet_name] = render_sheet(
+                old_xml, source, SHEET_TABLES[sheet_name], cell_style, date_style, chunk_size, strings
+            )
+            # Charts on the sheet (the Calendar spine) follow its new length
+            for chart in chart_parts(zin, parts[sheet_name]):
+                replaced[chart] = retarget_chart(zin.read(chart).decode("utf-8"), sheet_name,
+                                                 max(rows[sheet_name], 1) + 1)
+
+        with zipfile.ZipFile(tmp_name, "w", zipfile.ZIP_DEFLATED) as zout:
+            for info in zin.infolist():
+                if info.filename in replaced:
+                    zout.writestr(info, replaced[info.filename].encode("utf-8"),
+                                  compress_type=zipfile.ZIP_DEFLATED)
+                else:
+                    with zin.open(info) as src, zout.open(info, "w") as dst:
+                        for block in iter(lambda: src.read(1 << 20), b""):
+                            dst.write(block)
+
+    os.replace(tmp_name, filename)
+    save_manifest(manifest_path, filename, period, fingerprints)
+    return {"mode": "incremental", "rebuilt": changed, "rows": rows}
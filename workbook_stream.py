@@ -0,0 +1,310 @@
+# Streaming Command Center Workbook Builder
+# Builds Event-Inventory-CommandCenter.xlsx in openpyxl write-only mode, streaming
+# the real processed tables into their sheets in bounded chunks
+
+from pathlib import Path
+
+import pandas as pd
+from openpyxl.cell import WriteOnlyCell
+from openpyxl.styles import Alignment
+from openpyxl.utils import get_column_letter
+
+from event_calendar import CALENDAR_COLUMNS, calendar_frame
+from generate_workbook import (LAYOUT_ROW_SHEETS, SHEET_BUILDERS, UNFORMATTED_SHEETS,
+                                add_calendar_chart, header_styles)
+from table_dtypes import apply_dtypes
+from workbook_writers import MAX_COLUMN_WIDTH, TABLE_BORDER, StreamingWriter
+
+# Data sheets filled from processed tables: header -> candidate source columns.
+# Headers without a source column are left blank for manual entry. Derived
+# sheets (ROP_SS, Calendar) are computed from their source file rather than copied.
+SHEET_TABLES = {
+    "Plan_Buy": {
+        "table": "buy_plan",
+        "report": "buy_plan_{period}.csv",
+        "columns": {
+            "SKU": ["sku"], "Description": ["description"], "Category": ["category"],
+            "Current_Stock": ["current_stock"], "Forecast_30d": ["forecast_30d"],
+            "Safety_Stock": ["safety_stock"], "Days_of_Supply": ["days_of_supply"],
+            "ROP": ["rop"], "Recommended_Order_Qty": ["recommended_qty"],
+            "Order_Cost": ["order_cost"], "GM_Impact": ["gm_impact"],
+            "Priority": ["priority"], "Notes": ["notes"],
+        },
+    },
+    "ROP_SS": {
+        "table": "buy_plan",
+        "report": "buy_plan_{period}.csv",
+        "derived": "rop_ss",
+        "columns": {
+            "SKU": ["sku"], "Description": ["description"],
+            "Avg_Daily_Demand": ["daily_demand"], "Lead_Time_Days": ["lead_time_days"],
+            "Demand_StdDev": ["demand_std"], "Safety_Stock": ["safety_stock"],
+            "ROP": ["rop"], "Stock_Available": ["current_stock"],
+            "Days_Until_Stockout": ["days_of_supply"], "Action_Required": ["action_required"],
+        },
+    },
+    "PnL": {
+        "table": "pnl",
+        "report": "pnl_snapshot_{period}.csv",
+        "columns": {
+            "Date": ["period"], "SKU": ["sku"], "Description": ["description"],
+            "Category": ["category"], "Revenue": ["revenue"], "COGS": ["cogs"],
+            "Gross_Margin": ["gross_margin"], "GMROI": ["gmroi"],
+            "Sell_Through": ["sell_through"], "Units_Sold": ["units_sold"],
+            "Avg_Unit_Price": ["avg_unit_price"],
+        },
+    },
+    "Counts_Entry": {
+        "table": "counts",
+        "data": ["counts_unified.csv", "counts_processed.csv"],
+        "columns": {
+            "Unique_Key": ["unique_key"], "AsOf_Date": ["asof_date"],
+            "Checkpoint": ["checkpoint"], "Location": ["location"], "SKU": ["sku"],
+            "Qty": ["qty"], "UOM": ["uom"], "Counter_ID": ["counter_id"],
+            "Notes": ["notes"], "Source": ["source"], "Submitted_At": ["submitted_at"],
+        },
+    },
+    "Events": {
+        "table": "events",
+        "data": ["events_processed.csv"],
+        "columns": {
+            "Event_ID": ["event_id"], "Name": ["name"], "Venue_Area": ["venue_area"],
+            "Event_Type": ["event_type"], "Start_DateTime": ["start_dt"],
+            "End_DateTime": ["end_dt"], "Est_Attendance": ["est_attendance"],
+            "Actual_Attendance": ["actual_attendance"], "Status": ["status"],
+        },
+    },
+    "SKU": {
+        "table": "skus",
+        "data": ["sku_master.csv"],
+        "columns": {
+            "SKU": ["sku"], "Description": ["desc", "description"],
+            "Category": ["category"], "Cost": ["cost"], "Price": ["price"],
+            "Lead_Time_Days": ["lead_time_days", "lead_time"],
+            "Supplier": ["supplier", "vendor"], "UOM": ["uom"],
+        },
+    },
+    "Sales": {
+        "table": "sales",
+        "data": ["sales_processed.csv"],
+        "columns": {
+            "Date": ["date"], "SKU": ["sku"], "Units_Sold": ["units_sold"],
+            "Revenue": ["revenue"], "Event_ID": ["event_id"], "Channel": ["channel"],
+            "Salesperson": ["salesperson"],
+        },
+    },
+    "Calendar": {
+        "table": "events",
+        "data": ["events_processed.csv"],
+        "derived": "calendar",
+        "columns": {column: [column] for column in CALENDAR_COLUMNS},
+    },
+}
+
+
+# Buy plan priority -> ROP_SS action
+PRIORITY_ACTIONS = {"HIGH": "REORDER NOW", "MEDIUM": "MONITOR", "LOW": "OK"}
+
+
+def rop_ss_frame(buy_plan):
+    """ROP & safety stock rows derived from a buy plan"""
+    rop_ss = buy_plan.copy()
+    rop_ss["action_required"] = rop_ss["priority"].astype(str).map(PRIORITY_ACTIONS)
+    return rop_ss
+
+
+# Builders for sheets computed from their source file
+DERIVED_SOURCES = {
+    "calendar": calendar_frame,
+    "rop_ss": rop_ss_frame,
+}
+
+
+def latest_period(reports_path):
+    """Most recent YYYY-MM with a buy plan or P&L report"""
+    reports_path = Path(reports_path)
+    periods = sorted(
+        p.stem.rsplit("_", 1)[-1]
+        for pattern in ("buy_plan_*.csv", "pnl_snapshot_*.csv")
+        for p in reports_path.glob(pattern)
+    )
+    return periods[-1] if periods else None
+
+
+def resolve_source(sheet_name, data_path, reports_path, period, frames):
+    """File path or DataFrame feeding a data sheet, or None for layout only"""
+    spec = SHEET_TABLES.get(sheet_name)
+    if spec is None:
+        return None
+    if spec["table"] in frames:
+        source = frames[spec["table"]]
+    else:
+        if "report" in spec:
+            candidates = [Path(reports_path) / spec["report"].format(period=period)] if period else []
+        else:
+            candidates = [Path(data_path) / name for name in spec["data"]]
+        source = next((c for c in candidates if c.exists()), None)
+        if source is None:
+            return None
+
+    if "derived" in spec:
+        table = source if isinstance(source, pd.DataFrame) else pd.read_csv(source)
+        return DERIVED_SOURCES[spec["derived"]](apply_dtypes(table.copy(), spec["table"]))
+    return source
+
+
+def iter_chunks(source, chunk_size, usecols=None):
+    """Yield the source table in bounded chunks"""
+    if isinstance(source, pd.DataFrame):
+        if usecols is not None:
+            source = source[usecols]
+        for start in range(0, max(len(source), 1), chunk_size):
+            yield source.iloc[start:start + chunk_size]
+    else:
+        yield from pd.read_csv(source, chunksize=chunk_size, usecols=usecols)
+
+
+def source_header(source):
+    """Empty frame with the source table's columns, without reading its rows"""
+    if isinstance(source, pd.DataFrame):
+        return source.iloc[:0]
+    return pd.read_csv(source, nrows=0)
+
+
+def column_width(header, series):
+    """Display width from column statistics rather than per-cell str()"""
+    width = len(str(header))
+    values = series.dropna() if series is not None else None
+    if values is None or values.empty:
+        pass
+    elif pd.api.types.is_datetime64_any_dtype(values):
+        has_time = (values != values.dt.normalize()).any()
+        width = max(width, 19 if has_time else 10)
+    elif pd.api.types.is_bool_dtype(values):
+        width = max(width, 5)
+    elif pd.api.types.is_numeric_dtype(values):
+        width = max(width, len(str(values.max())), len(str(values.min())))
+    elif isinstance(values.dtype, pd.CategoricalDtype):
+        width = max(width, int(values.cat.categories.astype(str).str.len().max()))
+    else:
+        width = max(width, int(values.astype(str).str.len().max()))
+    return min(width + 2, MAX_COLUMN_WIDTH)
+
+
+def table_widths(source, headers, source_cols, spec, chunk_size):
+    """Column widths over every chunk of the source
+
+    Widths precede the rows in the file, so the mapped columns are read once
+    up front; the rows themselves are written in a second pass.
+    """
+    widths = [column_width(header, None) for header in headers]
+    used = list(dict.fromkeys(col for col in source_cols if col is not None))
+    if not used:
+        return widths
+    for chunk in iter_chunks(source, chunk_size, usecols=used):
+        chunk = apply_dtypes(chunk.copy(), spec["table"])
+        widths = [max(width, column_width(header, chunk[col])) if col is not None else width
+                  for width, header, col in zip(widths, headers, source_cols)]
+    return widths
+
+
+def _pick_columns(chunk, headers, mapping):
+    """Source column name for each sheet header (None when unmapped)"""
+    picked = []
+    for header in headers:
+        candidates = [c for c in mapping.get(header, []) if c in chunk.columns]
+        picked.append(candidates[0] if candidates else None)
+    return picked
+
+
+def _chunk_rows(chunk, source_cols):
+    """Rows of cell values for a chunk, with NaN/NaT written as blanks"""
+    columns = []
+    for col in source_cols:
+        if col is None:
+            columns.append([None] * len(chunk))
+        else:
+            series = chunk[col].astype(object)
+            columns.append(series.where(chunk[col].notna(), None).tolist())
+    return zip(*columns)
+
+
+def _bordered_cells(ws, border):
+    """Row builder: write-only cells carrying the table border, like format_as_table"""
+    def cells(row):
+        out = []
+        for value in row:
+            cell = WriteOnlyCell(ws, value=value)
+            cell.border = border
+            out.append(cell)
+        return out
+    return cells
+
+
+def stream_table(ws, headers, source, spec, header_fill, header_font, chunk_size):
+    """Write header + table rows into a write-only sheet; returns data rows"""
+    source_cols = _pick_columns(source_header(source), headers, spec["columns"])
+
+    # Widths and panes must be set before the first row is streamed
+    widths = table_widths(source, headers, source_cols, spec, chunk_size)
+    for idx, width in enumerate(widths, 1):
+        ws.column_dimensions[get_column_letter(idx)].width = width
+    ws.freeze_panes = "A2"
+
+    header_row = []
+    for header in headers:
+        cell = WriteOnlyCell(ws, value=header)
+        cell.fill = header_fill
+        cell.font = header_font
+        cell.border = TABLE_BORDER
+        cell.alignment = Alignment(horizontal="center", wrap_text=True)
+        header_row.append(cell)
+    ws.append(header_row)
+
+    bordered = _bordered_cells(ws, TABLE_BORDER)
+    rows = 0
+    for chunk in iter_chunks(source, chunk_size):
+        chunk = apply_dtypes(chunk.copy(), spec["table"])
+        for row in _chunk_rows(chunk, source_cols):
+            ws.append(bordered(row))
+        rows += len(chunk)
+    if rows == 0:  # an empty bordered body row, like format_as_table
+        ws.append(bordered([None] * len(headers)))
+    return rows
+
+
+def build_streaming_workbook(filename, data_path="data", reports_path="reports",
+                             period=None, frames=None, chunk_size=10000):
+    """Build the workbook in write-only mode; returns rows streamed per data sheet"""
+    frames = frames or {}
+    period = period or latest_period(reports_path)
+    header_fill, header_font = header_styles()
+    writer = StreamingWriter()
+
+    rows_written = {}
+    for sheet_name, creator_func in SHEET_BUILDERS:
+        ws = writer.create_sheet(sheet_name, table=sheet_name not in UNFORMATTED_SHEETS)
+        source = resolve_source(sheet_name, data_path, reports_path, period, frames)
+        # With a source the layout only contributes its header row
+        options = {"header_only": True} if source is not None and sheet_name in LAYOUT_ROW_SHEETS else {}
+        if sheet_name == "Calendar":
+            options["events_file"] = Path(data_path) / "events_processed.csv"
+        elif sheet_name == "Exceptions":
+            options["log_dir"] = Path(data_path) / "exceptions"
+        creator_func(ws, header_fill, header_font, **options)
+
+        if source is not None:
+            # Take the layout's header, stream the table rows straight through
+            headers = [cell.value for cell in ws[1]]
+            ws.discard()
+            spec = SHEET_TABLES[sheet_name]
+            rows_written[sheet_name] = stream_table(
+                ws.worksheet, headers, source, spec, header_fill, header_font, chunk_size
+            )
+            if sheet_name == "Calendar":
+                add_calendar_chart(ws.worksheet, max(rows_written[sheet_name], 1) + 1)
+        else:
+            writer.finish_sheet(ws)
+
+    writer.finish(active="Dashboard").save(filename)
+    return rows_written
@@ -0,0 +1,230 @@
+# Workbook Writer Backends
+# The sheet builders in generate_workbook.py write through a small worksheet API
+# (ws["A1"], ws.cell, ws.append, styles, merges, conditional formats, frozen
+# panes, charts). Two backends render the same builders:
+#   openpyxl  - the regular in-memory object model (every cell is a Python object)
+#   streaming - a write-only workbook behind a sliding row window, so memory
+#               stays constant no matter how many rows a sheet holds
+
+import warnings
+
+import openpyxl
+from openpyxl.cell import Cell
+from openpyxl.styles import Alignment, Border, Side
+from openpyxl.utils import get_column_letter, range_boundaries
+from openpyxl.utils.cell import coordinate_from_string, column_index_from_string
+
+MAX_COLUMN_WIDTH = 50
+
+# Thin border around every table cell, as format_as_table draws it
+TABLE_BORDER = Border(left=Side(style="thin"), right=Side(style="thin"),
+                      top=Side(style="thin"), bottom=Side(style="thin"))
+
+# Rows kept in memory per streaming sheet before the oldest are written out
+DEFAULT_WINDOW = 1000
+
+
+class StreamingSheet:
+    """Random-access worksheet facade over a write-only sheet
+
+    Cells stay editable until their row slides out of the window; rows are
+    then written in order and can no longer change. Column widths and frozen
+    panes are fixed by the first flush, as the file format requires.
+    """
+
+    def __init__(self, worksheet, table=False, window=DEFAULT_WINDOW):
+        self.worksheet = worksheet
+        self.title = worksheet.title
+        self.table = table
+        self.window = window
+        self.conditional_formatting = worksheet.conditional_formatting
+        self.column_dimensions = worksheet.column_dimensions
+        self._rows = {}
+        self._flushed = 0
+        self._max_col = 0
+
+    @property
+    def freeze_panes(self):
+        return self.worksheet.freeze_panes
+
+    @freeze_panes.setter
+    def freeze_panes(self, value):
+        self.worksheet.freeze_panes = value
+
+    @property
+    def tables(self):
+        return self.worksheet.tables
+
+    @property
+    def max_row(self):
+        return max(self._flushed, max(self._rows, default=0), 1)
+
+    @property
+    def max_column(self):
+        return max(self._max_col, 1)
+
+    def cell(self, row, column, value=None):
+        """Buffered cell at (row, column), created on first use"""
+        if row <= self._flushed:
+            raise ValueError(f"Row {row} of '{self.title}' was already streamed to disk")
+        cells = self._rows.get(row)
+        if cells is None:
+            cells = self._rows[row] = {}
+            self._maybe_flush()
+        cell = cells.get(column)
+        if cell is None:
+            cell = cells[column] = Cell(self.worksheet, row=row, column=column)
+            self._max_col = max(self._max_col, column)
+        if value is not None:
+            cell.value = value
+        return cell
+
+    def __getitem__(self, key):
+        if isinstance(key, int):
+            return tuple(self.cell(key, col) for col in range(1, self.max_column + 1))
+        if ":" in key:
+            min_col, min_row, max_col, max_row = range_boundaries(key)
+            return tuple(tuple(self.cell(row, col) for col in range(min_col, max_col + 1))
+                         for row in range(min_row, max_row + 1))
+        column, row = coordinate_from_string(key)
+        return self.cell(row, column_index_from_string(column))
+
+    def __setitem__(self, key, value):
+        self[key].value = value
+
+    def append(self, values):
+        row = self.max_row + 1 if self._rows or self._flushed else 1
+        for column, value in enumerate(values, 1):
+            if value is not None:
+                self.cell(row, column, value)
+        if row not in self._rows:
+            self._rows[row] = {}
+            self._maybe_flush()
+
+    def delete_rows(self, idx, amount=1):
+        """Delete buffered rows, shifting the rows below them up"""
+        if idx <= self._flushed:
+            raise ValueError(f"Rows from {idx} of '{self.title}' were already streamed to disk")
+        shifted = {}
+        for row, cells in self._rows.items():
+            if row < idx:
+                shifted[row] = cells
+            elif row >= idx + amount:
+                for cell in cells.values():
+                    cell.row = row - amount
+                shifted[row - amount] = cells
+        self._rows = shifted
+
+    def merge_cells(self, range_string):
+        self.worksheet.merged_cells.add(range_string)
+
+    def add_chart(self, chart, anchor=None):
+        self.worksheet.add_chart(chart, anchor)
+
+    def add_table(self, table):
+        if not table.tableColumns:
+            raise ValueError(f"Table '{table.displayName}' needs its columns named in streaming mode")
+        with warnings.catch_warnings():  # openpyxl warns for every write-only table
+            warnings.simplefilter("ignore", UserWarning)
+            self.worksheet.add_table(table)
+
+    def _maybe_flush(self):
+        if len(self._rows) > 2 * self.window:
+            self.flush(max(self._rows) - self.window)
+
+    def _layout_table(self):
+        """Widths from the buffered rows, frozen header and header alignment"""
+        widths = {}
+        for cells in self._rows.values():
+            for column, cell in cells.items():
+                if cell.value is not None:
+                    widths[column] = max(widths.get(column, 0), len(str(cell.value)))
+        for column in range(1, self._max_col + 1):
+            width = min(widths.get(column, 0) + 2, MAX_COLUMN_WIDTH)
+            self.column_dimensions[get_column_letter(column)].width = width
+        self.freeze_panes = "A2"
+        for column in range(1, self._max_col + 1):
+            self.cell(1, column).alignment = Alignment(horizontal="center", wrap_text=True)
+
+    def flush(self, upto=None):
+        """Write buffered rows up to and including `upto` (all rows by default)"""
+        upto = self.max_row if upto is None else upto
+        if self._flushed == 0 and self.table and self._rows:
+            self._layout_table()
+
+        for row in range(self._flushed + 1, upto + 1):
+            cells = self._rows.pop(row, {})
+            if self.table:
+                for column in range(1, self._max_col + 1):
+                    cell = cells.get(column)
+                    if cell is None:
+                        cell = cells[column] = Cell(self.worksheet, row=row, column=column)
+                    cell.border = TABLE_BORDER
+            self.worksheet.append([cells.get(col) for col in range(1, max(cells, default=0) + 1)])
+        self._flushed = max(self._flushed, upto)
+
+    def discard(self):
+        """Drop every buffered row without writing it; fails once rows were streamed"""
+        if self._flushed:
+            raise ValueError(f"Rows of '{self.title}' were already streamed to disk")
+        self._rows = {}
+
+    def close(self):
+        if self.table and self.max_row < 2:  # an empty bordered body row, like format_as_table
+            self._rows.setdefault(2, {})
+        self.flush()
+
+
+class OpenpyxlWriter:
+    """Regular in-memory openpyxl workbook"""
+
+    streaming = False
+
+    def __init__(self):
+        self.workbook = openpyxl.Workbook()
+        self.workbook.remove(self.workbook.active)
+
+    def create_sheet(self, title, table=False):
+        return self.workbook.create_sheet(title)
+
+    def finish_sheet(self, ws):
+        pass
+
+    def finish(self, active=None):
+        if active:
+            self.workbook.active = self.workbook[active]
+        return self.workbook
+
+
+class StreamingWriter:
+    """Constant-memory write-only workbook"""
+
+    streaming = True
+
+    def __init__(self, window=DEFAULT_WINDOW):
+        self.workbook = openpyxl.Workbook(write_only=True)
+        self.window = window
+
+    def create_sheet(self, title, table=False):
+        return StreamingSheet(self.workbook.create_sheet(title), table=table, window=self.window)
+
+    def finish_sheet(self, ws):
+        ws.close()
+
+    def finish(self, active=None):
+        if active:
+            self.workbook.active = self.workbook.sheetnames.index(active)
+        return self.workbook
+
+
+WRITER_BACKENDS = {
+    "openpyxl": OpenpyxlWriter,
+    "streaming": StreamingWriter,
+}
+
+
+def get_writer(backend="openpyxl", **options):
+    """Writer instance for a backend name"""
+    if backend not in WRITER_BACKENDS:
+        raise ValueError(f"Unknown workbook backend '{backend}' (use {', '.join(WRITER_BACKENDS)})")
+    return WRITER_BACKENDS[backend](**options)